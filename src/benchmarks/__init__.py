@@ -0,0 +1,24 @@
+"""
+NodeMonitor benchmark suite
+
+Synthetic mesh generator plus ingest, latency, lock contention and memory
+benchmarks for the monitoring package. Results can be saved as JSON
+baselines and compared across releases.
+
+Usage:
+    python3 -m src.benchmarks --nodes 1000 --packets 20000
+    python3 -m src.benchmarks --save                       # baselines/<version>.json
+    python3 -m src.benchmarks --compare src/benchmarks/baselines/4.0.1.json
+"""
+
+from .synthetic import SyntheticMesh, DEFAULT_MIX, parse_mix
+from .ingest import (
+    bench_parse, bench_ingest, bench_contention, bench_memory, bench_stream,
+    run_suite, compare, percentiles, InstrumentedLock,
+)
+
+__all__ = [
+    'SyntheticMesh', 'DEFAULT_MIX', 'parse_mix',
+    'bench_parse', 'bench_ingest', 'bench_contention', 'bench_memory', 'bench_stream',
+    'run_suite', 'compare', 'percentiles', 'InstrumentedLock',
+]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Run the NodeMonitor benchmark suite
+
+Usage:
+    python3 -m src.benchmarks [options]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .ingest import compare, run_suite
+from .synthetic import parse_mix
+
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+
+
+def print_results(results: dict):
+    """Print a human-readable summary"""
+    meta = results['meta']
+    params = meta['params']
+    print(f"\nNodeMonitor benchmarks - v{meta['version']} on Python {meta['python']} ({meta['machine']})")
+    print(f"  {params['nodes']} nodes, {params['packets']} packets, seed {params['seed']}\n")
+
+    parse = results['parse']
+    print(f"  Parse             {parse['packets_per_sec']:>10,} pkt/s")
+
+    for key, label in (('ingest', 'Ingest (queued)'), ('ingest_sync', 'Ingest (inline)')):
+        ingest = results[key]
+        lat = ingest['callback_latency_ms']
+        print(f"  {label:<17} {ingest['packets_per_sec']:>10,} pkt/s   "
+              f"callback p50 {lat['p50']:.3f} ms  p95 {lat['p95']:.3f} ms  "
+              f"p99 {lat['p99']:.3f} ms  max {lat['max']:.3f} ms")
+        print(f"  {'':<17} {ingest['callbacks']:>10,} callbacks  "
+              f"{ingest['coalesced']:,} coalesced  {ingest['dropped']:,} dropped  "
+              f"drain {ingest['drain_seconds']:.3f}s")
+
+    cont = results['contention']
+    wait = cont['lock_wait_us']
+    print(f"  Contention        {cont['packets_per_sec']:>10,} pkt/s   "
+          f"{cont['readers']} readers, {cont['reader_ops']:,} reads")
+    print(f"  {'':<17} {cont['lock_contended']:>10,} of {cont['lock_acquisitions']:,} acquisitions "
+          f"contended ({cont['contention_ratio']:.1%})  wait p99 {wait['p99']:.1f} us  "
+          f"max {wait['max']:.1f} us")
+
+    mem = results['memory']
+    print(f"  Memory            {mem['bytes_per_node']:>10,} B/node   "
+          f"(table {mem['table_bytes_per_node']} B/node)  "
+          f"to_dict {mem['to_dict_ms']:.2f} ms ({mem['to_dict_us_per_node']:.2f} us/node)")
+
+    stream = results.get('stream')
+    if stream:
+        if 'skipped' in stream:
+            print(f"  Stream            skipped: {stream['skipped']}")
+        else:
+            print(f"  Stream            {stream['packets_per_sec']:>10,} pkt/s   "
+                  f"config download {stream['config_seconds']:.3f}s")
+    print()
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="NodeMonitor ingest benchmarks")
+    parser.add_argument('--nodes', type=int, default=1000, help='Synthetic node count (default: 1000)')
+    parser.add_argument('--packets', type=int, default=20000, help='Packets per benchmark (default: 20000)')
+    parser.add_argument('--seed', type=int, default=1, help='RNG seed (default: 1)')
+    parser.add_argument('--mix', help='Packet mix, e.g. device=0.5,position=0.3,heard=0.2')
+    parser.add_argument('--readers', type=int, default=2,
+                        help='Reader threads for the contention benchmark (default: 2)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Live packet rate for the TCP stream benchmark, 0 = max (default: 0)')
+    parser.add_argument('--no-stream', action='store_true', help='Skip the TCP stream benchmark')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--save', nargs='?', const='', metavar='PATH',
+                        help='Save results as a baseline (default: baselines/<version>.json)')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Regression threshold as a fraction (default: 0.2)')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = run_suite(nodes=args.nodes, packets=args.packets, seed=args.seed, mix=mix,
+                        readers=args.readers, rate=args.rate, stream=not args.no_stream)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    if args.save is not None:
+        path = Path(args.save) if args.save else BASELINE_DIR / f"{results['meta']['version']}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"Baseline saved to {path}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        base_meta = baseline.get('meta', {})
+        print(f"Compared with {args.compare} (v{base_meta.get('version', '?')}, "
+              f"{base_meta.get('timestamp', '?')})", file=sys.stderr)
+        if base_meta.get('params') != results['meta']['params']:
+            print("  Warning: baseline was recorded with different parameters", file=sys.stderr)
+        if regressions:
+            for r in regressions:
+                print(f"  REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} "
+                      f"({r['change']:+.1%})", file=sys.stderr)
+            sys.exit(1)
+        print(f"  No regressions beyond {args.threshold:.0%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+NodeMonitor ingest benchmarks
+
+Each bench_* function builds a fresh NodeMonitor, drives it with a
+SyntheticMesh and returns a flat-ish dict of results:
+
+- bench_parse:      extract_node_fields throughput
+- bench_ingest:     _apply_node_data throughput and callback latency
+- bench_contention: ingest with concurrent readers on the monitor lock
+- bench_memory:     traced bytes per node and to_dict() cost
+- bench_stream:     end-to-end over TCP through FakeMeshtasticd
+                    (needs the meshtastic protobufs)
+
+run_suite() runs them all and adds run metadata; compare() checks a run
+against a saved baseline.
+"""
+
+import asyncio
+import platform
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from src.monitoring import NodeMonitor
+    from src.monitoring.node_monitor import extract_node_fields
+    from src.monitoring.fake_daemon import FakeMeshtasticd, build_my_info_payload
+except ImportError:
+    from monitoring import NodeMonitor
+    from monitoring.node_monitor import extract_node_fields
+    from monitoring.fake_daemon import FakeMeshtasticd, build_my_info_payload
+
+from .synthetic import SyntheticMesh
+
+
+def percentiles(values: Sequence[float], points=(50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles plus max, as {'p50': ..., 'max': ...}"""
+    if not values:
+        return dict({f"p{p}": 0.0 for p in points}, max=0.0)
+    ordered = sorted(values)
+    result = {}
+    for p in points:
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        result[f"p{p}"] = ordered[index]
+    result['max'] = ordered[-1]
+    return result
+
+
+def _scaled(stats: Dict[str, float], factor: float, digits: int = 3) -> Dict[str, float]:
+    return {k: round(v * factor, digits) for k, v in stats.items()}
+
+
+class InstrumentedLock:
+    """threading.Lock stand-in that records contended acquisitions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_times: List[float] = []
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        if acquired:
+            # Counters are only touched while holding the lock
+            self.wait_times.append(time.perf_counter() - start)
+            self.acquisitions += 1
+            self.contended += 1
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _loaded_monitor(mesh: SyntheticMesh, sync_callbacks: bool = False) -> NodeMonitor:
+    monitor = NodeMonitor(sync_callbacks=sync_callbacks)
+    for node_id, data in mesh.node_db():
+        monitor._apply_node_data(node_id, data)
+    return monitor
+
+
+def bench_parse(mesh: SyntheticMesh, packets: int) -> Dict[str, Any]:
+    """Throughput of extracting table fields from node dicts"""
+    stream = list(mesh.packets(packets))
+    start = time.perf_counter()
+    for node_id, data in stream:
+        extract_node_fields(node_id, data)
+    elapsed = time.perf_counter() - start
+    return {
+        'packets': packets,
+        'seconds': round(elapsed, 4),
+        'packets_per_sec': round(packets / elapsed) if elapsed else 0,
+    }
+
+
+def bench_ingest(mesh: SyntheticMesh, packets: int, synchronous: bool = False) -> Dict[str, Any]:
+    """
+    Ingest throughput and publish-to-callback latency.
+
+    Latency is measured from the most recent update of a node to the
+    on_node_changed call that delivers it, so coalesced updates count
+    from their newest member.
+    """
+    monitor = _loaded_monitor(mesh, sync_callbacks=synchronous)
+    stream = list(mesh.packets(packets))
+    published: Dict[str, float] = {}
+    latencies: List[float] = []
+
+    def on_node_changed(node, changes):
+        sent = published.get(node.node_id)
+        if sent is not None:
+            latencies.append(time.perf_counter() - sent)
+
+    monitor.on_node_changed = on_node_changed
+
+    apply = monitor._apply_node_data
+    start = time.perf_counter()
+    for node_id, data in stream:
+        published[node_id] = time.perf_counter()
+        apply(node_id, data)
+    ingest_done = time.perf_counter()
+    monitor.events.close(timeout=60)
+    drained = time.perf_counter()
+
+    elapsed = ingest_done - start
+    changed = next((s for s in monitor.get_dispatch_stats() if 'node_changed' in s['events']), {})
+    return {
+        'packets': packets,
+        'seconds': round(elapsed, 4),
+        'packets_per_sec': round(packets / elapsed) if elapsed else 0,
+        'drain_seconds': round(drained - ingest_done, 4),
+        'callbacks': len(latencies),
+        'coalesced': changed.get('coalesced', 0),
+        'dropped': changed.get('dropped', 0),
+        'callback_latency_ms': _scaled(percentiles(latencies), 1000),
+    }
+
+
+def bench_contention(mesh: SyntheticMesh, packets: int, readers: int = 2) -> Dict[str, Any]:
+    """
+    Ingest while `readers` threads poll get_nodes() and find_nodes().
+
+    Reports how often the monitor lock was contended and for how long.
+    """
+    monitor = _loaded_monitor(mesh)
+    lock = InstrumentedLock()
+    monitor._lock = lock
+    stream = list(mesh.packets(packets))
+    stop = threading.Event()
+    reads = [0] * readers
+
+    def reader(slot):
+        while not stop.is_set():
+            monitor.get_nodes()
+            monitor.find_nodes(battery_level__lt=20)
+            reads[slot] += 2
+
+    threads = [threading.Thread(target=reader, args=(i,), daemon=True) for i in range(readers)]
+    for t in threads:
+        t.start()
+
+    apply = monitor._apply_node_data
+    start = time.perf_counter()
+    for node_id, data in stream:
+        apply(node_id, data)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in threads:
+        t.join()
+    monitor.events.close(timeout=60)
+
+    return {
+        'packets': packets,
+        'readers': readers,
+        'packets_per_sec': round(packets / elapsed) if elapsed else 0,
+        'reader_ops': sum(reads),
+        'lock_acquisitions': lock.acquisitions,
+        'lock_contended': lock.contended,
+        'contention_ratio': round(lock.contended / lock.acquisitions, 4) if lock.acquisitions else 0.0,
+        'lock_wait_us': _scaled(percentiles(lock.wait_times), 1e6, 1),
+    }
+
+
+def bench_memory(nodes: int, seed: int = 1, repeats: int = 5) -> Dict[str, Any]:
+    """Traced memory per node and to_dict() cost for a loaded monitor"""
+    mesh = SyntheticMesh(nodes=nodes, seed=seed)
+    db = mesh.node_db()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    monitor = NodeMonitor()
+    for node_id, data in db:
+        monitor._apply_node_data(node_id, data)
+    traced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        monitor.to_dict()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    return {
+        'nodes': nodes,
+        'bytes_per_node': round(traced / nodes) if nodes else 0,
+        'table_bytes_per_node': round(monitor.table.memory_bytes() / nodes) if nodes else 0,
+        'to_dict_ms': round(best * 1000, 3),
+        'to_dict_us_per_node': round(best * 1e6 / nodes, 3) if nodes else 0,
+    }
+
+
+async def _stream(mesh: SyntheticMesh, packets: int, rate: float) -> Dict[str, Any]:
+    config = [build_my_info_payload(0x10000000)] + mesh.node_info_payloads()
+    updates = SyntheticMesh(nodes=mesh.node_count, seed=mesh.seed + 1).node_info_payloads()
+    live = [updates[i % len(updates)] for i in range(packets)]
+
+    daemon = FakeMeshtasticd(config_payloads=config)
+    port = await daemon.start()
+    monitor = NodeMonitor(host='127.0.0.1', port=port, sync_callbacks=True)
+    received = 0
+    done = asyncio.Event()
+
+    def on_frame(payload):
+        nonlocal received
+        received += 1
+        if received >= packets:
+            done.set()
+
+    try:
+        start = time.perf_counter()
+        if not await monitor.connect_async(timeout=60):
+            return {'skipped': 'connect failed'}
+        config_seconds = time.perf_counter() - start
+        monitor._stream_client.on_raw_frame = on_frame
+
+        start = time.perf_counter()
+        if rate > 0:
+            interval = 1.0 / rate
+            for i, payload in enumerate(live):
+                delay = start + i * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await daemon.broadcast(payload)
+        else:
+            for i in range(0, len(live), 256):
+                await daemon.broadcast_many(live[i:i + 256])
+        await asyncio.wait_for(done.wait(), timeout=120)
+        elapsed = time.perf_counter() - start
+    finally:
+        await monitor.disconnect_async()
+        await daemon.stop()
+
+    return {
+        'nodes': mesh.node_count,
+        'packets': packets,
+        'target_rate': rate,
+        'config_seconds': round(config_seconds, 4),
+        'seconds': round(elapsed, 4),
+        'packets_per_sec': round(packets / elapsed) if elapsed else 0,
+    }
+
+
+def bench_stream(mesh: SyntheticMesh, packets: int, rate: float = 0) -> Dict[str, Any]:
+    """
+    Config download time and live ingest rate over a real TCP socket.
+
+    Args:
+        rate: Target packets/s for live traffic (0 = as fast as possible)
+    """
+    try:
+        mesh.node_info_payloads()
+    except ImportError as e:
+        return {'skipped': f"meshtastic protobufs unavailable: {e}"}
+    return asyncio.run(_stream(mesh, packets, rate))
+
+
+def _version() -> str:
+    try:
+        from src.__version__ import __version__
+    except ImportError:
+        try:
+            from __version__ import __version__
+        except ImportError:
+            return 'unknown'
+    return __version__
+
+
+def run_suite(nodes: int = 1000, packets: int = 20000, seed: int = 1,
+              mix: Optional[Dict[str, float]] = None, readers: int = 2,
+              rate: float = 0, stream: bool = True) -> Dict[str, Any]:
+    """Run every benchmark with one configuration"""
+    def mesh():
+        return SyntheticMesh(nodes=nodes, seed=seed, mix=mix)
+
+    results = {
+        'meta': {
+            'version': _version(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'params': {
+                'nodes': nodes, 'packets': packets, 'seed': seed,
+                'mix': mesh().mix, 'readers': readers, 'rate': rate,
+            },
+        },
+        'parse': bench_parse(mesh(), packets),
+        'ingest': bench_ingest(mesh(), packets),
+        'ingest_sync': bench_ingest(mesh(), packets, synchronous=True),
+        'contention': bench_contention(mesh(), packets, readers),
+        'memory': bench_memory(nodes, seed),
+    }
+    if stream:
+        results['stream'] = bench_stream(mesh(), packets, rate)
+    return results
+
+
+# Metric name suffix -> True if higher is better
+_DIRECTIONS = (
+    ('packets_per_sec', True),
+    ('reader_ops', True),
+    ('_ms', False),
+    ('_us', False),
+    ('p50', False),
+    ('p95', False),
+    ('p99', False),
+    ('bytes_per_node', False),
+    ('us_per_node', False),
+    ('config_seconds', False),
+    ('contention_ratio', False),
+)
+
+
+def _flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if key == 'meta':
+            continue
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def _direction(name: str) -> Optional[bool]:
+    # Single worst samples are too noisy to gate on
+    if name.endswith('.max'):
+        return None
+    for part in reversed(name.split('.')):
+        for suffix, higher_is_better in _DIRECTIONS:
+            if part.endswith(suffix):
+                return higher_is_better
+    return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Metrics that got worse than the baseline by more than `threshold`.
+
+    Returns:
+        List of {'metric', 'baseline', 'current', 'change'} (change as a
+        signed fraction, positive = worse)
+    """
+    regressions = []
+    base = _flatten(baseline)
+    for name, value in _flatten(current).items():
+        higher_is_better = _direction(name)
+        old = base.get(name)
+        if higher_is_better is None or not old:
+            continue
+        change = (old - value) / old if higher_is_better else (value - old) / old
+        if change > threshold:
+            regressions.append({
+                'metric': name, 'baseline': old, 'current': value, 'change': round(change, 4)})
+    return regressions
@@ -0,0 +1,159 @@
+"""
+Synthetic mesh generator
+
+Produces deterministic node databases and packet streams shaped like the
+node dicts meshtastic hands to NodeMonitor (MessageToDict camelCase keys).
+Node count, telemetry mix and seed are configurable so runs are
+reproducible across machines and releases.
+"""
+
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+HW_MODELS = ('TBEAM', 'HELTEC_V3', 'RAK4631', 'T_ECHO', 'STATION_G2', 'TLORA_V2_1_1P6')
+ROLES = ('CLIENT', 'CLIENT', 'CLIENT', 'ROUTER', 'CLIENT_MUTE', 'REPEATER')
+
+# Packet kind -> relative weight
+DEFAULT_MIX = {
+    'device': 0.45,       # deviceMetrics telemetry
+    'environment': 0.15,  # environmentMetrics telemetry
+    'position': 0.25,     # position update
+    'nodeinfo': 0.05,     # user record rebroadcast
+    'heard': 0.10,        # snr / lastHeard only
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse 'device=0.5,position=0.5' into a mix dict"""
+    mix = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"Unknown packet kind '{kind}' (expected one of {', '.join(DEFAULT_MIX)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+class SyntheticMesh:
+    """Deterministic synthetic mesh of `nodes` nodes"""
+
+    def __init__(self, nodes: int = 500, seed: int = 1,
+                 mix: Optional[Dict[str, float]] = None,
+                 center: Tuple[float, float] = (21.3069, -157.8583)):
+        """
+        Args:
+            nodes: Number of nodes in the mesh
+            seed: RNG seed
+            mix: Packet kind weights (default: DEFAULT_MIX)
+            center: Latitude/longitude the nodes are scattered around
+        """
+        self.node_count = nodes
+        self.seed = seed
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.center = center
+        self._rng = random.Random(seed)
+        self._kinds = list(self.mix)
+        self._weights = [self.mix[k] for k in self._kinds]
+        self._nodes = [self._make_node(i) for i in range(nodes)]
+
+    def _make_node(self, index: int) -> Dict:
+        rng = self._rng
+        num = 0x10000000 + index
+        lat = self.center[0] + rng.uniform(-0.5, 0.5)
+        lon = self.center[1] + rng.uniform(-0.5, 0.5)
+        return {
+            'num': num,
+            'user': {
+                'id': f"!{num:08x}",
+                'longName': f"Synthetic {index:05d}",
+                'shortName': f"S{index % 1000:03d}",
+                'hwModel': rng.choice(HW_MODELS),
+                'role': rng.choice(ROLES),
+            },
+            'position': {
+                'latitudeI': int(lat * 1e7),
+                'longitudeI': int(lon * 1e7),
+                'altitude': rng.randint(0, 900),
+            },
+            'deviceMetrics': {
+                'batteryLevel': rng.randint(5, 100),
+                'voltage': round(rng.uniform(3.3, 4.2), 2),
+                'channelUtilization': round(rng.uniform(0, 40), 2),
+                'airUtilTx': round(rng.uniform(0, 10), 2),
+            },
+            'snr': round(rng.uniform(-20, 10), 2),
+            'hopsAway': rng.randint(0, 5),
+            'lastHeard': int(time.time()) - rng.randint(0, 7200),
+        }
+
+    def node_db(self) -> List[Tuple[str, Dict]]:
+        """Initial node database as (node_id, node dict) pairs"""
+        return [(n['user']['id'], n) for n in self._nodes]
+
+    def packets(self, count: int) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream of `count` partial node updates drawn from the mix.
+
+        Every update carries a fresh lastHeard and a changed value, so none
+        is suppressed as a no-op by the table merge.
+        """
+        rng = self._rng
+        nodes = self._nodes
+        kinds = rng.choices(self._kinds, self._weights, k=count)
+        now = int(time.time())
+        for i, kind in enumerate(kinds):
+            node = rng.choice(nodes)
+            now += 1
+            update = {'num': node['num'], 'lastHeard': now, 'snr': round(rng.uniform(-20, 10), 2)}
+            if kind == 'device':
+                update['deviceMetrics'] = {
+                    'batteryLevel': rng.randint(5, 100),
+                    'voltage': round(rng.uniform(3.3, 4.2), 3),
+                    'channelUtilization': round(rng.uniform(0, 40), 2),
+                    'airUtilTx': round(rng.uniform(0, 10), 2),
+                }
+            elif kind == 'environment':
+                update['environmentMetrics'] = {
+                    'temperature': round(rng.uniform(-5, 35), 2),
+                    'relativeHumidity': round(rng.uniform(10, 95), 1),
+                    'barometricPressure': round(rng.uniform(980, 1030), 1),
+                }
+            elif kind == 'position':
+                pos = node['position']
+                update['position'] = {
+                    'latitudeI': pos['latitudeI'] + rng.randint(-500, 500),
+                    'longitudeI': pos['longitudeI'] + rng.randint(-500, 500),
+                    'altitude': pos['altitude'] + rng.randint(-5, 5),
+                    'time': now,
+                }
+            elif kind == 'nodeinfo':
+                update['user'] = dict(node['user'], longName=f"{node['user']['longName']} {i}")
+            yield node['user']['id'], update
+
+    def node_info_payloads(self) -> List[bytes]:
+        """
+        Node database as serialized FromRadio node_info payloads.
+
+        Requires the meshtastic protobufs.
+        """
+        try:
+            from src.monitoring.fake_daemon import build_node_info_payload
+        except ImportError:
+            from monitoring.fake_daemon import build_node_info_payload
+
+        payloads = []
+        for node in self._nodes:
+            metrics = node['deviceMetrics']
+            position = node['position']
+            payloads.append(build_node_info_payload(
+                node['num'], node['user']['longName'], node['user']['shortName'],
+                battery_level=metrics['batteryLevel'], voltage=metrics['voltage'],
+                channel_utilization=metrics['channelUtilization'],
+                air_util_tx=metrics['airUtilTx'],
+                latitude=position['latitudeI'] / 1e7, longitude=position['longitudeI'] / 1e7,
+                snr=node['snr'], last_heard=node['lastHeard'], hops_away=node['hopsAway']))
+        return payloads
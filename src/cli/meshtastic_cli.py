@@ -50,6 +50,16 @@ class MeshtasticCLI:
             return []  # BLE uses --ble-scan first
         return ["--host", "localhost"]
 
+    def _broker_call(self, method, **params):
+        """Call the radio broker if it serves the daemon we point at, else None"""
+        if self._connection_type != "localhost":
+            return None
+        from monitoring.broker import try_broker
+        status = try_broker('status')
+        if not status or status.get('host') != self._connection_value:
+            return None
+        return try_broker(method, **params)
+
     def _run_command(self, args, show_output=True):
         """Run a meshtastic CLI command"""
         if not self._cli_available:
@@ -241,13 +251,48 @@ class MeshtasticCLI:
     def _show_info(self):
         """Show node information"""
         console.print("\n[bold cyan]Node Information[/bold cyan]\n")
-        self._run_command(["--info"])
+        # Radio broker answers from memory without starting the CLI
+        info = self._broker_call('get_radio_info')
+        if info and 'error' not in info:
+            console.print("[dim]From radio broker[/dim]\n")
+            table = Table(show_header=False)
+            table.add_column("Field", style="cyan")
+            table.add_column("Value")
+            for key, value in info.items():
+                table.add_row(str(key), str(value))
+            console.print(table)
+        else:
+            self._run_command(["--info"])
         Prompt.ask("\n[dim]Press Enter to continue[/dim]")
 
     def _list_nodes(self):
         """List all known nodes"""
         console.print("\n[bold cyan]Known Nodes[/bold cyan]\n")
-        self._run_command(["--nodes"])
+        nodes = self._broker_call('get_nodes')
+        if nodes is not None:
+            console.print(f"[dim]From radio broker: {len(nodes)} node(s)[/dim]\n")
+            table = Table()
+            table.add_column("ID", style="cyan")
+            table.add_column("Name")
+            table.add_column("Short")
+            table.add_column("Hardware")
+            table.add_column("SNR", justify="right")
+            table.add_column("Hops", justify="right")
+            table.add_column("Battery", justify="right")
+            table.add_column("Last Heard")
+            for node in nodes:
+                battery = node['metrics'].get('battery_level')
+                table.add_row(
+                    node['node_id'], node['long_name'] or '', node['short_name'] or '',
+                    node['hardware'] or '',
+                    f"{node['snr']:.1f}" if node['snr'] is not None else '',
+                    str(node['hops_away']) if node['hops_away'] is not None else '',
+                    f"{battery}%" if battery is not None else '',
+                    (node['last_heard'] or '').replace('T', ' ')[:19],
+                )
+            console.print(table)
+        else:
+            self._run_command(["--nodes"])
         Prompt.ask("\n[dim]Press Enter to continue[/dim]")
 
     def _get_all_settings(self):
@@ -356,13 +401,20 @@ class MeshtasticCLI:
         ch_index = Prompt.ask("Channel index", default="0")
         ack = Confirm.ask("Request acknowledgment?", default=False)
 
-        args = ["--ch-index", ch_index, "--sendtext", message]
-        if dest:
-            args.extend(["--dest", dest])
-        if ack:
-            args.append("--ack")
+        result = None
+        if ch_index.isdigit():
+            result = self._broker_call('send_text', text=message, destination=dest or None,
+                                       channel=int(ch_index), want_ack=ack)
+        if result and result.get('success'):
+            console.print("[green]Message sent via radio broker[/green]")
+        else:
+            args = ["--ch-index", ch_index, "--sendtext", message]
+            if dest:
+                args.extend(["--dest", dest])
+            if ack:
+                args.append("--ack")
 
-        self._run_command(args)
+            self._run_command(args)
         Prompt.ask("\n[dim]Press Enter to continue[/dim]")
 
     def _request_position(self):
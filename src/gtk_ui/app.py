@@ -226,6 +226,17 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         self.uptime_label = Gtk.Label(label="Uptime: --")
         box.append(self.uptime_label)
 
+        # Alerts from the radio broker's rule engine (shown once enabled)
+        from monitoring.alerts import GtkStatusBarSink
+        self.alert_separator = Gtk.Separator(orientation=Gtk.Orientation.VERTICAL)
+        self.alert_separator.set_visible(False)
+        box.append(self.alert_separator)
+        self.alert_label = Gtk.Label(label="Alerts: none")
+        self.alert_label.set_visible(False)
+        box.append(self.alert_label)
+        self._alert_sink = GtkStatusBarSink(self.alert_label)
+        self._alert_seq = 0
+
         return box
 
     def _create_sidebar(self):
@@ -417,6 +428,7 @@ class MeshForgeWindow(Adw.ApplicationWindow):
 
                 # Try to get node count from meshtastic CLI
                 node_count = self._get_node_count()
+                self._poll_alerts()
 
             # Update UI in main thread
             GLib.idle_add(self._update_status_ui, is_active, uptime, node_count)
@@ -424,6 +436,25 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         except Exception as e:
             GLib.idle_add(self._update_status_ui, False, "--", "--")
 
+    def _poll_alerts(self):
+        """Feed new alert events from the radio broker to the status bar"""
+        from monitoring.broker import try_broker
+        from monitoring.alerts import Alert
+
+        result = try_broker('get_alerts', after=self._alert_seq)
+        if not result or not result.get('enabled'):
+            return
+        if result['stats']['alerts_sent'] < self._alert_seq:
+            # Broker restarted; its sequence numbers start over
+            self._alert_seq = 0
+            self._alert_sink.reset()
+            return
+        for event in result['events']:
+            self._alert_sink(Alert.from_dict(event))
+        self._alert_seq = result['seq']
+        GLib.idle_add(self.alert_separator.set_visible, True)
+        GLib.idle_add(self.alert_label.set_visible, True)
+
     def _get_node_count(self):
         """Get the number of nodes from meshtastic TCP interface or CLI"""
         import time as time_module
@@ -434,6 +465,14 @@ class MeshForgeWindow(Adw.ApplicationWindow):
         if now - self._node_count_timestamp < self._node_count_cache_ttl:
             return self._node_count_cache
 
+        # Shared radio broker keeps the node DB in memory
+        from monitoring.broker import try_broker
+        count = try_broker('get_node_count')
+        if count is not None:
+            self._node_count_cache = str(count)
+            self._node_count_timestamp = now
+            return self._node_count_cache
+
         # Quick pre-check: is meshtasticd TCP port reachable?
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -79,6 +79,14 @@ class DashboardPanel(Gtk.Box):
         )
         grid.attach(self.hardware_card, 1, 1, 1, 1)
 
+        # Channel Utilization Card (from the radio broker)
+        self.channel_card = self._create_status_card(
+            "Channel Utilization",
+            "Checking...",
+            "network-wireless-signal-good-symbolic"
+        )
+        grid.attach(self.channel_card, 0, 2, 2, 1)
+
         # Log output area
         log_frame = Gtk.Frame()
         log_frame.set_label("Recent Service Logs")
@@ -290,6 +298,21 @@ class DashboardPanel(Gtk.Box):
         except Exception as e:
             GLib.idle_add(self._update_card_value, self.hardware_card, f"Error: {e}", "error")
 
+        # Channel utilization - rolling stats kept by the radio broker
+        try:
+            from monitoring.broker import try_broker
+            from monitoring.channel_analytics import format_summary_line
+            summary = try_broker('get_channel_analytics')
+            if summary is None:
+                GLib.idle_add(self._update_card_value, self.channel_card,
+                              "Radio broker not running", "warning")
+            else:
+                css = {'ok': 'success', 'warning': 'warning'}.get(summary['level'], 'error')
+                GLib.idle_add(self._update_card_value, self.channel_card,
+                              format_summary_line(summary), css)
+        except Exception as e:
+            GLib.idle_add(self._update_card_value, self.channel_card, f"Error: {e}", "error")
+
         # Logs
         try:
             result = subprocess.run(
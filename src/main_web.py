@@ -15,6 +15,9 @@ import os
 import sys
 import re
 import json
+import hashlib
+import queue
+import time
 import socket
 import signal
 import subprocess
@@ -22,6 +25,7 @@ import threading
 import argparse
 import secrets
 import atexit
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from functools import wraps
@@ -33,13 +37,19 @@ _shutdown_flag = False
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from monitoring.broker import BrokerClient, BrokerError, BrokerRequestError, try_broker
+from monitoring.host_stats import format_uptime, read_host_stats
+from monitoring.node_table import NodeTable
+from utils.singleflight import SingleFlight, singleflight
+from utils.journal import JournalFollower
+
 try:
-    from flask import Flask, render_template_string, jsonify, request, redirect, url_for, session
+    from flask import Flask, Response, render_template_string, jsonify, request, redirect, url_for, session
 except ImportError:
     print("Flask not installed. Installing...")
     subprocess.run([sys.executable, '-m', 'pip', 'install', '--break-system-packages', 'flask'],
                    capture_output=True)
-    from flask import Flask, render_template_string, jsonify, request, redirect, url_for, session
+    from flask import Flask, Response, render_template_string, jsonify, request, redirect, url_for, session
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(32)
@@ -50,11 +60,9 @@ CONFIG = {
     'password': None,  # Set via --password or environment
     'host': '0.0.0.0',
     'port': 8080,
+    'metrics_enabled': False,  # Set via --metrics or environment
 }
 
-# CPU stats for delta calculation
-_last_cpu = None
-
 # PID file for tracking
 WEB_PID_FILE = Path('/tmp/meshtasticd-web.pid')
 
@@ -75,6 +83,7 @@ def cleanup_processes():
         except Exception:
             pass
     _running_processes.clear()
+    _journal.stop()
 
     # Clean up PID file
     try:
@@ -237,100 +246,49 @@ def check_service_status():
     return is_running, status_detail
 
 
-def get_system_stats():
-    """Get system statistics"""
-    global _last_cpu
-    stats = {}
+# What the dashboard shows for readings that failed
+SYSTEM_PLACEHOLDER = {
+    'cpu_percent': 0,
+    'mem_percent': 0, 'mem_used_mb': 0, 'mem_total_mb': 0,
+    'disk_percent': 0, 'disk_used_gb': 0, 'disk_total_gb': 0,
+    'temperature': None,
+    'uptime': '--',
+    'measured': [],
+}
 
-    # CPU usage
-    try:
-        with open('/proc/stat', 'r') as f:
-            line = f.readline()
-        cpu_vals = [int(x) for x in line.split()[1:8]]
-        idle = cpu_vals[3]
-        total = sum(cpu_vals)
-        if _last_cpu:
-            diff_idle = idle - _last_cpu[0]
-            diff_total = total - _last_cpu[1]
-            stats['cpu_percent'] = round(100 * (1 - diff_idle / diff_total), 1) if diff_total > 0 else 0
-        else:
-            stats['cpu_percent'] = 0
-        _last_cpu = (idle, total)
-    except Exception:
-        stats['cpu_percent'] = 0
 
-    # Memory usage
-    try:
-        with open('/proc/meminfo', 'r') as f:
-            lines = f.readlines()
-        mem_info = {}
-        for line in lines:
-            parts = line.split(':')
-            if len(parts) == 2:
-                key = parts[0].strip()
-                val = int(parts[1].split()[0])
-                mem_info[key] = val
-        total = mem_info.get('MemTotal', 1)
-        avail = mem_info.get('MemAvailable', mem_info.get('MemFree', 0))
-        used = total - avail
-        stats['mem_percent'] = round(100 * used / total, 1) if total > 0 else 0
-        stats['mem_used_mb'] = round(used / 1024)
-        stats['mem_total_mb'] = round(total / 1024)
-    except Exception:
-        stats['mem_percent'] = 0
-        stats['mem_used_mb'] = 0
-        stats['mem_total_mb'] = 0
+def get_system_stats():
+    """Get system statistics (SYSTEM_PLACEHOLDER values for failed readings)"""
+    stats = dict(SYSTEM_PLACEHOLDER)
+    readings = read_host_stats()
+    stats.update(readings)
+    # /metrics exports only real readings, not the placeholders
+    stats['measured'] = sorted(readings)
+    uptime = readings.get('uptime_seconds')
+    stats['uptime'] = format_uptime(uptime) if uptime is not None else "--"
+    return stats
 
-    # Disk usage
-    try:
-        stat = os.statvfs('/')
-        total = stat.f_blocks * stat.f_frsize
-        free = stat.f_bfree * stat.f_frsize
-        used = total - free
-        stats['disk_percent'] = round(100 * used / total, 1) if total > 0 else 0
-        stats['disk_used_gb'] = round(used / (1024**3), 1)
-        stats['disk_total_gb'] = round(total / (1024**3), 1)
-    except Exception:
-        stats['disk_percent'] = 0
-        stats['disk_used_gb'] = 0
-        stats['disk_total_gb'] = 0
 
-    # Temperature
-    try:
-        temp = None
-        temp_file = Path('/sys/class/thermal/thermal_zone0/temp')
-        if temp_file.exists():
-            temp = int(temp_file.read_text().strip()) / 1000
-        if temp is None:
-            result = subprocess.run(['vcgencmd', 'measure_temp'],
-                                   capture_output=True, text=True)
-            if result.returncode == 0 and 'temp=' in result.stdout:
-                temp = float(result.stdout.split('=')[1].replace("'C", "").strip())
-        stats['temperature'] = round(temp, 1) if temp else None
-    except Exception:
-        stats['temperature'] = None
+# One `journalctl -f` shared by every log reader
+_journal = JournalFollower('meshtasticd', maxlen=2000)
 
-    # Uptime
-    try:
-        with open('/proc/uptime', 'r') as f:
-            uptime_sec = float(f.read().split()[0])
-        days = int(uptime_sec // 86400)
-        hours = int((uptime_sec % 86400) // 3600)
-        mins = int((uptime_sec % 3600) // 60)
-        if days > 0:
-            stats['uptime'] = f"{days}d {hours}h {mins}m"
-        elif hours > 0:
-            stats['uptime'] = f"{hours}h {mins}m"
-        else:
-            stats['uptime'] = f"{mins}m"
-    except Exception:
-        stats['uptime'] = "--"
 
-    return stats
+def read_logs(lines=50, after=None):
+    """Log entries after a journal cursor (or the newest `lines`), as /api/logs returns them"""
+    if not _journal.start():
+        return {'logs': get_service_logs(lines), 'entries': [], 'cursor': None, 'reset': True}
+    limit = _journal.maxlen if after else max(1, min(lines, _journal.maxlen))
+    entries, cursor, reset = _journal.read(after=after, limit=limit)
+    return {
+        'logs': '\n'.join(entry['line'] for entry in entries),
+        'entries': entries,
+        'cursor': cursor,
+        'reset': reset,
+    }
 
 
 def get_service_logs(lines=50):
-    """Get recent service logs"""
+    """Get recent service logs (one-shot journalctl, when the follower can't run)"""
     try:
         result = subprocess.run(
             ['journalctl', '-u', 'meshtasticd', '-n', str(lines), '--no-pager'],
@@ -341,20 +299,26 @@ def get_service_logs(lines=50):
         return f"Error fetching logs: {e}"
 
 
-# Radio info cache
-_radio_cache = {'data': None, 'timestamp': 0}
+# Radio info cache: one `meshtastic --info` in flight at a time, results
+# kept for 30 s and served stale for 5 min while a refresh runs
 _RADIO_CACHE_TTL = 30  # seconds
+_radio_flight = SingleFlight(ttl=_RADIO_CACHE_TTL, stale_ttl=300,
+                             cache_if=lambda info: 'error' not in info)
 
 
 def get_radio_info(use_cache=True):
-    """Get radio info from meshtastic CLI with caching"""
-    import time
+    """Get radio info, coalescing concurrent callers into one backend call"""
+    if use_cache:
+        return _radio_flight.do('radio', _fetch_radio_info)
+    return _radio_flight.refresh('radio', _fetch_radio_info)
+
 
-    # Return cached data if fresh
-    if use_cache and _radio_cache['data']:
-        age = time.time() - _radio_cache['timestamp']
-        if age < _RADIO_CACHE_TTL:
-            return _radio_cache['data']
+def _fetch_radio_info():
+    """Get radio info from the radio broker or meshtastic CLI"""
+    # Shared radio broker answers from memory without spawning the CLI
+    info = try_broker('get_radio_info')
+    if info and 'error' not in info:
+        return info
 
     cli = find_meshtastic_cli()
     if not cli:
@@ -404,10 +368,6 @@ def get_radio_info(use_cache=True):
             if id_match:
                 info['node_id'] = id_match.group(1)
 
-            # Cache successful result
-            _radio_cache['data'] = info
-            _radio_cache['timestamp'] = time.time()
-
             return info if info else {'error': 'No radio info found in response'}
 
         # Check for common errors
@@ -463,9 +423,10 @@ def detect_hardware():
     """Detect hardware and service status"""
     detected = []
 
-    is_running, status = check_service_status()
+    service = _status.get('service')
+    is_running, status = service['running'], service['status']
     if is_running:
-        info = get_radio_info()
+        info = _status.get('radio')
         if 'error' not in info:
             hw = info.get('hardware', 'Connected')
             fw = info.get('firmware', '')
@@ -508,8 +469,12 @@ def detect_hardware():
     return detected
 
 
-def get_nodes():
-    """Get mesh nodes from meshtastic CLI"""
+@singleflight(ttl=10, stale_ttl=120, cache_if=lambda result: 'error' not in result)
+def _cli_node_table():
+    """
+    Parse `meshtastic --nodes` into a NodeTable, for when the radio broker
+    isn't running. Concurrent callers share one CLI run.
+    """
     cli = find_meshtastic_cli()
     if not cli:
         return {'error': 'Meshtastic CLI not found'}
@@ -532,53 +497,41 @@ def get_nodes():
         )
         if result is None:
             return {'error': 'Server shutting down'}
-        if result.returncode == 0:
-            output = result.stdout
-            nodes = []
+        if result.returncode != 0:
+            return {'error': result.stderr or 'Failed to get nodes', 'raw': result.stdout}
 
-            # Parse node entries - look for node info patterns
-            # Format: !abcd1234: User Name (SHORT)
-            import re
-            node_pattern = re.compile(
-                r'(!?[a-fA-F0-9]{8}):\s*([^\(]+)\s*\(([^\)]+)\)'
-            )
+        output = result.stdout
+        table = NodeTable()
+
+        def add(node_id, name, short_name):
+            node_id = '!' + node_id.lstrip('!').lower()
+            if node_id in table:
+                return
+            try:
+                node_num = int(node_id[1:], 16)
+            except ValueError:
+                return
+            table.merge(node_id, node_num, {'long_name': name, 'short_name': short_name})
+
+        # Parse node entries - look for node info patterns
+        # Format: !abcd1234: User Name (SHORT)
+        node_pattern = re.compile(
+            r'(!?[a-fA-F0-9]{8}):\s*([^\(]+)\s*\(([^\)]+)\)'
+        )
+        for match in node_pattern.finditer(output):
+            node_id, name, short_name = match.groups()
+            add(node_id.strip(), name.strip(), short_name.strip())
 
-            for match in node_pattern.finditer(output):
-                node_id, name, short_name = match.groups()
-                nodes.append({
-                    'id': node_id.strip(),
-                    'name': name.strip(),
-                    'short': short_name.strip()
-                })
-
-            # Also try to parse the table format if present
-            # Look for lines with | separators
-            lines = output.strip().split('\n')
-            for line in lines:
-                if '│' in line and '!' in line:
-                    parts = [p.strip() for p in line.split('│')]
-                    if len(parts) >= 4:
-                        # Try to extract node info from table row
-                        for part in parts:
-                            if part.startswith('!'):
-                                node_id = part
-                                break
-                        else:
-                            continue
-
-                        # Get other fields
-                        node_data = {
-                            'id': node_id,
-                            'name': parts[1] if len(parts) > 1 else '',
-                            'short': parts[2] if len(parts) > 2 else ''
-                        }
-                        # Avoid duplicates
-                        if not any(n['id'] == node_id for n in nodes):
-                            nodes.append(node_data)
-
-            return {'nodes': nodes, 'raw': output}
-
-        return {'error': result.stderr or 'Failed to get nodes', 'raw': result.stdout}
+        # Also parse the table format if present (lines with │ separators)
+        for line in output.strip().split('\n'):
+            if '│' in line and '!' in line:
+                parts = [p.strip() for p in line.split('│')]
+                if len(parts) >= 4:
+                    node_id = next((part for part in parts if part.startswith('!')), None)
+                    if node_id:
+                        add(node_id, parts[1], parts[2])
+
+        return {'table': table, 'raw': output}
 
     except subprocess.TimeoutExpired:
         return {'error': 'Timeout getting nodes (30s)'}
@@ -586,15 +539,95 @@ def get_nodes():
         return {'error': str(e)}
 
 
+_NODE_FILTER = re.compile(r'^(\w+)\s*(<=|>=|!=|==|<|>|=)\s*(.*)$')
+
+
+def _filter_value(text):
+    """Typed value for a ?filter= comparison"""
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_node_query(args):
+    """
+    /api/nodes query string -> NodeTable.query parameters
+
+    Raises:
+        ValueError: malformed filter or number
+    """
+    params = {
+        'sort': args.get('sort', 'node_id'),
+        'descending': args.get('order', 'asc') == 'desc',
+        'limit': max(0, min(int(args.get('limit', 100)), 1000)),
+        'filters': [],
+    }
+    if args.get('fields'):
+        params['fields'] = [name.strip() for name in args['fields'].split(',') if name.strip()]
+    if args.get('q'):
+        params['search'] = args['q']
+    if args.get('after'):
+        params['after'] = args['after']
+    for expr in args.getlist('filter'):
+        match = _NODE_FILTER.match(expr.strip())
+        if not match:
+            raise ValueError(f"Bad filter: {expr} (expected field<op>value)")
+        name, op, value = match.groups()
+        params['filters'].append([name, '==' if op == '=' else op, _filter_value(value)])
+    if args.get('heard_within'):
+        params['filters'].append(['last_heard', '>=', time.time() - float(args['heard_within'])])
+    return params
+
+
+def query_nodes(params, include_raw=False):
+    """
+    One page of nodes from the radio broker, or from the CLI as a fallback
+
+    Returns {'error': ...} when neither can be reached.
+
+    Raises:
+        ValueError: unknown field, bad operator or value, or a bad cursor
+    """
+    client = BrokerClient()
+    if os.path.exists(client.socket_path):
+        try:
+            return dict(client.call('query_nodes', **params), source='broker')
+        except BrokerRequestError as e:
+            raise ValueError(str(e))
+        except BrokerError:
+            pass
+
+    cli = _cli_node_table()
+    if 'error' in cli:
+        return cli
+    try:
+        result = cli['table'].query(**dict(params, filters=[tuple(f) for f in params['filters']]))
+    except KeyError as e:
+        raise ValueError(f"Unknown field: {e.args[0]}")
+    except TypeError as e:
+        raise ValueError(str(e))
+    result['source'] = 'cli'
+    if include_raw:
+        result['raw'] = cli['raw']
+    return result
+
+
 def send_mesh_message(text, destination=None):
     """Send a message to the mesh"""
+    if not text or not text.strip():
+        return {'error': 'Message cannot be empty'}
+
+    result = try_broker('send_text', text=text.strip(), destination=destination)
+    if result and result.get('success'):
+        return result
+
     cli = find_meshtastic_cli()
     if not cli:
         return {'error': 'Meshtastic CLI not found'}
 
-    if not text or not text.strip():
-        return {'error': 'Message cannot be empty'}
-
     # Check if port is reachable
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -625,6 +658,299 @@ def send_mesh_message(text, destination=None):
         return {'error': str(e)}
 
 
+# ============================================================================
+# Status Collector
+# ============================================================================
+
+# Seconds between collections of each status source
+STATUS_INTERVALS = {
+    'system': 1.0,      # /proc reads
+    'service': 2.0,     # systemctl / pgrep / port probe
+    'radio': 30.0,      # broker or meshtastic CLI
+    'hardware': 60.0,   # /dev scan
+}
+
+
+class _StatusSource:
+    __slots__ = ('name', 'probe', 'interval', 'placeholder', 'data', 'updated', 'cost', 'error',
+                 'version', 'last_read', 'thread', 'wake', 'run_lock')
+
+    def __init__(self, name, probe, interval, placeholder):
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.placeholder = placeholder
+        self.data = None
+        self.updated = None
+        self.cost = None
+        self.error = None
+        self.version = 0
+        self.last_read = 0.0
+        self.thread = None
+        self.wake = threading.Event()
+        self.run_lock = threading.Lock()
+
+
+class StatusCollector:
+    """
+    Background refresh of the probes behind the status endpoints.
+
+    Each source runs on its own thread at its own cadence, so a slow
+    radio query never delays the service check, and stores its latest
+    result in a versioned snapshot. Endpoints serialize that snapshot
+    instead of forking systemctl/pgrep/the meshtastic CLI per request.
+    A source starts on its first read and pauses after `idle_after`
+    seconds without readers.
+    """
+
+    def __init__(self, idle_after=300.0):
+        self.idle_after = idle_after
+        self.version = 0
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, probe, interval, placeholder=None):
+        """
+        Register a source. `placeholder` (a dict) is what readers get,
+        plus an 'error' key, until the probe has succeeded once.
+        """
+        self._sources[name] = _StatusSource(name, probe, interval, placeholder or {})
+
+    def get(self, name):
+        """
+        Latest result of a source. The first read, and a read after the
+        source went idle, collect synchronously. A source without data
+        (its probe has only failed so far) returns its placeholder with
+        an 'error' key, never None.
+        """
+        source = self._sources[name]
+        now = source.last_read = time.time()
+        if source.updated is None or now - source.updated > 2 * source.interval + 1:
+            with source.run_lock:
+                if source.updated is None or time.time() - source.updated > 2 * source.interval + 1:
+                    self._collect(source)
+        self._ensure_running(source)
+        return self._result(source)
+
+    def refresh(self, name):
+        """Collect a source now and return the fresh result"""
+        source = self._sources[name]
+        source.last_read = time.time()
+        with source.run_lock:
+            self._collect(source)
+        self._ensure_running(source)
+        return self._result(source)
+
+    @staticmethod
+    def _result(source):
+        data = source.data
+        if data is None:
+            data = dict(source.placeholder)
+            data['error'] = source.error or f"No {source.name} data yet"
+        return data
+
+    def wake(self, name):
+        """Ask a source's thread to collect early (e.g. after a service action)"""
+        self._sources[name].wake.set()
+
+    def describe(self, names):
+        """Freshness and collection cost of the given sources"""
+        now = time.time()
+        sources = {}
+        for name in names:
+            source = self._sources[name]
+            sources[name] = {
+                'version': source.version,
+                'updated': source.updated,
+                'age_s': round(now - source.updated, 1) if source.updated else None,
+                'cost_ms': round(source.cost * 1000, 1) if source.cost is not None else None,
+                'interval_s': source.interval,
+                'error': source.error,
+            }
+        return {'version': self.version, 'sources': sources}
+
+    def _collect(self, source):
+        # Caller holds source.run_lock
+        started = time.perf_counter()
+        try:
+            data = source.probe()
+            error = None
+        except Exception as e:
+            data = source.data
+            error = str(e)
+        cost = time.perf_counter() - started
+        with self._lock:
+            self.version += 1
+            source.data = data
+            source.error = error
+            source.cost = cost
+            source.updated = time.time()
+            source.version = self.version
+
+    def _ensure_running(self, source):
+        with self._lock:
+            if source.thread is None or not source.thread.is_alive():
+                source.thread = threading.Thread(target=self._run, args=(source,), daemon=True)
+                source.thread.start()
+
+    def _run(self, source):
+        while not _shutdown_flag:
+            source.wake.wait(max(0.0, source.updated + source.interval - time.time())
+                             if source.updated else 0)
+            source.wake.clear()
+            if time.time() - source.last_read > self.idle_after:
+                return  # restarted by the next get()
+            with source.run_lock:
+                self._collect(source)
+
+
+def _service_probe():
+    is_running, status_detail = check_service_status()
+    return {'running': is_running, 'status': status_detail}
+
+
+_status = StatusCollector()
+_status.add('system', get_system_stats, STATUS_INTERVALS['system'], SYSTEM_PLACEHOLDER)
+_status.add('service', _service_probe, STATUS_INTERVALS['service'],
+            {'running': False, 'status': 'Unknown'})
+_status.add('radio', lambda: get_radio_info(use_cache=False), STATUS_INTERVALS['radio'])
+_status.add('hardware', detect_hardware, STATUS_INTERVALS['hardware'])
+
+
+def status_snapshot():
+    """Service status and system stats from the collector, as /api/status returns them"""
+    return {
+        'service': _status.get('service'),
+        'system': _status.get('system'),
+        'collector': _status.describe(('service', 'system')),
+    }
+
+
+# ============================================================================
+# Server-Sent Events
+# ============================================================================
+
+class EventBroadcaster:
+    """
+    Single producer for the /api/events stream.
+
+    One background thread picks up service status and system stats from
+    the StatusCollector, the radio broker's node table version and new
+    journal lines once per interval, and pushes only what changed into a
+    queue per connected client. Open
+    tabs therefore cost a queue each instead of a systemctl/pgrep/proc scan
+    per tab every few seconds. The thread idles while nobody is connected.
+    """
+
+    def __init__(self, interval=1.0, log_lines=100, client_queue_size=256):
+        self.interval = interval
+        self.client_queue_size = client_queue_size
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._has_clients = threading.Event()
+        self._thread = None
+        # Latest state, sent in full to each new client
+        self._status = None
+        self._status_versions = None
+        self._nodes = None
+        self._log_lines = deque(maxlen=log_lines)
+        self._log_cursor = None
+
+    def subscribe(self):
+        """Register a client; returns its queue, pre-filled with the current state"""
+        client = queue.Queue(self.client_queue_size)
+        with self._lock:
+            for event in self._initial_events():
+                client.put_nowait(event)
+            self._clients.add(client)
+            self._has_clients.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+            if not self._clients:
+                self._has_clients.clear()
+
+    def is_subscribed(self, client):
+        return client in self._clients
+
+    def _initial_events(self):
+        events = []
+        if self._status is not None:
+            events.append(('status', self._status))
+        if self._nodes is not None:
+            events.append(('nodes', self._nodes))
+        if self._log_lines:
+            events.append(('logs', {'reset': True, 'lines': list(self._log_lines),
+                                    'cursor': self._log_cursor}))
+        return events
+
+    def publish(self, event, data):
+        """Queue an event for every client; a client that cannot keep up is dropped"""
+        with self._lock:
+            for client in list(self._clients):
+                try:
+                    client.put_nowait((event, data))
+                except queue.Full:
+                    # It reconnects and gets a fresh snapshot
+                    self._clients.discard(client)
+            if not self._clients:
+                self._has_clients.clear()
+
+    def _run(self):
+        while not _shutdown_flag:
+            self._has_clients.wait()
+            started = time.time()
+            for collect in (self._collect_status, self._collect_nodes, self._collect_logs):
+                try:
+                    collect()
+                except Exception as e:
+                    print(f"Event producer error in {collect.__name__}: {e}")
+            time.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def _collect_status(self):
+        status = status_snapshot()
+        versions = [meta['version'] for meta in status['collector']['sources'].values()]
+        if self._status is not None and versions == self._status_versions:
+            return
+        self._status = status
+        self._status_versions = versions
+        self.publish('status', status)
+
+    def _collect_nodes(self):
+        # Clients page through /api/nodes themselves; they only need to know
+        # when the table changed (and its size) to re-fetch their page.
+        # Only the broker keeps the node DB in memory; the CLI fallback is far
+        # too slow to poll and stays on the manual refresh button.
+        summary = try_broker('query_nodes', limit=0)
+        if summary is None or 'error' in summary:
+            return
+        state = {'total': summary['total'], 'version': summary['version']}
+        if state != self._nodes:
+            self._nodes = state
+            self.publish('nodes', state)
+
+    def _collect_logs(self):
+        if not _journal.start():
+            return
+        entries, cursor, reset = _journal.read(after=self._log_cursor, limit=self._log_lines.maxlen)
+        if not entries:
+            return
+        lines = [entry['line'] for entry in entries]
+        self._log_cursor = cursor
+        if reset:
+            self._log_lines.clear()
+        self._log_lines.extend(lines)
+        self.publish('logs', {'reset': reset, 'lines': lines, 'cursor': cursor})
+
+
+_events = EventBroadcaster()
+
+
 # ============================================================================
 # API Routes
 # ============================================================================
@@ -632,25 +958,45 @@ def send_mesh_message(text, destination=None):
 @app.route('/api/status')
 @login_required
 def api_status():
-    """Get overall status"""
-    is_running, status_detail = check_service_status()
-    stats = get_system_stats()
+    """Get overall status (latest collector snapshot)"""
+    return jsonify(status_snapshot())
 
-    return jsonify({
-        'service': {
-            'running': is_running,
-            'status': status_detail
-        },
-        'system': stats
-    })
+
+@app.route('/api/events')
+@login_required
+def api_events():
+    """Server-Sent Events: status, node and log updates pushed as they change"""
+    client = _events.subscribe()
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while _events.is_subscribed(client):
+                try:
+                    event, data = client.get(timeout=15)
+                except queue.Empty:
+                    yield ': keepalive\n\n'  # keeps proxies from closing the connection
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            _events.unsubscribe(client)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/api/logs')
 @login_required
 def api_logs():
-    """Get service logs"""
+    """
+    Service logs from the shared journal follower.
+
+    ?lines=N returns the newest N entries; ?after=<cursor> returns only the
+    entries after that cursor ('reset' is true when the cursor has aged out
+    of the buffer and the newest entries were returned instead).
+    """
     lines = request.args.get('lines', 50, type=int)
-    return jsonify({'logs': get_service_logs(lines)})
+    return jsonify(read_logs(lines, request.args.get('after') or None))
 
 
 @app.route('/api/radio')
@@ -658,7 +1004,8 @@ def api_logs():
 def api_radio():
     """Get radio info (cached by default, use ?refresh=1 to force)"""
     force_refresh = request.args.get('refresh', '0') == '1'
-    return jsonify(get_radio_info(use_cache=not force_refresh))
+    info = _status.refresh('radio') if force_refresh else _status.get('radio')
+    return jsonify(dict(info, collector=_status.describe(('radio',))))
 
 
 @app.route('/api/configs')
@@ -672,7 +1019,12 @@ def api_configs():
 @login_required
 def api_hardware():
     """Get hardware detection"""
-    return jsonify({'devices': detect_hardware()})
+    devices = _status.get('hardware')
+    result = {'devices': devices, 'collector': _status.describe(('hardware',))}
+    if isinstance(devices, dict):
+        # Detection has not succeeded yet: placeholder with an 'error'
+        result.update(devices=[], error=devices['error'])
+    return jsonify(result)
 
 
 @app.route('/api/service/<action>', methods=['POST'])
@@ -687,6 +1039,7 @@ def api_service_action(action):
             ['systemctl', action, 'meshtasticd'],
             capture_output=True, text=True, timeout=30
         )
+        _status.wake('service')
         if result.returncode == 0:
             return jsonify({'success': True, 'message': f'Service {action}ed'})
         return jsonify({'success': False, 'error': result.stderr})
@@ -775,8 +1128,138 @@ def api_processes():
 @app.route('/api/nodes')
 @login_required
 def api_nodes():
-    """Get mesh nodes"""
-    return jsonify(get_nodes())
+    """
+    One page of mesh nodes, sorted, filtered and projected server side.
+
+    ?sort=<field>&order=asc|desc  ?q=<name or id substring>
+    ?filter=battery_level<20 (repeatable)  ?heard_within=<seconds>
+    ?fields=node_id,long_name,...  ?limit=100  ?after=<next cursor>
+    ?raw=1 (CLI output, when not using the radio broker)
+
+    Responses carry an ETag of the page content, so unchanged pages
+    revalidate with a 304.
+    """
+    try:
+        params = parse_node_query(request.args)
+        result = query_nodes(params, include_raw=request.args.get('raw') == '1')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if 'error' in result:
+        # Neither the broker nor meshtasticd via the CLI answered
+        return jsonify(result), 503
+    # The table version changes with any node; only the page content matters here
+    result.pop('version', None)
+
+    body = json.dumps(result, sort_keys=True)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body.encode('utf-8')).hexdigest())
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@app.route('/api/topology')
+@login_required
+def api_topology():
+    """Mesh topology graph from the radio broker (?format=json|graphml, ?node=!id)"""
+    fmt = request.args.get('format', 'json')
+    if fmt not in ('json', 'graphml'):
+        return jsonify({'error': f'Unknown format: {fmt}'}), 400
+    params = {'fmt': fmt}
+    if request.args.get('node'):
+        params['node_id'] = request.args['node']
+    result = try_broker('get_topology', **params)
+    if result is None:
+        return jsonify({'error': 'Topology requires the radio broker (python3 -m src.monitoring.broker)'}), 503
+    if isinstance(result, dict) and 'error' in result:
+        return jsonify(result), 400
+    if fmt == 'graphml':
+        return Response(result, mimetype='application/graphml+xml',
+                        headers={'Content-Disposition': 'attachment; filename=mesh.graphml'})
+    return jsonify(result)
+
+
+@app.route('/api/channel')
+@login_required
+def api_channel():
+    """Rolling channel utilization / airtime stats and congestion (?node=!id)"""
+    params = {}
+    if request.args.get('node'):
+        params['node_id'] = request.args['node']
+    result = try_broker('get_channel_analytics', **params)
+    if result is None:
+        return jsonify({'error': 'Channel analytics require the radio broker (python3 -m src.monitoring.broker)'}), 503
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route('/api/messages')
+@login_required
+def api_messages():
+    """
+    Search text message history, newest first.
+
+    Query params: q (words, 'word*' for prefixes), from, to, channel,
+    since / until (epoch seconds), before (message id cursor), limit.
+    """
+    args = request.args
+    try:
+        filters = {
+            'query': args.get('q') or None,
+            'sender': args.get('from') or None,
+            'dest': args.get('to') or None,
+            'channel': int(args['channel']) if args.get('channel') else None,
+            'start': float(args['since']) if args.get('since') else None,
+            'end': float(args['until']) if args.get('until') else None,
+            'before_id': int(args['before']) if args.get('before') else None,
+            'limit': min(500, max(1, int(args.get('limit', 100)))),
+        }
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {e}'}), 400
+
+    result = try_broker('search_messages', **filters)
+    if result is None or (isinstance(result, dict) and 'error' in result):
+        # The history is a plain SQLite file, readable without the broker
+        from monitoring.message_store import DEFAULT_DB_PATH, MessageStore
+        if not DEFAULT_DB_PATH.exists():
+            return jsonify({'error': 'No message history (start the broker with --message-db)'}), 503
+        store = MessageStore(readonly=True)
+        try:
+            result = store.search(**filters)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid parameter: {e}'}), 400
+        finally:
+            store.close()
+
+    return jsonify({
+        'messages': result,
+        'next_before': result[-1]['id'] if len(result) == filters['limit'] else None,
+    })
+
+
+@app.route('/metrics')
+def metrics():
+    """
+    Prometheus scrape endpoint (enable with --metrics).
+
+    Not behind the login so scrapers can reach it; node metrics come
+    from the radio broker's pre-rendered exposition.
+    """
+    if not CONFIG['metrics_enabled']:
+        return Response('Not found\n', status=404, mimetype='text/plain')
+    from monitoring.exporter import CONTENT_TYPE, render_host_stats
+
+    nodes = try_broker('get_metrics')
+    broker_up = isinstance(nodes, str)
+    system = _status.get('system') or {}
+    body = ''.join((
+        '# HELP meshtastic_broker_up Radio broker reachable\n'
+        '# TYPE meshtastic_broker_up gauge\n'
+        f'meshtastic_broker_up {1 if broker_up else 0}\n',
+        nodes if broker_up else '',
+        render_host_stats({key: system[key] for key in system.get('measured', ())}),
+    ))
+    return Response(body, content_type=CONTENT_TYPE)
 
 
 @app.route('/api/message', methods=['POST'])
@@ -825,9 +1308,16 @@ def api_edit_config():
 @app.route('/api/logs/stream')
 @login_required
 def api_logs_stream():
-    """Stream service logs (returns last N lines, call repeatedly for updates)"""
+    """
+    Stream service logs: call repeatedly with ?after=<cursor from the last
+    response> to get only new entries. ?since=<time> queries journalctl directly.
+    """
     lines = request.args.get('lines', 100, type=int)
     since = request.args.get('since', '')
+    if not since:
+        result = read_logs(lines, request.args.get('after') or None)
+        result['timestamp'] = datetime.now().isoformat()
+        return jsonify(result)
 
     try:
         cmd = ['journalctl', '-u', 'meshtasticd', '-n', str(lines), '--no-pager']
@@ -1174,6 +1664,12 @@ MAIN_TEMPLATE = '''
                     <h2>Uptime</h2>
                     <div class="value" id="uptime-value">--</div>
                 </div>
+                <div class="card">
+                    <h2>Channel Utilization</h2>
+                    <div class="value" id="chutil-value">--</div>
+                    <div class="progress-bar"><div class="fill" id="chutil-bar" style="width: 0%"></div></div>
+                    <div id="chutil-detail" style="font-size: 0.85em; margin-top: 8px;"></div>
+                </div>
             </div>
 
             <div class="card">
@@ -1186,8 +1682,26 @@ MAIN_TEMPLATE = '''
         <div id="nodes" class="tab-content">
             <div class="card">
                 <h2>Mesh Nodes</h2>
-                <button class="btn btn-success" onclick="refreshNodes()" style="margin-bottom: 15px;">Refresh Nodes</button>
+                <div style="display: flex; gap: 10px; flex-wrap: wrap; margin-bottom: 15px;">
+                    <button class="btn btn-success" onclick="refreshNodes()">Refresh Nodes</button>
+                    <input type="text" id="nodes-search" placeholder="Search name or !id" oninput="searchNodes()"
+                           style="flex: 1; min-width: 150px; padding: 10px; background: #222; border: 1px solid #444; border-radius: 5px; color: var(--text);">
+                    <select id="nodes-sort" onchange="firstNodesPage()"
+                            style="padding: 10px; background: #222; border: 1px solid #444; border-radius: 5px; color: var(--text);">
+                        <option value="last_heard:desc">Last heard</option>
+                        <option value="long_name:asc">Name</option>
+                        <option value="node_id:asc">Node ID</option>
+                        <option value="battery_level:asc">Battery (lowest first)</option>
+                        <option value="snr:desc">SNR</option>
+                        <option value="hops_away:asc">Hops</option>
+                    </select>
+                </div>
                 <div id="nodes-list">Loading...</div>
+                <div style="display: flex; gap: 10px; align-items: center; margin-top: 10px;">
+                    <button class="btn" id="nodes-prev" onclick="prevNodesPage()" disabled>&laquo; Prev</button>
+                    <button class="btn" id="nodes-next" onclick="nextNodesPage()" disabled>Next &raquo;</button>
+                    <span id="nodes-page-info" style="color: var(--text-muted);"></span>
+                </div>
                 <div id="nodes-raw" style="margin-top: 15px; display: none;">
                     <h3>Raw Output</h3>
                     <div class="log-box" id="nodes-raw-content" style="max-height: 200px;"></div>
@@ -1304,56 +1818,103 @@ MAIN_TEMPLATE = '''
         async function fetchStatus() {
             try {
                 const resp = await fetch('/api/status');
-                const data = await resp.json();
+                renderStatus(await resp.json());
+            } catch (e) {
+                console.error('Error fetching status:', e);
+            }
+        }
 
-                // Service status
-                const statusEl = document.getElementById('service-status');
-                statusEl.textContent = data.service.status;
-                statusEl.className = 'value ' + (data.service.running ? 'success' : 'error');
-
-                // CPU
-                document.getElementById('cpu-value').textContent = data.system.cpu_percent + '%';
-                document.getElementById('cpu-bar').style.width = data.system.cpu_percent + '%';
-
-                // Memory
-                document.getElementById('mem-value').textContent =
-                    data.system.mem_used_mb + '/' + data.system.mem_total_mb + ' MB';
-                document.getElementById('mem-bar').style.width = data.system.mem_percent + '%';
-
-                // Disk
-                document.getElementById('disk-value').textContent =
-                    data.system.disk_used_gb + '/' + data.system.disk_total_gb + ' GB';
-                document.getElementById('disk-bar').style.width = data.system.disk_percent + '%';
-
-                // Temperature
-                if (data.system.temperature) {
-                    document.getElementById('temp-value').textContent = data.system.temperature + '°C';
-                    const tempPct = Math.min(data.system.temperature / 85 * 100, 100);
-                    document.getElementById('temp-bar').style.width = tempPct + '%';
-                }
+        function renderStatus(data) {
+            // Service status
+            const statusEl = document.getElementById('service-status');
+            statusEl.textContent = data.service.status;
+            statusEl.className = 'value ' + (data.service.running ? 'success' : 'error');
+
+            // CPU
+            document.getElementById('cpu-value').textContent = data.system.cpu_percent + '%';
+            document.getElementById('cpu-bar').style.width = data.system.cpu_percent + '%';
+
+            // Memory
+            document.getElementById('mem-value').textContent =
+                data.system.mem_used_mb + '/' + data.system.mem_total_mb + ' MB';
+            document.getElementById('mem-bar').style.width = data.system.mem_percent + '%';
+
+            // Disk
+            document.getElementById('disk-value').textContent =
+                data.system.disk_used_gb + '/' + data.system.disk_total_gb + ' GB';
+            document.getElementById('disk-bar').style.width = data.system.disk_percent + '%';
+
+            // Temperature
+            if (data.system.temperature) {
+                document.getElementById('temp-value').textContent = data.system.temperature + '°C';
+                const tempPct = Math.min(data.system.temperature / 85 * 100, 100);
+                document.getElementById('temp-bar').style.width = tempPct + '%';
+            }
+
+            // Uptime
+            document.getElementById('uptime-value').textContent = data.system.uptime;
+        }
 
-                // Uptime
-                document.getElementById('uptime-value').textContent = data.system.uptime;
+        async function fetchChannel() {
+            // 15 min mesh-wide channel utilization from the radio broker
+            try {
+                const resp = await fetch('/api/channel');
+                if (!resp.ok) return;
+                const data = await resp.json();
+                const util = data.mesh.channel_utilization['15m'];
+                const air = data.mesh.air_util_tx['1h'];
+                const valueEl = document.getElementById('chutil-value');
+                const bar = document.getElementById('chutil-bar');
+                if (!util) {
+                    valueEl.textContent = 'No telemetry yet';
+                    return;
+                }
+                valueEl.textContent = util.mean + '% (p95 ' + util.p95 + '%)';
+                const levelClass = {ok: 'success', warning: 'warning', throttling: 'error', critical: 'error'};
+                valueEl.className = 'value ' + levelClass[data.level];
+                bar.style.width = Math.min(util.mean / 40 * 100, 100) + '%';
+                bar.className = 'fill' + (data.level === 'ok' ? '' : data.level === 'warning' ? ' warning' : ' danger');
+                let detail = 'TX airtime ' + (air ? air.mean + '%' : '--') + ' / h';
+                if (data.congested.length) {
+                    detail += ' - ' + data.congested.length + ' node(s) ' + data.level;
+                }
+                document.getElementById('chutil-detail').textContent = detail;
             } catch (e) {
-                console.error('Error fetching status:', e);
+                console.error('Error fetching channel analytics:', e);
             }
         }
 
         async function fetchLogs() {
             try {
-                const resp = await fetch('/api/logs?lines=30');
-                const data = await resp.json();
-                document.getElementById('logs').textContent = data.logs;
-                document.getElementById('service-logs').textContent = data.logs;
+                // Only entries after the last cursor we have
+                const resp = await fetch('/api/logs?lines=100' + (logCursor ? '&after=' + encodeURIComponent(logCursor) : ''));
+                appendLogs(await resp.json());
             } catch (e) {
                 console.error('Error fetching logs:', e);
             }
         }
 
+        // Last lines of the journal, appended to by /api/events or by
+        // polling /api/logs?after=<cursor>
+        let logLines = [];
+        let logCursor = null;
+
+        function appendLogs(data) {
+            let lines = data.lines;
+            if (!lines) {
+                lines = data.entries && data.entries.length
+                    ? data.entries.map(e => e.line) : (data.logs ? data.logs.split('\\n') : []);
+            }
+            if (data.cursor) logCursor = data.cursor;
+            if (!lines.length && !data.reset) return;
+            logLines = (data.reset ? lines : logLines.concat(lines)).slice(-100);
+            document.getElementById('logs').textContent = logLines.slice(-30).join('\\n');
+            document.getElementById('service-logs').textContent = logLines.join('\\n');
+        }
+
         async function refreshLogs() {
             const resp = await fetch('/api/logs?lines=100');
-            const data = await resp.json();
-            document.getElementById('service-logs').textContent = data.logs;
+            appendLogs(Object.assign(await resp.json(), {reset: true}));
         }
 
         async function fetchConfigs() {
@@ -1437,7 +1998,7 @@ MAIN_TEMPLATE = '''
                 if (data.error) {
                     el.innerHTML = `<div class="item" style="grid-column: span 2; color: var(--warning);">${data.error}</div>`;
                 } else {
-                    el.innerHTML = Object.entries(data).map(([k, v]) => `
+                    el.innerHTML = Object.entries(data).filter(([k]) => k !== 'collector').map(([k, v]) => `
                         <div class="item">
                             <div class="label">${k.replace('_', ' ').toUpperCase()}</div>
                             <div>${v}</div>
@@ -1506,40 +2067,54 @@ MAIN_TEMPLATE = '''
             }
         }
 
-        async function refreshNodes() {
+        // Node table: the server sorts, filters and pages; the browser only
+        // downloads the rows it shows (unchanged pages come back as 304)
+        const NODES_PAGE_SIZE = 50;
+        const NODE_FIELDS = 'node_id,long_name,short_name,hardware_model,last_heard,battery_level,snr';
+        const nodesPage = {cursors: [null], index: 0, next: null};
+        let nodesReloadTimer = null;
+        let nodesSearchTimer = null;
+
+        function escapeHtml(text) {
+            return String(text ?? '').replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+        }
+
+        function formatAge(epoch) {
+            if (!epoch) return '--';
+            const secs = Math.max(0, Date.now() / 1000 - epoch);
+            if (secs < 60) return Math.round(secs) + 's ago';
+            if (secs < 3600) return Math.round(secs / 60) + 'm ago';
+            if (secs < 86400) return Math.round(secs / 3600) + 'h ago';
+            return Math.round(secs / 86400) + 'd ago';
+        }
+
+        function nodesUrl() {
+            const [sort, order] = document.getElementById('nodes-sort').value.split(':');
+            const params = new URLSearchParams({sort, order, fields: NODE_FIELDS, limit: NODES_PAGE_SIZE});
+            const q = document.getElementById('nodes-search').value.trim();
+            if (q) params.set('q', q);
+            const cursor = nodesPage.cursors[nodesPage.index];
+            if (cursor) params.set('after', cursor);
+            return '/api/nodes?' + params;
+        }
+
+        async function refreshNodes(quiet = false) {
             const el = document.getElementById('nodes-list');
             const rawEl = document.getElementById('nodes-raw');
             const rawContent = document.getElementById('nodes-raw-content');
 
-            el.innerHTML = '<em>Loading nodes... (may take up to 30s)</em>';
+            if (!quiet) el.innerHTML = '<em>Loading nodes... (may take up to 30s)</em>';
 
             try {
-                const resp = await fetch('/api/nodes');
+                const resp = await fetch(nodesUrl());
                 const data = await resp.json();
 
                 if (data.error) {
-                    el.innerHTML = `<div style="color: var(--warning);">${data.error}</div>`;
-                } else if (data.nodes && data.nodes.length > 0) {
-                    el.innerHTML = `
-                        <table style="width: 100%; border-collapse: collapse;">
-                            <tr style="border-bottom: 1px solid #444;">
-                                <th style="padding: 10px; text-align: left;">Node ID</th>
-                                <th style="padding: 10px; text-align: left;">Name</th>
-                                <th style="padding: 10px; text-align: left;">Short</th>
-                            </tr>
-                            ${data.nodes.map(n => `
-                                <tr style="border-bottom: 1px solid #333;">
-                                    <td style="padding: 10px; font-family: monospace;">${n.id}</td>
-                                    <td style="padding: 10px;">${n.name}</td>
-                                    <td style="padding: 10px;">${n.short}</td>
-                                </tr>
-                            `).join('')}
-                        </table>
-                        <p style="margin-top: 10px; color: var(--text-muted);">${data.nodes.length} node(s) found</p>
-                    `;
-                } else {
-                    el.innerHTML = '<div style="color: var(--text-muted);">No nodes found</div>';
+                    el.innerHTML = `<div style="color: var(--warning);">${escapeHtml(data.error)}</div>`;
+                    return;
                 }
+                nodesPage.next = data.next;
+                renderNodes(data.nodes, data.total);
 
                 // Show raw output
                 if (data.raw) {
@@ -1552,6 +2127,76 @@ MAIN_TEMPLATE = '''
             }
         }
 
+        function renderNodes(nodes, total) {
+            const el = document.getElementById('nodes-list');
+            const first = nodesPage.index * NODES_PAGE_SIZE;
+            document.getElementById('nodes-prev').disabled = nodesPage.index === 0;
+            document.getElementById('nodes-next').disabled = !nodesPage.next;
+            document.getElementById('nodes-page-info').textContent = total
+                ? `${first + 1}-${first + nodes.length} of ${total} node(s)` : '';
+            if (nodes.length > 0) {
+                el.innerHTML = `
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <tr style="border-bottom: 1px solid #444;">
+                            <th style="padding: 10px; text-align: left;">Node ID</th>
+                            <th style="padding: 10px; text-align: left;">Name</th>
+                            <th style="padding: 10px; text-align: left;">Short</th>
+                            <th style="padding: 10px; text-align: left;">Hardware</th>
+                            <th style="padding: 10px; text-align: left;">Last heard</th>
+                            <th style="padding: 10px; text-align: right;">Battery</th>
+                            <th style="padding: 10px; text-align: right;">SNR</th>
+                        </tr>
+                        ${nodes.map(n => `
+                            <tr style="border-bottom: 1px solid #333;">
+                                <td style="padding: 10px; font-family: monospace;">${escapeHtml(n.node_id)}</td>
+                                <td style="padding: 10px;">${escapeHtml(n.long_name)}</td>
+                                <td style="padding: 10px;">${escapeHtml(n.short_name)}</td>
+                                <td style="padding: 10px;">${escapeHtml(n.hardware_model || '--')}</td>
+                                <td style="padding: 10px;">${formatAge(n.last_heard)}</td>
+                                <td style="padding: 10px; text-align: right;">${n.battery_level ?? '--'}${n.battery_level != null ? '%' : ''}</td>
+                                <td style="padding: 10px; text-align: right;">${n.snr ?? '--'}</td>
+                            </tr>
+                        `).join('')}
+                    </table>
+                `;
+            } else {
+                el.innerHTML = '<div style="color: var(--text-muted);">No nodes found</div>';
+            }
+        }
+
+        function firstNodesPage() {
+            nodesPage.cursors = [null];
+            nodesPage.index = 0;
+            refreshNodes();
+        }
+
+        function nextNodesPage() {
+            if (!nodesPage.next) return;
+            nodesPage.cursors[nodesPage.index + 1] = nodesPage.next;
+            nodesPage.index += 1;
+            refreshNodes();
+        }
+
+        function prevNodesPage() {
+            if (nodesPage.index === 0) return;
+            nodesPage.index -= 1;
+            refreshNodes();
+        }
+
+        function searchNodes() {
+            clearTimeout(nodesSearchTimer);
+            nodesSearchTimer = setTimeout(firstNodesPage, 300);
+        }
+
+        function nodesChanged() {
+            // The broker's node table changed: re-fetch the visible page, at most every 3 s
+            if (nodesReloadTimer) return;
+            nodesReloadTimer = setTimeout(() => {
+                nodesReloadTimer = null;
+                refreshNodes(true);
+            }, 3000);
+        }
+
         async function sendMessage() {
             const text = document.getElementById('message-text').value;
             const dest = document.getElementById('message-dest').value;
@@ -1586,6 +2231,7 @@ MAIN_TEMPLATE = '''
 
         // Initial load
         fetchStatus();
+        fetchChannel();
         fetchLogs();
         fetchConfigs();
         refreshHardware();
@@ -1593,8 +2239,24 @@ MAIN_TEMPLATE = '''
         refreshNodes();
         refreshProcesses();
 
-        // Auto-refresh status every 5 seconds
-        setInterval(fetchStatus, 5000);
+        // Live updates: one shared server-side producer pushes status, node
+        // and log changes; fall back to polling status when the stream is down
+        let eventsConnected = false;
+        if (window.EventSource) {
+            const events = new EventSource('/api/events');
+            events.onopen = () => { eventsConnected = true; };
+            events.onerror = () => { eventsConnected = false; };
+            events.addEventListener('status', e => renderStatus(JSON.parse(e.data)));
+            events.addEventListener('nodes', nodesChanged);
+            events.addEventListener('logs', e => appendLogs(JSON.parse(e.data)));
+        }
+        setInterval(() => {
+            if (!eventsConnected) {
+                fetchStatus();
+                fetchLogs();
+            }
+        }, 5000);
+        setInterval(fetchChannel, 15000);
     </script>
 </body>
 </html>
@@ -1705,6 +2367,8 @@ Environment variables:
                         help=f'Port to listen on (default: {default_port}, env: MESHTASTICD_WEB_PORT)')
     parser.add_argument('--password', '-P',
                         help='Enable authentication with this password (env: MESHTASTICD_WEB_PASSWORD)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Serve Prometheus metrics on /metrics without login (env: MESHTASTICD_WEB_METRICS=1)')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug mode')
     parser.add_argument('--stop', action='store_true',
@@ -1753,6 +2417,10 @@ Environment variables:
         CONFIG['password'] = os.environ.get('MESHTASTICD_WEB_PASSWORD')
         print("Authentication enabled (from environment)")
 
+    if args.metrics or os.environ.get('MESHTASTICD_WEB_METRICS') == '1':
+        CONFIG['metrics_enabled'] = True
+        print("Prometheus metrics enabled on /metrics")
+
     # Get local IP for display
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
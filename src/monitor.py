@@ -14,6 +14,9 @@ Options:
     --json          Output as JSON
     --watch         Continuous monitoring mode
     --interval N    Update interval in seconds (default: 5)
+    --hosts A,B,C   Monitor several daemons and merge their node lists
+    --events        Stream node add/update/remove deltas as NDJSON
+    --search TEXT   Search the stored text message history
 
 Examples:
     # Quick node list
@@ -25,8 +28,17 @@ Examples:
     # JSON output for scripting
     python3 -m src.monitor --json
 
+    # Delta event stream for log shippers, full snapshot every 5 minutes
+    python3 -m src.monitor --events --snapshot-interval 300 >> mesh-events.ndjson
+
     # Connect to remote node
     python3 -m src.monitor --host 192.168.1.100
+
+    # Merged view of several daemons
+    python3 -m src.monitor --hosts pi1,pi2:4403 --watch
+
+    # Messages from one node in the last day mentioning a word
+    python3 -m src.monitor --search 'antenna' --from '!a1b2c3d4' --since 24
 """
 
 import argparse
@@ -35,6 +47,7 @@ import os
 import sys
 import time
 import signal
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -126,6 +139,106 @@ def format_time_ago(dt: Optional[datetime]) -> str:
         return f"{int(seconds / 86400)}d ago"
 
 
+class NdjsonWriter:
+    """
+    Buffered NDJSON output for --events mode.
+
+    Lines are batched and written by flush(), which the main loop calls
+    every half second. Once the buffer passes max_buffer bytes the thread
+    that produced the event flushes it itself; with a slow reader that
+    write blocks the monitor's event worker, so further updates coalesce
+    per node in its queue instead of piling up here.
+    """
+
+    def __init__(self, stream=None, max_buffer: int = 64 * 1024):
+        self._stream = stream or sys.stdout
+        self.max_buffer = max_buffer
+        self._lines = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.closed = False
+        self.lines_written = 0
+
+    def write(self, record: dict):
+        line = json.dumps(record, separators=(',', ':'), default=str) + '\n'
+        with self._lock:
+            if self.closed:
+                return
+            self._lines.append(line)
+            self._size += len(line)
+            full = self._size >= self.max_buffer
+        if full:
+            self.flush()
+
+    def flush(self):
+        # _io_lock keeps batches in order when two threads flush at once
+        with self._io_lock:
+            with self._lock:
+                lines, self._lines, self._size = self._lines, [], 0
+            if not lines or self.closed:
+                return
+            try:
+                self._stream.write(''.join(lines))
+                self._stream.flush()
+                self.lines_written += len(lines)
+            except BrokenPipeError:
+                # Reader went away (e.g. piped into `head`); stop quietly
+                self.closed = True
+                try:
+                    devnull = os.open(os.devnull, os.O_WRONLY)
+                    try:
+                        os.dup2(devnull, self._stream.fileno())
+                    finally:
+                        os.close(devnull)
+                except (OSError, ValueError):
+                    pass
+
+
+def _event_time() -> str:
+    return datetime.now().isoformat()
+
+
+def _json_changes(changes: dict) -> dict:
+    """Table field changes with epoch time fields converted to ISO strings"""
+    return {
+        name: datetime.fromtimestamp(value).isoformat()
+        if name in ('last_heard', 'position_time', 'metrics_updated') and value is not None else value
+        for name, value in changes.items()
+    }
+
+
+def attach_event_stream(monitor, writer: NdjsonWriter, to_dict):
+    """
+    Write a monitor's node and connection events to an NdjsonWriter.
+
+    Records are {"event": "add"|"update"|"remove"|"connection", "ts": ...}
+    plus node_id and the full node (add), the changed fields (update) or
+    the new state (connection). to_dict serializes a node.
+    """
+    def emit_added(node):
+        writer.write({'event': 'add', 'ts': _event_time(), 'node_id': node.node_id,
+                      'node': to_dict(node)})
+
+    def emit_changed(node, changes):
+        writer.write({'event': 'update', 'ts': _event_time(), 'node_id': node.node_id,
+                      'changes': _json_changes(changes)})
+
+    monitor.on_node_update = None
+    monitor.on_node_added = emit_added
+    monitor.on_node_changed = emit_changed
+    monitor.on_node_removed = lambda node_id: writer.write({
+        'event': 'remove', 'ts': _event_time(), 'node_id': node_id})
+    monitor.on_connection_change = lambda state: writer.write({
+        'event': 'connection', 'ts': _event_time(), 'state': state.value})
+
+
+def snapshot_record(nodes: list, to_dict) -> dict:
+    """Full node list as a --snapshot-interval record"""
+    return {'event': 'snapshot', 'ts': _event_time(), 'node_count': len(nodes),
+            'nodes': [to_dict(n) for n in nodes]}
+
+
 def print_banner():
     """Print application banner"""
     print("""
@@ -156,16 +269,145 @@ def print_node_table(nodes: list, my_node_id: Optional[str] = None):
               f"{node.hardware_model[:18]:<18} {battery:<8} {last_heard}{is_me}")
 
 
-def run_monitor(host: str, port: int, json_output: bool, watch: bool, interval: int):
+def print_source_health(sources: list):
+    """Print per-daemon connection health"""
+    print(f"  {'Source':<24} {'State':<13} {'Nodes':<6} {'Packets':<8} {'Reconnects':<10} {'Last Error'}")
+    print(f"  {'-'*24} {'-'*13} {'-'*6} {'-'*8} {'-'*10} {'-'*10}")
+    for health in sources:
+        reconnects = max(0, health.connects - 1)
+        error = (health.last_error or '')[:30]
+        print(f"  {health.name[:24]:<24} {health.state:<13} {health.node_count:<6} "
+              f"{health.packets:<8} {reconnects:<10} {error}")
+
+
+def run_search(query: str, sender: Optional[str], channel: Optional[int],
+               since: Optional[float], limit: int, db_path: Optional[str], json_output: bool):
+    """Search message history through the broker, or the database file directly"""
+    try:
+        from src.monitoring.broker import try_broker
+        from src.monitoring.message_store import DEFAULT_DB_PATH, MessageStore
+    except ImportError:
+        try:
+            from monitoring.broker import try_broker
+            from monitoring.message_store import DEFAULT_DB_PATH, MessageStore
+        except ImportError:
+            print("Error: Could not import MessageStore. Make sure you're running from the project root.")
+            print("Usage: python3 -m src.monitor")
+            sys.exit(1)
+
+    filters = {'query': query or None, 'sender': sender, 'channel': channel, 'limit': limit}
+    if since:
+        filters['start'] = time.time() - since * 3600
+
+    results = None if db_path else try_broker('search_messages', **filters)
+    if isinstance(results, dict) and 'error' in results:
+        results = None
+    if results is None:
+        path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        if not path.exists():
+            print(f"No message history at {path}. Start the broker with --message-db to record it.")
+            sys.exit(1)
+        store = MessageStore(str(path), readonly=True)
+        try:
+            results = store.search(**filters)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        finally:
+            store.close()
+
+    if json_output:
+        print(json.dumps(results, indent=2))
+        return
+
+    if not results:
+        print("No matching messages")
+        return
+    for msg in reversed(results):
+        when = datetime.fromtimestamp(msg['time']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"  {when}  {msg['from']} -> {msg['to'] or '?':<10} ch{msg['channel']}  {msg['text']}")
+    print(f"\n{len(results)} message(s)")
+
+
+def run_multi_monitor(hosts: list, json_output: bool, watch: bool, interval: int):
+    """Monitor several daemons and show the merged node list"""
+    global _running
+
+    try:
+        from src.monitoring.multi_monitor import MultiMonitor
+    except ImportError:
+        try:
+            from monitoring.multi_monitor import MultiMonitor
+        except ImportError:
+            print("Error: Could not import MultiMonitor. Make sure you're running from the project root.")
+            print("Usage: python3 -m src.monitor")
+            sys.exit(1)
+
+    if not json_output:
+        print_banner()
+        print(f"Connecting to {', '.join(hosts)}...")
+
+    monitor = MultiMonitor(hosts)
+
+    def on_node_added(node):
+        if not json_output:
+            print(f"  [NEW] {node.short_name} ({node.node_id[-8:]}) via {monitor.best_source(node.node_id)}")
+
+    if watch:
+        monitor.on_node_added = on_node_added
+
+    monitor.start()
+
+    # Give every source one config download before the first report
+    deadline = time.time() + 15
+    while _running and time.time() < deadline:
+        if all(h.state == 'connected' for h in monitor.get_health()):
+            break
+        time.sleep(0.2)
+
+    try:
+        if json_output:
+            if watch:
+                while _running:
+                    data = monitor.to_dict()
+                    data['timestamp'] = datetime.now().isoformat()
+                    print(json.dumps(data))
+                    sys.stdout.flush()
+                    time.sleep(interval)
+            else:
+                print(json.dumps(monitor.to_dict(), indent=2))
+        else:
+            print(f"\nConnected to {monitor.connected_count}/{len(hosts)} sources")
+            print(f"Node count: {monitor.get_node_count()}\n")
+
+            while True:
+                if watch:
+                    print(f"\n--- {datetime.now().strftime('%H:%M:%S')} ---")
+                print_source_health(monitor.get_health())
+                print()
+                print_node_table(monitor.get_nodes())
+                if not watch or not _running:
+                    break
+                time.sleep(interval)
+    finally:
+        monitor.stop()
+        if not json_output:
+            print("\nDisconnected.")
+
+
+def run_monitor(host: str, port: int, json_output: bool, watch: bool, interval: int,
+                events: bool = False, snapshot_interval: int = 0):
     """Main monitoring function"""
     global _running
 
     try:
         from src.monitoring import NodeMonitor
+        from src.monitoring.node_monitor import node_to_dict
     except ImportError:
         try:
             # Handle running from different directories
             from monitoring import NodeMonitor
+            from monitoring.node_monitor import node_to_dict
         except ImportError:
             print("Error: Could not import NodeMonitor. Make sure you're running from the project root.")
             print("Usage: python3 -m src.monitor")
@@ -190,6 +432,12 @@ def run_monitor(host: str, port: int, json_output: bool, watch: bool, interval:
         monitor.on_node_update = on_node_update
         monitor.on_node_added = on_node_added
 
+    writer = None
+    if events:
+        # Set before connect so the initial node database streams as adds
+        writer = NdjsonWriter()
+        attach_event_stream(monitor, writer, node_to_dict)
+
     if not monitor.connect(timeout=15):
         if json_output:
             print(json.dumps({"error": "Connection failed", "host": host, "port": port}))
@@ -202,7 +450,15 @@ def run_monitor(host: str, port: int, json_output: bool, watch: bool, interval:
         sys.exit(1)
 
     try:
-        if json_output:
+        if events:
+            next_snapshot = time.time() + snapshot_interval if snapshot_interval > 0 else None
+            while _running and not writer.closed:
+                time.sleep(0.5)
+                if next_snapshot and time.time() >= next_snapshot:
+                    writer.write(snapshot_record(monitor.get_nodes(), node_to_dict))
+                    next_snapshot += snapshot_interval
+                writer.flush()
+        elif json_output:
             # JSON output mode
             if watch:
                 while _running:
@@ -236,7 +492,9 @@ def run_monitor(host: str, port: int, json_output: bool, watch: bool, interval:
 
     finally:
         monitor.disconnect()
-        if not json_output:
+        if writer:
+            writer.flush()
+        elif not json_output:
             print("\nDisconnected.")
 
 
@@ -251,7 +509,10 @@ Examples:
   python3 -m src.monitor --setup      # Configure host interactively
   python3 -m src.monitor --watch      # Continuous monitoring
   python3 -m src.monitor --json       # JSON output
+  python3 -m src.monitor --events     # NDJSON add/update/remove deltas
   python3 -m src.monitor --host pi4   # Connect to specific host
+  python3 -m src.monitor --hosts pi1,pi2:4403  # Merge several daemons
+  python3 -m src.monitor --search 'solar*' --since 24  # Search message history
         """
     )
 
@@ -265,6 +526,24 @@ Examples:
                         help='Continuous monitoring mode')
     parser.add_argument('--interval', '-i', type=int, default=5,
                         help='Update interval in seconds (default: 5)')
+    parser.add_argument('--events', action='store_true',
+                        help='Stream node add/update/remove deltas as NDJSON (implies --json --watch)')
+    parser.add_argument('--snapshot-interval', type=int, default=0, metavar='N',
+                        help='With --events, also emit a full snapshot every N seconds (default: off)')
+    parser.add_argument('--hosts',
+                        help='Comma-separated list of host[:port] to monitor together')
+    parser.add_argument('--search', metavar='TEXT',
+                        help="Search stored text messages (all words must match, 'word*' for prefixes)")
+    parser.add_argument('--from', dest='sender', metavar='NODE',
+                        help='Search messages from this node (e.g. !a1b2c3d4)')
+    parser.add_argument('--channel', type=int,
+                        help='Search messages on this channel index')
+    parser.add_argument('--since', type=float, metavar='HOURS',
+                        help='Search messages from the last HOURS hours')
+    parser.add_argument('--limit', type=int,
+                        help='With a search, maximum results (default: 50)')
+    parser.add_argument('--message-db', metavar='PATH',
+                        help='With a search, read this database instead of asking the broker')
     parser.add_argument('--setup', '-s', action='store_true',
                         help='Interactive setup to configure host')
     parser.add_argument('--show-config', action='store_true',
@@ -272,6 +551,35 @@ Examples:
 
     args = parser.parse_args()
 
+    # Any message filter starts a search, e.g. --from !a1b2c3d4 alone
+    searching = any(value is not None for value in (args.search, args.sender, args.channel, args.since))
+    if not searching and (args.limit is not None or args.message_db):
+        parser.error("--limit and --message-db need a search (--search, --from, --channel or --since)")
+    if searching:
+        run_search(
+            query=args.search,
+            sender=args.sender,
+            channel=args.channel,
+            since=args.since,
+            limit=args.limit if args.limit is not None else 50,
+            db_path=args.message_db,
+            json_output=args.json
+        )
+        return
+
+    if args.hosts and (args.events or args.snapshot_interval):
+        parser.error("--events and --snapshot-interval are not supported with --hosts")
+
+    if args.hosts:
+        hosts = [h for h in args.hosts.split(',') if h.strip()]
+        run_multi_monitor(
+            hosts=hosts,
+            json_output=args.json,
+            watch=args.watch,
+            interval=args.interval
+        )
+        return
+
     # Handle --setup
     if args.setup:
         config = setup_interactive()
@@ -298,9 +606,11 @@ Examples:
     run_monitor(
         host=host,
         port=port,
-        json_output=args.json,
-        watch=args.watch,
-        interval=args.interval
+        json_output=args.json or args.events,
+        watch=args.watch or args.events,
+        interval=args.interval,
+        events=args.events,
+        snapshot_interval=args.snapshot_interval
     )
 
 
@@ -13,10 +13,30 @@ Usage:
     # Get current nodes
     nodes = monitor.get_nodes()
 
+    # Nodes within 10 km of a point, and the 5 nearest
+    near = monitor.nodes_within(21.30, -157.85, radius_km=10)
+    closest = monitor.nearest_nodes(21.30, -157.85, k=5)
+
     # Subscribe to events
     monitor.on_node_update = my_callback
+    monitor.on_node_changed = lambda node, changes: print(changes)
 
     monitor.disconnect()
+
+Asyncio usage (no reader thread):
+    monitor = NodeMonitor()
+    await monitor.connect_async()
+    ...
+    await monitor.disconnect_async()
+
+Several daemons merged into one view:
+    from src.monitoring.multi_monitor import MultiMonitor
+
+    multi = MultiMonitor(["pi1", "pi2:4403"])
+    multi.start()
+    nodes = multi.get_nodes()
+    health = multi.get_health()
+    multi.stop()
 """
 
 from .node_monitor import NodeMonitor, NodeInfo, NodeMetrics
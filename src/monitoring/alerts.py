@@ -0,0 +1,668 @@
+"""
+AlertEngine - Declarative alert rules over node updates
+
+Rules are one-line conditions on NodeTable fields, optionally held for a
+duration before they fire:
+
+    battery_level < 20 for 10m
+    last_heard > 2h
+    channel_utilization > 40
+
+Rules are indexed by field, and each node_changed event only evaluates
+the rules whose field is in that event's changes, so the cost of an
+update depends on the number of matching rules, never on the number of
+nodes. Durations ("for 10m") and age rules on time fields
+("last_heard > 2h") are deadlines in a TimerWheel instead of periodic
+re-scans.
+
+Each (rule, node) pair is a small state machine - ok -> pending ->
+firing -> ok - so an alert is sent once when it fires and once when it
+resolves, however many updates arrive in between. Hysteresis keeps a
+value hovering around the threshold from flapping:
+
+    rules:
+      - name: low-battery
+        when: battery_level < 20 for 10m
+        hysteresis: 5           # resolve at >= 25
+        severity: warning
+      - name: silent-router
+        when: last_heard > 2h
+        nodes: ['!a1b2c3d4']
+      - name: busy-channel
+        when: channel_utilization > 40
+        clear: channel_utilization < 30
+        cooldown: 15m           # don't re-notify within 15 minutes
+
+Sinks are callables taking an Alert: StdoutSink, WebhookSink (JSON POST
+from a background thread), AlertLog (in-memory ring for the broker) and
+GtkStatusBarSink.
+
+Usage:
+    engine = AlertEngine(monitor, load_rules('alerts.yaml'), sinks=[StdoutSink()])
+    engine.start()
+    ...
+    engine.close()
+"""
+
+import json
+import logging
+import operator
+import queue
+import re
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .expiry import TimerWheel
+    from .node_table import FIELDS, TIME_FIELDS, node_fields
+except ImportError:
+    from expiry import TimerWheel
+    from node_table import FIELDS, TIME_FIELDS, node_fields
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+DEFAULT_RULES_PATH = Path.home() / '.config' / 'meshtastic-monitor' / 'alerts.yaml'
+
+# Used when no rules file exists
+DEFAULT_RULES = [
+    {'name': 'low-battery', 'when': 'battery_level < 20 for 10m', 'hysteresis': 5,
+     'severity': 'warning'},
+    {'name': 'node-silent', 'when': 'last_heard > 2h', 'severity': 'info'},
+    {'name': 'channel-congested', 'when': 'channel_utilization > 40', 'hysteresis': 10,
+     'severity': 'critical'},
+]
+
+SEVERITIES = ('info', 'warning', 'critical')
+
+_OPERATORS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+
+_CONDITION = re.compile(
+    r'^\s*(?P<field>\w+)\s*(?P<op><=|>=|==|!=|<|>)\s*(?P<value>"[^"]*"|\'[^\']*\'|[^\s]+)'
+    r'(?:\s+for\s+(?P<hold>\S+))?\s*$')
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(text: Any) -> float:
+    """'90s', '10m', '2h', '1d' or a plain number of seconds"""
+    if isinstance(text, (int, float)):
+        return float(text)
+    text = str(text).strip()
+    unit = _DURATION_UNITS.get(text[-1:].lower())
+    try:
+        return float(text[:-1]) * unit if unit else float(text)
+    except ValueError:
+        raise ValueError(f"Invalid duration: {text!r}")
+
+
+def _parse_value(field_name: str, text: str) -> Any:
+    if text[:1] in '"\'':
+        return text[1:-1]
+    if field_name in TIME_FIELDS:
+        return parse_duration(text)
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+@dataclass
+class Condition:
+    """field op value; on time fields the value is an age in seconds"""
+    field: str
+    op: str
+    value: Any
+    hold: float = 0.0
+    text: str = ''
+
+    @classmethod
+    def parse(cls, text: str) -> 'Condition':
+        match = _CONDITION.match(text)
+        if not match:
+            raise ValueError(f"Cannot parse condition: {text!r} (expected 'field op value [for duration]')")
+        name = match.group('field')
+        if name not in FIELDS:
+            raise ValueError(f"Unknown field in {text!r}: {name}")
+        op = match.group('op')
+        if name in TIME_FIELDS and op not in ('>', '>='):
+            raise ValueError(f"Time field {name} only supports '>' / '>=' (age), got {text!r}")
+        hold = parse_duration(match.group('hold')) if match.group('hold') else 0.0
+        return cls(name, op, _parse_value(name, match.group('value')), hold, text.strip())
+
+    @property
+    def is_age(self) -> bool:
+        return self.field in TIME_FIELDS
+
+    def test(self, value: Any) -> bool:
+        try:
+            return _OPERATORS[self.op](value, self.value)
+        except TypeError:
+            return False
+
+    def __str__(self) -> str:
+        if self.text:
+            return self.text
+        if isinstance(self.value, float):
+            return f"{self.field} {self.op} {self.value:g}"
+        return f"{self.field} {self.op} {self.value}"
+
+
+@dataclass
+class Rule:
+    """One alert rule"""
+    name: str
+    when: Condition
+    clear: Optional[Condition] = None
+    severity: str = 'warning'
+    cooldown: float = 0.0
+    nodes: Optional[frozenset] = None
+    message: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rule':
+        if 'when' not in data:
+            raise ValueError(f"Rule {data.get('name', '?')!r} has no 'when' condition")
+        when = Condition.parse(data['when'])
+        if data.get('for') is not None:
+            when.hold = parse_duration(data['for'])
+            when.text = f"{when.text.split(' for ')[0]} for {data['for']}"
+        name = data.get('name') or str(when)
+
+        clear = None
+        if data.get('clear'):
+            clear = Condition.parse(data['clear'])
+            if clear.field != when.field:
+                raise ValueError(f"Rule {name!r}: clear must test the same field as when")
+        elif data.get('hysteresis') is not None:
+            if when.is_age or not isinstance(when.value, float) or when.op not in ('<', '<=', '>', '>='):
+                raise ValueError(f"Rule {name!r}: hysteresis needs a numeric <, <=, > or >= condition")
+            margin = float(data['hysteresis'])
+            if when.op in ('<', '<='):
+                clear = Condition(when.field, '>=', when.value + margin)
+            else:
+                clear = Condition(when.field, '<=', when.value - margin)
+
+        severity = data.get('severity', 'warning')
+        if severity not in SEVERITIES:
+            raise ValueError(f"Rule {name!r}: severity must be one of {', '.join(SEVERITIES)}")
+        nodes = data.get('nodes')
+        return cls(
+            name=name, when=when, clear=clear, severity=severity,
+            cooldown=parse_duration(data.get('cooldown', 0)),
+            nodes=frozenset(nodes) if nodes else None,
+            message=data.get('message'),
+        )
+
+    def cleared(self, value: Any) -> bool:
+        """Whether a firing alert may resolve at this value"""
+        if self.clear is not None:
+            return self.clear.test(value)
+        return not self.when.test(value)
+
+
+def parse_rules(data: Any) -> List[Rule]:
+    """
+    Rules from parsed YAML/JSON: a list (or {'rules': [...]}) whose items
+    are dicts or bare condition strings.
+    """
+    if isinstance(data, dict):
+        data = data.get('rules', [])
+    rules = []
+    for item in data or []:
+        rules.append(Rule.from_dict({'when': item} if isinstance(item, str) else item))
+    names = [rule.name for rule in rules]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate rule names: {', '.join(sorted(duplicates))}")
+    return rules
+
+
+def load_rules(path=None) -> List[Rule]:
+    """
+    Load rules from a YAML file.
+
+    Args:
+        path: Rules file (default: ~/.config/meshtastic-monitor/alerts.yaml,
+            falling back to DEFAULT_RULES when it does not exist)
+    """
+    if path is None:
+        if not DEFAULT_RULES_PATH.exists():
+            return parse_rules(DEFAULT_RULES)
+        path = DEFAULT_RULES_PATH
+    import yaml
+    with open(path) as f:
+        return parse_rules(yaml.safe_load(f))
+
+
+@dataclass
+class Alert:
+    """A rule firing or resolving for one node"""
+    rule: str
+    node_id: str
+    state: str           # 'firing' or 'resolved'
+    severity: str
+    value: Any
+    message: str
+    ts: float = field(default_factory=time.time)
+    seq: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Alert':
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
+
+    def format(self) -> str:
+        stamp = time.strftime('%H:%M:%S', time.localtime(self.ts))
+        return f"[{stamp}] {self.state.upper()} {self.severity} {self.rule} {self.node_id}: {self.message}"
+
+
+class _State:
+    __slots__ = ('status', 'since', 'notified')
+
+    def __init__(self, status: str, since: float):
+        self.status = status      # 'pending' or 'firing'
+        self.since = since
+        self.notified = False
+
+
+class AlertEngine:
+    """Evaluates rules against node updates and sends alerts to sinks"""
+
+    def __init__(self, monitor=None, rules: Optional[Iterable[Rule]] = None,
+                 sinks: Optional[List[Callable[[Alert], None]]] = None, tick: float = 1.0):
+        """
+        Args:
+            monitor: NodeMonitor or MultiMonitor to watch (or call attach() later)
+            rules: Rules to evaluate (default: load_rules())
+            sinks: Callables receiving each Alert
+            tick: Timer resolution in seconds for 'for' and age rules
+        """
+        self.rules = list(load_rules() if rules is None else rules)
+        self.sinks = list(sinks or [])
+        self._by_field: Dict[str, List[Rule]] = {}
+        for rule in self.rules:
+            self._by_field.setdefault(rule.when.field, []).append(rule)
+        self._lock = threading.Lock()
+        self._states: Dict[Tuple[str, str], _State] = {}
+        self._last_notified: Dict[Tuple[str, str], float] = {}
+        self._timers = TimerWheel(tick=tick)
+        self._rules_by_name = {rule.name: rule for rule in self.rules}
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.monitor = None
+        self._sub = None
+        self.evaluations = 0
+        if monitor is not None:
+            self.attach(monitor)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def attach(self, monitor):
+        """Subscribe to a monitor's node events and evaluate its current nodes"""
+        self.monitor = monitor
+        self._sub = monitor.events.subscribe_nodes({
+            'node_added': self.evaluate,
+            'node_changed': self.evaluate,
+            'node_removed': self.node_removed,
+        }, name='alerts')
+        for node in monitor.get_nodes():
+            self.evaluate(node)
+
+    def start(self):
+        """Drive 'for' and age timers from a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def timer_loop():
+            while not self._stop.wait(self._timers.tick):
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"Error evaluating alert timers: {e}")
+
+        self._thread = threading.Thread(target=timer_loop, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self.monitor is not None and self._sub is not None:
+            self.monitor.events.unsubscribe(self._sub)
+            self._sub = None
+        for sink in self.sinks:
+            close = getattr(sink, 'close', None)
+            if close:
+                close()
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def evaluate(self, view, changes: Optional[Dict[str, Any]] = None, now: Optional[float] = None):
+        """
+        Evaluate the rules affected by one update.
+
+        Args:
+            view: NodeInfo or NodeView of the updated node
+            changes: Changed fields (None for a new node: every rule runs)
+            now: Current time (default: time.time())
+        """
+        now = time.time() if now is None else now
+        if changes is None:
+            rules = self.rules
+        else:
+            by_field = self._by_field
+            rules = [rule for name in changes if name in by_field for rule in by_field[name]]
+        if not rules:
+            self.poll(now)
+            return
+
+        try:
+            node_id = view.node_id
+            current = node_fields(view)
+        except LookupError:
+            return  # removed before this event was delivered
+
+        alerts = []
+        with self._lock:
+            for rule in rules:
+                if rule.nodes is not None and node_id not in rule.nodes:
+                    continue
+                self.evaluations += 1
+                value = current.get(rule.when.field)
+                if value is None:
+                    continue
+                if rule.when.is_age:
+                    self._update_age(rule, node_id, value, now, alerts)
+                else:
+                    self._update_value(rule, node_id, value, now, alerts)
+            alerts.extend(self._advance(now))
+        self._send(alerts)
+
+    def _update_value(self, rule: Rule, node_id: str, value: Any, now: float, alerts: List[Alert]):
+        key = (rule.name, node_id)
+        state = self._states.get(key)
+        if state is None:
+            if not rule.when.test(value):
+                return
+            if rule.when.hold:
+                self._states[key] = _State('pending', now)
+                self._timers.schedule(key, now + rule.when.hold)
+            else:
+                self._fire(key, rule, node_id, value, now, alerts)
+        elif state.status == 'pending':
+            if not rule.when.test(value):
+                del self._states[key]
+                self._timers.cancel(key)
+        elif rule.cleared(value):
+            self._resolve(key, rule, node_id, value, now, alerts)
+
+    def _update_age(self, rule: Rule, node_id: str, stamp: float, now: float, alerts: List[Alert]):
+        # A fresh timestamp resolves a firing age alert and re-arms the
+        # deadline; the timer fires if no newer one arrives in time
+        key = (rule.name, node_id)
+        state = self._states.get(key)
+        deadline = stamp + rule.when.value + rule.when.hold
+        if state is not None and state.status == 'firing':
+            if deadline <= now:
+                return
+            self._resolve(key, rule, node_id, now - stamp, now, alerts)
+        self._states[key] = _State('pending', now)
+        self._timers.schedule(key, deadline)
+
+    def poll(self, now: Optional[float] = None):
+        """Fire alerts whose hold time or age deadline has passed"""
+        if not self._timers.pending(now):
+            return
+        with self._lock:
+            alerts = self._advance(time.time() if now is None else now)
+        self._send(alerts)
+
+    def _advance(self, now: float) -> List[Alert]:
+        alerts = []
+        if not self._timers.pending(now):
+            return alerts
+        for key in self._timers.advance(now):
+            state = self._states.get(key)
+            rule = self._rules_by_name.get(key[0])
+            if state is None or state.status != 'pending' or rule is None:
+                continue
+            value = None
+            if self.monitor is not None:
+                node = self.monitor.get_node(key[1])
+                if node is None:
+                    continue
+                value = node_fields(node).get(rule.when.field)
+                if rule.when.is_age and value is not None:
+                    value = round(now - value)
+            self._fire(key, rule, key[1], value, now, alerts)
+        return alerts
+
+    def node_removed(self, node_id: str):
+        """Drop a removed node's alert state, resolving anything firing"""
+        now = time.time()
+        alerts = []
+        with self._lock:
+            for rule in self.rules:
+                key = (rule.name, node_id)
+                state = self._states.pop(key, None)
+                if state is None:
+                    continue
+                self._timers.cancel(key)
+                self._last_notified.pop(key, None)
+                if state.status == 'firing' and state.notified:
+                    alerts.append(self._alert(rule, node_id, 'resolved', None, 'node removed', now))
+        self._send(alerts)
+
+    # ------------------------------------------------------------------
+    # State transitions (lock held)
+    # ------------------------------------------------------------------
+
+    def _fire(self, key, rule: Rule, node_id: str, value: Any, now: float, alerts: List[Alert]):
+        state = self._states.get(key)
+        if state is None or state.status != 'firing':
+            state = self._states[key] = _State('firing', now)
+        # De-duplicate: within the cooldown a re-fire is tracked but not sent
+        last = self._last_notified.get(key)
+        if last is not None and now - last < rule.cooldown:
+            return
+        state.notified = True
+        self._last_notified[key] = now
+        message = rule.message or str(rule.when)
+        alerts.append(self._alert(rule, node_id, 'firing', value, f"{message} (value {value})", now))
+
+    def _resolve(self, key, rule: Rule, node_id: str, value: Any, now: float, alerts: List[Alert]):
+        state = self._states.pop(key)
+        self._timers.cancel(key)
+        if state.notified:
+            alerts.append(self._alert(rule, node_id, 'resolved', value, f"cleared (value {value})", now))
+
+    def _alert(self, rule: Rule, node_id: str, status: str, value: Any, message: str, now: float) -> Alert:
+        self._seq += 1
+        if isinstance(value, float):
+            value = round(value, 2)
+        return Alert(rule=rule.name, node_id=node_id, state=status, severity=rule.severity,
+                     value=value, message=message, ts=now, seq=self._seq)
+
+    def _send(self, alerts: List[Alert]):
+        for alert in alerts:
+            for sink in self.sinks:
+                try:
+                    sink(alert)
+                except Exception as e:
+                    logger.error(f"Alert sink {sink!r} failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def active_alerts(self) -> List[Dict[str, Any]]:
+        """Currently firing (rule, node) pairs"""
+        with self._lock:
+            return [{'rule': rule, 'node_id': node_id, 'since': state.since,
+                     'severity': self._rules_by_name[rule].severity}
+                    for (rule, node_id), state in self._states.items() if state.status == 'firing']
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            firing = sum(1 for state in self._states.values() if state.status == 'firing')
+            return {
+                'rules': len(self.rules),
+                'tracked': len(self._states),
+                'firing': firing,
+                'evaluations': self.evaluations,
+                'alerts_sent': self._seq,
+            }
+
+
+# ----------------------------------------------------------------------
+# Sinks
+# ----------------------------------------------------------------------
+
+class StdoutSink:
+    """Print one line per alert"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, alert: Alert):
+        print(alert.format(), file=self.stream or sys.stdout, flush=True)
+
+
+class WebhookSink:
+    """
+    POST each alert as JSON to a URL.
+
+    Requests go out from a background thread through a bounded queue, so
+    a slow or dead endpoint never stalls rule evaluation; alerts that do
+    not fit in the queue are dropped and counted.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0, maxsize: int = 1000):
+        self.url = url
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def __call__(self, alert: Alert):
+        try:
+            self._queue.put_nowait(alert)
+        except queue.Full:
+            self.dropped += 1
+
+    def _worker(self):
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                return
+            body = json.dumps(alert.to_dict()).encode('utf-8')
+            request = urllib.request.Request(
+                self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Webhook {self.url} failed: {e}")
+
+    def close(self, timeout: float = 2.0):
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+
+class AlertLog:
+    """Ring buffer of recent alerts, read incrementally by sequence number"""
+
+    def __init__(self, maxlen: int = 500):
+        self._events: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __call__(self, alert: Alert):
+        with self._lock:
+            self._events.append(alert)
+
+    def since(self, seq: int = 0) -> List[Alert]:
+        """Alerts with a sequence number above seq, oldest first"""
+        with self._lock:
+            return [alert for alert in self._events if alert.seq > seq]
+
+
+class GtkStatusBarSink:
+    """
+    Show the number of firing alerts and the most severe one in a
+    Gtk.Label. Safe to call from any thread; the label is updated on
+    the GLib main loop.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self._lock = threading.Lock()
+        self._firing: Dict[Tuple[str, str], Alert] = {}
+        self._render_pending = False
+
+    def __call__(self, alert: Alert):
+        key = (alert.rule, alert.node_id)
+        with self._lock:
+            if alert.state == 'firing':
+                self._firing[key] = alert
+            else:
+                self._firing.pop(key, None)
+        self._schedule()
+
+    def reset(self):
+        """Forget all firing alerts"""
+        with self._lock:
+            self._firing.clear()
+        self._schedule()
+
+    def _schedule(self):
+        # One pending render at a time; it reads the state when it runs,
+        # so renders queued from different threads can't land out of order
+        from gi.repository import GLib
+
+        with self._lock:
+            if self._render_pending:
+                return
+            self._render_pending = True
+        GLib.idle_add(self._render)
+
+    def _render(self) -> bool:
+        with self._lock:
+            self._render_pending = False
+            firing = list(self._firing.values())
+        label = self.label
+        for css in ('warning', 'error'):
+            label.remove_css_class(css)
+        if not firing:
+            label.set_label("Alerts: none")
+            return False
+        worst = max(firing, key=lambda a: (SEVERITIES.index(a.severity), a.ts))
+        label.set_label(f"Alerts: {len(firing)} - {worst.rule} {worst.node_id}")
+        label.add_css_class('error' if worst.severity == 'critical' else 'warning')
+        return False
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+RadioBroker - Shared persistent meshtasticd session for all UIs
+
+The web UI, GTK UI, TUI and Rich CLI used to start a fresh
+`meshtastic --host localhost` process for every action, which costs
+2-5 s of interpreter startup plus a full node-DB download each time.
+
+The broker keeps one long-lived NodeMonitor connection to meshtasticd
+and answers reads from memory over a local Unix socket. Requests and
+replies are single JSON lines:
+
+    -> {"method": "get_nodes", "params": {}}
+    <- {"result": [...]}
+    <- {"error": "..."}
+    <- {"error": "...", "bad_request": true}     # invalid parameters
+
+Usage:
+    python3 -m src.monitoring.broker                # Run the broker
+    python3 -m src.monitoring.broker --host pi4     # Broker for a remote daemon
+
+    from monitoring.broker import BrokerClient
+    nodes = BrokerClient().call('get_nodes')
+"""
+
+import argparse
+import asyncio
+import grp
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import time
+from typing import Any, Dict, Optional
+
+try:
+    from .node_monitor import NodeMonitor, node_to_dict
+    from .telemetry_store import TelemetryStore
+    from .message_store import MessageStore
+    from .exporter import MetricsExporter
+    from .snapshot import default_snapshot_path
+    from .channel_analytics import ChannelAnalytics
+    from .alerts import AlertEngine, AlertLog, StdoutSink, WebhookSink, load_rules
+except ImportError:
+    from node_monitor import NodeMonitor, node_to_dict
+    from telemetry_store import TelemetryStore
+    from message_store import MessageStore
+    from exporter import MetricsExporter
+    from snapshot import default_snapshot_path
+    from channel_analytics import ChannelAnalytics
+    from alerts import AlertEngine, AlertLog, StdoutSink, WebhookSink, load_rules
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+# System broker (run as root/systemd) and per-user broker locations.
+# The socket can transmit through the radio (send_text), so it never
+# lives in a world-writable directory and is only group-accessible.
+SYSTEM_SOCKET_DIR = '/run/meshtasticd'
+SYSTEM_SOCKET_PATH = os.path.join(SYSTEM_SOCKET_DIR, 'broker.sock')
+USER_SOCKET_NAME = 'meshtasticd-broker.sock'
+SOCKET_MODE = 0o660
+SOCKET_DIR_MODE = 0o750
+# Members of this group may use a system broker
+SOCKET_GROUP = os.environ.get('MESHTASTIC_BROKER_GROUP', 'meshtastic')
+
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class BrokerError(Exception):
+    """Broker unavailable or returned an error"""
+
+
+class BrokerRequestError(BrokerError):
+    """Broker is running but rejected the request's parameters"""
+
+
+def _socket_candidates() -> list:
+    override = os.environ.get('MESHTASTIC_BROKER_SOCKET')
+    if override:
+        return [override]
+    paths = [SYSTEM_SOCKET_PATH]
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        paths.append(os.path.join(runtime_dir, USER_SOCKET_NAME))
+    return paths
+
+
+def default_socket_path(server: bool = False) -> str:
+    """
+    Broker socket location.
+
+    $MESHTASTIC_BROKER_SOCKET wins. Otherwise root uses
+    /run/meshtasticd/broker.sock and other users $XDG_RUNTIME_DIR;
+    clients pick whichever of the two exists, system broker first.
+    """
+    candidates = _socket_candidates()
+    if not server:
+        for path in candidates:
+            if os.path.exists(path):
+                return path
+    if os.geteuid() == 0 or len(candidates) == 1:
+        return candidates[0]
+    return candidates[-1]
+
+
+def _socket_gid() -> Optional[int]:
+    try:
+        return grp.getgrnam(SOCKET_GROUP).gr_gid
+    except KeyError:
+        return None
+
+
+def _prepare_socket_path(path: str):
+    """
+    Make the socket directory and clear a stale socket left by us.
+
+    Raises:
+        BrokerError: path is owned by another user, not a socket, or live
+    """
+    directory = os.path.dirname(path) or '.'
+    if directory == SYSTEM_SOCKET_DIR and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory, mode=SOCKET_DIR_MODE, exist_ok=True)
+            gid = _socket_gid()
+            if gid is not None:
+                os.chown(directory, -1, gid)
+        except OSError as e:
+            raise BrokerError(f"Cannot create {directory} ({e}); run as root, "
+                              f"set XDG_RUNTIME_DIR or pass --socket")
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if st.st_uid != os.geteuid():
+        raise BrokerError(f"{path} belongs to uid {st.st_uid}, not us; refusing to start")
+    if not stat.S_ISSOCK(st.st_mode):
+        raise BrokerError(f"{path} exists and is not a socket; refusing to start")
+    if _socket_alive(path):
+        raise BrokerError(f"Broker already running on {path}")
+    os.unlink(path)
+
+
+class RadioBroker:
+    """
+    Long-lived broker process.
+
+    Owns a single NodeMonitor on the asyncio stream client and serves
+    its in-memory state to any number of local clients.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 4403,
+                 socket_path: Optional[str] = None,
+                 telemetry_store=None, message_store=None, snapshot: Optional[str] = None,
+                 alert_rules=None, alert_sinks=None):
+        """
+        Args:
+            host: Hostname of meshtasticd (default: localhost)
+            port: TCP port (default: 4403)
+            socket_path: Unix socket to listen on (default: default_socket_path())
+            telemetry_store: Optional TelemetryStore for node metric history
+            message_store: Optional MessageStore for text message history
+            snapshot: Optional node table snapshot file for warm restarts
+            alert_rules: Optional list of alert Rules to evaluate on node updates
+            alert_sinks: Extra alert sinks besides the log served by get_alerts
+        """
+        self.socket_path = socket_path or default_socket_path(server=True)
+        self.telemetry_store = telemetry_store
+        self.message_store = message_store
+        self.channel_analytics = ChannelAnalytics()
+        self.monitor = NodeMonitor(host=host, port=port, telemetry_store=telemetry_store,
+                                   message_store=message_store, snapshot=snapshot,
+                                   channel_analytics=self.channel_analytics)
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._exporter: Optional[MetricsExporter] = None
+        self.alert_log = AlertLog()
+        self.alerts: Optional[AlertEngine] = None
+        if alert_rules is not None:
+            self.alerts = AlertEngine(self.monitor, alert_rules,
+                                      sinks=[self.alert_log] + list(alert_sinks or []))
+
+        self._methods = {
+            'ping': self._ping,
+            'status': self._status,
+            'get_nodes': self._get_nodes,
+            'get_node': self._get_node,
+            'query_nodes': self._query_nodes,
+            'get_node_count': self._get_node_count,
+            'get_radio_info': self._get_radio_info,
+            'send_text': self._send_text,
+            'get_telemetry': self._get_telemetry,
+            'get_topology': self._get_topology,
+            'search_messages': self._search_messages,
+            'get_metrics': self._get_metrics,
+            'get_channel_analytics': self._get_channel_analytics,
+            'get_alerts': self._get_alerts,
+        }
+
+    async def start(self):
+        """Start the monitor and the Unix socket server"""
+        _prepare_socket_path(self.socket_path)
+
+        self._monitor_task = asyncio.ensure_future(self.monitor.run_async())
+        if self.alerts:
+            self.alerts.start()
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path, limit=MAX_REQUEST_BYTES)
+        os.chmod(self.socket_path, SOCKET_MODE)
+        gid = _socket_gid()
+        if gid is not None:
+            try:
+                os.chown(self.socket_path, -1, gid)
+            except OSError as e:
+                logger.warning(f"Cannot give group {SOCKET_GROUP} access to {self.socket_path}: {e}")
+        logger.info(f"Broker listening on {self.socket_path}")
+
+    async def stop(self):
+        """Stop serving and disconnect from meshtasticd"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.monitor.disconnect_async()
+        if self.alerts:
+            self.alerts.close()
+        if self._monitor_task:
+            self._monitor_task.cancel()
+        if self.telemetry_store:
+            self.telemetry_store.close()
+        if self.message_store:
+            self.message_store.close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit; the rest of the line
+                    # is still unread, so reply and drop the connection
+                    writer.write(json.dumps({'error': 'Request too large', 'bad_request': True})
+                                 .encode('utf-8') + b'\n')
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                reply = await self._dispatch(line)
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+            method = self._methods.get(request.get('method'))
+            if method is None:
+                return {'error': f"Unknown method: {request.get('method')}"}
+            params = request.get('params') or {}
+            self.requests_served += 1
+            return {'result': await method(**params)}
+        except (ValueError, TypeError, AttributeError) as e:
+            # Marked so clients can tell a rejected call from a broker
+            # that is down or too old to know the method
+            return {'error': f"Bad request: {e}", 'bad_request': True}
+        except Exception as e:
+            logger.error(f"Broker request failed: {e}")
+            return {'error': str(e)}
+
+    # ------------------------------------------------------------------
+    # RPC methods
+    # ------------------------------------------------------------------
+
+    async def _ping(self):
+        return 'pong'
+
+    async def _status(self):
+        return {
+            'host': self.monitor.host,
+            'port': self.monitor.port,
+            'state': self.monitor.state.value,
+            'my_node_id': self.monitor.my_node_id,
+            'node_count': self.monitor.get_node_count(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'requests_served': self.requests_served,
+            'connection': self.monitor.connection_stats.to_dict(),
+        }
+
+    async def _get_nodes(self):
+        return [node_to_dict(n) for n in self.monitor.get_nodes()]
+
+    async def _query_nodes(self, filters=(), search: Optional[str] = None, sort: str = 'node_id',
+                           descending: bool = False, fields=None, after: Optional[str] = None,
+                           limit: int = 100):
+        """
+        Server-side sorted/filtered/paged node list (see NodeTable.query).
+
+        Bad fields, operators, values and cursors raise, so the reply is
+        a bad_request error rather than a result.
+        """
+        try:
+            return self.monitor.query_nodes(
+                filters=[tuple(f) for f in filters], search=search, sort=sort, descending=descending,
+                fields=fields, after=after, limit=limit)
+        except KeyError as e:
+            raise ValueError(f"Unknown field: {e.args[0]}")
+
+    async def _get_node(self, node_id: str):
+        node = self.monitor.get_node(node_id)
+        return node_to_dict(node) if node else None
+
+    async def _get_node_count(self):
+        return self.monitor.get_node_count()
+
+    async def _get_radio_info(self):
+        if not self.monitor.is_connected:
+            return {'error': f"Broker not connected to meshtasticd ({self.monitor.state.value})"}
+
+        info = dict(self.monitor.radio_info)
+        my_node = self.monitor.get_my_node()
+        if my_node:
+            info['name'] = my_node.long_name
+            info['hardware'] = my_node.hardware_model
+        if self.monitor.my_node_id:
+            info['node_id'] = self.monitor.my_node_id
+        return info
+
+    async def _send_text(self, text: str, destination: Optional[str] = None,
+                         channel: int = 0, want_ack: bool = False):
+        if not text or not text.strip():
+            return {'error': 'Message cannot be empty'}
+        if await self.monitor.send_text_async(text.strip(), destination,
+                                              channel=int(channel), want_ack=bool(want_ack)):
+            return {'success': True, 'message': 'Message sent'}
+        return {'error': 'Failed to send message'}
+
+    async def _get_telemetry(self, node_id: str, metric: str,
+                             start: Optional[float] = None, end: Optional[float] = None,
+                             resolution: str = 'auto'):
+        if not self.telemetry_store:
+            return {'error': 'Telemetry history not enabled (start broker with --telemetry-db)'}
+        node_num = int(node_id[1:], 16) if node_id.startswith('!') else int(node_id)
+        loop = asyncio.get_running_loop()
+        points = await loop.run_in_executor(
+            None, self.telemetry_store.query, node_num, metric, start, end, resolution)
+        return [list(p) for p in points]
+
+    async def _get_topology(self, fmt: str = 'json', node_id: Optional[str] = None):
+        if fmt not in ('json', 'graphml'):
+            return {'error': f"Unknown format: {fmt}"}
+        result = self.monitor.get_topology(fmt)
+        if node_id and fmt == 'json':
+            topology = self.monitor.topology
+            result['partition_if_removed'] = [
+                sorted(f"!{n:08x}" for n in group) for group in topology.partition_if_removed(node_id)]
+        return result
+
+    async def _search_messages(self, **filters):
+        if not self.message_store:
+            return {'error': 'Message history not enabled (start broker with --message-db)'}
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, lambda: self.message_store.search(**filters))
+        except (TypeError, ValueError) as e:
+            return {'error': f"Invalid search: {e}"}
+
+    async def _get_metrics(self):
+        # Created on first use so brokers nobody scrapes pay nothing;
+        # the web UI adds its own host metrics
+        if self._exporter is None:
+            self._exporter = MetricsExporter(self.monitor, host_stats=None)
+        return self._exporter.render(include_host=False)
+
+    async def _get_channel_analytics(self, node_id: Optional[str] = None):
+        if node_id is None:
+            return self.channel_analytics.summary()
+        try:
+            node_num = int(node_id[1:], 16) if node_id.startswith('!') else int(node_id)
+        except ValueError:
+            return {'error': f"Invalid node id: {node_id}"}
+        return {
+            'node_id': node_id,
+            'stats': self.channel_analytics.node_stats(node_num),
+            'congestion': self.channel_analytics.congestion(node_num),
+        }
+
+    async def _get_alerts(self, after: int = 0):
+        """Firing alerts plus alert events newer than sequence number `after`"""
+        if self.alerts is None:
+            return {'enabled': False, 'seq': 0, 'active': [], 'events': []}
+        events = [alert.to_dict() for alert in self.alert_log.since(after)]
+        return {
+            'enabled': True,
+            'seq': events[-1]['seq'] if events else after,
+            'active': self.alerts.active_alerts(),
+            'events': events,
+            'stats': self.alerts.get_stats(),
+        }
+
+
+def _socket_alive(path: str) -> bool:
+    """Check whether something is accepting connections on a Unix socket"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(0.5)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class BrokerClient:
+    """
+    Synchronous client for RadioBroker.
+
+    Each call opens a short-lived Unix socket connection, so the client
+    is safe to share between threads.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 2.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        """True if a broker is listening on the socket"""
+        return os.path.exists(self.socket_path) and _socket_alive(self.socket_path)
+
+    def call(self, method: str, **params) -> Any:
+        """
+        Invoke a broker method and return its result.
+
+        Raises:
+            BrokerRequestError: The broker rejected the parameters
+            BrokerError: Broker not running or the call failed
+        """
+        request = json.dumps({'method': method, 'params': params}).encode('utf-8') + b'\n'
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+            sock.sendall(request)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b'\n'):
+                    break
+        except OSError as e:
+            raise BrokerError(f"Broker unavailable: {e}")
+        finally:
+            sock.close()
+
+        try:
+            reply = json.loads(b''.join(chunks))
+        except ValueError as e:
+            raise BrokerError(f"Invalid broker reply: {e}")
+        if 'error' in reply:
+            if reply.get('bad_request'):
+                raise BrokerRequestError(reply['error'])
+            raise BrokerError(reply['error'])
+        return reply.get('result')
+
+
+def try_broker(method: str, **params) -> Optional[Any]:
+    """Call the broker if it is running; return None if it is not"""
+    client = BrokerClient()
+    if not os.path.exists(client.socket_path):
+        return None
+    try:
+        return client.call(method, **params)
+    except BrokerError as e:
+        logger.debug(f"Broker call {method} failed: {e}")
+        return None
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(
+        description="Shared meshtasticd session broker for the web, GTK, TUI and CLI front ends")
+    parser.add_argument('--host', default='localhost', help='meshtasticd hostname (default: localhost)')
+    parser.add_argument('--port', type=int, default=4403, help='meshtasticd port (default: 4403)')
+    parser.add_argument('--socket', default=None,
+                        help=f'Unix socket path (default: {SYSTEM_SOCKET_PATH} as root, else '
+                             f'$XDG_RUNTIME_DIR/{USER_SOCKET_NAME}; env: MESHTASTIC_BROKER_SOCKET)')
+    parser.add_argument('--telemetry-db', nargs='?', const='', default=None, metavar='PATH',
+                        help='Record node telemetry history (default path: '
+                             '~/.local/share/meshtastic-monitor/telemetry.db)')
+    parser.add_argument('--message-db', nargs='?', const='', default=None, metavar='PATH',
+                        help='Record text message history (default path: '
+                             '~/.local/share/meshtastic-monitor/messages.db)')
+    parser.add_argument('--snapshot', nargs='?', const='', default=None, metavar='PATH',
+                        help='Keep a node table snapshot for warm restarts (default path: '
+                             '~/.local/share/meshtastic-monitor/nodes-HOST-PORT.snap)')
+    parser.add_argument('--alerts', nargs='?', const='', default=None, metavar='RULES',
+                        help='Evaluate alert rules from a YAML file (default path: '
+                             '~/.config/meshtastic-monitor/alerts.yaml, or built-in rules)')
+    parser.add_argument('--alert-webhook', metavar='URL',
+                        help='POST alerts as JSON to this URL (implies --alerts)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable info logging')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+        logger.setLevel(logging.INFO)
+
+    async def run():
+        store = None
+        if args.telemetry_db is not None:
+            store = TelemetryStore(args.telemetry_db or None)
+        messages = None
+        if args.message_db is not None:
+            messages = MessageStore(args.message_db or None)
+        snapshot = None
+        if args.snapshot is not None:
+            snapshot = str(args.snapshot or default_snapshot_path(args.host, args.port))
+        rules = None
+        sinks = []
+        if args.alerts is not None or args.alert_webhook:
+            rules = load_rules(args.alerts or None)
+            sinks.append(StdoutSink())
+            if args.alert_webhook:
+                sinks.append(WebhookSink(args.alert_webhook))
+        broker = RadioBroker(args.host, args.port, args.socket,
+                             telemetry_store=store, message_store=messages, snapshot=snapshot,
+                             alert_rules=rules, alert_sinks=sinks)
+        await broker.start()
+        print(f"Radio broker on {broker.socket_path} -> {args.host}:{args.port} (Ctrl+C to stop)")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        await broker.stop()
+
+    try:
+        asyncio.run(run())
+    except BrokerError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Packet capture and deterministic replay
+
+Records every framed FromRadio payload a NodeMonitor receives to a compact
+capture file, and serves a capture back over a local TCP stand-in for
+meshtasticd at 1x, Nx or maximum speed. Production traffic can then be
+reproduced offline for benchmarks and regression runs without a radio.
+
+File layout (little endian):
+
+    header   b"MSHCAP01" | start_time float64
+    record   varint delta_us | varint (length << 1 | config) | payload
+    index    (base_us uint64, offset uint64) for every INDEX_EVERY-th record
+    footer   index_offset uint64 | record_count uint64 | b"MSHCIDX1"
+
+delta_us is relative to the previous record, so a record costs 2-4 bytes
+of overhead. The config bit marks frames received during the initial
+config download. base_us in an index entry is the timestamp of the record
+*before* the indexed one, which is what delta decoding starts from. A
+capture that was not closed cleanly has no footer; the reader then
+rebuilds the index with a sequential scan.
+
+Usage:
+    python3 -m src.monitoring.capture record -o mesh.cap --host pi1
+    python3 -m src.monitoring.capture info mesh.cap
+    python3 -m src.monitoring.capture replay mesh.cap --port 4404 --speed 10
+"""
+
+import argparse
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    from .fake_daemon import FakeMeshtasticd, _decode_varint, _encode_varint, parse_config_complete_id
+except ImportError:
+    from fake_daemon import FakeMeshtasticd, _decode_varint, _encode_varint, parse_config_complete_id
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+MAGIC = b"MSHCAP01"
+INDEX_MAGIC = b"MSHCIDX1"
+HEADER = struct.Struct('<8sd')
+INDEX_ENTRY = struct.Struct('<QQ')
+FOOTER = struct.Struct('<QQ8s')
+INDEX_EVERY = 256
+
+# (timestamp, payload, received during config download)
+Record = Tuple[float, bytes, bool]
+
+
+class CaptureError(Exception):
+    """Raised for unreadable capture files"""
+    pass
+
+
+class CaptureWriter:
+    """Appends FromRadio payloads to a capture file"""
+
+    def __init__(self, path, start_time: Optional[float] = None):
+        """
+        Args:
+            path: Output file (overwritten)
+            start_time: Epoch time of the capture start (default: now)
+        """
+        self.path = Path(path)
+        self.start_time = time.time() if start_time is None else start_time
+        self.count = 0
+        self._last_us = 0
+        self._index: List[Tuple[int, int]] = []
+        self._file = open(self.path, 'wb', buffering=1 << 16)
+        self._file.write(HEADER.pack(MAGIC, self.start_time))
+        self._offset = HEADER.size
+
+    def write(self, payload: bytes, timestamp: Optional[float] = None, config: bool = False):
+        """
+        Append one payload.
+
+        Args:
+            payload: Serialized FromRadio (without stream framing)
+            timestamp: Receive time (default: now)
+            config: True if received during the config download
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        ts_us = max(self._last_us, round((timestamp - self.start_time) * 1e6))
+        if self.count % INDEX_EVERY == 0:
+            self._index.append((self._last_us, self._offset))
+        record = (_encode_varint(ts_us - self._last_us)
+                  + _encode_varint(len(payload) << 1 | bool(config))
+                  + payload)
+        self._file.write(record)
+        self._offset += len(record)
+        self._last_us = ts_us
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """Write the index and footer and close the file"""
+        if self._file.closed:
+            return
+        index_offset = self._offset
+        for base_us, offset in self._index:
+            self._file.write(INDEX_ENTRY.pack(base_us, offset))
+        self._file.write(FOOTER.pack(index_offset, self.count, INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureReader:
+    """Random-access reader for capture files"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise CaptureError(f"{path}: empty file")
+
+        if len(self._data) < HEADER.size:
+            self.close()
+            raise CaptureError(f"{path}: truncated header")
+        magic, self.start_time = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise CaptureError(f"{path}: not a capture file")
+
+        self.indexed = False
+        self._end = len(self._data)
+        self._index: List[Tuple[int, int]] = []
+        self.count = 0
+        self._load_index()
+
+    def _load_index(self):
+        data = self._data
+        if len(data) >= HEADER.size + FOOTER.size:
+            index_offset, count, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                self._end = index_offset
+                self.count = count
+                entries = (len(data) - FOOTER.size - index_offset) // INDEX_ENTRY.size
+                self._index = [INDEX_ENTRY.unpack_from(data, index_offset + i * INDEX_ENTRY.size)
+                               for i in range(entries)]
+                self.indexed = True
+                return
+
+        # No footer: rebuild the index from a scan, dropping a torn last record
+        logger.info(f"{self.path}: no index, scanning")
+        pos, ts_us, count = HEADER.size, 0, 0
+        end = len(data)
+        try:
+            while pos < end:
+                if count % INDEX_EVERY == 0:
+                    self._index.append((ts_us, pos))
+                delta, p = _decode_varint(data, pos)
+                meta, p = _decode_varint(data, p)
+                p += meta >> 1
+                if p > end:
+                    break
+                ts_us += delta
+                pos = p
+                count += 1
+        except IndexError:
+            pass
+        if self._index and self._index[-1][1] >= pos:
+            self._index.pop()
+        self._end = pos
+        self.count = count
+
+    def records(self, start: Optional[float] = None) -> Iterator[Record]:
+        """
+        Iterate records in order.
+
+        Args:
+            start: Skip to the first record at or after this epoch time
+        """
+        data = self._data
+        base, pos = 0, HEADER.size
+        start_us = None
+        if start is not None:
+            start_us = int((start - self.start_time) * 1e6)
+            for base_us, offset in self._index:
+                if base_us > start_us:
+                    break
+                base, pos = base_us, offset
+
+        ts_us, end, start_time = base, self._end, self.start_time
+        while pos < end:
+            delta, pos = _decode_varint(data, pos)
+            meta, pos = _decode_varint(data, pos)
+            length = meta >> 1
+            ts_us += delta
+            if start_us is None or ts_us >= start_us:
+                yield start_time + ts_us / 1e6, data[pos:pos + length], bool(meta & 1)
+            pos += length
+
+    __iter__ = records
+
+    def config_payloads(self) -> List[bytes]:
+        """
+        Frames of the first config download, without its config_complete_id.
+
+        The replayer answers want_config with these followed by a
+        config_complete_id that matches the client's request.
+        """
+        payloads = []
+        for _, payload, config in self.records():
+            if not config:
+                break
+            if parse_config_complete_id(payload) is not None:
+                break
+            payloads.append(payload)
+        return payloads
+
+    def live_records(self) -> Iterator[Record]:
+        """Records received after the config download"""
+        return (r for r in self.records() if not r[2])
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the capture start and the last record"""
+        last = 0.0
+        if self._index:
+            base, pos = self._index[-1]
+            ts_us = base
+            while pos < self._end:
+                delta, pos = _decode_varint(self._data, pos)
+                meta, pos = _decode_varint(self._data, pos)
+                ts_us += delta
+                pos += meta >> 1
+            last = ts_us / 1e6
+        return last
+
+    def close(self):
+        data = getattr(self, '_data', None)
+        if data is not None:
+            data.close()
+            self._data = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CaptureReplayer:
+    """
+    Serves a capture over TCP as a stand-in for meshtasticd.
+
+    Each client gets the captured config download. Live frames are
+    replayed to every connected client, paced by their original
+    timestamps divided by `speed` (0 = as fast as possible), once the
+    first client has finished its config download.
+    """
+
+    def __init__(self, path, host: str = "127.0.0.1", port: int = 0,
+                 speed: float = 1.0, loop: bool = False, batch: int = 256):
+        """
+        Args:
+            path: Capture file
+            host: Address to bind (default: 127.0.0.1)
+            port: Port to bind (0 picks a free port)
+            speed: Playback speed multiplier; 0 replays without pacing
+            loop: Start over when the capture ends
+            batch: Frames written per drain at maximum speed
+        """
+        self.reader = CaptureReader(path)
+        self.speed = speed
+        self.loop = loop
+        self.batch = max(1, batch)
+        self.daemon = FakeMeshtasticd(host, port, self.reader.config_payloads())
+        self.daemon.on_client_ready = lambda writer: self._ready.set()
+        self._ready: Optional[asyncio.Event] = None
+        self.frames_sent = 0
+        self.elapsed = 0.0
+
+    @property
+    def port(self) -> int:
+        return self.daemon.port
+
+    async def start(self) -> int:
+        """Start listening and return the bound port"""
+        self._ready = asyncio.Event()
+        return await self.daemon.start()
+
+    async def wait_client(self):
+        """Wait until a client has completed its config download"""
+        await self._ready.wait()
+
+    async def replay(self) -> int:
+        """
+        Replay live frames once (or forever with loop=True).
+
+        Returns:
+            Number of frames sent
+        """
+        if self._ready is None:
+            await self.start()
+        await self.wait_client()
+        started = time.monotonic()
+        while True:
+            await self._replay_once()
+            if not self.loop:
+                break
+        self.elapsed = time.monotonic() - started
+        return self.frames_sent
+
+    async def _replay_once(self):
+        daemon = self.daemon
+        if self.speed <= 0:
+            pending = []
+            for _, payload, _ in self.reader.live_records():
+                pending.append(payload)
+                if len(pending) >= self.batch:
+                    await daemon.broadcast_many(pending)
+                    self.frames_sent += len(pending)
+                    pending = []
+            if pending:
+                await daemon.broadcast_many(pending)
+                self.frames_sent += len(pending)
+            return
+
+        first = None
+        t0 = time.monotonic()
+        for timestamp, payload, _ in self.reader.live_records():
+            if first is None:
+                first = timestamp
+            delay = (timestamp - first) / self.speed - (time.monotonic() - t0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await daemon.broadcast(payload)
+            self.frames_sent += 1
+
+    async def stop(self):
+        await self.daemon.stop()
+        self.reader.close()
+
+
+async def record(host: str, port: int, output, duration: Optional[float] = None,
+                 timeout: float = 15.0) -> int:
+    """
+    Capture a live meshtasticd session.
+
+    Returns:
+        Number of frames recorded
+    """
+    try:
+        from .node_monitor import NodeMonitor
+    except ImportError:
+        from node_monitor import NodeMonitor
+
+    writer = CaptureWriter(output)
+    monitor = NodeMonitor(host=host, port=port, sync_callbacks=True, capture=writer)
+    task = asyncio.ensure_future(monitor.run_async(timeout=timeout))
+    try:
+        if duration:
+            await asyncio.sleep(duration)
+        else:
+            await task
+    finally:
+        await monitor.disconnect_async()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        writer.close()
+    return writer.count
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Record and replay meshtasticd traffic")
+    sub = parser.add_subparsers(dest='command')
+
+    rec = sub.add_parser('record', help='Capture a live session')
+    rec.add_argument('-o', '--output', required=True, help='Capture file to write')
+    rec.add_argument('--host', default='localhost', help='meshtasticd host (default: localhost)')
+    rec.add_argument('--port', type=int, default=4403, help='meshtasticd port (default: 4403)')
+    rec.add_argument('--duration', type=float, help='Stop after N seconds (default: until Ctrl+C)')
+
+    info = sub.add_parser('info', help='Summarize a capture')
+    info.add_argument('file')
+
+    rep = sub.add_parser('replay', help='Serve a capture as a fake meshtasticd')
+    rep.add_argument('file')
+    rep.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    rep.add_argument('--port', type=int, default=4404, help='Bind port (default: 4404)')
+    rep.add_argument('--speed', type=float, default=1.0,
+                     help='Playback speed multiplier, 0 for maximum (default: 1)')
+    rep.add_argument('--loop', action='store_true', help='Repeat the capture forever')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        print(f"Recording {args.host}:{args.port} to {args.output} (Ctrl+C to stop)")
+        try:
+            count = asyncio.run(record(args.host, args.port, args.output, args.duration))
+            print(f"Recorded {count} frames")
+        except KeyboardInterrupt:
+            pass
+
+    elif args.command == 'info':
+        with CaptureReader(args.file) as reader:
+            size = os.path.getsize(args.file)
+            config = len(reader.config_payloads())
+            print(f"File:      {args.file} ({size} bytes)")
+            print(f"Started:   {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(reader.start_time))}")
+            print(f"Duration:  {reader.duration:.1f}s")
+            print(f"Frames:    {reader.count} ({config} config)")
+            print(f"Indexed:   {'yes' if reader.indexed else 'no (recovered by scan)'}")
+
+    elif args.command == 'replay':
+        async def serve():
+            replayer = CaptureReplayer(args.file, args.host, args.port, args.speed, args.loop)
+            await replayer.start()
+            speed = 'max' if args.speed <= 0 else f"{args.speed:g}x"
+            print(f"Replaying {args.file} on {args.host}:{replayer.port} at {speed} (Ctrl+C to stop)")
+            try:
+                sent = await replayer.replay()
+                rate = sent / replayer.elapsed if replayer.elapsed else 0
+                print(f"Sent {sent} frames in {replayer.elapsed:.2f}s ({rate:.0f} frames/s)")
+            finally:
+                await replayer.stop()
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+ChannelAnalytics - Rolling-window channel utilization statistics
+
+NodeMetrics only holds the latest channel_utilization and air_util_tx.
+ChannelAnalytics keeps every report in fixed-size ring buffers per node
+and mesh-wide, over 1 minute, 15 minute and 1 hour windows, and flags
+congestion before the firmware starts throttling:
+
+- channel_utilization >= 25% makes the firmware hold back "polite"
+  traffic (position and telemetry broadcasts); >= 40% blocks most sends
+- air_util_tx is the node's own airtime over the last hour; the
+  regional duty cycle (10% in most regions) caps it
+
+Each window is a ring of buckets (count, sum, max and the samples' 1%
+histogram bins). Adding a sample is O(1); when a bucket slides out of
+the window its totals are subtracted again, so mean is O(1), p95 is a
+walk over 101 histogram bins and max a walk over the buckets.
+
+Usage:
+    analytics = ChannelAnalytics()
+    monitor = NodeMonitor(channel_analytics=analytics)
+    ...
+    analytics.node_stats(0x12345678)['channel_utilization']['15m']
+    analytics.summary()
+"""
+
+import heapq
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+METRICS = ('channel_utilization', 'air_util_tx')
+
+# (name, seconds) - every window is split into the same number of buckets
+WINDOWS = (('1m', 60), ('15m', 900), ('1h', 3600))
+DEFAULT_BUCKETS = 60
+
+HISTOGRAM_BINS = 101  # 1% bins, 0..100
+
+LEVELS = ('ok', 'warning', 'throttling', 'critical')
+
+# (metric, window, stat, threshold, level), most severe first.
+# Nodes report channel_utilization as the firmware's own rolling
+# average, so the latest value is what the firmware is acting on;
+# the 15 minute p95 gives the early warning.
+CONGESTION_RULES = (
+    ('channel_utilization', '15m', 'last', 40.0, 'critical'),
+    ('channel_utilization', '15m', 'last', 25.0, 'throttling'),
+    ('air_util_tx', '1h', 'max', 10.0, 'throttling'),
+    ('channel_utilization', '15m', 'p95', 20.0, 'warning'),
+    ('air_util_tx', '1h', 'max', 8.0, 'warning'),
+)
+
+
+class RollingWindow:
+    """Ring-buffered count/sum/max/histogram over the last `span` seconds"""
+
+    __slots__ = ('span', 'width', 'size', 'stamps', 'counts', 'sums', 'maxes', 'bins',
+                 'hist', 'count', 'total', 'last_value', 'last_ts', 'expired_through',
+                 '_max', '_p95')
+
+    def __init__(self, span: float, buckets: int = DEFAULT_BUCKETS):
+        self.span = span
+        self.width = span / buckets
+        self.size = buckets
+        self.stamps = array('q', [-1]) * buckets   # absolute bucket index per slot
+        self.counts = array('I', bytes(4 * buckets))
+        self.sums = array('d', bytes(8 * buckets))
+        self.maxes = array('d', bytes(8 * buckets))
+        self.bins: List[Optional[List[int]]] = [None] * buckets
+        self.hist: Optional[array] = None
+        self.count = 0
+        self.total = 0.0
+        self.last_value: Optional[float] = None
+        self.last_ts = 0.0
+        # Every bucket index <= this has been evicted
+        self.expired_through = -1
+        # Cached max / p95, cleared when a sample leaves (or, for p95, enters)
+        self._max: Optional[float] = None
+        self._p95: Optional[float] = None
+
+    def _evict(self, slot: int):
+        if not self.counts[slot]:
+            return
+        self.count -= self.counts[slot]
+        self.total -= self.sums[slot]
+        self._max = self._p95 = None
+        hist = self.hist
+        for b in self.bins[slot]:
+            hist[b] -= 1
+        self.counts[slot] = 0
+        self.sums[slot] = 0.0
+        self.maxes[slot] = 0.0
+        self.bins[slot] = None
+        if not self.count:
+            self.total = 0.0  # drop accumulated float error
+
+    def expire(self, now: float):
+        """Drop buckets that have slid out of the window"""
+        oldest = int(now // self.width) - self.size
+        if oldest <= self.expired_through:
+            return
+        if self.count:
+            # Visit only the slots whose bucket may have aged out since
+            # the last call (each slot at most once)
+            start = max(self.expired_through + 1, oldest - self.size + 1)
+            stamps = self.stamps
+            for index in range(start, oldest + 1):
+                slot = index % self.size
+                if 0 <= stamps[slot] <= oldest:
+                    self._evict(slot)
+                    stamps[slot] = -1
+        self.expired_through = oldest
+
+    def add(self, value: float, ts: float, now: float) -> bool:
+        """Add a sample; returns False if it is older than the window"""
+        index = int(ts // self.width)
+        self.expire(now)
+        if index <= self.expired_through:
+            return False
+        slot = index % self.size
+        stamp = self.stamps[slot]
+        if stamp != index:
+            if stamp > index:
+                return False  # slot already holds a newer bucket
+            self._evict(slot)
+            self.stamps[slot] = index
+
+        b = min(HISTOGRAM_BINS - 1, max(0, int(value)))
+        if self.hist is None:
+            self.hist = array('I', bytes(4 * HISTOGRAM_BINS))
+        self.hist[b] += 1
+        if self.bins[slot] is None:
+            self.bins[slot] = [b]
+        else:
+            self.bins[slot].append(b)
+        self.counts[slot] += 1
+        self.sums[slot] += value
+        if value > self.maxes[slot] or self.counts[slot] == 1:
+            self.maxes[slot] = value
+        self.count += 1
+        self.total += value
+        if self._max is not None and value > self._max:
+            self._max = value
+        self._p95 = None
+        if ts >= self.last_ts:
+            self.last_ts = ts
+            self.last_value = value
+        return True
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper edge of the 1% bin holding the q-th percentile"""
+        if not self.count:
+            return None
+        if q == 95 and self._p95 is not None:
+            return self._p95
+        rank = q / 100.0 * self.count
+        seen = 0
+        for b, n in enumerate(self.hist):
+            seen += n
+            if n and seen >= rank:
+                break
+        result = min(float(b + 1), self.max())
+        if q == 95:
+            self._p95 = result
+        return result
+
+    def max(self) -> Optional[float]:
+        if not self.count:
+            return None
+        if self._max is None:
+            self._max = max(m for m, c in zip(self.maxes, self.counts) if c)
+        return self._max
+
+    def value(self, stat: str, now: float) -> Optional[float]:
+        """One of count, mean, p95, max or last (None if the window is empty)"""
+        self.expire(now)
+        if not self.count:
+            return None
+        if stat == 'mean':
+            return round(self.total / self.count, 2)
+        if stat == 'p95':
+            return self.percentile(95)
+        if stat == 'max':
+            return round(self.max(), 2)
+        if stat == 'last':
+            return round(self.last_value, 2) if now - self.last_ts < self.span else None
+        if stat == 'count':
+            return self.count
+        raise ValueError(f"Unknown statistic: {stat}")
+
+    def stats(self, now: float) -> Optional[Dict[str, float]]:
+        """count, mean, p95, max and last over the window (None if empty)"""
+        self.expire(now)
+        if not self.count:
+            return None
+        last = self.last_value if now - self.last_ts < self.span else None
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 2),
+            'p95': self.percentile(95),
+            'max': round(self.max(), 2),
+            'last': round(last, 2) if last is not None else None,
+        }
+
+
+class ChannelAnalytics:
+    """Per-node and mesh-wide rolling channel utilization statistics"""
+
+    def __init__(self, windows: Sequence[Tuple[str, float]] = WINDOWS,
+                 buckets: int = DEFAULT_BUCKETS,
+                 rules: Sequence[Tuple[str, str, str, float, str]] = CONGESTION_RULES):
+        """
+        Args:
+            windows: (name, seconds) pairs
+            buckets: Ring buckets per window (resolution = seconds / buckets)
+            rules: Congestion rules (metric, window, stat, threshold, level),
+                most severe first
+        """
+        self.windows = tuple(windows)
+        self.buckets = buckets
+        self.rules = tuple(rules)
+        self._lock = threading.Lock()
+        self._nodes: Dict[int, Dict[str, Dict[str, RollingWindow]]] = {}
+        self._mesh = self._new_series()
+        self._last_report: Dict[int, float] = {}   # node_num -> ts of its last report
+        self.samples = 0
+
+    def _new_series(self) -> Dict[str, Dict[str, RollingWindow]]:
+        return {metric: {name: RollingWindow(span, self.buckets) for name, span in self.windows}
+                for metric in METRICS}
+
+    def record(self, node_num: int, metrics: Dict[str, Optional[float]],
+               ts: Optional[float] = None, now: Optional[float] = None) -> bool:
+        """
+        Add one telemetry report.
+
+        Every report counts, including one that repeats the previous
+        values. A report with the same explicit ts as the node's previous
+        one is the same report seen twice (its packet and the node DB
+        update it caused) and is ignored.
+
+        Args:
+            node_num: Reporting node
+            metrics: Metric name -> value; other metrics and None are ignored
+            ts: Sample time (default: now)
+            now: Current time (default: time.time())
+
+        Returns:
+            False if the report was a duplicate
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if ts is not None:
+                if self._last_report.get(node_num) == ts:
+                    return False
+                self._last_report[node_num] = ts
+            ts = now if ts is None else min(ts, now)
+            series = None
+            for metric in METRICS:
+                value = metrics.get(metric)
+                if value is None:
+                    continue
+                if series is None:
+                    series = self._nodes.get(node_num)
+                    if series is None:
+                        series = self._nodes[node_num] = self._new_series()
+                for window in series[metric].values():
+                    window.add(value, ts, now)
+                for window in self._mesh[metric].values():
+                    window.add(value, ts, now)
+                self.samples += 1
+        return True
+
+    def remove_node(self, node_num: int):
+        """Forget a node's windows (its samples stay in the mesh series)"""
+        with self._lock:
+            self._nodes.pop(node_num, None)
+            self._last_report.pop(node_num, None)
+
+    def _series_stats(self, series, now: float) -> Dict[str, Dict[str, Any]]:
+        return {metric: {name: window.stats(now) for name, window in windows.items()}
+                for metric, windows in series.items()}
+
+    def node_stats(self, node_num: int, now: Optional[float] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """metric -> window -> stats for one node, or None if it never reported"""
+        now = time.time() if now is None else now
+        with self._lock:
+            series = self._nodes.get(node_num)
+            return self._series_stats(series, now) if series else None
+
+    def mesh_stats(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """metric -> window -> stats over every report from every node"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._series_stats(self._mesh, now)
+
+    def _evaluate(self, series, now: float) -> Tuple[str, List[str]]:
+        """Apply the congestion rules to one series, computing only the stats they use"""
+        level = 'ok'
+        reasons = []
+        for metric, window_name, stat, threshold, rule_level in self.rules:
+            window = series.get(metric, {}).get(window_name)
+            value = window.value(stat, now) if window else None
+            if value is None or value < threshold:
+                continue
+            reasons.append(f"{metric} {window_name} {stat} {value:g}% >= {threshold:g}%")
+            if LEVELS.index(rule_level) > LEVELS.index(level):
+                level = rule_level
+        return level, reasons
+
+    def congestion(self, node_num: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Congestion level ('ok', 'warning', 'throttling', 'critical') for a node"""
+        now = time.time() if now is None else now
+        with self._lock:
+            series = self._nodes.get(node_num)
+            level, reasons = self._evaluate(series, now) if series else ('ok', [])
+        return {'level': level, 'reasons': reasons}
+
+    def _scan(self, now: float) -> Tuple[List[Dict[str, Any]], List[Tuple[float, int]]]:
+        """(congested nodes, (15 minute mean channel utilization, node_num)) in one pass"""
+        congested = []
+        busiest = []
+        with self._lock:
+            for node_num, series in self._nodes.items():
+                level, reasons = self._evaluate(series, now)
+                if level != 'ok':
+                    congested.append({'node_num': node_num, 'node_id': f"!{node_num:08x}",
+                                      'level': level, 'reasons': reasons})
+                window = series['channel_utilization'].get('15m')
+                mean = window.value('mean', now) if window else None
+                if mean is not None:
+                    busiest.append((mean, node_num))
+        congested.sort(key=lambda n: -LEVELS.index(n['level']))
+        return congested, busiest
+
+    def congested_nodes(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Every node above 'ok', most severe first"""
+        return self._scan(time.time() if now is None else now)[0]
+
+    def summary(self, now: Optional[float] = None, top: int = 10) -> Dict[str, Any]:
+        """
+        Dashboard view: mesh-wide stats, overall level, congested nodes
+        and the busiest nodes by 15 minute mean channel utilization.
+        """
+        now = time.time() if now is None else now
+        congested, busiest = self._scan(now)
+        busiest = heapq.nlargest(top, busiest)
+        return {
+            'mesh': self.mesh_stats(now),
+            'level': congested[0]['level'] if congested else 'ok',
+            'congested': congested,
+            'busiest': [{'node_num': n, 'node_id': f"!{n:08x}", 'channel_utilization': mean}
+                        for mean, n in busiest],
+            'nodes_tracked': len(self._nodes),
+            'samples': self.samples,
+        }
+
+
+def format_summary_line(summary: Dict[str, Any]) -> str:
+    """One-line text for dashboard cards, e.g. 'ChUtil 12.3% (p95 18%) TX 2.1% - ok'"""
+    mesh = summary.get('mesh', {})
+    util = (mesh.get('channel_utilization') or {}).get('15m')
+    air = (mesh.get('air_util_tx') or {}).get('1h')
+    if not util and not air:
+        return "No telemetry yet"
+    parts = []
+    if util:
+        parts.append(f"ChUtil {util['mean']:.1f}% (p95 {util['p95']:g}%)")
+    if air:
+        parts.append(f"TX {air['mean']:.1f}%")
+    level = summary.get('level', 'ok')
+    congested = len(summary.get('congested', []))
+    tail = f"{level}, {congested} node(s)" if congested else level
+    return f"{' '.join(parts)} - {tail}"
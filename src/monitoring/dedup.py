@@ -0,0 +1,197 @@
+"""
+PacketDedupCache - Duplicate suppression and rebroadcast accounting
+
+Managed flooding delivers the same packet (same sender and packet id)
+several times, once per relay that rebroadcasts it. The cache remembers
+each (from, id) for a time window, bounded by entry count, so only the
+first copy is passed on. Every copy is still counted:
+
+- per packet: copies, hop counts seen, relays that delivered it
+- per relay:  copies relayed, how many were redundant (not first)
+
+Relays are identified by the MeshPacket relay_node byte (firmware 2.5+),
+which is the low byte of the relaying node's number.
+
+Usage:
+    cache = PacketDedupCache(window=600, max_entries=4096)
+    if cache.observe(packet):
+        handle(packet)              # first copy
+    cache.get_relay_stats()
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class PacketRecord:
+    """Everything seen for one (from, id) packet"""
+    sender: int
+    packet_id: int
+    first_seen: float
+    last_seen: float
+    copies: int = 1
+    min_hops: Optional[int] = None
+    max_hops: Optional[int] = None
+    relays: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'from': f"!{self.sender:08x}",
+            'id': self.packet_id,
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen,
+            'copies': self.copies,
+            'min_hops': self.min_hops,
+            'max_hops': self.max_hops,
+            'relays': list(self.relays),
+        }
+
+
+@dataclass
+class RelayStats:
+    """Rebroadcast counters for one relay (by relay_node byte)"""
+    relay: int
+    relayed: int = 0
+    first: int = 0
+    redundant: int = 0
+
+    @property
+    def redundant_ratio(self) -> float:
+        return self.redundant / self.relayed if self.relayed else 0.0
+
+
+def _hops(packet: Dict[str, Any]) -> Optional[int]:
+    hop_start = packet.get('hopStart')
+    hop_limit = packet.get('hopLimit')
+    if hop_start is None or hop_limit is None:
+        return None
+    return max(0, hop_start - hop_limit)
+
+
+class PacketDedupCache:
+    """
+    Time-windowed, size-bounded cache of recently seen packets.
+
+    Entries are kept in first-seen order, so expiry and size eviction
+    both pop from the front in O(1).
+    """
+
+    def __init__(self, window: float = 600.0, max_entries: int = 4096):
+        """
+        Args:
+            window: Seconds a packet id is remembered
+            max_entries: Upper bound on remembered packets
+        """
+        self.window = window
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[int, int], PacketRecord]" = OrderedDict()
+        self._relays: Dict[int, RelayStats] = {}
+        self._lock = threading.Lock()
+
+        self.unique = 0
+        self.duplicates = 0
+        self.untracked = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def observe(self, packet: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Record one received copy of a packet.
+
+        Returns:
+            True for the first copy (deliver it), False for a duplicate.
+            Packets without a sender or id cannot be matched and always
+            return True.
+        """
+        sender = packet.get('from')
+        packet_id = packet.get('id')
+        if not sender or not packet_id:
+            self.untracked += 1
+            return True
+
+        if now is None:
+            now = time.time()
+        hops = _hops(packet)
+        relay = packet.get('relayNode')
+        key = (sender, packet_id)
+
+        with self._lock:
+            entries = self._entries
+            self._expire(now)
+
+            record = entries.get(key)
+            first = record is None
+            if first:
+                record = PacketRecord(sender, packet_id, now, now)
+                entries[key] = record
+                if len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                    self.evicted += 1
+                self.unique += 1
+            else:
+                record.copies += 1
+                record.last_seen = now
+                self.duplicates += 1
+
+            if hops is not None:
+                if record.min_hops is None or hops < record.min_hops:
+                    record.min_hops = hops
+                if record.max_hops is None or hops > record.max_hops:
+                    record.max_hops = hops
+
+            if relay is not None:
+                record.relays.append(relay)
+                stats = self._relays.get(relay)
+                if stats is None:
+                    stats = self._relays[relay] = RelayStats(relay)
+                stats.relayed += 1
+                if first:
+                    stats.first += 1
+                else:
+                    stats.redundant += 1
+
+        return first
+
+    def _expire(self, now: float):
+        entries = self._entries
+        cutoff = now - self.window
+        while entries:
+            record = next(iter(entries.values()))
+            if record.first_seen >= cutoff:
+                break
+            entries.popitem(last=False)
+
+    def get(self, sender: int, packet_id: int) -> Optional[PacketRecord]:
+        with self._lock:
+            return self._entries.get((sender, packet_id))
+
+    def get_relay_stats(self) -> List[RelayStats]:
+        """Per-relay counters, most redundant rebroadcasts first"""
+        with self._lock:
+            return sorted(self._relays.values(), key=lambda s: s.redundant, reverse=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache-wide counters"""
+        with self._lock:
+            copies = self.unique + self.duplicates
+            return {
+                'entries': len(self._entries),
+                'window': self.window,
+                'max_entries': self.max_entries,
+                'unique': self.unique,
+                'duplicates': self.duplicates,
+                'untracked': self.untracked,
+                'evicted': self.evicted,
+                'copies_per_packet': round(copies / self.unique, 3) if self.unique else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._relays.clear()
@@ -0,0 +1,405 @@
+"""
+EventDispatcher - Bounded, per-subscriber event delivery
+
+NodeMonitor used to call on_message / on_node_update / on_node_added
+inline on the radio reader. A slow consumer (a GTK redraw, a disk write)
+then stalled the reader and backed up the TCP socket.
+
+Each subscriber now gets its own bounded queue and worker thread; a
+subscriber of several events receives them in publish order. When a
+queue is full the subscriber's overflow policy decides what to lose:
+
+- DROP_OLDEST: discard the oldest queued event (default)
+- DROP_NEWEST: discard the incoming event
+- COALESCE:    keep one pending event per (event, key) (e.g. per node); a
+               newer event replaces the queued one, optionally merged
+               with it
+
+Per-subscriber metrics (queue depth, drops, coalesced events, delivery
+lag) are available from stats().
+
+Usage:
+    dispatcher = EventDispatcher()
+    dispatcher.subscribe('node_update', redraw, maxsize=500,
+                         policy=OverflowPolicy.COALESCE,
+                         key=lambda node: node.node_id)
+    dispatcher.subscribe_nodes({'node_added': add, 'node_removed': remove})
+    dispatcher.publish('node_update', node)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with new events"""
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+
+
+class Subscription:
+    """
+    One subscriber: a bounded queue drained by a dedicated worker thread.
+
+    A subscription may handle several events. They share the one queue
+    and worker, so they are delivered in publish order - a node's
+    node_added, node_changed and node_removed never overtake each other.
+
+    Workers start on the first event and exit after close(); a later
+    publish starts them again.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[..., None]],
+                 maxsize: int = 1000,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 key: Optional[Callable[..., Any]] = None,
+                 merge: Optional[Dict[str, Callable[[tuple, tuple], tuple]]] = None,
+                 coalesce: Optional[Iterable[str]] = None,
+                 name: Optional[str] = None):
+        """
+        Args:
+            handlers: Event name -> callback, called with the published
+                args on the worker thread
+            maxsize: Queue bound
+            policy: Overflow policy when the queue is full
+            key: COALESCE only - maps event args to the coalescing key
+            merge: COALESCE only - event -> merge(old_args, new_args) -> args
+            coalesce: COALESCE only - events that coalesce per (event, key)
+                (default: all). A pending event only absorbs newer ones
+                while no other event with the same key was queued after
+                it, so coalescing never reorders a key's events.
+            name: Label used in stats and thread names
+        """
+        if policy == OverflowPolicy.COALESCE and key is None:
+            raise ValueError("COALESCE policy requires a key function")
+
+        self.handlers = dict(handlers)
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.key = key
+        self.merge = merge or {}
+        self.coalesce = frozenset(self.handlers if coalesce is None else coalesce)
+        self.name = name or getattr(next(iter(self.handlers.values()), None), '__name__', 'subscriber')
+
+        # Entries are [event, args, enqueued_at, slot]; with COALESCE,
+        # _pending maps (event, key) -> the entry still open for merging
+        self._queue: deque = deque()
+        self._pending: Dict[Tuple[str, Any], list] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        # Set when a worker is started and cleared under _cond by the
+        # worker as it exits, so put() never queues behind a worker
+        # that has already decided to stop
+        self._running = False
+        self._closing = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+
+    @property
+    def events(self) -> List[str]:
+        return list(self.handlers)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def put(self, event: str, args: tuple):
+        now = time.monotonic()
+        with self._cond:
+            queue = self._queue
+            slot = None
+            if self.policy == OverflowPolicy.COALESCE:
+                key = self.key(*args)
+                if event in self.coalesce:
+                    slot = (event, key)
+                    entry = self._pending.get(slot)
+                    if entry is not None:
+                        merge = self.merge.get(event)
+                        entry[1] = merge(entry[1], args) if merge else args
+                        self.coalesced += 1
+                        return
+                else:
+                    # Later events for this key must queue behind this one
+                    for name in self.coalesce:
+                        self._pending.pop((name, key), None)
+
+            if len(queue) >= self.maxsize:
+                if self.policy == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                self._forget(queue.popleft())
+                self.dropped += 1
+            entry = [event, args, now, slot]
+            queue.append(entry)
+            if slot is not None:
+                self._pending[slot] = entry
+
+            if len(queue) > self.max_depth:
+                self.max_depth = len(queue)
+            self._closing = False
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name=f"dispatch-{self.name}")
+                self._thread.start()
+            self._cond.notify()
+
+    def _forget(self, entry: list):
+        # Caller holds self._cond
+        slot = entry[3]
+        if slot is not None and self._pending.get(slot) is entry:
+            del self._pending[slot]
+
+    def _pop(self) -> Optional[list]:
+        with self._cond:
+            while not self._queue:
+                if self._closing:
+                    self._running = False
+                    return None
+                self._cond.wait()
+            entry = self._queue.popleft()
+            self._forget(entry)
+            return entry
+
+    def _run(self):
+        while True:
+            entry = self._pop()
+            if entry is None:
+                return
+            event, args, enqueued_at, _ = entry
+            lag = time.monotonic() - enqueued_at
+            self.last_lag = lag
+            self._lag_total += lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+            self.deliver(event, args)
+
+    def deliver(self, event: str, args: tuple):
+        """Run one handler now and count it (worker thread, or inline when synchronous)"""
+        failed = False
+        try:
+            self.handlers[event](*args)
+        except Exception as e:
+            failed = True
+            logger.error(f"Error in {event} subscriber {self.name}: {e}")
+        # Synchronous publishers may deliver from several threads at once
+        with self._cond:
+            self.delivered += 1
+            if failed:
+                self.errors += 1
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the worker after it drains the queue"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'event': ','.join(self.handlers),
+            'events': self.events,
+            'name': self.name,
+            'policy': self.policy.value,
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'maxsize': self.maxsize,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'last_lag_ms': round(self.last_lag * 1000, 3),
+            'max_lag_ms': round(self.max_lag * 1000, 3),
+            'avg_lag_ms': round(self._lag_total / self.delivered * 1000, 3) if self.delivered else 0.0,
+        }
+
+
+class EventDispatcher:
+    """
+    Fan-out of named events to bounded subscriber queues.
+
+    publish() never blocks on a subscriber; it only appends to queues.
+    With synchronous=True callbacks run inline instead (useful for
+    scripts and benchmarks that want deterministic ordering).
+    """
+
+    def __init__(self, synchronous: bool = False):
+        self.synchronous = synchronous
+        self._subs: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, event: str, callback: Callable[..., None], **options) -> Subscription:
+        """Register a subscriber for one event; options are passed to Subscription"""
+        return self.subscribe_many({event: callback}, **options)
+
+    def subscribe_many(self, handlers: Dict[str, Callable[..., None]], **options) -> Subscription:
+        """Register one ordered subscriber for several events"""
+        sub = Subscription(handlers, **options)
+        with self._lock:
+            # Copy-on-write so publish() can iterate without the lock
+            for event in sub.handlers:
+                self._subs[event] = self._subs.get(event, []) + [sub]
+        return sub
+
+    def subscribe_nodes(self, handlers: Dict[str, Callable[..., None]], **options) -> Subscription:
+        """
+        Ordered subscriber for node events (see NODE_SUBSCRIPTION).
+
+        Example:
+            dispatcher.subscribe_nodes({'node_added': add, 'node_removed': remove})
+        """
+        unknown = set(handlers) - set(NODE_EVENTS)
+        if unknown:
+            raise ValueError(f"Not node events: {', '.join(sorted(unknown))}")
+        return self.subscribe_many(handlers, **dict(NODE_SUBSCRIPTION, **options))
+
+    def add_handler(self, sub: Subscription, event: str, callback: Callable[..., None]):
+        """Route another event into an existing subscription's queue"""
+        with self._lock:
+            sub.handlers = dict(sub.handlers, **{event: callback})
+            if sub not in self._subs.get(event, []):
+                self._subs[event] = self._subs.get(event, []) + [sub]
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            for event in sub.handlers:
+                subs = self._subs.get(event, [])
+                self._subs[event] = [s for s in subs if s is not sub]
+        sub.close(timeout=0)
+
+    def has_subscribers(self, event: str) -> bool:
+        return bool(self._subs.get(event))
+
+    def publish(self, event: str, *args):
+        subs = self._subs.get(event)
+        if not subs:
+            return
+        self.published += 1
+        for sub in subs:
+            if self.synchronous:
+                sub.deliver(event, args)
+            else:
+                sub.put(event, args)
+
+    def subscriptions(self) -> List[Subscription]:
+        """Every subscription once, in registration order"""
+        unique = {}
+        for subs in list(self._subs.values()):
+            for sub in subs:
+                unique.setdefault(id(sub), sub)
+        return list(unique.values())
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, drop and lag metrics for every subscriber"""
+        return [sub.stats() for sub in self.subscriptions()]
+
+    def close(self, timeout: float = 2.0):
+        """Drain and stop all worker threads"""
+        deadline = time.monotonic() + timeout
+        for sub in self.subscriptions():
+            sub.close(max(0.0, deadline - time.monotonic()))
+
+
+def _node_key(node, *args) -> str:
+    # node_removed carries the node id, the other node events a node
+    return node if isinstance(node, str) else node.node_id
+
+
+def _merge_changes(old_args: tuple, new_args: tuple) -> tuple:
+    return new_args[0], {**old_args[1], **new_args[1]}
+
+
+NODE_EVENTS = ('node_added', 'node_update', 'node_changed', 'node_removed')
+
+# Event name -> legacy on_* callback attribute
+CALLBACK_ATTRS = {
+    'node_added': 'on_node_added',
+    'node_update': 'on_node_update',
+    'node_changed': 'on_node_changed',
+    'node_removed': 'on_node_removed',
+    'message': 'on_message',
+}
+
+# Subscription options for node events. One queue per subscriber keeps
+# each node's events in order; updates coalesce per (node, event), so a
+# backlog never holds more than one pending update per node between
+# adds and removes.
+NODE_SUBSCRIPTION = {
+    'maxsize': 100000,
+    'policy': OverflowPolicy.COALESCE,
+    'key': _node_key,
+    'coalesce': ('node_update', 'node_changed'),
+    'merge': {'node_changed': _merge_changes},
+}
+MESSAGE_SUBSCRIPTION = {'maxsize': 1000}
+
+
+class CallbackEventsMixin:
+    """
+    Bridges on_* callback attributes onto an EventDispatcher.
+
+    Classes using this set self.events and self._bridges in __init__.
+    The first time an event fires with its on_* attribute set, a
+    subscription is created that calls whatever the attribute currently
+    holds, so callbacks can be swapped at any time.
+    """
+
+    events: EventDispatcher
+    _bridges: Dict[str, Subscription]
+
+    def _emit(self, event: str, *args):
+        """Publish an event, bridging to the matching on_* attribute if set"""
+        if event not in self._bridges:
+            attr = CALLBACK_ATTRS[event]
+            if getattr(self, attr, None) is not None:
+                self._bridge(event, attr)
+        self.events.publish(event, *args)
+
+    def _bridge(self, event: str, attr: str):
+        bridge = self._make_bridge(attr)
+        if event not in NODE_EVENTS:
+            self._bridges[event] = self.events.subscribe(
+                event, bridge, name=attr, **MESSAGE_SUBSCRIPTION)
+            return
+        # All node callbacks share one ordered subscription
+        sub = next((self._bridges[e] for e in NODE_EVENTS if e in self._bridges), None)
+        if sub is None:
+            sub = self.events.subscribe_nodes({event: bridge}, name='callbacks')
+        else:
+            self.events.add_handler(sub, event, bridge)
+        self._bridges[event] = sub
+
+    def _wants_node_events(self) -> bool:
+        """Whether anything would receive a node event right now"""
+        return any(self.events.has_subscribers(event) or getattr(self, CALLBACK_ATTRS[event], None)
+                   for event in NODE_EVENTS)
+
+    def _make_bridge(self, attr: str) -> Callable[..., None]:
+        def bridge(*args):
+            callback = getattr(self, attr)
+            if callback:
+                callback(*args)
+        return bridge
+
+    def get_dispatch_stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, drop and lag metrics for every event subscriber"""
+        return self.events.stats()
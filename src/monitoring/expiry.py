@@ -0,0 +1,214 @@
+"""
+TimerWheel - Hierarchical timer wheel for stale-node expiry
+
+Each key carries one deadline. Deadlines are bucketed into wheels of
+increasing resolution (seconds, minutes, hours by default), so
+scheduling, rescheduling and cancelling are O(1) and advancing the clock
+only touches the buckets that come due. Buckets on the coarser wheels
+are cascaded down to finer ones as their time approaches.
+
+Rescheduling a key moves it out of its old bucket, so a node that is
+heard every few seconds costs one set insert per update and never
+leaves stale entries behind.
+
+Usage:
+    wheel = TimerWheel(tick=1.0)
+    wheel.schedule('!a1b2c3d4', time.time() + 7200)
+    for node_id in wheel.advance():
+        expire(node_id)
+"""
+
+import math
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+# Seconds a node may go unheard before it is dropped, by device role.
+# Routers and repeaters rarely send anything but NodeInfo and telemetry,
+# so they get a longer grace period.
+DEFAULT_NODE_TTLS: Dict[str, Optional[float]] = {
+    'default': 6 * 3600,
+    'ROUTER': 24 * 3600,
+    'ROUTER_LATE': 24 * 3600,
+    'ROUTER_CLIENT': 24 * 3600,
+    'REPEATER': 24 * 3600,
+}
+
+
+def ttl_for_role(role: Optional[str], ttls: Dict[str, Optional[float]]) -> Optional[float]:
+    """TTL in seconds for a role (None or 0 means never expire)"""
+    if role and role in ttls:
+        return ttls[role]
+    return ttls.get('default')
+
+
+class TimerWheel:
+    """Hierarchical timer wheel keyed by hashable ids"""
+
+    def __init__(self, tick: float = 1.0, levels: Sequence[int] = (60, 60, 24),
+                 now: Optional[float] = None):
+        """
+        Args:
+            tick: Resolution of the finest wheel in seconds
+            levels: Bucket count of each wheel, finest first; the default
+                covers 24 hours exactly, later deadlines wait on the
+                coarsest wheel and are re-bucketed when it turns
+            now: Starting clock (default: time.time())
+        """
+        self.tick = tick
+        self._sizes = tuple(levels)
+        resolutions = []
+        span = 1
+        for size in self._sizes:
+            resolutions.append(span)
+            span *= size
+        self._res = tuple(resolutions)
+        self._spans = tuple(r * s for r, s in zip(self._res, self._sizes))
+        self._slots: List[List[Set[Hashable]]] = [[set() for _ in range(size)] for size in self._sizes]
+        self._counts = [0] * len(self._sizes)
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self._deadlines: Dict[Hashable, int] = {}
+        self._tick = int((time.time() if now is None else now) // tick)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """Scheduled deadline of a key in seconds"""
+        ticks = self._deadlines.get(key)
+        return ticks * self.tick if ticks is not None else None
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Set (or move) the deadline of a key"""
+        ticks = int(math.ceil(deadline / self.tick))
+        # The current tick has already been processed
+        where = self._locate(max(ticks, self._tick + 1))
+        self._deadlines[key] = ticks
+        old = self._where.get(key)
+        if old == where:
+            # Same bucket (the common case for a node heard again); the
+            # bucket rechecks deadlines when it fires or cascades
+            return
+        if old is not None:
+            self._slots[old[0]][old[1]].discard(key)
+            self._counts[old[0]] -= 1
+        self._link(key, where)
+
+    def cancel(self, key: Hashable) -> bool:
+        if key not in self._deadlines:
+            return False
+        self._unlink(key)
+        del self._deadlines[key]
+        return True
+
+    def clear(self):
+        for wheel in self._slots:
+            for bucket in wheel:
+                bucket.clear()
+        self._counts = [0] * len(self._sizes)
+        self._where.clear()
+        self._deadlines.clear()
+
+    def _unlink(self, key: Hashable):
+        where = self._where.pop(key, None)
+        if where is not None:
+            self._slots[where[0]][where[1]].discard(key)
+            self._counts[where[0]] -= 1
+
+    def _locate(self, ticks: int) -> Tuple[int, int]:
+        """(wheel, bucket) a deadline belongs in at the current tick"""
+        delta = ticks - self._tick
+        level = len(self._sizes) - 1
+        for index, span in enumerate(self._spans):
+            if delta < span:
+                level = index
+                break
+        return level, (ticks // self._res[level]) % self._sizes[level]
+
+    def _link(self, key: Hashable, where: Tuple[int, int]):
+        self._slots[where[0]][where[1]].add(key)
+        self._counts[where[0]] += 1
+        self._where[key] = where
+
+    def _place(self, key: Hashable, ticks: int):
+        self._link(key, self._locate(ticks))
+
+    def _next_tick(self) -> Optional[int]:
+        """Next tick at which any bucket can come due or cascade"""
+        for level, count in enumerate(self._counts):
+            if count:
+                res = self._res[level]
+                return (self._tick // res + 1) * res
+        return None
+
+    def pending(self, now: Optional[float] = None) -> bool:
+        """True if advance(now) would move the clock (cheap, lock-free check)"""
+        return (time.time() if now is None else now) // self.tick > self._tick
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """
+        Move the clock forward and collect everything that came due.
+
+        Returns:
+            Keys whose deadline is at or before `now`; they are no longer
+            scheduled
+        """
+        target = int((time.time() if now is None else now) // self.tick)
+        if target <= self._tick:
+            return []
+        if target - self._tick >= self._spans[-1]:
+            return self._jump(target)
+
+        expired = []
+        slots = self._slots
+        deadlines = self._deadlines
+        while self._tick < target:
+            # Skip straight over stretches where every finer wheel is empty
+            tick = self._next_tick()
+            if tick is None or tick > target:
+                self._tick = target
+                break
+            self._tick = tick
+            # Cascade coarse buckets that start at this tick, coarsest first
+            for level in range(len(self._sizes) - 1, 0, -1):
+                res = self._res[level]
+                if tick % res:
+                    continue
+                slot = (tick // res) % self._sizes[level]
+                bucket = slots[level][slot]
+                if bucket:
+                    slots[level][slot] = set()
+                    self._counts[level] -= len(bucket)
+                    for key in bucket:
+                        self._place(key, max(deadlines[key], tick))
+
+            slot = tick % self._sizes[0]
+            bucket = slots[0][slot]
+            if bucket:
+                slots[0][slot] = set()
+                self._counts[0] -= len(bucket)
+                for key in bucket:
+                    if deadlines[key] <= tick:
+                        del deadlines[key]
+                        del self._where[key]
+                        expired.append(key)
+                    else:
+                        self._place(key, deadlines[key])
+        return expired
+
+    def _jump(self, target: int) -> List[Any]:
+        """Clock moved past the whole wheel (e.g. suspend): rebuild from scratch"""
+        self._tick = target
+        expired = [key for key, ticks in self._deadlines.items() if ticks <= target]
+        for key in expired:
+            del self._deadlines[key]
+        for wheel in self._slots:
+            for bucket in wheel:
+                bucket.clear()
+        self._counts = [0] * len(self._sizes)
+        self._where.clear()
+        for key, ticks in self._deadlines.items():
+            self._place(key, max(ticks, target + 1))
+        return expired
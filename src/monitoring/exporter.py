@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+MetricsExporter - Prometheus text exposition of node and host metrics
+
+Publishes per-node battery, voltage, channel utilization, air_util_tx,
+SNR, hops and last-heard time, plus monitor and host gauges, in the
+Prometheus text format (which OpenMetrics scrapers also accept).
+
+Each node's sample lines are rendered once when the node is added or
+changes and kept per metric family, so a scrape only joins cached
+strings. The joined body is itself cached until the next change, so
+repeated scrapes of an idle mesh cost nothing. Last heard is exported
+as a timestamp (age = time() - meshtastic_node_last_heard_timestamp_seconds
+in PromQL) so it does not go stale between updates.
+
+Usage:
+    python3 -m src.monitoring.exporter                     # :9473/metrics
+    python3 -m src.monitoring.exporter --host pi4 --listen 127.0.0.1:9473
+
+    exporter = MetricsExporter(monitor)
+    text = exporter.render()
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from .host_stats import read_host_stats
+    from .node_monitor import ConnectionState, NodeMonitor
+    from .node_table import node_fields
+except ImportError:
+    from host_stats import read_host_stats
+    from node_monitor import ConnectionState, NodeMonitor
+    from node_table import node_fields
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_LISTEN_PORT = 9473
+
+# Table field -> (metric name, help); every one is a gauge
+NODE_METRICS: Dict[str, Tuple[str, str]] = {
+    'battery_level': ('meshtastic_node_battery_level_percent', 'Battery level reported by the node (101 = powered)'),
+    'voltage': ('meshtastic_node_voltage_volts', 'Battery voltage reported by the node'),
+    'channel_utilization': ('meshtastic_node_channel_utilization_percent', 'Channel utilization seen by the node'),
+    'air_util_tx': ('meshtastic_node_air_util_tx_percent', 'Share of airtime the node spent transmitting'),
+    'snr': ('meshtastic_node_snr_db', 'SNR of the last packet heard from the node'),
+    'hops_away': ('meshtastic_node_hops_away', 'Hops between the local radio and the node'),
+    'last_heard': ('meshtastic_node_last_heard_timestamp_seconds', 'Unix time the node was last heard'),
+}
+
+# Fields used as labels; a change to any of them re-renders every family
+LABEL_FIELDS = frozenset(('long_name', 'short_name'))
+
+# read_host_stats() key -> (metric name, help); missing or non-numeric values are skipped
+HOST_METRICS: Dict[str, Tuple[str, str]] = {
+    'cpu_percent': ('meshtastic_host_cpu_percent', 'Host CPU usage'),
+    'load1': ('meshtastic_host_load1', 'Host 1 minute load average'),
+    'mem_percent': ('meshtastic_host_memory_percent', 'Host memory usage'),
+    'mem_used_mb': ('meshtastic_host_memory_used_megabytes', 'Host memory in use'),
+    'mem_total_mb': ('meshtastic_host_memory_total_megabytes', 'Host memory total'),
+    'disk_percent': ('meshtastic_host_disk_percent', 'Root filesystem usage'),
+    'disk_used_gb': ('meshtastic_host_disk_used_gigabytes', 'Root filesystem space in use'),
+    'disk_total_gb': ('meshtastic_host_disk_total_gigabytes', 'Root filesystem size'),
+    'temperature': ('meshtastic_host_temperature_celsius', 'SoC temperature'),
+    'uptime_seconds': ('meshtastic_host_uptime_seconds', 'Host uptime'),
+}
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _header(name: str, help_text: str, kind: str = 'gauge') -> str:
+    return f"# HELP {name} {help_text}\n# TYPE {name} {kind}\n"
+
+
+def render_host_stats(stats: Dict[str, Any]) -> str:
+    """Exposition text for a read_host_stats() dict"""
+    parts = []
+    for key, (name, help_text) in HOST_METRICS.items():
+        value = stats.get(key)
+        if isinstance(value, (int, float)):
+            parts.append(f"{_header(name, help_text)}{name} {format_value(value)}\n")
+    return ''.join(parts)
+
+
+class MetricsExporter:
+    """
+    Incrementally maintained exposition for one monitor.
+
+    Works with anything that has NodeMonitor's events dispatcher and
+    get_nodes() (NodeMonitor, MultiMonitor).
+    """
+
+    def __init__(self, monitor, host_stats: Optional[Callable[[], Dict[str, Any]]] = read_host_stats):
+        """
+        Args:
+            monitor: NodeMonitor or MultiMonitor to export
+            host_stats: Returns host stats for each scrape (None to leave
+                host metrics out)
+        """
+        self.monitor = monitor
+        self.host_stats = host_stats
+        self._families: Dict[str, Dict[str, str]] = {field: {} for field in NODE_METRICS}
+        self._lock = threading.Lock()
+        self._body: Optional[str] = None
+        self._body_bytes: Optional[bytes] = None
+        self.renders = 0
+        self.scrapes = 0
+
+        self._sub = monitor.events.subscribe_nodes({
+            'node_added': self._on_node,
+            'node_changed': self._on_node,
+            'node_removed': self._on_removed,
+        }, name='exporter')
+        for node in monitor.get_nodes():
+            self._on_node(node)
+
+    def close(self):
+        self.monitor.events.unsubscribe(self._sub)
+
+    def _on_node(self, view, changes: Optional[Dict[str, Any]] = None):
+        """Re-render a node's lines for the families that changed"""
+        if changes is not None and not (changes.keys() & LABEL_FIELDS):
+            fields = [f for f in changes if f in NODE_METRICS]
+            if not fields:
+                return
+        else:
+            fields = list(NODE_METRICS)
+
+        try:
+            node_id = view.node_id
+            current = node_fields(view)
+            values = {field: current.get(field) for field in fields}
+            labels = (f'{{node="{node_id}",name="{escape_label(view.long_name or "")}",'
+                      f'short_name="{escape_label(view.short_name or "")}"}}')
+        except LookupError:
+            return  # removed before this event was delivered
+
+        with self._lock:
+            for field in fields:
+                value = values[field]
+                family = self._families[field]
+                if value is None:
+                    family.pop(node_id, None)
+                else:
+                    family[node_id] = f"{NODE_METRICS[field][0]}{labels} {format_value(value)}\n"
+            self._body = self._body_bytes = None
+
+    def _on_removed(self, node_id: str):
+        with self._lock:
+            for family in self._families.values():
+                family.pop(node_id, None)
+            self._body = self._body_bytes = None
+
+    def render_nodes(self) -> str:
+        """Per-node families; cached until a node changes"""
+        with self._lock:
+            body = self._body
+            if body is None:
+                parts = []
+                for field, (name, help_text) in NODE_METRICS.items():
+                    parts.append(_header(name, help_text))
+                    parts.extend(self._families[field].values())
+                body = self._body = ''.join(parts)
+                self.renders += 1
+        return body
+
+    def render_nodes_bytes(self) -> bytes:
+        """render_nodes() encoded, also cached (encoding is the costly part)"""
+        body = self._body_bytes
+        if body is None:
+            text = self.render_nodes()
+            body = text.encode('utf-8')
+            with self._lock:
+                if self._body is text:
+                    self._body_bytes = body
+        return body
+
+    def render_monitor(self) -> str:
+        """Monitor-level gauges, computed per scrape (all O(1))"""
+        monitor = self.monitor
+        parts = [
+            _header('meshtastic_nodes', 'Nodes currently known'),
+            f"meshtastic_nodes {monitor.get_node_count()}\n",
+        ]
+        state = getattr(monitor, 'state', None)
+        if isinstance(state, ConnectionState):
+            parts.append(_header('meshtastic_connected', 'Connected to meshtasticd'))
+            parts.append(f"meshtastic_connected {1 if state == ConnectionState.CONNECTED else 0}\n")
+        stats = getattr(monitor, 'connection_stats', None)
+        if stats is not None:
+            parts.append(_header('meshtastic_connects_total', 'Completed handshakes with meshtasticd', 'counter'))
+            parts.append(f"meshtastic_connects_total {stats.connects}\n")
+            parts.append(_header('meshtastic_connect_failures_total', 'Failed connection attempts', 'counter'))
+            parts.append(f"meshtastic_connect_failures_total {stats.failures}\n")
+            parts.append(_header('meshtastic_connection_flaps_total',
+                                 'Connections dropped within a minute of connecting', 'counter'))
+            parts.append(f"meshtastic_connection_flaps_total {stats.flaps}\n")
+            if stats.last_latency is not None:
+                parts.append(_header('meshtastic_connect_latency_seconds',
+                                     'Duration of the last connection handshake'))
+                parts.append(f"meshtastic_connect_latency_seconds {format_value(stats.last_latency)}\n")
+        dedup = getattr(monitor, 'dedup', None)
+        if dedup is not None:
+            parts.append(_header('meshtastic_packets_unique_total', 'First copies of received packets', 'counter'))
+            parts.append(f"meshtastic_packets_unique_total {dedup.unique}\n")
+            parts.append(_header('meshtastic_packets_duplicate_total',
+                                 'Rebroadcast copies of already received packets', 'counter'))
+            parts.append(f"meshtastic_packets_duplicate_total {dedup.duplicates}\n")
+        return ''.join(parts)
+
+    def _render_host(self) -> str:
+        if self.host_stats is None:
+            return ''
+        try:
+            return render_host_stats(self.host_stats())
+        except Exception as e:
+            logger.error(f"Host stats failed: {e}")
+            return ''
+
+    def render(self, include_host: bool = True) -> str:
+        """Full exposition text for one scrape"""
+        self.scrapes += 1
+        host = self._render_host() if include_host else ''
+        return ''.join((self.render_monitor(), self.render_nodes(), host))
+
+    def render_bytes(self) -> bytes:
+        """Full exposition, encoded, for HTTP responses"""
+        self.scrapes += 1
+        return b''.join((self.render_monitor().encode('utf-8'), self.render_nodes_bytes(),
+                         self._render_host().encode('utf-8')))
+
+
+def serve(exporter: MetricsExporter, host: str = '', port: int = DEFAULT_LISTEN_PORT) -> ThreadingHTTPServer:
+    """Serve /metrics from a background thread; returns the server"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = exporter.render_bytes()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            logger.debug(fmt % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Prometheus exporter for meshtasticd node metrics")
+    parser.add_argument('--host', default='localhost', help='meshtasticd hostname (default: localhost)')
+    parser.add_argument('--port', type=int, default=4403, help='meshtasticd port (default: 4403)')
+    parser.add_argument('--listen', default=f':{DEFAULT_LISTEN_PORT}', metavar='[ADDR]:PORT',
+                        help=f'Address to serve /metrics on (default: :{DEFAULT_LISTEN_PORT})')
+    parser.add_argument('--no-host-stats', action='store_true', help='Leave out host CPU/memory/disk metrics')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Enable info logging')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+        logger.setLevel(logging.INFO)
+
+    listen_host, _, listen_port = args.listen.rpartition(':')
+    monitor = NodeMonitor(host=args.host, port=args.port)
+    exporter = MetricsExporter(monitor, host_stats=None if args.no_host_stats else read_host_stats)
+    server = serve(exporter, listen_host, int(listen_port))
+    print(f"Serving metrics on http://{listen_host or '0.0.0.0'}:{listen_port}/metrics "
+          f"for {args.host}:{args.port} (Ctrl+C to stop)")
+
+    async def run():
+        task = asyncio.ensure_future(monitor.run_async())
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        await monitor.disconnect_async()
+        task.cancel()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
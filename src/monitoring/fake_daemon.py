@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+FakeMeshtasticd - Local stand-in for meshtasticd's TCP API
+
+Serves a scripted node database over the 0x94 0xC3 stream framing so
+MeshtasticStreamClient and NodeMonitor can be exercised offline.
+
+The server itself needs no meshtastic install: it only parses the
+want_config_id field of ToRadio and emits pre-serialized FromRadio
+payloads. The build_* helpers use the meshtastic protobufs when they
+are available.
+
+Usage:
+    python3 -m src.monitoring.fake_daemon --port 4404 --nodes 25
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Callable, Iterable, List, Optional
+
+try:
+    from .stream_client import FrameDecoder, encode_frame, _load_protobufs
+except ImportError:
+    from stream_client import FrameDecoder, encode_frame, _load_protobufs
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+# Field numbers from meshtastic/mesh.proto
+TORADIO_WANT_CONFIG_ID = 3
+FROMRADIO_CONFIG_COMPLETE_ID = 7
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _varint_field(payload: bytes, field: int) -> Optional[int]:
+    """Value of the first varint field `field` in a serialized message, if present"""
+    pos = 0
+    try:
+        while pos < len(payload):
+            key, pos = _decode_varint(payload, pos)
+            field_num, wire_type = key >> 3, key & 0x7
+            if wire_type == 0:
+                value, pos = _decode_varint(payload, pos)
+                if field_num == field:
+                    return value
+            elif wire_type == 2:
+                length, pos = _decode_varint(payload, pos)
+                pos += length
+            elif wire_type == 5:
+                pos += 4
+            elif wire_type == 1:
+                pos += 8
+            else:
+                return None
+    except IndexError:
+        return None
+    return None
+
+
+def parse_want_config_id(payload: bytes) -> Optional[int]:
+    """Extract want_config_id from a serialized ToRadio, if present"""
+    return _varint_field(payload, TORADIO_WANT_CONFIG_ID)
+
+
+def parse_config_complete_id(payload: bytes) -> Optional[int]:
+    """Extract config_complete_id from a serialized FromRadio, if present"""
+    return _varint_field(payload, FROMRADIO_CONFIG_COMPLETE_ID)
+
+
+def encode_config_complete(config_id: int) -> bytes:
+    """Serialize FromRadio(config_complete_id=config_id) without protobuf"""
+    return _encode_varint((FROMRADIO_CONFIG_COMPLETE_ID << 3) | 0) + _encode_varint(config_id)
+
+
+def build_my_info_payload(my_node_num: int) -> bytes:
+    """Serialize FromRadio(my_info=...)"""
+    mesh_pb2 = _load_protobufs()[0]
+    from_radio = mesh_pb2.FromRadio()
+    from_radio.my_info.my_node_num = my_node_num
+    return from_radio.SerializeToString()
+
+
+def build_node_info_payload(node_num: int, long_name: str = "", short_name: str = "",
+                            battery_level: Optional[int] = None,
+                            voltage: Optional[float] = None,
+                            channel_utilization: Optional[float] = None,
+                            air_util_tx: Optional[float] = None,
+                            latitude: Optional[float] = None,
+                            longitude: Optional[float] = None,
+                            snr: Optional[float] = None,
+                            last_heard: Optional[int] = None,
+                            hops_away: Optional[int] = None) -> bytes:
+    """Serialize FromRadio(node_info=...) for a synthetic node"""
+    mesh_pb2 = _load_protobufs()[0]
+    from_radio = mesh_pb2.FromRadio()
+    node = from_radio.node_info
+    node.num = node_num
+    node.user.id = f"!{node_num:08x}"
+    node.user.long_name = long_name or f"Node {node_num & 0xFFFF:04x}"
+    node.user.short_name = short_name or f"{node_num & 0xFFFF:04x}"
+    if battery_level is not None:
+        node.device_metrics.battery_level = battery_level
+    if voltage is not None:
+        node.device_metrics.voltage = voltage
+    if channel_utilization is not None:
+        node.device_metrics.channel_utilization = channel_utilization
+    if air_util_tx is not None:
+        node.device_metrics.air_util_tx = air_util_tx
+    if latitude is not None and longitude is not None:
+        node.position.latitude_i = int(latitude * 1e7)
+        node.position.longitude_i = int(longitude * 1e7)
+    if snr is not None:
+        node.snr = snr
+    node.last_heard = last_heard if last_heard is not None else int(time.time())
+    if hops_away is not None:
+        node.hops_away = hops_away
+    return from_radio.SerializeToString()
+
+
+def random_node_payloads(count: int, seed: int = 1) -> List[bytes]:
+    """Generate node_info payloads for a synthetic mesh"""
+    rng = random.Random(seed)
+    now = int(time.time())
+    payloads = []
+    for i in range(count):
+        payloads.append(build_node_info_payload(
+            node_num=0x10000000 + i,
+            battery_level=rng.randint(5, 100),
+            voltage=round(rng.uniform(3.3, 4.2), 2),
+            channel_utilization=round(rng.uniform(0, 40), 1),
+            air_util_tx=round(rng.uniform(0, 8), 2),
+            latitude=45.0 + rng.uniform(-0.5, 0.5),
+            longitude=-122.0 + rng.uniform(-0.5, 0.5),
+            snr=round(rng.uniform(-15, 10), 2),
+            last_heard=now - rng.randint(0, 7200),
+            hops_away=rng.randint(0, 4),
+        ))
+    return payloads
+
+
+class FakeMeshtasticd:
+    """
+    Minimal asyncio TCP server that behaves like meshtasticd's API port.
+
+    On want_config_id it replies with config_payloads followed by the
+    matching config_complete_id. Live traffic can then be pushed to every
+    connected client with broadcast().
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 config_payloads: Optional[Iterable[bytes]] = None):
+        """
+        Args:
+            host: Address to bind (default: 127.0.0.1)
+            port: Port to bind (0 picks a free port)
+            config_payloads: Serialized FromRadio messages sent during config
+        """
+        self.host = host
+        self.port = port
+        self.config_payloads: List[bytes] = list(config_payloads or [])
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: List[asyncio.StreamWriter] = []
+        self._handlers: List[asyncio.Task] = []
+        self.received: List[bytes] = []
+        self.on_to_radio: Optional[Callable[[bytes], None]] = None
+        self.on_client_ready: Optional[Callable[[asyncio.StreamWriter], None]] = None
+
+    async def start(self) -> int:
+        """Start listening and return the bound port"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Fake meshtasticd listening on {self.host}:{self.port}")
+        return self.port
+
+    async def stop(self):
+        """Stop the server and drop all clients"""
+        for writer in self._clients[:]:
+            writer.close()
+        self._clients.clear()
+        for task in self._handlers[:]:
+            task.cancel()
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def broadcast(self, payload: bytes):
+        """Send a FromRadio payload to every connected client"""
+        frame = encode_frame(payload)
+        for writer in self._clients[:]:
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except (ConnectionError, OSError):
+                self._clients.remove(writer)
+
+    async def broadcast_many(self, payloads: Iterable[bytes]):
+        """Send several FromRadio payloads to every client with one drain each"""
+        data = b''.join(encode_frame(p) for p in payloads)
+        for writer in self._clients[:]:
+            try:
+                writer.write(data)
+                await writer.drain()
+            except (ConnectionError, OSError):
+                self._clients.remove(writer)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.append(writer)
+        task = asyncio.current_task()
+        self._handlers.append(task)
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for payload in decoder.feed(data):
+                    self.received.append(payload)
+                    if self.on_to_radio:
+                        self.on_to_radio(payload)
+                    config_id = parse_want_config_id(payload)
+                    if config_id is not None:
+                        for item in self.config_payloads:
+                            writer.write(encode_frame(item))
+                        writer.write(encode_frame(encode_config_complete(config_id)))
+                        await writer.drain()
+                        if self.on_client_ready:
+                            self.on_client_ready(writer)
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.remove(task)
+            if writer in self._clients:
+                self._clients.remove(writer)
+            writer.close()
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Fake meshtasticd TCP API for offline testing")
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=4404, help='Bind port (default: 4404)')
+    parser.add_argument('--nodes', type=int, default=10, help='Synthetic node count (default: 10)')
+    parser.add_argument('--my-node', type=lambda v: int(v, 0), default=0x10000000,
+                        help='Local node number (default: 0x10000000)')
+    args = parser.parse_args()
+
+    payloads = [build_my_info_payload(args.my_node)] + random_node_payloads(args.nodes)
+    daemon = FakeMeshtasticd(args.host, args.port, payloads)
+    print(f"Fake meshtasticd on {args.host}:{args.port} with {args.nodes} nodes (Ctrl+C to stop)")
+    try:
+        asyncio.run(daemon.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
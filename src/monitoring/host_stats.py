@@ -0,0 +1,121 @@
+"""Host CPU, load, memory, disk, temperature and uptime readings
+
+Shared by the web dashboard's system panel and the Prometheus exporter,
+so both parse /proc the same way and agree on the keys:
+
+    cpu_percent, load1, mem_percent, mem_used_mb, mem_total_mb,
+    disk_percent, disk_used_gb, disk_total_gb, temperature, uptime_seconds
+
+Readings that fail are left out rather than reported as 0.
+
+Usage:
+    stats = read_host_stats()
+    print(format_uptime(stats['uptime_seconds']))
+"""
+
+import os
+import subprocess
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+THERMAL_ZONE = '/sys/class/thermal/thermal_zone0/temp'
+
+_cpu_lock = threading.Lock()
+_last_cpu: Optional[Tuple[int, int]] = None
+
+
+def _cpu_percent() -> Optional[float]:
+    """CPU usage since the previous call (None on the first one)"""
+    global _last_cpu
+    with open('/proc/stat') as f:
+        values = [int(x) for x in f.readline().split()[1:8]]
+    idle, total = values[3], sum(values)
+    with _cpu_lock:
+        last, _last_cpu = _last_cpu, (idle, total)
+    if last and total > last[1]:
+        return round(100 * (1 - (idle - last[0]) / (total - last[1])), 1)
+    return None
+
+
+def _temperature() -> Optional[float]:
+    try:
+        with open(THERMAL_ZONE) as f:
+            return round(int(f.read().strip()) / 1000, 1)
+    except (OSError, ValueError):
+        pass
+    # Older Raspberry Pi OS images only expose it through the firmware
+    try:
+        result = subprocess.run(['vcgencmd', 'measure_temp'], capture_output=True,
+                                text=True, timeout=2)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode == 0 and 'temp=' in result.stdout:
+        try:
+            return round(float(result.stdout.split('=')[1].replace("'C", "").strip()), 1)
+        except ValueError:
+            pass
+    return None
+
+
+def read_host_stats() -> Dict[str, Any]:
+    """
+    Current host readings from /proc, statvfs and the thermal zone.
+
+    CPU usage is measured between consecutive calls, so the first call
+    has no cpu_percent.
+    """
+    stats: Dict[str, Any] = {}
+    try:
+        cpu = _cpu_percent()
+        if cpu is not None:
+            stats['cpu_percent'] = cpu
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        stats['load1'] = os.getloadavg()[0]
+    except OSError:
+        pass
+    try:
+        meminfo = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if rest.strip():
+                    meminfo[key] = int(rest.split()[0])
+        total = meminfo['MemTotal']
+        used = total - meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+        stats['mem_percent'] = round(100 * used / total, 1)
+        stats['mem_used_mb'] = round(used / 1024)
+        stats['mem_total_mb'] = round(total / 1024)
+    except (OSError, ValueError, KeyError, IndexError, ZeroDivisionError):
+        pass
+    try:
+        st = os.statvfs('/')
+        total = st.f_blocks * st.f_frsize
+        used = total - st.f_bfree * st.f_frsize
+        stats['disk_percent'] = round(100 * used / total, 1)
+        stats['disk_used_gb'] = round(used / 1024 ** 3, 1)
+        stats['disk_total_gb'] = round(total / 1024 ** 3, 1)
+    except (OSError, ZeroDivisionError):
+        pass
+    temperature = _temperature()
+    if temperature is not None:
+        stats['temperature'] = temperature
+    try:
+        with open('/proc/uptime') as f:
+            stats['uptime_seconds'] = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return stats
+
+
+def format_uptime(seconds: float) -> str:
+    """Uptime as '3d 4h 5m', '4h 5m' or '5m'"""
+    days = int(seconds // 86400)
+    hours = int((seconds % 86400) // 3600)
+    mins = int((seconds % 3600) // 60)
+    if days > 0:
+        return f"{days}d {hours}h {mins}m"
+    if hours > 0:
+        return f"{hours}h {mins}m"
+    return f"{mins}m"
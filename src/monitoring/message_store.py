@@ -0,0 +1,429 @@
+"""
+MessageStore - Persistent, searchable text message history
+
+NodeMonitor hands every text message to on_message and then forgets it.
+MessageStore appends them to SQLite (WAL mode) so the history survives
+restarts and can be filtered and searched.
+
+Design notes:
+- Messages are queued in memory and written in one transaction per batch
+- (sender, packet id) is unique, so a message heard again after a
+  restart or via another path is stored once
+- Full-text search uses an FTS5 external-content index kept in sync by
+  triggers. On SQLite builds without FTS5 a plain inverted index table
+  (term, message id) is used instead, with the same query syntax
+- Results are returned newest first and paged by message id, which both
+  indexes can walk in order without sorting
+
+Usage:
+    store = MessageStore()
+    monitor = NodeMonitor(message_store=store)
+    ...
+    store.search('antenna', sender='!a1b2c3d4', start=time.time() - 86400)
+    store.close()
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+DEFAULT_DB_PATH = Path.home() / '.local' / 'share' / 'meshtastic-monitor' / 'messages.db'
+
+BROADCAST_NUM = 0xFFFFFFFF
+
+_COLUMNS = "m.id, m.ts, m.sender, m.dest, m.channel, m.packet_id, m.text, m.snr, m.hops"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id        INTEGER PRIMARY KEY,
+    ts        INTEGER NOT NULL,
+    sender    INTEGER NOT NULL,
+    dest      INTEGER,
+    channel   INTEGER NOT NULL DEFAULT 0,
+    packet_id INTEGER,
+    text      TEXT NOT NULL,
+    snr       REAL,
+    hops      INTEGER
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS messages_packet ON messages (sender, packet_id);
+CREATE INDEX IF NOT EXISTS messages_ts ON messages (ts);
+CREATE INDEX IF NOT EXISTS messages_channel ON messages (channel, id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# Fallback index: one row per distinct term per message
+_TERMS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS message_terms (
+    term   TEXT NOT NULL,
+    msg_id INTEGER NOT NULL,
+    PRIMARY KEY (term, msg_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS message_terms_delete AFTER DELETE ON messages BEGIN
+    DELETE FROM message_terms WHERE msg_id = old.id;
+END;
+"""
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_QUERY_TOKEN_RE = re.compile(r'(\w+)(\*?)', re.UNICODE)
+
+
+def fts5_available() -> bool:
+    """True if this SQLite build has the FTS5 extension"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, roughly what FTS5's unicode61 tokenizer yields"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[str, bool]]:
+    """
+    Split a search string into (term, is_prefix) pairs.
+
+    All terms must match; a trailing * makes a term a prefix match.
+    Any other punctuation is ignored, so user input can never form
+    FTS5 operators.
+    """
+    return [(term, bool(star)) for term, star in _QUERY_TOKEN_RE.findall(query.lower())]
+
+
+def _node_num(node: Union[str, int]) -> int:
+    if isinstance(node, int):
+        return node
+    node = node.strip()
+    return int(node[1:], 16) if node.startswith('!') else int(node)
+
+
+def message_from_packet(packet: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    Build a messages row from a received packet dict.
+
+    Returns:
+        (ts, sender, dest, channel, packet_id, text, snr, hops) or None
+        if the packet is not a text message
+    """
+    decoded = packet.get('decoded') or {}
+    if decoded.get('portnum') != 'TEXT_MESSAGE_APP':
+        return None
+    text = decoded.get('text')
+    sender = packet.get('from')
+    if not text or not sender:
+        return None
+    hop_start = packet.get('hopStart')
+    hop_limit = packet.get('hopLimit')
+    hops = max(0, hop_start - hop_limit) if hop_start is not None and hop_limit is not None else None
+    return (
+        int(packet.get('rxTime') or time.time()),
+        sender,
+        packet.get('to'),
+        packet.get('channel', 0),
+        packet.get('id') or None,
+        text,
+        packet.get('rxSnr'),
+        hops,
+    )
+
+
+class MessageStore:
+    """
+    Text message log with batched writes and full-text search.
+
+    record() is cheap and thread-safe; a background thread commits the
+    queued messages every flush_interval seconds or once batch_size
+    messages are pending.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 flush_interval: float = 5.0,
+                 batch_size: int = 500,
+                 retention: Optional[int] = None,
+                 use_fts: Optional[bool] = None,
+                 readonly: bool = False):
+        """
+        Args:
+            path: SQLite database file (default: ~/.local/share/meshtastic-monitor/messages.db)
+            flush_interval: Max seconds messages wait in memory
+            batch_size: Flush early once this many messages are queued
+            retention: Seconds of history to keep (default: keep everything)
+            use_fts: Force the FTS5 index on or off (default: FTS5 when
+                available); an existing database keeps the index it was
+                created with
+            readonly: Open an existing database for queries only, with no
+                writer thread (for processes that only search)
+        """
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.readonly = readonly
+
+        self._pending: List[Tuple] = []
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = not readonly
+        self._last_retention = 0.0
+        self._thread = None
+
+        self.messages_written = 0
+        self.flushes = 0
+
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+            self.index = meta.get('index', 'fts5')
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        index = meta.get('index')
+        if index is None:
+            if use_fts is None:
+                use_fts = fts5_available()
+            index = 'fts5' if use_fts else 'terms'
+        self.index = index
+        self._conn.executescript(_FTS_SCHEMA if index == 'fts5' else _TERMS_SCHEMA)
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('index', ?)", (index,))
+        self._conn.commit()
+
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                        name="message-writer")
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, packet: Dict[str, Any]) -> bool:
+        """
+        Queue a received packet if it is a text message.
+
+        Returns:
+            True if the packet was queued
+        """
+        row = message_from_packet(packet)
+        if row is None:
+            return False
+        with self._pending_lock:
+            self._pending.append(row)
+            pending = len(self._pending)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self):
+        """Write all queued messages"""
+        if self.readonly:
+            return
+        with self._pending_lock:
+            batch = self._pending
+            self._pending = []
+
+        with self._db_lock:
+            now = int(time.time())
+            if batch:
+                with self._conn:
+                    if self.index == 'fts5':
+                        # rowcount leaves out the trigger's index inserts
+                        written = self._conn.executemany(
+                            "INSERT OR IGNORE INTO messages "
+                            "(ts, sender, dest, channel, packet_id, text, snr, hops) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch).rowcount
+                    else:
+                        written = self._insert_with_terms(batch)
+                self.messages_written += written
+                self.flushes += 1
+
+            if self.retention and now - self._last_retention > 3600:
+                with self._conn:
+                    self._conn.execute("DELETE FROM messages WHERE ts < ?", (now - self.retention,))
+                self._last_retention = now
+
+    def _insert_with_terms(self, batch: List[Tuple]) -> int:
+        """Insert rows and their fallback index terms; must run inside a transaction"""
+        written = 0
+        terms = []
+        for row in batch:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO messages "
+                "(ts, sender, dest, channel, packet_id, text, snr, hops) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            if cursor.rowcount:
+                written += 1
+                msg_id = cursor.lastrowid
+                terms.extend((term, msg_id) for term in set(tokenize(row[5])))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO message_terms (term, msg_id) VALUES (?, ?)", terms)
+        return written
+
+    def _writer_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Message flush failed: {e}")
+
+    def close(self):
+        """Flush pending messages and close the database"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Message flush failed: {e}")
+        with self._db_lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def search(self, query: Optional[str] = None,
+               sender: Optional[Union[str, int]] = None,
+               dest: Optional[Union[str, int]] = None,
+               channel: Optional[int] = None,
+               start: Optional[float] = None, end: Optional[float] = None,
+               before_id: Optional[int] = None,
+               limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Find messages, newest first.
+
+        Args:
+            query: Words that must all appear; 'word*' matches a prefix
+            sender: Sender node ('!a1b2c3d4' or node number)
+            dest: Destination node ('^all' or the broadcast number for broadcasts)
+            channel: Channel index
+            start: Earliest receive time, epoch seconds
+            end: Latest receive time (exclusive), epoch seconds
+            before_id: Only messages older than this id (for paging)
+            limit: Maximum number of results
+
+        Returns:
+            List of message dicts
+        """
+        where = []
+        params: List[Any] = []
+        if sender is not None:
+            where.append("m.sender = ?")
+            params.append(_node_num(sender))
+        if dest is not None:
+            where.append("m.dest = ?")
+            params.append(BROADCAST_NUM if dest == '^all' else _node_num(dest))
+        if channel is not None:
+            where.append("m.channel = ?")
+            params.append(int(channel))
+        if start is not None:
+            where.append("m.ts >= ?")
+            params.append(int(start))
+        if end is not None:
+            where.append("m.ts < ?")
+            params.append(int(end))
+        if before_id is not None:
+            where.append("m.id < ?")
+            params.append(int(before_id))
+
+        terms = parse_query(query) if query else []
+        if query and not terms:
+            return []
+
+        if terms and self.index == 'fts5':
+            # Quoted terms cannot be read as FTS5 operators
+            match = ' '.join(f'"{term}"*' if prefix else f'"{term}"' for term, prefix in terms)
+            sql = (f"SELECT {_COLUMNS} FROM messages_fts f JOIN messages m ON m.id = f.rowid "
+                   f"WHERE messages_fts MATCH ?")
+            params.insert(0, match)
+            order = "f.rowid"
+        else:
+            for term, prefix in terms:
+                if prefix:
+                    where.append("m.id IN (SELECT msg_id FROM message_terms WHERE term >= ? AND term < ?)")
+                    params.extend((term, term + '\U0010ffff'))
+                else:
+                    where.append("m.id IN (SELECT msg_id FROM message_terms WHERE term = ?)")
+                    params.append(term)
+            sql = f"SELECT {_COLUMNS} FROM messages m WHERE 1"
+            order = "m.id"
+
+        if where:
+            sql += " AND " + " AND ".join(where)
+        sql += f" ORDER BY {order} DESC LIMIT ?"
+        params.append(max(0, int(limit)))
+
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    @staticmethod
+    def _row_to_dict(row: Tuple) -> Dict[str, Any]:
+        msg_id, ts, sender, dest, channel, packet_id, text, snr, hops = row
+        return {
+            'id': msg_id,
+            'time': ts,
+            'from': f"!{sender:08x}",
+            'to': '^all' if dest == BROADCAST_NUM else (f"!{dest:08x}" if dest is not None else None),
+            'channel': channel,
+            'packet_id': packet_id,
+            'text': text,
+            'snr': snr,
+            'hops': hops,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Row count, index kind and writer counters"""
+        with self._db_lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            'messages': count,
+            'index': self.index,
+            'pending': pending,
+            'messages_written': self.messages_written,
+            'flushes': self.flushes,
+        }
@@ -0,0 +1,314 @@
+"""
+MultiMonitor - Fan-in monitoring of several meshtasticd daemons
+
+Connects to N daemons concurrently on a single asyncio event loop (one
+NodeMonitor per source on the native stream client, no thread per host)
+and merges their node tables into one view:
+
+- last_heard is the freshest value reported by any source
+- snr is the best value currently reported by any source
+- all other fields come from the source that heard the node most recently
+
+Per-source connection health (state, reconnects, packet counts, last
+error) is tracked alongside the merged table.
+
+Usage:
+    multi = MultiMonitor(["pi1", "pi2:4403", "192.168.1.40"])
+    multi.start()                 # background event loop thread
+    for node in multi.get_nodes():
+        print(node.long_name, node.snr, multi.best_source(node.node_id))
+    multi.stop()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dispatch import CallbackEventsMixin, EventDispatcher
+from .node_monitor import ConnectionState, NodeInfo, NodeMonitor, node_to_dict
+from .node_table import NodeTable, NodeView, node_fields
+from .spatial import SpatialIndex, SpatialQueryMixin
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+
+def parse_host_spec(spec: str, default_port: int = 4403) -> Tuple[str, int]:
+    """Split 'host' or 'host:port' into (host, port)"""
+    spec = spec.strip()
+    if spec.count(':') == 1:
+        host, port = spec.split(':')
+        return host, int(port)
+    return spec, default_port
+
+
+@dataclass
+class SourceHealth:
+    """Connection health of one daemon"""
+    name: str
+    host: str
+    port: int
+    state: str = ConnectionState.DISCONNECTED.value
+    connected_since: Optional[float] = None
+    last_change: Optional[float] = None
+    connects: int = 0
+    disconnects: int = 0
+    last_error: Optional[str] = None
+    node_count: int = 0
+    packets: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'host': self.host,
+            'port': self.port,
+            'state': self.state,
+            'connected_since': self.connected_since,
+            'last_change': self.last_change,
+            'connects': self.connects,
+            'disconnects': self.disconnects,
+            'last_error': self.last_error,
+            'node_count': self.node_count,
+            'packets': self.packets,
+        }
+
+
+class MultiMonitor(CallbackEventsMixin, SpatialQueryMixin):
+    """
+    Merged node view over several meshtasticd daemons.
+
+    Exposes the same read API as NodeMonitor (get_nodes, get_node,
+    get_node_count, find_nodes, the spatial queries, to_dict) and the same on_node_added /
+    on_node_update / on_node_changed / on_node_removed callbacks for the
+    merged table.
+    """
+
+    def __init__(self, hosts: List[str], default_port: int = 4403, timeout: float = 10.0):
+        """
+        Args:
+            hosts: Daemon addresses as 'host' or 'host:port'
+            default_port: Port used when a host has none
+            timeout: Per-connection config download timeout
+        """
+        self.timeout = timeout
+        self._table = NodeTable()
+        self.spatial = SpatialIndex()
+        self._lock = threading.Lock()
+        self._best_source: Dict[str, str] = {}
+        self._monitors: Dict[str, NodeMonitor] = {}
+        self._health: Dict[str, SourceHealth] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.events = EventDispatcher()
+        self._bridges = {}
+
+        # Callbacks for the merged table
+        self.on_node_added = None
+        self.on_node_update = None
+        self.on_node_changed = None
+        self.on_node_removed = None
+
+        for spec in hosts:
+            host, port = parse_host_spec(spec, default_port)
+            name = f"{host}:{port}"
+            if name in self._monitors:
+                continue
+            # Source callbacks run inline on the shared loop; merging is
+            # cheap and fans out through this monitor's own dispatcher
+            monitor = NodeMonitor(host=host, port=port, sync_callbacks=True)
+            monitor.on_node_added = lambda node, name=name: self._merge_node(name, node)
+            monitor.on_node_changed = lambda node, changes, name=name: self._merge_node(name, node, changes)
+            monitor.on_node_removed = lambda node_id, name=name: self._remove_node(name, node_id)
+            monitor.on_connection_change = lambda state, name=name: self._on_state(name, state)
+            monitor.on_error = lambda error, name=name: self._on_error(name, error)
+            self._monitors[name] = monitor
+            self._health[name] = SourceHealth(name=name, host=host, port=port)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def run(self):
+        """Connect to every source and keep them running until stop()"""
+        self._loop = asyncio.get_running_loop()
+        await asyncio.gather(*(m.run_async(timeout=self.timeout) for m in self._monitors.values()))
+
+    async def close(self):
+        """Disconnect every source"""
+        await asyncio.gather(*(m.disconnect_async() for m in self._monitors.values()))
+
+    def start(self):
+        """Run the event loop on a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                        daemon=True, name="multi-monitor")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background event loop started with start()"""
+        if self._loop and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.close(), self._loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.error(f"Error stopping sources: {e}")
+        if self._thread:
+            self._thread.join(timeout)
+        self.events.close(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Merging
+    # ------------------------------------------------------------------
+
+    def _merge_node(self, source: str, node: NodeInfo, changes: Optional[Dict[str, Any]] = None):
+        node_id = node.node_id
+        fields = changes if changes is not None else node_fields(node)
+        incoming_heard = node.last_heard.timestamp() if node.last_heard else None
+
+        with self._lock:
+            table = self._table
+            row = table.row_of(node_id)
+            current_heard = table.get_field(row, 'last_heard') if row is not None else None
+            fresher = current_heard is None or (
+                incoming_heard is not None and incoming_heard >= current_heard)
+
+            update = {}
+            for name, value in fields.items():
+                if name == 'snr':
+                    continue
+                if name == 'last_heard':
+                    if value is not None and (current_heard is None or value > current_heard):
+                        update[name] = value
+                elif fresher or row is None or table.get_field(row, name) is None:
+                    update[name] = value
+
+            best_snr, best_source = self._best_snr(node_id)
+            update['snr'] = best_snr
+            merged, is_new, merged_changes = table.merge(node_id, node.node_num, update)
+            self._update_spatial(merged, merged_changes)
+            self._best_source[node_id] = best_source or source
+            payload = table.snapshot(merged._row) if is_new or merged_changes else None
+
+        if is_new:
+            self._emit('node_added', payload)
+        elif merged_changes:
+            self._emit('node_update', payload)
+            self._emit('node_changed', payload, merged_changes)
+
+    def _best_snr(self, node_id: str) -> Tuple[Optional[float], Optional[str]]:
+        best, best_source = None, None
+        for name, monitor in self._monitors.items():
+            row = monitor.table.row_of(node_id)
+            if row is None:
+                continue
+            snr = monitor.table.get_field(row, 'snr')
+            if snr is not None and (best is None or snr > best):
+                best, best_source = snr, name
+        return best, best_source
+
+    def _remove_node(self, source: str, node_id: str):
+        holders = [name for name, m in self._monitors.items() if node_id in m.table]
+        payload = merged_changes = None
+        with self._lock:
+            row = self._table.row_of(node_id)
+            if holders:
+                if row is None:
+                    return
+                # Still heard elsewhere, but the departed source may have
+                # held the best SNR
+                best_snr, best_source = self._best_snr(node_id)
+                merged, _, merged_changes = self._table.merge(
+                    node_id, self._table.get_field(row, 'node_num'), {'snr': best_snr})
+                self._best_source[node_id] = best_source or holders[0]
+                if merged_changes:
+                    payload = self._table.snapshot(merged._row)
+                removed = False
+            else:
+                removed = self._table.remove(node_id)
+                self.spatial.remove(node_id)
+                self._best_source.pop(node_id, None)
+        if removed:
+            self._emit('node_removed', node_id)
+        elif payload is not None:
+            self._emit('node_update', payload)
+            self._emit('node_changed', payload, merged_changes)
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _on_state(self, source: str, state: ConnectionState):
+        health = self._health[source]
+        now = time.time()
+        if state == ConnectionState.CONNECTED and health.state != state.value:
+            health.connects += 1
+            health.connected_since = now
+        elif health.state == ConnectionState.CONNECTED.value and state != ConnectionState.CONNECTED:
+            health.disconnects += 1
+            health.connected_since = None
+        health.state = state.value
+        health.last_change = now
+
+    def _on_error(self, source: str, error: Exception):
+        self._health[source].last_error = str(error)
+
+    def get_health(self) -> List[SourceHealth]:
+        """Connection health per source"""
+        for name, monitor in self._monitors.items():
+            health = self._health[name]
+            health.node_count = monitor.get_node_count()
+            client = monitor._stream_client
+            if client:
+                health.packets = client.packets_received
+        return list(self._health.values())
+
+    @property
+    def connected_count(self) -> int:
+        return sum(1 for m in self._monitors.values() if m.is_connected)
+
+    # ------------------------------------------------------------------
+    # Read API (mirrors NodeMonitor)
+    # ------------------------------------------------------------------
+
+    @property
+    def table(self) -> NodeTable:
+        return self._table
+
+    def get_nodes(self) -> List[NodeView]:
+        with self._lock:
+            node_ids, columns = self._table.export_columns()
+        return NodeTable.from_columns(node_ids, columns).views()
+
+    def get_node(self, node_id: str) -> Optional[NodeInfo]:
+        with self._lock:
+            row = self._table.row_of(node_id)
+            return self._table.to_node_info(row) if row is not None else None
+
+    def get_node_count(self) -> int:
+        with self._lock:
+            return len(self._table)
+
+    def find_nodes(self, **criteria) -> List[NodeInfo]:
+        with self._lock:
+            return [view.to_node_info() for view in self._table.filter(**criteria)]
+
+    def best_source(self, node_id: str) -> Optional[str]:
+        """Source that currently reports the best SNR for a node"""
+        return self._best_source.get(node_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export merged state and per-source health as a dictionary"""
+        return {
+            'sources': [h.to_dict() for h in self.get_health()],
+            'node_count': self.get_node_count(),
+            'nodes': [
+                dict(node_to_dict(n), best_source=self.best_source(n.node_id))
+                for n in self.get_nodes()
+            ],
+        }
@@ -12,7 +12,9 @@ Features:
 - Event callbacks for UI integration
 """
 
+import asyncio
 import logging
+import os
 import threading
 import time
 from dataclasses import dataclass, field
@@ -20,6 +22,15 @@ from datetime import datetime
 from typing import Callable, Dict, List, Optional, Any
 from enum import Enum
 
+from .dedup import PacketDedupCache
+from .dispatch import CallbackEventsMixin, EventDispatcher
+from .expiry import DEFAULT_NODE_TTLS, TimerWheel, ttl_for_role
+from .node_table import NodeSnapshot, NodeTable, NodeView
+from .reconnect import Backoff, ConnectionStats
+from .snapshot import SnapshotError, read_snapshot, write_snapshot
+from .spatial import SpatialIndex, SpatialQueryMixin
+from .topology import MeshTopology
+
 # Configure logging - default to WARNING to reduce noise
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -82,7 +93,7 @@ class NodeInfo:
             self.metrics = NodeMetrics()
 
 
-class NodeMonitor:
+class NodeMonitor(CallbackEventsMixin, SpatialQueryMixin):
     """
     Meshtastic Node Monitor
 
@@ -101,26 +112,84 @@ class NodeMonitor:
         monitor.disconnect()
     """
 
-    def __init__(self, host: str = "localhost", port: int = 4403):
+    def __init__(self, host: str = "localhost", port: int = 4403,
+                 telemetry_store=None, sync_callbacks: bool = False, capture=None,
+                 dedup: bool = True, message_store=None, channel_analytics=None,
+                 expire_nodes: bool = True,
+                 node_ttls: Optional[Dict[str, Optional[float]]] = None,
+                 snapshot: Optional[str] = None, snapshot_interval: float = 60.0,
+                 heartbeat_interval: float = 60.0):
         """
         Initialize NodeMonitor.
 
         Args:
             host: Hostname of meshtasticd (default: localhost)
             port: TCP port (default: 4403)
+            telemetry_store: Optional TelemetryStore that receives every node's metrics
+            message_store: Optional MessageStore that logs every text message
+            channel_analytics: Optional ChannelAnalytics fed with every
+                channel_utilization / air_util_tx report
+            sync_callbacks: Run node/message callbacks inline on the reader
+                instead of on per-subscriber worker threads
+            capture: Optional CaptureWriter that records every raw frame
+                (asyncio connections only)
+            dedup: Deliver only the first copy of flooded packets to
+                on_message and count rebroadcasts
+            expire_nodes: Drop nodes not heard within their role's TTL
+                and fire on_node_removed; nodes already past it when first
+                seen (radio DB, snapshot) are never added
+            node_ttls: Role -> TTL seconds, with a 'default' entry for
+                unlisted roles (default: DEFAULT_NODE_TTLS)
+            snapshot: Optional node table snapshot file; loaded now for a
+                warm start, rewritten every snapshot_interval seconds
+                while the table changes, and on disconnect
+            snapshot_interval: Seconds between periodic snapshots
+            heartbeat_interval: Seconds between keepalive heartbeats; a
+                failed heartbeat drops the connection and reconnects
+                (0 disables)
         """
         self.host = host
         self.port = port
         self.interface = None
-        self._nodes: Dict[str, NodeInfo] = {}
+        self._table = NodeTable()
+        self.spatial = SpatialIndex()
         self._lock = threading.Lock()
         self._state = ConnectionState.DISCONNECTED
         self._running = False
         self._reconnect_thread = None
+        self._stream_client = None
+        self.heartbeat_interval = heartbeat_interval
+        self._last_heartbeat = 0.0
+        self.connection_stats = ConnectionStats()
+        self._backoff = Backoff()
+        # Set by meshtastic's connection.established once the config
+        # download is complete; set to cancel reconnect waits
+        self._handshake = threading.Event()
+        self._stop = threading.Event()
+        self._stop_async: Optional[asyncio.Event] = None
+        self.telemetry_store = telemetry_store
+        self.message_store = message_store
+        self.channel_analytics = channel_analytics
+        self.capture = capture
+        self.dedup = PacketDedupCache() if dedup else None
+        self.topology = MeshTopology()
+        self.node_ttls = dict(DEFAULT_NODE_TTLS if node_ttls is None else node_ttls)
+        self.expiry = TimerWheel() if expire_nodes else None
+        self.snapshot_path = snapshot
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_version = -1
+        self._snapshot_time = 0.0
+        self._maintenance_thread = None
+
+        # Node and message events are delivered through bounded queues so
+        # a slow consumer never stalls the radio reader
+        self.events = EventDispatcher(synchronous=sync_callbacks)
+        self._bridges: Dict[str, Any] = {}
 
         # Callbacks
-        self.on_node_update: Optional[Callable[[NodeInfo], None]] = None
-        self.on_node_added: Optional[Callable[[NodeInfo], None]] = None
+        self.on_node_update: Optional[Callable[[NodeSnapshot], None]] = None
+        self.on_node_added: Optional[Callable[[NodeSnapshot], None]] = None
+        self.on_node_changed: Optional[Callable[[NodeSnapshot, Dict[str, Any]], None]] = None
         self.on_node_removed: Optional[Callable[[str], None]] = None
         self.on_message: Optional[Callable[[dict], None]] = None
         self.on_connection_change: Optional[Callable[[ConnectionState], None]] = None
@@ -129,6 +198,10 @@ class NodeMonitor:
         # My node info
         self.my_node_id: Optional[str] = None
         self.my_node_num: Optional[int] = None
+        self.radio_info: Dict[str, Any] = {}
+
+        if self.snapshot_path:
+            self.load_snapshot()
 
     @property
     def state(self) -> ConnectionState:
@@ -154,7 +227,7 @@ class NodeMonitor:
         Connect to meshtasticd.
 
         Args:
-            timeout: Connection timeout in seconds
+            timeout: Seconds to wait for the initial config download
 
         Returns:
             True if connected successfully
@@ -163,8 +236,14 @@ class NodeMonitor:
             logger.warning("Already connected")
             return True
 
-        self.state = ConnectionState.CONNECTING
         self._running = True
+        self._stop.clear()
+        return self._open(timeout)
+
+    def _open(self, timeout: float) -> bool:
+        """One connection attempt; blocks until the handshake completes"""
+        self.state = ConnectionState.CONNECTING
+        start = time.perf_counter()
 
         try:
             from meshtastic.tcp_interface import TCPInterface
@@ -176,38 +255,30 @@ class NodeMonitor:
             pub.subscribe(self._on_disconnect, "meshtastic.connection.lost")
             pub.subscribe(self._on_node_update_event, "meshtastic.node.updated")
 
-            # Pre-check: Test if port is reachable (fail fast)
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(min(timeout, 5.0))
-            try:
-                sock.connect((self.host, self.port))
-                sock.close()
-            except (socket.timeout, socket.error, OSError) as e:
-                raise ConnectionError(f"Cannot reach {self.host}:{self.port} - {e}")
-
-            # Connect
+            # Connect; a refused or unreachable port raises straight away
             logger.info(f"Connecting to {self.host}:{self.port}...")
+            self._handshake.clear()
             self.interface = TCPInterface(
                 hostname=self.host,
                 portNumber=self.port
             )
 
-            # Wait for connection
-            start = time.time()
-            while self.interface.myInfo is None and (time.time() - start) < timeout:
-                time.sleep(0.1)
-
-            if self.interface.myInfo:
-                self.my_node_num = self.interface.myInfo.my_node_num
-                self.my_node_id = f"!{self.my_node_num:08x}"
-                self.state = ConnectionState.CONNECTED
-                self._load_initial_nodes()
-                logger.info(f"Connected. My node: {self.my_node_id}")
-                return True
-            else:
+            # connection.established fires on config_complete_id; older
+            # meshtastic releases may publish it before we subscribed
+            if not (self._handshake.wait(timeout) or self.interface.myInfo):
                 raise TimeoutError("Connection timeout")
 
+            self.my_node_num = self.interface.myInfo.my_node_num
+            self.my_node_id = f"!{self.my_node_num:08x}"
+            self.connection_stats.record_connect(time.perf_counter() - start)
+            self._last_heartbeat = time.time()
+            self.state = ConnectionState.CONNECTED
+            self._load_initial_nodes()
+            self._start_maintenance_thread()
+            logger.info(f"Connected in {self.connection_stats.last_latency * 1000:.0f} ms. "
+                        f"My node: {self.my_node_id}")
+            return True
+
         except ImportError as e:
             logger.error(f"meshtastic package not installed: {e}")
             self.state = ConnectionState.ERROR
@@ -217,14 +288,147 @@ class NodeMonitor:
 
         except Exception as e:
             logger.error(f"Connection failed: {e}")
+            self.connection_stats.record_failure(e)
+            self._close_interface()
+            self.state = ConnectionState.ERROR
+            if self.on_error:
+                self.on_error(e)
+            return False
+
+    async def connect_async(self, timeout: float = 10.0) -> bool:
+        """
+        Connect to meshtasticd on the running event loop.
+
+        Uses MeshtasticStreamClient instead of TCPInterface, so packets are
+        handled on the event loop with no reader thread or pubsub hop.
+
+        Args:
+            timeout: Seconds to wait for the initial node database
+
+        Returns:
+            True if connected successfully
+        """
+        if self.is_connected:
+            logger.warning("Already connected")
+            return True
+
+        from .stream_client import MeshtasticStreamClient
+
+        self.state = ConnectionState.CONNECTING
+        self._running = True
+
+        client = MeshtasticStreamClient(host=self.host, port=self.port,
+                                        heartbeat_interval=self.heartbeat_interval)
+        client.on_from_radio = self._on_from_radio
+        client.on_disconnect = self._on_stream_disconnect
+        if self.capture is not None:
+            client.on_raw_frame = lambda payload: self.capture.write(
+                payload, config=not client.config_complete)
+        self._stream_client = client
+
+        start = time.perf_counter()
+        try:
+            logger.info(f"Connecting to {self.host}:{self.port} (asyncio)...")
+            await client.connect(timeout=timeout)
+        except ImportError as e:
+            logger.error(f"meshtastic package not installed: {e}")
+            self._stream_client = None
+            self.state = ConnectionState.ERROR
+            if self.on_error:
+                self.on_error(e)
+            return False
+        except Exception as e:
+            logger.error(f"Connection failed: {e}")
+            self.connection_stats.record_failure(e)
+            self._stream_client = None
             self.state = ConnectionState.ERROR
             if self.on_error:
                 self.on_error(e)
             return False
 
+        self.interface = client
+        self.connection_stats.record_connect(time.perf_counter() - start)
+        self.state = ConnectionState.CONNECTED
+        logger.info(f"Connected in {self.connection_stats.last_latency * 1000:.0f} ms. "
+                    f"My node: {self.my_node_id}")
+        return True
+
+    async def run_async(self, timeout: float = 10.0, reconnect: bool = True):
+        """
+        Connect and keep the stream running until disconnect_async().
+
+        Reconnects with jittered backoff when the daemon goes away; the
+        first retry comes after ~100 ms so a daemon restart is picked up
+        almost immediately. disconnect_async() cancels a pending wait.
+        """
+        self._running = True
+        self._stop_async = asyncio.Event()
+        maintenance_task = asyncio.ensure_future(self._maintenance_loop_async())
+        try:
+            while self._running:
+                if await self.connect_async(timeout=timeout):
+                    self._backoff.reset()
+                    await self._stream_client.wait_closed()
+                if not (self._running and reconnect):
+                    break
+                self.state = ConnectionState.RECONNECTING
+                delay = self._backoff.next()
+                logger.info(f"Attempting reconnect in {delay:.2f}s...")
+                try:
+                    await asyncio.wait_for(self._stop_async.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            maintenance_task.cancel()
+
+    async def disconnect_async(self):
+        """Disconnect an asyncio stream connection"""
+        self._running = False
+        if self._stop_async is not None:
+            self._stop_async.set()
+        client = self._stream_client
+        self._stream_client = None
+        self.interface = None
+        if client:
+            await client.close()
+        if self.snapshot_path:
+            await asyncio.get_event_loop().run_in_executor(None, self.save_snapshot)
+        self.events.close(timeout=0)
+        self.state = ConnectionState.DISCONNECTED
+        logger.info("Disconnected")
+
+    def _on_from_radio(self, from_radio):
+        """Handle a FromRadio message from the asyncio stream client"""
+        variant = from_radio.WhichOneof('payload_variant')
+        if variant == 'my_info':
+            self.my_node_num = from_radio.my_info.my_node_num
+            self.my_node_id = f"!{self.my_node_num:08x}"
+        elif variant == 'node_info':
+            node = self._stream_client.node_info_to_dict(from_radio.node_info)
+            self._on_node_update_event(node, self._stream_client)
+        elif variant == 'packet':
+            packet = self._stream_client.packet_to_dict(from_radio.packet)
+            self._on_receive(packet, self._stream_client)
+        elif variant == 'metadata':
+            self.radio_info['firmware'] = from_radio.metadata.firmware_version
+        elif variant == 'config' and from_radio.config.HasField('lora'):
+            lora = from_radio.config.lora
+            region_enum = lora.DESCRIPTOR.fields_by_name['region'].enum_type
+            self.radio_info['region'] = region_enum.values_by_number[lora.region].name
+
+    def _on_stream_disconnect(self, error: Optional[Exception]):
+        """Handle the asyncio stream closing"""
+        if self._stream_client is None:
+            return
+        logger.warning(f"Connection lost{': ' + str(error) if error else ''}")
+        self.connection_stats.record_disconnect()
+        self.interface = None
+        self.state = ConnectionState.DISCONNECTED
+
     def disconnect(self):
         """Disconnect from meshtasticd"""
         self._running = False
+        self._stop.set()
 
         if self.interface:
             try:
@@ -236,111 +440,141 @@ class NodeMonitor:
             except Exception:
                 pass
 
-            try:
-                self.interface.close()
-            except Exception as e:
-                logger.error(f"Error closing interface: {e}")
-
-            self.interface = None
+            self._close_interface()
 
+        if self.snapshot_path:
+            self.save_snapshot()
+        self.events.close(timeout=1.0)
         self.state = ConnectionState.DISCONNECTED
         logger.info("Disconnected")
 
+    def _close_interface(self):
+        interface, self.interface = self.interface, None
+        if interface is None:
+            return
+        try:
+            interface.close()
+        except Exception as e:
+            logger.error(f"Error closing interface: {e}")
+
     def _load_initial_nodes(self):
         """Load existing nodes from interface"""
         if not self.interface or not self.interface.nodes:
             return
 
-        with self._lock:
-            for node_id, node_data in self.interface.nodes.items():
-                node_info = self._parse_node_data(node_id, node_data)
-                if node_info:
-                    self._nodes[node_info.node_id] = node_info
-                    if self.on_node_added:
-                        try:
-                            self.on_node_added(node_info)
-                        except Exception as e:
-                            logger.error(f"Error in node_added callback: {e}")
-
-        logger.info(f"Loaded {len(self._nodes)} nodes")
-
-    def _parse_node_data(self, node_id: str, data: dict) -> Optional[NodeInfo]:
-        """Parse node data from meshtastic interface"""
-        try:
-            user = data.get('user', {})
-            position = data.get('position', {})
-            device_metrics = data.get('deviceMetrics', {})
-            env_metrics = data.get('environmentMetrics', {})
-
-            # Extract node number
-            node_num = data.get('num', 0)
-            if isinstance(node_id, str) and node_id.startswith('!'):
-                try:
-                    node_num = int(node_id[1:], 16)
-                except ValueError:
-                    pass
+        for node_id, node_data in self.interface.nodes.items():
+            self._apply_node_data(node_id, node_data)
 
-            node_info = NodeInfo(
-                node_id=f"!{node_num:08x}" if node_num else str(node_id),
-                node_num=node_num,
-                long_name=user.get('longName', ''),
-                short_name=user.get('shortName', ''),
-                hardware_model=user.get('hwModel', ''),
-                role=user.get('role', ''),
-                snr=data.get('snr'),
-                hops_away=data.get('hopsAway'),
-                via_mqtt=data.get('viaMqtt', False),
-                is_licensed=user.get('isLicensed', False),
-            )
+        logger.info(f"Loaded {len(self._table)} nodes")
 
-            # Position
-            if position:
-                node_info.position = NodePosition(
-                    latitude=position.get('latitude') or position.get('latitudeI', 0) / 1e7,
-                    longitude=position.get('longitude') or position.get('longitudeI', 0) / 1e7,
-                    altitude=position.get('altitude'),
-                    precision_bits=position.get('precisionBits'),
-                    time=datetime.fromtimestamp(position['time']) if 'time' in position else None,
-                )
-
-            # Metrics
-            node_info.metrics = NodeMetrics(
-                battery_level=device_metrics.get('batteryLevel'),
-                voltage=device_metrics.get('voltage'),
-                channel_utilization=device_metrics.get('channelUtilization'),
-                air_util_tx=device_metrics.get('airUtilTx'),
-                temperature=env_metrics.get('temperature'),
-                humidity=env_metrics.get('relativeHumidity'),
-                pressure=env_metrics.get('barometricPressure'),
-                last_updated=datetime.now(),
-            )
+    def _apply_node_data(self, node_id, data: dict):
+        """Merge one node dict into the table and notify on real changes"""
+        node_num, fields = extract_node_fields(node_id, data)
+        if not node_num:
+            return
 
-            # Last heard
-            if 'lastHeard' in data:
-                node_info.last_heard = datetime.fromtimestamp(data['lastHeard'])
+        node_id = f"!{node_num:08x}"
+        node = None
+        removed = False
+        with self._lock:
+            # A node first seen with a last_heard already past its TTL
+            # would only be added now and expired on the next tick
+            if (self.expiry is not None and node_id != self.my_node_id
+                    and self._table.row_of(node_id) is None
+                    and self._past_deadline(fields.get('role'), fields.get('last_heard'))):
+                return
+            view, is_new, changes = self._table.merge(node_id, node_num, fields)
+            if changes.keys() & METRIC_FIELDS:
+                self._table.set_field(view._row, 'metrics_updated', time.time())
+            self._update_spatial(view, changes)
+            last_heard = self._table.get_field(view._row, 'last_heard')
+            if self.expiry is not None and (is_new or 'last_heard' in changes or 'role' in changes):
+                if node_id != self.my_node_id and self._past_deadline(view.role, last_heard):
+                    # e.g. a role change to a shorter TTL: drop it now
+                    # rather than emitting an update for a dead node
+                    self._drop_node(node_id, view._row)
+                    removed = True
+                else:
+                    self._schedule_expiry(view)
+            # Event payloads are copies taken here: a live view could be
+            # expired or removed before a subscriber reads it
+            if not removed and (is_new or changes) and self._wants_node_events():
+                node = self._table.snapshot(view._row)
+
+        if removed:
+            self._emit('node_removed', node_id)
+            return
+        if self.telemetry_store:
+            # Every reading in the report, not just the changed ones, so
+            # rollup counts and means are per report. The same report
+            # delivered again has the same last_heard and overwrites its
+            # samples in place.
+            samples = {k: v for k, v in fields.items() if k in METRIC_FIELDS or k == 'snr'}
+            if samples:
+                self.telemetry_store.record(node_num, samples, last_heard)
+
+        self.expire_stale()
+        if not (is_new or changes):
+            return
 
-            return node_info
+        if self.channel_analytics is not None and changes.keys() & ANALYTICS_FIELDS:
+            # Telemetry packets are recorded as they arrive (_on_receive);
+            # this covers node DB entries and updates that arrive without
+            # the packet. A report already recorded from its packet has
+            # the same timestamp and is skipped by ChannelAnalytics.
+            self.channel_analytics.record(
+                node_num, {k: fields.get(k) for k in ANALYTICS_FIELDS}, last_heard)
 
-        except Exception as e:
-            logger.error(f"Error parsing node data: {e}")
-            return None
+        if node is None:
+            return
+        if is_new:
+            self._emit('node_added', node)
+        else:
+            self._emit('node_update', node)
+            self._emit('node_changed', node, changes)
 
     def _on_receive(self, packet, interface):
         """Handle received packets"""
+        # Every copy feeds the topology: duplicates still confirm links
+        self.topology.local_node = self.my_node_num
         try:
-            if self.on_message:
-                self.on_message(packet)
+            self.topology.observe_packet(packet)
         except Exception as e:
-            logger.error(f"Error in message callback: {e}")
+            logger.debug(f"Ignoring malformed topology packet: {e}")
+
+        self.expire_stale()
+        if self.dedup is not None and not self.dedup.observe(packet):
+            return
+        if self.message_store is not None:
+            self.message_store.record(packet)
+        if self.channel_analytics is not None:
+            self._record_channel_report(packet)
+        self._emit('message', packet)
+
+    def _record_channel_report(self, packet: dict):
+        """Feed a device_metrics telemetry packet to ChannelAnalytics"""
+        decoded = packet.get('decoded') or {}
+        if decoded.get('portnum') != 'TELEMETRY_APP':
+            return
+        metrics = (decoded.get('telemetry') or {}).get('deviceMetrics')
+        node_num = packet.get('from')
+        if not metrics or not node_num:
+            return
+        # Every report counts, even one repeating the previous values
+        report = {field: metrics[key] for key, field in _ANALYTICS_KEYS if key in metrics}
+        if report:
+            self.channel_analytics.record(node_num, report, packet.get('rxTime') or None)
 
     def _on_connection(self, interface, topic=None):
-        """Handle connection established"""
+        """Handle connection established (config download complete)"""
         logger.info("Connection established")
+        self._handshake.set()
         self.state = ConnectionState.CONNECTED
 
     def _on_disconnect(self, interface, topic=None):
         """Handle connection lost"""
         logger.warning("Connection lost")
+        self.connection_stats.record_disconnect()
         self.state = ConnectionState.DISCONNECTED
 
         # Auto-reconnect if still running
@@ -350,25 +584,231 @@ class NodeMonitor:
     def _on_node_update_event(self, node, interface):
         """Handle node update from meshtastic"""
         try:
-            if isinstance(node, dict):
-                node_id = node.get('num', 0)
-                node_info = self._parse_node_data(str(node_id), node)
-            else:
-                node_id = getattr(node, 'num', 0)
-                node_info = self._parse_node_data(str(node_id), node.__dict__ if hasattr(node, '__dict__') else {})
+            if not isinstance(node, dict):
+                node = node.__dict__ if hasattr(node, '__dict__') else {}
+            self._apply_node_data(str(node.get('num', 0)), node)
 
-            if node_info:
-                with self._lock:
-                    is_new = node_info.node_id not in self._nodes
-                    self._nodes[node_info.node_id] = node_info
+        except Exception as e:
+            logger.error(f"Error handling node update: {e}")
 
-                if is_new and self.on_node_added:
-                    self.on_node_added(node_info)
-                elif self.on_node_update:
-                    self.on_node_update(node_info)
+    # ------------------------------------------------------------------
+    # Stale node expiry
+    # ------------------------------------------------------------------
 
+    def _schedule_expiry(self, view: NodeView):
+        """(Re)arm a node's expiry timer; call with the lock held"""
+        ttl = ttl_for_role(view.role, self.node_ttls)
+        if not ttl:
+            self.expiry.cancel(view.node_id)
+            return
+        last_heard = self._table.get_field(view._row, 'last_heard')
+        self.expiry.schedule(view.node_id, (last_heard or time.time()) + ttl)
+
+    def _past_deadline(self, role: Optional[str], last_heard: Optional[float],
+                       now: Optional[float] = None) -> bool:
+        """True if a node last heard at last_heard has outlived its role's TTL"""
+        ttl = ttl_for_role(role, self.node_ttls)
+        if not ttl or last_heard is None:
+            return False
+        return last_heard + ttl <= (time.time() if now is None else now)
+
+    def _drop_node(self, node_id: str, row: int):
+        """Remove a node from the table and every index; call with the lock held"""
+        node_num = self._table.get_field(row, 'node_num')
+        self._table.remove(node_id)
+        self.expiry.cancel(node_id)
+        self.spatial.remove(node_id)
+        self.topology.remove_node(node_num)
+        if self.channel_analytics is not None:
+            self.channel_analytics.remove_node(node_num)
+
+    def expire_stale(self, now: Optional[float] = None) -> List[str]:
+        """
+        Remove nodes whose TTL has run out and fire on_node_removed.
+
+        Cheap enough to call on every packet: the timer wheel only does
+        work when a tick has passed.
+
+        Returns:
+            IDs of the removed nodes
+        """
+        if self.expiry is None or not self.expiry.pending(now):
+            return []
+        removed = []
+        with self._lock:
+            for node_id in self.expiry.advance(now):
+                # Never drop the local node, it is re-armed on its next update
+                if node_id == self.my_node_id:
+                    continue
+                row = self._table.row_of(node_id)
+                if row is None:
+                    continue
+                self._drop_node(node_id, row)
+                removed.append(node_id)
+
+        if removed:
+            logger.info(f"Expired {len(removed)} stale node(s)")
+        for node_id in removed:
+            self._emit('node_removed', node_id)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Warm-start snapshots
+    # ------------------------------------------------------------------
+
+    def load_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Fill the (empty) node table from a snapshot file.
+
+        The live node DB is merged over the loaded rows on connect, so
+        only fields that changed while we were away fire callbacks.
+        Nodes missing from the live DB age out through normal expiry.
+        A missing or corrupt snapshot is logged and ignored.
+
+        Returns:
+            Number of nodes loaded
+        """
+        path = path or self.snapshot_path
+        if not os.path.exists(path):
+            logger.info(f"No node snapshot at {path} yet")
+            return 0
+        start = time.perf_counter()
+        try:
+            node_ids, columns, header = read_snapshot(path)
+        except SnapshotError as e:
+            logger.warning(f"Starting without node snapshot: {e}")
+            return 0
+
+        with self._lock:
+            if len(self._table):
+                logger.warning("Node table already populated, not loading snapshot")
+                return 0
+            try:
+                self._table.load_columns(node_ids, columns)
+            except ValueError as e:
+                logger.warning(f"Ignoring unusable snapshot {path}: {e}")
+                return 0
+            if (header.get('host'), header.get('port')) == (self.host, self.port):
+                self.my_node_num = self.my_node_num or header.get('my_node_num')
+                if self.my_node_num and not self.my_node_id:
+                    self.my_node_id = f"!{self.my_node_num:08x}"
+            # Rows load in snapshot order, so walk them by index instead
+            # of building a view per node
+            get = self._table.get_field
+            now = time.time()
+            expired = []
+            for row, node_id in enumerate(node_ids):
+                if self.expiry is not None:
+                    role, last_heard = get(row, 'role'), get(row, 'last_heard')
+                    # Nodes that went stale while we were away are dropped
+                    # here, before anyone sees them
+                    if node_id != self.my_node_id and self._past_deadline(role, last_heard, now):
+                        expired.append(node_id)
+                        continue
+                    ttl = ttl_for_role(role, self.node_ttls)
+                    if ttl:
+                        self.expiry.schedule(node_id, (last_heard or now) + ttl)
+                self.spatial.update(node_id, get(row, 'latitude'), get(row, 'longitude'))
+            for node_id in expired:
+                self._table.remove(node_id)
+            self._snapshot_version = self._table.version
+
+        loaded = len(node_ids) - len(expired)
+        logger.info(f"Loaded {loaded} nodes from snapshot in "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms ({len(expired)} expired)")
+        return loaded
+
+    def save_snapshot(self, path: Optional[str] = None) -> bool:
+        """
+        Write the node table to a snapshot file.
+
+        Columns are copied under the lock; the file is written outside it.
+
+        Returns:
+            True if the snapshot was written
+        """
+        path = path or self.snapshot_path
+        if not path:
+            return False
+        with self._lock:
+            version = self._table.version
+            node_ids, columns = self._table.export_columns()
+        meta = {'host': self.host, 'port': self.port, 'my_node_num': self.my_node_num}
+        try:
+            size = write_snapshot(path, node_ids, columns, meta)
+        except OSError as e:
+            logger.error(f"Failed to write node snapshot {path}: {e}")
+            return False
+        self._snapshot_version = version
+        self._snapshot_time = time.time()
+        logger.debug(f"Saved {len(node_ids)} nodes to {path} ({size} bytes)")
+        return True
+
+    def _snapshot_due(self) -> bool:
+        return (bool(self.snapshot_path)
+                and self._table.version != self._snapshot_version
+                and time.time() - self._snapshot_time >= self.snapshot_interval)
+
+    # ------------------------------------------------------------------
+    # Background maintenance (expiry sweeps, snapshots, heartbeats)
+    # ------------------------------------------------------------------
+
+    async def _maintenance_loop_async(self):
+        """Expire nodes while the mesh is quiet and save snapshots"""
+        tick = self.expiry.tick if self.expiry else 1.0
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                self.expire_stale()
+                if self._snapshot_due():
+                    await loop.run_in_executor(None, self.save_snapshot)
+            except Exception as e:
+                logger.error(f"Error in node maintenance: {e}")
+
+    def _heartbeat(self):
+        """
+        Health check for the threaded connection: send a keepalive every
+        heartbeat_interval and treat a failed send as a dropped link.
+        The asyncio stream client runs its own heartbeat.
+        """
+        interface = self.interface
+        if (not self.heartbeat_interval or self._stream_client is not None
+                or interface is None or self._state != ConnectionState.CONNECTED
+                or time.time() - self._last_heartbeat < self.heartbeat_interval):
+            return
+        self._last_heartbeat = time.time()
+        send = getattr(interface, 'sendHeartbeat', None)
+        if send is None:
+            return
+        try:
+            send()
         except Exception as e:
-            logger.error(f"Error handling node update: {e}")
+            logger.warning(f"Heartbeat failed: {e}")
+            self._on_disconnect(interface)
+
+    def _start_maintenance_thread(self):
+        """Maintenance driver for the threaded meshtastic connection"""
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            return
+        if self.expiry is None and not self.snapshot_path and not self.heartbeat_interval:
+            return
+        tick = self.expiry.tick if self.expiry else 1.0
+
+        def maintenance_loop():
+            while self._running:
+                if self._stop.wait(tick):
+                    break
+                try:
+                    self.expire_stale()
+                    if self._snapshot_due():
+                        self.save_snapshot()
+                    self._heartbeat()
+                except Exception as e:
+                    logger.error(f"Error in node maintenance: {e}")
+
+        self._maintenance_thread = threading.Thread(target=maintenance_loop, daemon=True)
+        self._maintenance_thread.start()
 
     def _start_reconnect(self):
         """Start reconnection thread"""
@@ -378,32 +818,113 @@ class NodeMonitor:
         self.state = ConnectionState.RECONNECTING
 
         def reconnect_loop():
-            delay = 1
-            max_delay = 30
-            while self._running and self._state == ConnectionState.RECONNECTING:
-                logger.info(f"Attempting reconnect in {delay}s...")
-                time.sleep(delay)
-                if self.connect(timeout=5):
+            # Close the dead interface here, not on its own reader thread
+            self._close_interface()
+            while self._running:
+                delay = self._backoff.next()
+                logger.info(f"Attempting reconnect in {delay:.2f}s...")
+                if self._stop.wait(delay) or not self._running:
+                    break
+                if self._open(timeout=5):
+                    self._backoff.reset()
                     break
-                delay = min(delay * 2, max_delay)
+                self.state = ConnectionState.RECONNECTING
 
         self._reconnect_thread = threading.Thread(target=reconnect_loop, daemon=True)
         self._reconnect_thread.start()
 
-    def get_nodes(self) -> List[NodeInfo]:
-        """Get all known nodes"""
+    def get_nodes(self) -> List[NodeView]:
+        """
+        Get all known nodes as NodeInfo-compatible views of a private copy.
+
+        The copy is detached: later updates and expiry don't change or
+        invalidate the returned nodes. Columns are copied under the lock
+        and the copy is built after releasing it.
+        """
         with self._lock:
-            return list(self._nodes.values())
+            node_ids, columns = self._table.export_columns()
+        return NodeTable.from_columns(node_ids, columns).views()
 
     def get_node(self, node_id: str) -> Optional[NodeInfo]:
-        """Get a specific node by ID"""
+        """Get a detached copy of a specific node by ID"""
         with self._lock:
-            return self._nodes.get(node_id)
+            row = self._table.row_of(node_id)
+            return self._table.to_node_info(row) if row is not None else None
 
     def get_node_count(self) -> int:
         """Get total number of known nodes"""
         with self._lock:
-            return len(self._nodes)
+            return len(self._table)
+
+    def find_nodes(self, **criteria) -> List[NodeInfo]:
+        """
+        Filter nodes by column, e.g. find_nodes(battery_level__lt=20, heard_within=600).
+
+        See NodeTable.filter for the supported keywords. Returns detached copies.
+        """
+        with self._lock:
+            return [view.to_node_info() for view in self._table.filter(**criteria)]
+
+    def query_nodes(self, **params) -> Dict[str, Any]:
+        """
+        One sorted, filtered, projected page of nodes.
+
+        See NodeTable.query for the parameters. Only the column copy
+        happens under the lock (as in save_snapshot); filtering, sorting
+        and projection run on the copy without blocking ingest.
+        """
+        with self._lock:
+            if params.get('limit', 100) <= 0 and not params.get('filters') and not params.get('search'):
+                # Change polling (total and version only) needs no copy
+                return self._table.query(**params)
+            node_ids, columns = self._table.export_columns()
+            version = self._table.version
+        result = NodeTable.from_columns(node_ids, columns).query(**params)
+        result['version'] = version
+        return result
+
+    @property
+    def table(self) -> NodeTable:
+        """Underlying columnar node table"""
+        return self._table
+
+    def get_rebroadcast_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-relay rebroadcast counters, most redundant first.
+
+        relay_node only carries the low byte of the relaying node number,
+        so each entry lists every known node that byte could belong to.
+        """
+        if self.dedup is None:
+            return []
+        candidates: Dict[int, List[str]] = {}
+        with self._lock:
+            for view in self._table.views():
+                candidates.setdefault(view.node_num & 0xFF, []).append(view.node_id)
+        return [
+            {
+                'relay': f"0x{stats.relay:02x}",
+                'nodes': candidates.get(stats.relay, []),
+                'relayed': stats.relayed,
+                'first': stats.first,
+                'redundant': stats.redundant,
+                'redundant_ratio': round(stats.redundant_ratio, 3),
+            }
+            for stats in self.dedup.get_relay_stats()
+        ]
+
+    def get_topology(self, fmt: str = 'json'):
+        """
+        Mesh graph export with node names filled in.
+
+        Args:
+            fmt: 'json' for a node-link dict, 'graphml' for a GraphML string
+        """
+        with self._lock:
+            names = {v.node_id: v.long_name or v.short_name for v in self._table.views()}
+        if fmt == 'graphml':
+            return self.topology.to_graphml(names)
+        return self.topology.to_json(names)
 
     def get_my_node(self) -> Optional[NodeInfo]:
         """Get this node's info"""
@@ -411,6 +932,30 @@ class NodeMonitor:
             return self.get_node(self.my_node_id)
         return None
 
+    async def send_text_async(self, text: str, destination: Optional[str] = None,
+                              channel: int = 0, want_ack: bool = False) -> bool:
+        """Send a text message over the asyncio stream connection"""
+        if not self._stream_client or not self.is_connected:
+            logger.error("Not connected")
+            return False
+
+        try:
+            dest_num = None
+            if destination:
+                if destination.startswith('!'):
+                    dest_num = int(destination[1:], 16)
+                else:
+                    dest_num = int(destination)
+
+            await self._stream_client.send_text(text, destination=dest_num,
+                                                channel=channel, want_ack=want_ack)
+            logger.info(f"Sent message: {text[:50]}...")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send message: {e}")
+            return False
+
     def send_text(self, text: str, destination: Optional[str] = None) -> bool:
         """
         Send a text message.
@@ -481,6 +1026,114 @@ class NodeMonitor:
         }
 
 
+# Flat NodeTable field names that belong to NodeMetrics
+METRIC_FIELDS = frozenset((
+    'battery_level', 'voltage', 'channel_utilization', 'air_util_tx',
+    'temperature', 'humidity', 'pressure',
+))
+
+# Fields fed to ChannelAnalytics
+ANALYTICS_FIELDS = ('channel_utilization', 'air_util_tx')
+# (deviceMetrics key, ANALYTICS_FIELDS name) in telemetry packets
+_ANALYTICS_KEYS = (('channelUtilization', 'channel_utilization'), ('airUtilTx', 'air_util_tx'))
+
+# (packet section, packet key, NodeTable field)
+_NODE_FIELD_MAP = (
+    ('user', 'longName', 'long_name'),
+    ('user', 'shortName', 'short_name'),
+    ('user', 'hwModel', 'hardware_model'),
+    ('user', 'role', 'role'),
+    ('user', 'isLicensed', 'is_licensed'),
+    ('position', 'altitude', 'altitude'),
+    ('position', 'precisionBits', 'precision_bits'),
+    ('position', 'time', 'position_time'),
+    ('deviceMetrics', 'batteryLevel', 'battery_level'),
+    ('deviceMetrics', 'voltage', 'voltage'),
+    ('deviceMetrics', 'channelUtilization', 'channel_utilization'),
+    ('deviceMetrics', 'airUtilTx', 'air_util_tx'),
+    ('environmentMetrics', 'temperature', 'temperature'),
+    ('environmentMetrics', 'relativeHumidity', 'humidity'),
+    ('environmentMetrics', 'barometricPressure', 'pressure'),
+    (None, 'snr', 'snr'),
+    (None, 'hopsAway', 'hops_away'),
+    (None, 'viaMqtt', 'via_mqtt'),
+    (None, 'lastHeard', 'last_heard'),
+)
+
+
+def extract_node_fields(node_id, data: dict):
+    """
+    Pull the fields present in a meshtastic node dict.
+
+    Only keys that exist in the packet are returned, so partial updates
+    (e.g. a telemetry-only packet) leave the other columns untouched.
+
+    Returns:
+        (node_num, {NodeTable field: value})
+    """
+    node_num = data.get('num', 0)
+    if isinstance(node_id, str) and node_id.startswith('!'):
+        try:
+            node_num = int(node_id[1:], 16)
+        except ValueError:
+            pass
+
+    fields = {}
+    for section, key, name in _NODE_FIELD_MAP:
+        source = data.get(section) if section else data
+        if source and key in source:
+            fields[name] = source[key]
+
+    position = data.get('position')
+    if position:
+        if 'latitude' in position:
+            fields['latitude'] = position['latitude']
+        elif 'latitudeI' in position:
+            fields['latitude'] = position['latitudeI'] / 1e7
+        if 'longitude' in position:
+            fields['longitude'] = position['longitude']
+        elif 'longitudeI' in position:
+            fields['longitude'] = position['longitudeI'] / 1e7
+
+    return node_num, fields
+
+
+def node_to_dict(node) -> Dict[str, Any]:
+    """Serialize every NodeInfo / NodeView field to JSON-friendly types"""
+    position = node.position or NodePosition()
+    metrics = node.metrics or NodeMetrics()
+    return {
+        'node_id': node.node_id,
+        'node_num': node.node_num,
+        'long_name': node.long_name,
+        'short_name': node.short_name,
+        'hardware': node.hardware_model,
+        'role': node.role,
+        'snr': node.snr,
+        'hops_away': node.hops_away,
+        'via_mqtt': node.via_mqtt,
+        'is_licensed': node.is_licensed,
+        'last_heard': node.last_heard.isoformat() if node.last_heard else None,
+        'position': {
+            'latitude': position.latitude,
+            'longitude': position.longitude,
+            'altitude': position.altitude,
+            'precision_bits': position.precision_bits,
+            'time': position.time.isoformat() if position.time else None,
+        },
+        'metrics': {
+            'battery_level': metrics.battery_level,
+            'voltage': metrics.voltage,
+            'channel_utilization': metrics.channel_utilization,
+            'air_util_tx': metrics.air_util_tx,
+            'temperature': metrics.temperature,
+            'humidity': metrics.humidity,
+            'pressure': metrics.pressure,
+            'last_updated': metrics.last_updated.isoformat() if metrics.last_updated else None,
+        },
+    }
+
+
 # Convenience function
 def create_monitor(host: str = "localhost", port: int = 4403) -> NodeMonitor:
     """Create and return a NodeMonitor instance"""
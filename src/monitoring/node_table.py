@@ -0,0 +1,945 @@
+"""
+NodeTable - Columnar storage for the node database
+
+Each NodeInfo dataclass owns a NodePosition and a NodeMetrics dataclass,
+each with its own __dict__ and datetime objects. On MQTT-bridged meshes
+with 5-10k nodes that object graph dominates RSS on 512 MB boards.
+
+NodeTable stores every field in a typed column instead:
+- numeric fields live in array.array columns (NaN / INT_NONE for "unset")
+- timestamps are stored as float epoch seconds
+- strings are kept in lists; repetitive ones (hardware model, role) are interned
+- node_id -> row index dict; removed rows go on a free list for reuse
+
+Readers inside the monitoring package get NodeView objects: __slots__
+views that expose the same attributes as NodeInfo
+(node.metrics.battery_level, node.position.latitude, node.last_heard, ...)
+without copying the row. A view raises LookupError once its node is
+removed, so public getters hand out detached copies instead: views of a
+private copy() of the table, or to_node_info() for single nodes.
+
+Filters scan a single column, e.g.:
+    table.where('battery_level', '<', 20)
+    table.heard_within(600)
+"""
+
+import base64
+import functools
+import heapq
+import json
+import math
+import operator
+import sys
+import time
+from array import array
+from datetime import datetime
+from itertools import compress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+NAN = float('nan')
+INT_NONE = -(2 ** 31)
+
+# Field name -> column kind. Names match NodeInfo / NodePosition /
+# NodeMetrics attributes except where noted.
+FLOAT_FIELDS = (
+    'snr',
+    'last_heard',            # epoch seconds
+    'latitude',
+    'longitude',
+    'position_time',         # NodePosition.time, epoch seconds
+    'voltage',
+    'channel_utilization',
+    'air_util_tx',
+    'temperature',
+    'humidity',
+    'pressure',
+    'metrics_updated',       # NodeMetrics.last_updated, epoch seconds
+)
+INT_FIELDS = (
+    'hops_away',
+    'altitude',
+    'precision_bits',
+    'battery_level',
+)
+BOOL_FIELDS = (
+    'via_mqtt',
+    'is_licensed',
+)
+STR_FIELDS = (
+    'long_name',
+    'short_name',
+    'hardware_model',
+    'role',
+)
+INTERNED_FIELDS = frozenset(('hardware_model', 'role'))
+
+FIELDS = FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS + STR_FIELDS
+TIME_FIELDS = frozenset(('last_heard', 'position_time', 'metrics_updated'))
+QUERYABLE_FIELDS = ('node_id', 'node_num') + FIELDS
+
+# Row fields returned by query() when no projection is given
+QUERY_FIELDS = ('node_id', 'long_name', 'short_name', 'hardware_model', 'role',
+                'last_heard', 'snr', 'hops_away', 'battery_level')
+
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _to_epoch(value) -> float:
+    if value is None:
+        return NAN
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _operand(name: str, value: Any) -> Any:
+    """
+    Filter value converted to the column's type, so a comparison can't
+    raise TypeError halfway through a scan.
+
+    Raises:
+        ValueError: value can't be compared with the column
+    """
+    if value is None:
+        raise ValueError(f"{name}: compare against a value, not null")
+    if name in STR_FIELDS or name == 'node_id':
+        # Numeric-looking names and IDs arrive from query strings as numbers
+        return value if isinstance(value, str) else str(value)
+    if name in BOOL_FIELDS:
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in ('true', '1', 'yes'):
+                return True
+            if lowered in ('false', '0', 'no'):
+                return False
+        elif isinstance(value, (bool, int)) and value in (0, 1):
+            return bool(value)
+        raise ValueError(f"{name} is true/false, got {value!r}")
+    if name in TIME_FIELDS:
+        try:
+            return _to_epoch(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} is a time (epoch seconds), got {value!r}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} is a number, got {value!r}")
+    return value
+
+
+def _order_key(value, descending: bool) -> Tuple:
+    """Ascending-comparable key for a field value; unset sorts last"""
+    if value is None or value == "":
+        return (1, 0)
+    if isinstance(value, str):
+        value = value.casefold()
+        if descending:
+            # Negated code points, plus a terminator above any of them so
+            # that "ab" still sorts before its prefix "a"
+            return (0, tuple(-ord(c) for c in value) + (1,))
+        return (0, value)
+    return (0, -value if descending else value)
+
+
+class NodeTable:
+    """
+    Columnar, array-backed node database.
+
+    Not thread-safe for writers; NodeMonitor serializes writes with its
+    own lock. Readers may use views concurrently.
+    """
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._node_id: List[Optional[str]] = []
+        self._node_num = array('q')
+        self._gen = array('I')
+        self._live = array('b')
+        self._float = {name: array('d') for name in FLOAT_FIELDS}
+        self._int = {name: array('i') for name in INT_FIELDS}
+        self._bool = {name: array('b') for name in BOOL_FIELDS}
+        self._str: Dict[str, List[str]] = {name: [] for name in STR_FIELDS}
+        self.version = 0
+
+    # ------------------------------------------------------------------
+    # Row management
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._index
+
+    def __iter__(self) -> Iterator['NodeView']:
+        return iter(self.views())
+
+    def row_of(self, node_id: str) -> Optional[int]:
+        return self._index.get(node_id)
+
+    def _alloc(self, node_id: str, node_num: int) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._node_id[row] = node_id
+            self._node_num[row] = node_num
+            self._gen[row] += 1
+            self._live[row] = 1
+            for col in self._float.values():
+                col[row] = NAN
+            for col in self._int.values():
+                col[row] = INT_NONE
+            for col in self._bool.values():
+                col[row] = 0
+            for col in self._str.values():
+                col[row] = ""
+        else:
+            row = len(self._node_id)
+            self._node_id.append(node_id)
+            self._node_num.append(node_num)
+            self._gen.append(0)
+            self._live.append(1)
+            for col in self._float.values():
+                col.append(NAN)
+            for col in self._int.values():
+                col.append(INT_NONE)
+            for col in self._bool.values():
+                col.append(0)
+            for col in self._str.values():
+                col.append("")
+        self._index[node_id] = row
+        return row
+
+    def ensure(self, node_id: str, node_num: int) -> Tuple[int, bool]:
+        """Return (row, is_new) for node_id, allocating a row if needed"""
+        row = self._index.get(node_id)
+        if row is not None:
+            return row, False
+        self.version += 1
+        return self._alloc(node_id, node_num), True
+
+    def remove(self, node_id: str) -> bool:
+        """Delete a node; outstanding views of it become invalid"""
+        row = self._index.pop(node_id, None)
+        if row is None:
+            return False
+        self._live[row] = 0
+        self._gen[row] += 1
+        self._node_id[row] = None
+        for col in self._str.values():
+            col[row] = ""
+        self._free.append(row)
+        self.version += 1
+        return True
+
+    def clear(self):
+        """Drop every node (views become invalid)"""
+        for node_id in list(self._index):
+            self.remove(node_id)
+
+    # ------------------------------------------------------------------
+    # Field access
+    # ------------------------------------------------------------------
+
+    def get_field(self, row: int, name: str) -> Any:
+        """Read one field as a Python value (None for unset)"""
+        if name in self._float:
+            value = self._float[name][row]
+            return None if math.isnan(value) else value
+        if name in self._int:
+            value = self._int[name][row]
+            return None if value == INT_NONE else value
+        if name in self._bool:
+            return bool(self._bool[name][row])
+        if name in self._str:
+            return self._str[name][row]
+        if name == 'node_num':
+            return self._node_num[row]
+        if name == 'node_id':
+            return self._node_id[row]
+        raise KeyError(name)
+
+    def set_field(self, row: int, name: str, value: Any):
+        """Write one field; time fields accept datetime or epoch seconds"""
+        if name in self._float:
+            self._float[name][row] = _to_epoch(value) if name in TIME_FIELDS else (
+                NAN if value is None else float(value))
+        elif name in self._int:
+            self._int[name][row] = INT_NONE if value is None else int(value)
+        elif name in self._bool:
+            self._bool[name][row] = 1 if value else 0
+        elif name in self._str:
+            value = value or ""
+            self._str[name][row] = sys.intern(value) if name in INTERNED_FIELDS else value
+        else:
+            raise KeyError(name)
+        self.version += 1
+
+    def merge(self, node_id: str, node_num: int,
+              fields: Dict[str, Any]) -> Tuple['NodeView', bool, Dict[str, Any]]:
+        """
+        Apply only the fields present in an update.
+
+        Unchanged values are not written, so a no-op update does not bump
+        the table version.
+
+        Returns:
+            (view, is_new, changes) where changes maps each field whose
+            value actually changed to its new value
+        """
+        row, is_new = self.ensure(node_id, node_num)
+        changes = {}
+        for name, value in fields.items():
+            if name in TIME_FIELDS and isinstance(value, datetime):
+                value = value.timestamp()
+            if self.get_field(row, name) != value:
+                self.set_field(row, name, value)
+                changes[name] = value
+        return NodeView(self, row), is_new, changes
+
+    def row_fields(self, row: int) -> Dict[str, Any]:
+        """All set fields of a row as {name: value} (time fields as epoch seconds)"""
+        fields = {}
+        for name in FIELDS:
+            value = self.get_field(row, name)
+            if value is not None:
+                fields[name] = value
+        return fields
+
+    def upsert(self, node) -> Tuple['NodeView', bool]:
+        """
+        Store every field of a NodeInfo (or NodeView).
+
+        Returns:
+            (view, is_new)
+        """
+        row, is_new = self.ensure(node.node_id, node.node_num)
+        self._node_num[row] = node.node_num
+        for name, value in _flatten(node).items():
+            self.set_field(row, name, value)
+        return self.view(row), is_new
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def view(self, row: int) -> 'NodeView':
+        return NodeView(self, row)
+
+    def get(self, node_id: str) -> Optional['NodeView']:
+        row = self._index.get(node_id)
+        return NodeView(self, row) if row is not None else None
+
+    def views(self) -> List['NodeView']:
+        return [NodeView(self, row) for row in self._index.values()]
+
+    def to_node_info(self, row: int):
+        """Detached NodeInfo copy of one row"""
+        return _node_info(self._node_id[row], self._node_num[row], self._row_values(row))
+
+    def snapshot(self, row: int) -> 'NodeSnapshot':
+        """Detached, NodeInfo-compatible copy of one row (cheaper than to_node_info)"""
+        return NodeSnapshot(self._node_id[row], self._node_num[row], self._row_values(row))
+
+    def _row_values(self, row: int) -> Dict[str, Any]:
+        # Column by column rather than get_field(): this runs for every
+        # published node event
+        values = {}
+        for name, col in self._float.items():
+            value = col[row]
+            values[name] = None if value != value else value
+        for name, col in self._int.items():
+            value = col[row]
+            values[name] = None if value == INT_NONE else value
+        for name, col in self._bool.items():
+            values[name] = bool(col[row])
+        for name, col in self._str.items():
+            values[name] = col[row]
+        return values
+
+    # ------------------------------------------------------------------
+    # Column filters
+    # ------------------------------------------------------------------
+
+    def where(self, name: str, op: str, value: Any) -> List['NodeView']:
+        """
+        Nodes whose field compares true against value, skipping unset fields.
+
+        Example:
+            table.where('battery_level', '<', 20)
+        """
+        return [NodeView(self, row) for row in self.where_rows(name, op, value)]
+
+    def where_rows(self, name: str, op: str, value: Any) -> List[int]:
+        """
+        Row numbers for where(); also accepts node_id and node_num.
+
+        Raises:
+            KeyError: Unknown field
+            ValueError: Unknown operator, or a value of the wrong type
+        """
+        if name not in QUERYABLE_FIELDS:
+            raise KeyError(name)
+        if op not in _OPS:
+            raise ValueError(f"Unknown operator: {op}")
+        compare = _OPS[op]
+        value = _operand(name, value)
+        live = self._live
+        if name == 'node_id':
+            mask = map(lambda v, alive: alive and compare(v, value), self._node_id, live)
+        elif name == 'node_num':
+            mask = map(lambda v, alive: alive and compare(v, value), self._node_num, live)
+        elif name in self._float:
+            col = self._float[name]
+            mask = map(lambda v, alive: alive and v == v and compare(v, value), col, live)
+        elif name in self._int:
+            col = self._int[name]
+            mask = map(lambda v, alive: alive and v != INT_NONE and compare(v, value), col, live)
+        elif name in self._bool:
+            col = self._bool[name]
+            mask = map(lambda v, alive: alive and compare(bool(v), value), col, live)
+        elif name in self._str:
+            col = self._str[name]
+            mask = map(lambda v, alive: alive and compare(v, value), col, live)
+        else:
+            raise KeyError(name)
+        return list(compress(range(len(live)), mask))
+
+    def heard_within(self, seconds: float, now: Optional[float] = None) -> List['NodeView']:
+        """Nodes heard in the last `seconds` seconds"""
+        now = now if now is not None else time.time()
+        return self.where('last_heard', '>=', now - seconds)
+
+    def filter(self, **criteria) -> List['NodeView']:
+        """
+        AND together several column filters.
+
+        Keyword forms: <field>__lt, __le, __gt, __ge, __eq, __ne, or
+        heard_within=<seconds>.
+
+        Example:
+            table.filter(battery_level__lt=20, heard_within=600)
+        """
+        suffixes = {'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=', 'eq': '==', 'ne': '!='}
+        rows = None
+        for key, value in criteria.items():
+            if key == 'heard_within':
+                matched = self.where_rows('last_heard', '>=', time.time() - value)
+            else:
+                name, _, suffix = key.rpartition('__')
+                if suffix not in suffixes:
+                    name, suffix = key, 'eq'
+                matched = self.where_rows(name, suffixes[suffix], value)
+            rows = set(matched) if rows is None else rows.intersection(matched)
+        if rows is None:
+            return self.views()
+        return [NodeView(self, row) for row in sorted(rows)]
+
+    # ------------------------------------------------------------------
+    # Paged queries
+    # ------------------------------------------------------------------
+
+    def query(self, filters: Sequence[Tuple[str, str, Any]] = (), search: Optional[str] = None,
+              sort: str = 'node_id', descending: bool = False,
+              fields: Optional[Sequence[str]] = None, after: Optional[str] = None,
+              limit: int = 100) -> Dict[str, Any]:
+        """
+        One page of nodes, filtered, sorted and projected inside the table.
+
+        Pages are addressed by keyset cursors (the sort key of the last row
+        returned) rather than offsets, so nodes appearing or disappearing
+        between requests don't shift rows across pages. Only the requested
+        page is sorted (a bounded heap), not the whole match set.
+
+        Args:
+            filters: (field, op, value) tuples ANDed together, as in where()
+            search: Case-insensitive substring of node_id, long_name or short_name
+            sort: Field to order by; unset values sort last either way
+            descending: Reverse the order
+            fields: Fields to return per row (default: QUERY_FIELDS)
+            after: 'next' cursor of the previous page
+            limit: Page size (0 returns only the total)
+
+        Returns:
+            {'total': matching nodes, 'nodes': [...], 'next': cursor or None,
+             'version': table version}
+
+        Raises:
+            KeyError: Unknown field
+            ValueError: Unknown operator, a filter value of the wrong type,
+                or a cursor from a different sort
+        """
+        fields = list(fields or QUERY_FIELDS)
+        for name in fields + [sort]:
+            if name not in QUERYABLE_FIELDS:
+                raise KeyError(name)
+
+        rows = None
+        for name, op, value in filters:
+            matched = self.where_rows(name, op, value)
+            rows = set(matched) if rows is None else rows.intersection(matched)
+        if rows is None:
+            rows = self._index.values()
+        if search:
+            needle = search.casefold()
+            node_ids = self._node_id
+            long_names = self._str['long_name']
+            short_names = self._str['short_name']
+            rows = [row for row in rows
+                    if needle in node_ids[row].casefold() or needle in long_names[row].casefold()
+                    or needle in short_names[row].casefold()]
+        else:
+            rows = list(rows)
+
+        result = {'total': len(rows), 'nodes': [], 'next': None, 'version': self.version}
+        if limit <= 0 or not rows:
+            return result
+
+        keys = [(self._sort_key(row, sort, descending), row) for row in rows]
+        if after:
+            cursor = self._decode_cursor(after, sort, descending)
+            keys = [item for item in keys if item[0] > cursor]
+        page = heapq.nsmallest(limit + 1, keys)
+
+        get_field = self.get_field
+        result['nodes'] = [{name: get_field(row, name) for name in fields} for _, row in page[:limit]]
+        if len(page) > limit:
+            result['next'] = self._encode_cursor(page[limit - 1][1], sort, descending)
+        return result
+
+    def _sort_key(self, row: int, sort: str, descending: bool) -> Tuple:
+        value = self.get_field(row, sort)
+        return _order_key(value, descending) + (self._node_id[row],)
+
+    def _encode_cursor(self, row: int, sort: str, descending: bool) -> str:
+        state = [sort, descending, self.get_field(row, sort), self._node_id[row]]
+        return base64.urlsafe_b64encode(json.dumps(state).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple:
+        try:
+            cursor_sort, cursor_desc, value, node_id = json.loads(base64.urlsafe_b64decode(cursor))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if cursor_sort != sort or cursor_desc != descending:
+            raise ValueError("Cursor belongs to a different sort order")
+        # The key is compared against every row's key: a value of the
+        # wrong type would raise TypeError halfway through the page
+        if value is None or value == "":
+            valid = True
+        elif sort in STR_FIELDS or sort == 'node_id':
+            valid = isinstance(value, str)
+        elif sort in BOOL_FIELDS:
+            valid = isinstance(value, bool)
+        else:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if not valid or not isinstance(node_id, str):
+            raise ValueError("Invalid cursor")
+        return _order_key(value, descending) + (node_id,)
+
+    # ------------------------------------------------------------------
+    # Bulk export / load (snapshots)
+    # ------------------------------------------------------------------
+
+    def export_columns(self) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Live rows packed densely, in row order.
+
+        Returns:
+            (node_ids, columns) where columns maps 'node_num' and every
+            field name to an array (numeric) or list (strings)
+        """
+        if not self._free:
+            # No removed rows: plain copies, no per-element filtering
+            columns = {'node_num': self._node_num[:]}
+            for group in (self._float, self._int, self._bool, self._str):
+                for name, col in group.items():
+                    columns[name] = col[:]
+            return self._node_id[:], columns
+        live = self._live
+        columns: Dict[str, Any] = {'node_num': array('q', compress(self._node_num, live))}
+        for group in (self._float, self._int, self._bool):
+            for name, col in group.items():
+                columns[name] = array(col.typecode, compress(col, live))
+        for name, col in self._str.items():
+            columns[name] = list(compress(col, live))
+        return list(compress(self._node_id, live)), columns
+
+    @classmethod
+    def from_columns(cls, node_ids: List[str], columns: Dict[str, Any]) -> 'NodeTable':
+        """
+        New table holding export_columns() output.
+
+        Callers copy the columns under their lock and build the table
+        after releasing it; views of the result never go stale.
+        """
+        table = cls()
+        table.load_columns(node_ids, columns)
+        return table
+
+    def load_columns(self, node_ids: List[str], columns: Dict[str, Any]):
+        """
+        Fill an empty table from export_columns() output.
+
+        Columns that are missing (e.g. from an older snapshot) are left
+        unset; unknown ones are ignored.
+        """
+        if self._index:
+            raise ValueError("load_columns() needs an empty table")
+        if 'node_num' not in columns:
+            raise ValueError("load_columns() needs a node_num column")
+        count = len(node_ids)
+        for name, col in columns.items():
+            if len(col) != count:
+                raise ValueError(f"Column {name} has {len(col)} rows, expected {count}")
+
+        self._free = []
+        self._node_id = list(node_ids)
+        self._index = {node_id: row for row, node_id in enumerate(node_ids)}
+        self._node_num = array('q', columns['node_num'])
+        self._gen = array('I', bytes(4 * count))
+        self._live = array('b', b'\x01' * count)
+        for group, typecode, unset in ((self._float, 'd', NAN), (self._int, 'i', INT_NONE),
+                                       (self._bool, 'b', 0)):
+            for name in group:
+                col = columns.get(name)
+                group[name] = array(typecode, col) if col is not None else array(typecode, [unset]) * count
+        for name in self._str:
+            col = columns.get(name)
+            if col is None:
+                self._str[name] = [""] * count
+            elif name in INTERNED_FIELDS:
+                self._str[name] = [sys.intern(value) for value in col]
+            else:
+                self._str[name] = list(col)
+        self.version += 1
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes used by the numeric columns"""
+        total = self._node_num.itemsize * len(self._node_num)
+        for group in (self._float, self._int, self._bool):
+            for col in group.values():
+                total += col.itemsize * len(col)
+        return total
+
+
+@functools.lru_cache(maxsize=None)
+def _node_types():
+    # node_monitor imports this module, so resolve its dataclasses lazily
+    from .node_monitor import NodeInfo, NodePosition, NodeMetrics
+    return NodeInfo, NodePosition, NodeMetrics
+
+
+def _node_info(node_id: str, node_num: int, values: Dict[str, Any]):
+    """Build a NodeInfo from flat field values (time fields as epoch seconds)"""
+    NodeInfo, NodePosition, NodeMetrics = _node_types()
+
+    def stamp(name):
+        value = values[name]
+        return datetime.fromtimestamp(value) if value is not None else None
+
+    return NodeInfo(
+        node_id=node_id,
+        node_num=node_num,
+        long_name=values['long_name'],
+        short_name=values['short_name'],
+        hardware_model=values['hardware_model'],
+        role=values['role'],
+        position=NodePosition(
+            latitude=values['latitude'],
+            longitude=values['longitude'],
+            altitude=values['altitude'],
+            precision_bits=values['precision_bits'],
+            time=stamp('position_time'),
+        ),
+        metrics=NodeMetrics(
+            battery_level=values['battery_level'],
+            voltage=values['voltage'],
+            channel_utilization=values['channel_utilization'],
+            air_util_tx=values['air_util_tx'],
+            temperature=values['temperature'],
+            humidity=values['humidity'],
+            pressure=values['pressure'],
+            last_updated=stamp('metrics_updated'),
+        ),
+        last_heard=stamp('last_heard'),
+        snr=values['snr'],
+        hops_away=values['hops_away'],
+        via_mqtt=values['via_mqtt'],
+        is_licensed=values['is_licensed'],
+    )
+
+
+def node_fields(node) -> Dict[str, Any]:
+    """
+    Set fields of a NodeInfo or NodeView as {name: value}, with time
+    fields as epoch seconds (the same shape as NodeTable.row_fields).
+    """
+    if isinstance(node, NodeSnapshot):
+        return {name: value for name, value in node._values.items() if value is not None}
+    fields = {}
+    for name, value in _flatten(node).items():
+        if name in TIME_FIELDS:
+            value = _to_epoch(value)
+            if value != value:
+                continue
+        elif value is None:
+            continue
+        fields[name] = value
+    return fields
+
+
+def _flatten(node) -> Dict[str, Any]:
+    """NodeInfo -> flat field dict understood by NodeTable.set_field"""
+    position = node.position
+    metrics = node.metrics
+    fields = {
+        'long_name': node.long_name,
+        'short_name': node.short_name,
+        'hardware_model': node.hardware_model,
+        'role': node.role,
+        'snr': node.snr,
+        'hops_away': node.hops_away,
+        'via_mqtt': node.via_mqtt,
+        'is_licensed': node.is_licensed,
+        'last_heard': node.last_heard,
+    }
+    if position is not None:
+        fields.update(
+            latitude=position.latitude,
+            longitude=position.longitude,
+            altitude=position.altitude,
+            precision_bits=position.precision_bits,
+            position_time=position.time,
+        )
+    if metrics is not None:
+        fields.update(
+            battery_level=metrics.battery_level,
+            voltage=metrics.voltage,
+            channel_utilization=metrics.channel_utilization,
+            air_util_tx=metrics.air_util_tx,
+            temperature=metrics.temperature,
+            humidity=metrics.humidity,
+            pressure=metrics.pressure,
+            metrics_updated=metrics.last_updated,
+        )
+    return fields
+
+
+class NodeView:
+    """
+    Read-only view of one NodeTable row with the NodeInfo attribute layout.
+
+    Views are live: they reflect later updates to the same node. Reading a
+    view after its node was removed raises LookupError; call
+    to_node_info() to keep a detached copy.
+    """
+
+    __slots__ = ('_table', '_row', '_gen')
+
+    def __init__(self, table: NodeTable, row: int):
+        self._table = table
+        self._row = row
+        self._gen = table._gen[row]
+
+    def _field(self, name: str):
+        table = self._table
+        if table._gen[self._row] != self._gen:
+            raise LookupError("Node was removed from the table")
+        return table.get_field(self._row, name)
+
+    def _time(self, name: str) -> Optional[datetime]:
+        value = self._field(name)
+        return datetime.fromtimestamp(value) if value is not None else None
+
+    @property
+    def is_valid(self) -> bool:
+        return self._table._gen[self._row] == self._gen
+
+    @property
+    def node_id(self) -> str:
+        return self._field('node_id')
+
+    @property
+    def node_num(self) -> int:
+        return self._field('node_num')
+
+    @property
+    def long_name(self) -> str:
+        return self._field('long_name')
+
+    @property
+    def short_name(self) -> str:
+        return self._field('short_name')
+
+    @property
+    def hardware_model(self) -> str:
+        return self._field('hardware_model')
+
+    @property
+    def role(self) -> str:
+        return self._field('role')
+
+    @property
+    def snr(self) -> Optional[float]:
+        return self._field('snr')
+
+    @property
+    def hops_away(self) -> Optional[int]:
+        return self._field('hops_away')
+
+    @property
+    def via_mqtt(self) -> bool:
+        return self._field('via_mqtt')
+
+    @property
+    def is_licensed(self) -> bool:
+        return self._field('is_licensed')
+
+    @property
+    def last_heard(self) -> Optional[datetime]:
+        return self._time('last_heard')
+
+    @property
+    def position(self) -> '_PositionView':
+        return _PositionView(self)
+
+    @property
+    def metrics(self) -> '_MetricsView':
+        return _MetricsView(self)
+
+    def to_node_info(self):
+        """Materialize a detached NodeInfo copy"""
+        if not self.is_valid:
+            raise LookupError("Node was removed from the table")
+        return self._table.to_node_info(self._row)
+
+    def __eq__(self, other):
+        if isinstance(other, NodeView):
+            return self._table is other._table and self._row == other._row and self._gen == other._gen
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._table), self._row, self._gen))
+
+    def __repr__(self):
+        if not self.is_valid:
+            return "NodeView(<removed>)"
+        return f"NodeView(node_id={self.node_id!r}, long_name={self.long_name!r})"
+
+
+class NodeSnapshot(NodeView):
+    """
+    Detached copy of one row with the NodeView / NodeInfo attribute layout.
+
+    Holds its own field values, so it never goes stale; used as the node
+    event payload.
+    """
+
+    __slots__ = ('_node_id', '_node_num', '_values')
+
+    def __init__(self, node_id: str, node_num: int, values: Dict[str, Any]):
+        self._table = None
+        self._row = None
+        self._gen = None
+        self._node_id = node_id
+        self._node_num = node_num
+        self._values = values
+
+    def _field(self, name: str):
+        if name == 'node_id':
+            return self._node_id
+        if name == 'node_num':
+            return self._node_num
+        return self._values[name]
+
+    @property
+    def is_valid(self) -> bool:
+        return True
+
+    def to_node_info(self):
+        return _node_info(self._node_id, self._node_num, self._values)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"NodeSnapshot(node_id={self._node_id!r}, long_name={self._values['long_name']!r})"
+
+
+class _PositionView:
+    """NodePosition-compatible view"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node: NodeView):
+        self._node = node
+
+    @property
+    def latitude(self) -> Optional[float]:
+        return self._node._field('latitude')
+
+    @property
+    def longitude(self) -> Optional[float]:
+        return self._node._field('longitude')
+
+    @property
+    def altitude(self) -> Optional[int]:
+        return self._node._field('altitude')
+
+    @property
+    def precision_bits(self) -> Optional[int]:
+        return self._node._field('precision_bits')
+
+    @property
+    def time(self) -> Optional[datetime]:
+        return self._node._time('position_time')
+
+
+class _MetricsView:
+    """NodeMetrics-compatible view"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node: NodeView):
+        self._node = node
+
+    @property
+    def battery_level(self) -> Optional[int]:
+        return self._node._field('battery_level')
+
+    @property
+    def voltage(self) -> Optional[float]:
+        return self._node._field('voltage')
+
+    @property
+    def channel_utilization(self) -> Optional[float]:
+        return self._node._field('channel_utilization')
+
+    @property
+    def air_util_tx(self) -> Optional[float]:
+        return self._node._field('air_util_tx')
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return self._node._field('temperature')
+
+    @property
+    def humidity(self) -> Optional[float]:
+        return self._node._field('humidity')
+
+    @property
+    def pressure(self) -> Optional[float]:
+        return self._node._field('pressure')
+
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        return self._node._time('metrics_updated')
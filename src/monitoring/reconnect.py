@@ -0,0 +1,116 @@
+"""
+Reconnect helpers - jittered backoff and connection health counters
+
+Backoff uses "decorrelated jitter": each delay is drawn between the
+initial delay and three times the previous one, capped at `maximum`.
+The first retry after a drop is therefore ~100 ms, so a daemon restart
+is picked up almost immediately, while many clients that lost the same
+daemon spread their retries out instead of reconnecting in lockstep.
+
+Usage:
+    backoff = Backoff()
+    while not stop.wait(backoff.next()):
+        if try_connect():
+            backoff.reset()
+            break
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# A drop within this many seconds of connecting counts as a flap
+DEFAULT_FLAP_WINDOW = 60.0
+
+
+class Backoff:
+    """Decorrelated-jitter exponential backoff"""
+
+    def __init__(self, initial: float = 0.1, maximum: float = 30.0,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            initial: Lower bound and first retry delay in seconds
+            maximum: Upper bound in seconds
+            rng: Random source (for reproducible tests)
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self._rng = rng or random.Random()
+        self._previous = 0.0
+        self.attempts = 0
+
+    def next(self) -> float:
+        """Delay before the next attempt"""
+        self.attempts += 1
+        if not self._previous:
+            delay = self.initial
+        else:
+            delay = min(self.maximum, self._rng.uniform(self.initial, self._previous * 3))
+        self._previous = delay
+        return delay
+
+    def reset(self):
+        """Call after a successful connect"""
+        self._previous = 0.0
+        self.attempts = 0
+
+
+@dataclass
+class ConnectionStats:
+    """Connect latency and flap counters for one daemon connection"""
+    connects: int = 0
+    failures: int = 0
+    disconnects: int = 0
+    flaps: int = 0
+    last_latency: Optional[float] = None
+    min_latency: Optional[float] = None
+    max_latency: Optional[float] = None
+    total_latency: float = 0.0
+    connected_since: Optional[float] = None
+    last_error: Optional[str] = None
+    flap_window: float = DEFAULT_FLAP_WINDOW
+
+    def record_connect(self, latency: float):
+        """A handshake completed after `latency` seconds"""
+        self.connects += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+        self.max_latency = latency if self.max_latency is None else max(self.max_latency, latency)
+        self.connected_since = time.time()
+
+    def record_failure(self, error: Exception):
+        self.failures += 1
+        self.last_error = str(error)
+
+    def record_disconnect(self):
+        """The connection dropped; counts a flap if it was short-lived"""
+        if self.connected_since is None:
+            return
+        self.disconnects += 1
+        if time.time() - self.connected_since < self.flap_window:
+            self.flaps += 1
+        self.connected_since = None
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        return self.total_latency / self.connects if self.connects else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'connects': self.connects,
+            'failures': self.failures,
+            'disconnects': self.disconnects,
+            'flaps': self.flaps,
+            'last_latency_ms': ms(self.last_latency),
+            'mean_latency_ms': ms(self.mean_latency),
+            'min_latency_ms': ms(self.min_latency),
+            'max_latency_ms': ms(self.max_latency),
+            'connected_since': self.connected_since,
+            'last_error': self.last_error,
+        }
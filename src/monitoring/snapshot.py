@@ -0,0 +1,178 @@
+"""
+Node table snapshots - warm start for NodeMonitor
+
+A snapshot is a binary dump of NodeTable's columns, so loading it is a
+handful of array.frombytes() calls over an mmap instead of replaying
+the node DB. NodeMonitor writes one periodically and on disconnect,
+and loads it at startup; the live node DB is then merged over it
+as usual, so only fields that really changed fire callbacks.
+
+File layout:
+    b'MSHSNP01'
+    uint32 header length, then a JSON header:
+        {"rows": n, "byteorder": "little", "crc32": ..., "saved_at": ...,
+         "columns": [{"name": ..., "type": "d"|"i"|"b"|"q"|"s", "bytes": ...}, ...],
+         plus caller metadata (host, port, my_node_num)}
+    column blobs in header order: numeric columns are raw arrays,
+    string columns are UTF-8 joined with NUL
+
+Writes go to a temporary file that is fsynced and renamed over the old
+snapshot, so a crash never leaves a torn file behind.
+
+Usage:
+    node_ids, columns = table.export_columns()
+    write_snapshot(path, node_ids, columns, {'host': 'localhost'})
+    node_ids, columns, meta = read_snapshot(path)
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MAGIC = b'MSHSNP01'
+DEFAULT_SNAPSHOT_DIR = Path.home() / '.local' / 'share' / 'meshtastic-monitor'
+
+
+class SnapshotError(Exception):
+    """Snapshot file is missing, corrupt or from an incompatible format"""
+
+
+def default_snapshot_path(host: str, port: int) -> Path:
+    """Per-daemon snapshot file under ~/.local/share/meshtastic-monitor"""
+    safe_host = ''.join(c if c.isalnum() or c in '.-' else '_' for c in host)
+    return DEFAULT_SNAPSHOT_DIR / f"nodes-{safe_host}-{port}.snap"
+
+
+def write_snapshot(path, node_ids: List[str], columns: Dict[str, Any],
+                   meta: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Atomically write a snapshot.
+
+    Args:
+        path: Destination file
+        node_ids: Row node ids (from NodeTable.export_columns)
+        columns: Column name -> array or list of str
+        meta: Extra JSON-serializable header fields
+
+    Returns:
+        Bytes written
+    """
+    path = Path(path)
+    blobs = []
+    specs = []
+    for name, col in [('node_id', node_ids)] + list(columns.items()):
+        if isinstance(col, array):
+            blob = col.tobytes()
+            kind = col.typecode
+        else:
+            blob = '\0'.join(value.replace('\0', '') for value in col).encode('utf-8')
+            kind = 's'
+        blobs.append(blob)
+        specs.append({'name': name, 'type': kind, 'bytes': len(blob)})
+
+    crc = 0
+    for blob in blobs:
+        crc = zlib.crc32(blob, crc)
+    header = dict(meta or {}, rows=len(node_ids), byteorder=sys.byteorder,
+                  saved_at=time.time(), crc32=crc, columns=specs)
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(MAGIC) + 4 + len(header_bytes) + sum(len(b) for b in blobs)
+
+
+def read_snapshot(path) -> Tuple[List[str], Dict[str, Any], Dict[str, Any]]:
+    """
+    Load a snapshot.
+
+    Returns:
+        (node_ids, columns, header)
+
+    Raises:
+        SnapshotError: missing, truncated or corrupt file
+    """
+    try:
+        f = open(path, 'rb')
+    except OSError as e:
+        raise SnapshotError(f"Cannot open snapshot {path}: {e}")
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise SnapshotError(f"Empty snapshot {path}")
+        with mm:
+            return _parse(mm, path)
+
+
+def _parse(mm, path) -> Tuple[List[str], Dict[str, Any], Dict[str, Any]]:
+    magic = mm[:len(MAGIC)]
+    if magic != MAGIC:
+        if magic[:-2] == MAGIC[:-2]:
+            version = magic[-2:].decode('ascii', 'replace')
+            raise SnapshotError(f"Unsupported snapshot version {version} in {path}")
+        raise SnapshotError(f"Not a node snapshot: {path}")
+    offset = len(MAGIC)
+    try:
+        (header_len,) = struct.unpack_from('<I', mm, offset)
+        offset += 4
+        header = json.loads(mm[offset:offset + header_len].decode('utf-8'))
+        specs = header['columns']
+        rows = header['rows']
+        total = sum(spec['bytes'] for spec in specs)
+    except (struct.error, ValueError, KeyError, TypeError) as e:
+        raise SnapshotError(f"Bad snapshot header in {path}: {e}")
+    offset += header_len
+
+    if offset + total > len(mm):
+        raise SnapshotError(f"Truncated snapshot {path}")
+
+    view = memoryview(mm)
+    blob = None
+    try:
+        crc = 0
+        columns: Dict[str, Any] = {}
+        swap = header.get('byteorder', sys.byteorder) != sys.byteorder
+        for spec in specs:
+            blob = view[offset:offset + spec['bytes']]
+            offset += spec['bytes']
+            crc = zlib.crc32(blob, crc)
+            if spec['type'] == 's':
+                values = bytes(blob).decode('utf-8').split('\0') if rows else []
+                if rows and len(values) != rows:
+                    raise SnapshotError(f"Column {spec['name']} has {len(values)} rows, expected {rows}")
+                columns[spec['name']] = values
+            else:
+                col = array(spec['type'])
+                col.frombytes(blob)
+                if swap:
+                    col.byteswap()
+                columns[spec['name']] = col
+    except (KeyError, TypeError, ValueError) as e:
+        # Unknown typecode, a blob that isn't whole items, bad UTF-8
+        raise SnapshotError(f"Bad column in snapshot {path}: {e}")
+    finally:
+        # The mmap cannot close while slices of it are alive
+        blob = None
+        view.release()
+
+    if crc != header.get('crc32'):
+        raise SnapshotError(f"Checksum mismatch in {path}")
+    node_ids = columns.pop('node_id', [])
+    return node_ids, columns, header
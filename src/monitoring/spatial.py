@@ -0,0 +1,326 @@
+"""
+SpatialIndex - Grid index over node positions
+
+Buckets nodes into fixed-size latitude/longitude cells so proximity
+queries only touch the cells around the query point instead of every
+node:
+
+- within(lat, lon, radius_km): nodes inside a great-circle radius
+- in_bbox(south, west, north, east): nodes inside a bounding box
+  (west > east crosses the antimeridian)
+- nearest(lat, lon, k): k nearest nodes, searched ring by ring
+
+Updates are incremental: moving a node only touches its old and new
+cell. The index is not thread-safe on its own; NodeMonitor guards it
+with its table lock.
+
+Usage:
+    index = SpatialIndex(cell_deg=0.05)
+    index.update('!a1b2c3d4', 21.30, -157.85)
+    index.within(21.31, -157.86, radius_km=5)   # [(node_id, km), ...]
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def valid_position(lat: Optional[float], lon: Optional[float]) -> bool:
+    """True for a usable fix (meshtastic reports 0/0 when there is none)"""
+    if lat is None or lon is None:
+        return False
+    if lat != lat or lon != lon:  # NaN
+        return False
+    if lat == 0 and lon == 0:
+        return False
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+class SpatialIndex:
+    """Uniform lat/lon grid of node ids"""
+
+    def __init__(self, cell_deg: float = 0.05):
+        """
+        Args:
+            cell_deg: Cell edge in degrees (0.05 deg is about 5.5 km of
+                latitude; pick roughly the typical query radius)
+        """
+        self.cell_deg = cell_deg
+        self._cols = max(1, int(round(360 / cell_deg)))
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._points: Dict[str, Tuple[float, float, Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._points
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor((lon + 180) / self.cell_deg)) % self._cols
+
+    def update(self, node_id: str, lat: Optional[float], lon: Optional[float]):
+        """Insert or move a node; an invalid position removes it"""
+        if not valid_position(lat, lon):
+            self.remove(node_id)
+            return
+        cell = self._cell(lat, lon)
+        old = self._points.get(node_id)
+        if old is not None and old[2] != cell:
+            self._discard(node_id, old[2])
+        if old is None or old[2] != cell:
+            self._cells.setdefault(cell, set()).add(node_id)
+        self._points[node_id] = (lat, lon, cell)
+
+    def remove(self, node_id: str) -> bool:
+        old = self._points.pop(node_id, None)
+        if old is None:
+            return False
+        self._discard(node_id, old[2])
+        return True
+
+    def _discard(self, node_id: str, cell: Tuple[int, int]):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(node_id)
+            if not members:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+
+    def position(self, node_id: str) -> Optional[Tuple[float, float]]:
+        point = self._points.get(node_id)
+        return (point[0], point[1]) if point else None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _cells_in(self, row_lo: int, row_hi: int, col_lo: int, col_hi: int):
+        """Occupied cells in a row/column range (columns may wrap)"""
+        rows = row_hi - row_lo + 1
+        cols = col_hi - col_lo + 1
+        if cols >= self._cols:
+            col_lo, cols = 0, self._cols
+        # Scanning the occupied cells is cheaper than probing a big empty range
+        if rows * cols > len(self._cells):
+            for (row, col), members in self._cells.items():
+                if row_lo <= row <= row_hi and (col - col_lo) % self._cols < cols:
+                    yield members
+            return
+        cells = self._cells
+        for row in range(row_lo, row_hi + 1):
+            for c in range(col_lo, col_lo + cols):
+                members = cells.get((row, c % self._cols))
+                if members:
+                    yield members
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[str, float]]:
+        """
+        Nodes within radius_km of a point.
+
+        Returns:
+            [(node_id, distance_km)] sorted by distance
+        """
+        dlat = radius_km / KM_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(min(89.9, abs(lat) + dlat)))
+        dlon = 180.0 if cos_lat <= 0 else min(180.0, radius_km / (KM_PER_DEG_LAT * cos_lat))
+
+        row_lo, col_lo = self._cell(max(-90.0, lat - dlat), lon - dlon)
+        row_hi, _ = self._cell(min(90.0, lat + dlat), lon)
+        col_span = int(math.ceil(2 * dlon / self.cell_deg)) + 1
+
+        points = self._points
+        found = []
+        for members in self._cells_in(row_lo, row_hi, col_lo, col_lo + col_span):
+            for node_id in members:
+                plat, plon, _ = points[node_id]
+                distance = haversine_km(lat, lon, plat, plon)
+                if distance <= radius_km:
+                    found.append((node_id, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def in_bbox(self, south: float, west: float, north: float, east: float) -> List[str]:
+        """
+        Nodes inside a bounding box.
+
+        A box with west > east crosses the antimeridian.
+        """
+        if west > east:
+            return self.in_bbox(south, west, north, 180.0) + self.in_bbox(south, -180.0, north, east)
+        row_lo, col_lo = self._cell(south, west)
+        row_hi, col_hi = self._cell(north, min(east, 180.0 - 1e-9))
+        points = self._points
+        found = []
+        for members in self._cells_in(row_lo, row_hi, col_lo, col_hi):
+            for node_id in members:
+                plat, plon, _ = points[node_id]
+                if south <= plat <= north and west <= plon <= east:
+                    found.append(node_id)
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int = 1,
+                max_km: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        The k nearest nodes to a point.
+
+        Scans rings of cells outward from the query cell and stops once
+        the next ring cannot hold anything closer than the k-th best.
+
+        Returns:
+            [(node_id, distance_km)] sorted by distance
+        """
+        if k <= 0 or not self._points:
+            return []
+        row0, col0 = self._cell(lat, lon)
+        points = self._points
+        best: List[Tuple[float, str]] = []  # max-heap via negated distance
+        seen = 0
+        total = len(points)
+        max_rows = int(math.ceil(180 / self.cell_deg))
+
+        def consider(node_id):
+            plat, plon, _ = points[node_id]
+            distance = haversine_km(lat, lon, plat, plon)
+            if max_km is not None and distance > max_km:
+                return
+            if len(best) < k:
+                heapq.heappush(best, (-distance, node_id))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, node_id))
+
+        ring = 0
+        while True:
+            # Once the rings probed so far outnumber the occupied cells,
+            # checking every remaining node is cheaper than probing on
+            if ring and (2 * ring + 1) ** 2 > len(self._cells):
+                self._nearest_by_cell(lat, lon, row0, col0, ring, k, best, consider)
+                break
+
+            for cell in self._ring(row0, col0, ring):
+                members = self._cells.get(cell)
+                if members:
+                    seen += len(members)
+                    for node_id in members:
+                        consider(node_id)
+
+            if seen >= total or ring > max_rows:
+                break
+            # Anything beyond this ring is at least `ring` whole cells away
+            reach_lat = min(89.9, abs(lat) + (ring + 1) * self.cell_deg)
+            bound = ring * self.cell_deg * KM_PER_DEG_LAT * math.cos(math.radians(reach_lat))
+            if max_km is not None and bound > max_km:
+                break
+            if len(best) == k and bound > -best[0][0]:
+                break
+            ring += 1
+
+        return sorted(((node_id, -neg) for neg, node_id in best), key=lambda item: item[1])
+
+    def _nearest_by_cell(self, lat, lon, row0, col0, ring, k, best, consider):
+        """Visit the unscanned occupied cells closest-first until none can improve `best`"""
+        half_diag = self.cell_deg * KM_PER_DEG_LAT * 0.7072
+        candidates = []
+        for (row, col), members in self._cells.items():
+            dcol = min((col - col0) % self._cols, (col0 - col) % self._cols)
+            if max(abs(row - row0), dcol) < ring:
+                continue
+            center_lat = min(90.0, (row + 0.5) * self.cell_deg)
+            center_lon = (col + 0.5) * self.cell_deg - 180
+            bound = haversine_km(lat, lon, center_lat, center_lon) - half_diag
+            candidates.append((bound, row, col))
+        candidates.sort()
+        for bound, row, col in candidates:
+            if len(best) == k and bound > -best[0][0]:
+                break
+            for node_id in self._cells[(row, col)]:
+                consider(node_id)
+
+    def _ring(self, row0: int, col0: int, ring: int):
+        """Cells on the square ring at Chebyshev distance `ring`"""
+        if ring == 0:
+            yield row0, col0
+            return
+        cols = self._cols
+        span = min(ring, cols // 2)
+        seen = set()
+        for dc in range(-span, span + 1):
+            for row in (row0 - ring, row0 + ring):
+                cell = (row, (col0 + dc) % cols)
+                if cell not in seen:
+                    seen.add(cell)
+                    yield cell
+        if ring <= cols // 2:
+            for dr in range(-ring + 1, ring):
+                for dc in (-ring, ring):
+                    cell = (row0 + dr, (col0 + dc) % cols)
+                    if cell not in seen:
+                        seen.add(cell)
+                        yield cell
+
+
+POSITION_FIELDS = frozenset(('latitude', 'longitude'))
+
+
+class SpatialQueryMixin:
+    """
+    Proximity queries for monitors that keep a NodeTable.
+
+    Classes using this set self.spatial, self._table and self._lock, and
+    call _update_spatial() with the lock held whenever a merge changes a
+    position field.
+    """
+
+    spatial: SpatialIndex
+
+    def _update_spatial(self, view, changes):
+        if changes.keys() & POSITION_FIELDS:
+            table = self._table
+            self.spatial.update(view.node_id,
+                                table.get_field(view._row, 'latitude'),
+                                table.get_field(view._row, 'longitude'))
+
+    def nodes_within(self, latitude: float, longitude: float, radius_km: float):
+        """
+        Nodes within radius_km of a point.
+
+        Returns:
+            [(NodeInfo, distance_km)] sorted by distance
+        """
+        with self._lock:
+            return [(self._table.get(node_id).to_node_info(), km)
+                    for node_id, km in self.spatial.within(latitude, longitude, radius_km)]
+
+    def nodes_in_bbox(self, south: float, west: float, north: float, east: float):
+        """Nodes inside a bounding box (west > east crosses the antimeridian)"""
+        with self._lock:
+            return [self._table.get(node_id).to_node_info()
+                    for node_id in self.spatial.in_bbox(south, west, north, east)]
+
+    def nearest_nodes(self, latitude: float, longitude: float, k: int = 1,
+                      max_km: Optional[float] = None):
+        """
+        The k nodes nearest to a point.
+
+        Returns:
+            [(NodeInfo, distance_km)] sorted by distance
+        """
+        with self._lock:
+            return [(self._table.get(node_id).to_node_info(), km)
+                    for node_id, km in self.spatial.nearest(latitude, longitude, k, max_km)]
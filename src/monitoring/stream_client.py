@@ -0,0 +1,388 @@
+"""
+MeshtasticStreamClient - Native asyncio client for meshtasticd
+
+Speaks the meshtasticd TCP stream protocol directly on port 4403 instead of
+going through meshtastic.tcp_interface.TCPInterface. Every protobuf is
+wrapped in a 4 byte header:
+
+    0x94 0xC3 <len MSB> <len LSB> <FromRadio/ToRadio protobuf>
+
+Bytes outside a frame are daemon debug output and are ignored.
+
+Because the client runs on the caller's event loop there is no reader
+thread and no pypubsub hop between the socket and NodeMonitor.
+
+Usage:
+    client = MeshtasticStreamClient("localhost", 4403)
+    client.on_from_radio = handle_packet
+    await client.connect(timeout=10)
+    await client.wait_closed()
+"""
+
+import asyncio
+import base64
+import logging
+import random
+import socket
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+START1 = 0x94
+START2 = 0xC3
+HEADER_LEN = 4
+MAX_PAYLOAD = 512
+BROADCAST_NUM = 0xFFFFFFFF
+
+# Sent before the first frame so a sleeping serial bridge resyncs
+WAKE_BYTES = bytes([START2]) * 32
+
+
+def _load_protobufs():
+    """Import meshtastic protobuf modules (layout changed in meshtastic 2.3)"""
+    try:
+        from meshtastic.protobuf import mesh_pb2, portnums_pb2, telemetry_pb2
+    except ImportError:
+        from meshtastic import mesh_pb2, portnums_pb2, telemetry_pb2
+    return mesh_pb2, portnums_pb2, telemetry_pb2
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Wrap a serialized protobuf in the stream header"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload too large ({len(payload)} > {MAX_PAYLOAD} bytes)")
+    return bytes([START1, START2, len(payload) >> 8, len(payload) & 0xFF]) + payload
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for the 0x94 0xC3 framing.
+
+    Feed arbitrary chunks read from the socket; complete payloads are
+    returned in order. Garbage and oversized frames are skipped by
+    resyncing on the next START1 byte.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self.discarded_bytes = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return all complete payloads"""
+        buf = self._buf
+        buf.extend(data)
+        frames = []
+        pos = 0
+        end = len(buf)
+
+        while pos < end:
+            start = buf.find(START1, pos)
+            if start < 0:
+                self.discarded_bytes += end - pos
+                pos = end
+                break
+            self.discarded_bytes += start - pos
+            pos = start
+
+            if end - pos < 2:
+                break
+            if buf[pos + 1] != START2:
+                pos += 1
+                self.discarded_bytes += 1
+                continue
+            if end - pos < HEADER_LEN:
+                break
+
+            length = (buf[pos + 2] << 8) | buf[pos + 3]
+            if length > MAX_PAYLOAD:
+                # Corrupt header - skip START1 and look for the next frame
+                pos += 1
+                self.discarded_bytes += 1
+                continue
+            if end - pos < HEADER_LEN + length:
+                break
+
+            frames.append(bytes(buf[pos + HEADER_LEN:pos + HEADER_LEN + length]))
+            pos += HEADER_LEN + length
+
+        del buf[:pos]
+        return frames
+
+
+class MeshtasticStreamClient:
+    """
+    Asyncio meshtasticd client.
+
+    connect() opens the socket, requests the node database with
+    want_config_id and returns once the daemon sends the matching
+    config_complete_id. Every FromRadio message is passed to
+    on_from_radio on the event loop as it arrives.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 4403,
+                 heartbeat_interval: float = 300.0):
+        """
+        Initialize the client.
+
+        Args:
+            host: Hostname of meshtasticd (default: localhost)
+            port: TCP port (default: 4403)
+            heartbeat_interval: Seconds between keepalive heartbeats (0 disables)
+        """
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._config_id: Optional[int] = None
+        self._config_complete: Optional[asyncio.Event] = None
+        self._decoder = FrameDecoder()
+
+        self.my_info = None
+        self.packets_received = 0
+        self.bytes_received = 0
+
+        # Callbacks
+        self.on_from_radio: Optional[Callable[[Any], None]] = None
+        self.on_raw_frame: Optional[Callable[[bytes], None]] = None
+        self.on_disconnect: Optional[Callable[[Optional[Exception]], None]] = None
+
+        self._pb = None
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the reader task is running"""
+        return self._reader_task is not None and not self._reader_task.done()
+
+    @property
+    def config_complete(self) -> bool:
+        """True once the initial node database has been received"""
+        return self._config_complete is not None and self._config_complete.is_set()
+
+    async def connect(self, timeout: float = 10.0):
+        """
+        Connect and wait for the initial config download to finish.
+
+        Raises:
+            ImportError: meshtastic protobufs are not installed
+            ConnectionError: daemon unreachable
+            TimeoutError: config_complete_id not received within timeout
+        """
+        if self._pb is None:
+            self._pb = _load_protobufs()
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionError(f"Cannot reach {self.host}:{self.port} - {e}")
+        sock = self._writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        self._decoder = FrameDecoder()
+        self._config_complete = asyncio.Event()
+        self._config_id = random.randint(1, 0xFFFFFFFF)
+
+        mesh_pb2 = self._pb[0]
+        connected = False
+        try:
+            self._writer.write(WAKE_BYTES)
+            await self.send(mesh_pb2.ToRadio(want_config_id=self._config_id))
+
+            self._reader_task = asyncio.ensure_future(self._read_loop())
+            if self.heartbeat_interval > 0:
+                self._heartbeat_task = asyncio.ensure_future(self._heartbeat_loop())
+
+            try:
+                await asyncio.wait_for(self._wait_config(), timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError("Timed out waiting for config_complete_id")
+            connected = True
+        finally:
+            # Don't leak the socket when the handshake fails for any reason
+            if not connected:
+                await self.close()
+
+    async def _wait_config(self):
+        waiter = asyncio.ensure_future(self._config_complete.wait())
+        done, _ = await asyncio.wait(
+            {waiter, self._reader_task}, return_when=asyncio.FIRST_COMPLETED)
+        if waiter not in done:
+            waiter.cancel()
+            raise ConnectionError("Connection closed during config download")
+
+    async def send(self, to_radio):
+        """Serialize and send a ToRadio message"""
+        if self._writer is None:
+            raise ConnectionError("Not connected")
+        self._writer.write(encode_frame(to_radio.SerializeToString()))
+        await self._writer.drain()
+
+    async def send_text(self, text: str, destination: Optional[int] = None,
+                        channel: int = 0, want_ack: bool = False):
+        """
+        Send a text message.
+
+        Args:
+            text: Message text
+            destination: Destination node number (None for broadcast)
+            channel: Channel index
+            want_ack: Request an ACK from the destination
+        """
+        mesh_pb2, portnums_pb2, _ = self._pb
+        packet = mesh_pb2.MeshPacket()
+        packet.to = destination if destination is not None else BROADCAST_NUM
+        packet.channel = channel
+        packet.id = random.randint(1, 0xFFFFFFFF)
+        packet.want_ack = want_ack
+        packet.decoded.portnum = portnums_pb2.PortNum.TEXT_MESSAGE_APP
+        packet.decoded.payload = text.encode('utf-8')
+        await self.send(mesh_pb2.ToRadio(packet=packet))
+
+    async def _read_loop(self):
+        error = None
+        mesh_pb2 = self._pb[0]
+        try:
+            while True:
+                data = await self._reader.read(4096)
+                if not data:
+                    break
+                self.bytes_received += len(data)
+                for payload in self._decoder.feed(data):
+                    self.packets_received += 1
+                    if self.on_raw_frame:
+                        try:
+                            self.on_raw_frame(payload)
+                        except Exception as e:
+                            logger.error(f"Error in raw frame callback: {e}")
+                    from_radio = mesh_pb2.FromRadio()
+                    try:
+                        from_radio.ParseFromString(payload)
+                    except Exception as e:
+                        logger.debug(f"Dropping undecodable frame: {e}")
+                        continue
+                    self._handle_from_radio(from_radio)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.error(f"Stream read error: {e}")
+        finally:
+            if self._heartbeat_task:
+                self._heartbeat_task.cancel()
+            if self.on_disconnect:
+                try:
+                    self.on_disconnect(error)
+                except Exception as e:
+                    logger.error(f"Error in disconnect callback: {e}")
+
+    def _handle_from_radio(self, from_radio):
+        variant = from_radio.WhichOneof('payload_variant')
+        if variant == 'my_info':
+            self.my_info = from_radio.my_info
+        elif variant == 'config_complete_id':
+            if from_radio.config_complete_id == self._config_id:
+                self._config_complete.set()
+
+        if self.on_from_radio:
+            try:
+                self.on_from_radio(from_radio)
+            except Exception as e:
+                logger.error(f"Error in from_radio callback: {e}")
+
+    async def _heartbeat_loop(self):
+        mesh_pb2 = self._pb[0]
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.send(mesh_pb2.ToRadio(heartbeat=mesh_pb2.Heartbeat()))
+            except Exception as e:
+                # A half-open socket may never error on read; dropping the
+                # transport ends the read loop so the owner reconnects
+                logger.warning(f"Heartbeat failed, closing connection: {e}")
+                if self._writer:
+                    self._writer.close()
+                return
+
+    async def wait_closed(self):
+        """Wait until the connection drops"""
+        if self._reader_task:
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+
+    async def close(self):
+        """Close the connection"""
+        for task in (self._heartbeat_task, self._reader_task):
+            if task and not task.done():
+                task.cancel()
+        if self._writer:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._writer = None
+        self._reader = None
+
+    # ------------------------------------------------------------------
+    # Protobuf -> dict helpers (same shape as meshtastic.mesh_interface)
+    # ------------------------------------------------------------------
+
+    def node_info_to_dict(self, node_info) -> Dict[str, Any]:
+        """Convert a NodeInfo protobuf to the dict layout NodeMonitor parses"""
+        from google.protobuf.json_format import MessageToDict
+        return MessageToDict(node_info)
+
+    def packet_to_dict(self, packet) -> Dict[str, Any]:
+        """
+        Convert a MeshPacket protobuf to a dict, decoding well-known
+        application payloads the same way the meshtastic library does.
+        """
+        from google.protobuf.json_format import MessageToDict
+        mesh_pb2, portnums_pb2, telemetry_pb2 = self._pb
+
+        result = MessageToDict(packet)
+        from_num = result.get('from')
+        if from_num is not None:
+            result['fromId'] = f"!{from_num:08x}"
+        to_num = result.get('to')
+        if to_num is not None:
+            result['toId'] = f"!{to_num:08x}"
+
+        if not packet.HasField('decoded'):
+            return result
+
+        decoded = result.setdefault('decoded', {})
+        portnum = portnums_pb2.PortNum.Name(packet.decoded.portnum)
+        decoded['portnum'] = portnum
+        payload = packet.decoded.payload
+
+        decoders = {
+            'POSITION_APP': ('position', mesh_pb2.Position),
+            'NODEINFO_APP': ('user', mesh_pb2.User),
+            'TELEMETRY_APP': ('telemetry', telemetry_pb2.Telemetry),
+            'NEIGHBORINFO_APP': ('neighborinfo', mesh_pb2.NeighborInfo),
+            'TRACEROUTE_APP': ('traceroute', mesh_pb2.RouteDiscovery),
+            'ROUTING_APP': ('routing', mesh_pb2.Routing),
+        }
+        try:
+            if portnum == 'TEXT_MESSAGE_APP':
+                decoded['text'] = payload.decode('utf-8', errors='replace')
+            elif portnum in decoders:
+                key, message_cls = decoders[portnum]
+                message = message_cls()
+                message.ParseFromString(payload)
+                decoded[key] = MessageToDict(message)
+        except Exception as e:
+            logger.debug(f"Could not decode {portnum} payload: {e}")
+            decoded['payload'] = base64.b64encode(payload).decode('ascii')
+
+        return result
@@ -0,0 +1,355 @@
+"""
+TelemetryStore - On-disk time-series history for node telemetry
+
+NodeMonitor only keeps the latest NodeMetrics per node. TelemetryStore
+appends every sample to SQLite (WAL mode) so battery, voltage, channel
+utilization, air_util_tx, SNR and environment history survive restarts.
+
+Design notes for SD-card storage:
+- Samples are queued in memory and written in one transaction per batch
+- Tables are WITHOUT ROWID and keyed on (ts, node_num, metric), so inserts
+  append and repeated reports of the same lastHeard overwrite in place
+- Raw samples roll up into 1 minute and 1 hour tables, and each tier
+  has its own retention window
+
+Usage:
+    store = TelemetryStore()
+    monitor = NodeMonitor(telemetry_store=store)
+    ...
+    store.query(0x12345678, 'battery_level', start=time.time() - 86400)
+    store.close()
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+DEFAULT_DB_PATH = Path.home() / '.local' / 'share' / 'meshtastic-monitor' / 'telemetry.db'
+
+# Stable metric ids - stored as integers to keep rows small
+METRICS = (
+    'battery_level',
+    'voltage',
+    'channel_utilization',
+    'air_util_tx',
+    'snr',
+    'temperature',
+    'humidity',
+    'pressure',
+)
+METRIC_IDS = {name: i for i, name in enumerate(METRICS)}
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+# Raw and 1 minute tables are keyed time-first so inserts append at the
+# right edge of the B-tree and rollups are range scans; per-node queries
+# use their (node_num, metric, ts) secondary indexes.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples_raw (
+    ts       INTEGER NOT NULL,
+    node_num INTEGER NOT NULL,
+    metric   INTEGER NOT NULL,
+    value    REAL NOT NULL,
+    PRIMARY KEY (ts, node_num, metric)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS samples_raw_node ON samples_raw (node_num, metric, ts);
+
+CREATE TABLE IF NOT EXISTS samples_1m (
+    ts       INTEGER NOT NULL,
+    node_num INTEGER NOT NULL,
+    metric   INTEGER NOT NULL,
+    count    INTEGER NOT NULL,
+    sum      REAL NOT NULL,
+    min      REAL NOT NULL,
+    max      REAL NOT NULL,
+    PRIMARY KEY (ts, node_num, metric)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS samples_1m_node ON samples_1m (node_num, metric, ts);
+
+CREATE TABLE IF NOT EXISTS samples_1h (
+    node_num INTEGER NOT NULL,
+    metric   INTEGER NOT NULL,
+    ts       INTEGER NOT NULL,
+    count    INTEGER NOT NULL,
+    sum      REAL NOT NULL,
+    min      REAL NOT NULL,
+    max      REAL NOT NULL,
+    PRIMARY KEY (node_num, metric, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class TelemetryStore:
+    """
+    Append-only telemetry history with batched writes and downsampling.
+
+    record() is cheap and thread-safe; a background thread commits the
+    queued samples every flush_interval seconds or once batch_size
+    samples are pending, then rolls completed minutes and hours up.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 flush_interval: float = 30.0,
+                 batch_size: int = 2000,
+                 raw_retention: int = 2 * DAY,
+                 minute_retention: int = 30 * DAY,
+                 hour_retention: int = 365 * DAY):
+        """
+        Args:
+            path: SQLite database file (default: ~/.local/share/meshtastic-monitor/telemetry.db)
+            flush_interval: Max seconds samples wait in memory
+            batch_size: Flush early once this many samples are queued
+            raw_retention: Seconds of raw samples to keep
+            minute_retention: Seconds of 1 minute rollups to keep
+            hour_retention: Seconds of 1 hour rollups to keep
+        """
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.raw_retention = raw_retention
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+
+        self._pending: List[Tuple[int, int, int, float]] = []  # (ts, node, metric, value)
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = True
+        self._last_retention = 0.0
+
+        self.samples_written = 0
+        self.flushes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable across application crashes in WAL mode and
+        # avoids an fsync per commit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA wal_autocheckpoint=4000")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        # Oldest sample not yet folded into the 1m / 1h tables
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self._minute_dirty_from: Optional[int] = meta.get('minute_dirty_from')
+        self._hour_dirty_from: Optional[int] = meta.get('hour_dirty_from')
+
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                        name="telemetry-writer")
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, node_num: int, metrics: Dict[str, Optional[float]],
+               timestamp: Optional[float] = None):
+        """
+        Queue one set of samples for a node.
+
+        Args:
+            node_num: Numeric node ID
+            metrics: Metric name -> value; None values and unknown names are skipped
+            timestamp: Sample time (default: now)
+        """
+        ts = int(timestamp if timestamp is not None else time.time())
+        rows = [
+            (ts, node_num, METRIC_IDS[name], float(value))
+            for name, value in metrics.items()
+            if value is not None and name in METRIC_IDS
+        ]
+        if not rows:
+            return
+
+        with self._pending_lock:
+            self._pending.extend(rows)
+            pending = len(self._pending)
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def record_node(self, node):
+        """Queue the current metrics of a NodeInfo"""
+        metrics = node.metrics
+        values = {'snr': node.snr}
+        if metrics:
+            values.update(
+                battery_level=metrics.battery_level,
+                voltage=metrics.voltage,
+                channel_utilization=metrics.channel_utilization,
+                air_util_tx=metrics.air_util_tx,
+                temperature=metrics.temperature,
+                humidity=metrics.humidity,
+                pressure=metrics.pressure,
+            )
+        timestamp = node.last_heard.timestamp() if node.last_heard else None
+        self.record(node.node_num, values, timestamp)
+
+    def flush(self):
+        """Write all queued samples and update rollups"""
+        with self._pending_lock:
+            batch = self._pending
+            self._pending = []
+
+        with self._db_lock:
+            now = int(time.time())
+            with self._conn:
+                if batch:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO samples_raw (ts, node_num, metric, value) "
+                        "VALUES (?, ?, ?, ?)", batch)
+                    oldest = min(row[0] for row in batch)
+                    if self._minute_dirty_from is None or oldest < self._minute_dirty_from:
+                        self._minute_dirty_from = oldest
+                self._rollup(now)
+
+            if batch:
+                self.samples_written += len(batch)
+                self.flushes += 1
+
+            if now - self._last_retention > HOUR:
+                self._apply_retention(now)
+                self._last_retention = now
+
+    def _rollup(self, now: int):
+        """
+        Fold completed minutes into samples_1m and completed hours into
+        samples_1h, starting from the oldest sample written since the
+        last rollup. Must run inside a transaction.
+        """
+        minute_end = now - now % MINUTE
+        if self._minute_dirty_from is not None:
+            minute_start = self._minute_dirty_from - self._minute_dirty_from % MINUTE
+            if minute_start < minute_end:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO samples_1m "
+                    "SELECT ts - ts % 60, node_num, metric, COUNT(*), SUM(value), MIN(value), MAX(value) "
+                    "FROM samples_raw WHERE ts >= ? AND ts < ? "
+                    "GROUP BY ts - ts % 60, node_num, metric",
+                    (minute_start, minute_end))
+                if self._hour_dirty_from is None or minute_start < self._hour_dirty_from:
+                    self._hour_dirty_from = minute_start
+                # The current minute is still open
+                self._minute_dirty_from = minute_end
+
+        hour_end = now - now % HOUR
+        if self._hour_dirty_from is not None:
+            hour_start = self._hour_dirty_from - self._hour_dirty_from % HOUR
+            if hour_start < hour_end:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO samples_1h "
+                    "SELECT node_num, metric, ts - ts % 3600, SUM(count), SUM(sum), MIN(min), MAX(max) "
+                    "FROM samples_1m WHERE ts >= ? AND ts < ? "
+                    "GROUP BY node_num, metric, ts - ts % 3600",
+                    (hour_start, hour_end))
+                self._hour_dirty_from = hour_end
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, value) for key, value in (
+                ('minute_dirty_from', self._minute_dirty_from),
+                ('hour_dirty_from', self._hour_dirty_from),
+            ) if value is not None])
+
+    def _apply_retention(self, now: int):
+        with self._conn:
+            self._conn.execute("DELETE FROM samples_raw WHERE ts < ?", (now - self.raw_retention,))
+            self._conn.execute("DELETE FROM samples_1m WHERE ts < ?", (now - self.minute_retention,))
+            self._conn.execute("DELETE FROM samples_1h WHERE ts < ?", (now - self.hour_retention,))
+
+    def _writer_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Telemetry flush failed: {e}")
+
+    def close(self):
+        """Flush pending samples and close the database"""
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Telemetry flush failed: {e}")
+        with self._db_lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def query(self, node_num: int, metric: str,
+              start: Optional[float] = None, end: Optional[float] = None,
+              resolution: str = 'auto') -> List[Tuple[int, float]]:
+        """
+        Get (timestamp, value) points for one node and metric.
+
+        Args:
+            node_num: Numeric node ID
+            metric: One of METRICS
+            start: Range start, epoch seconds (default: 24h ago)
+            end: Range end, epoch seconds (default: now)
+            resolution: 'raw', '1m', '1h' or 'auto' (pick by range length)
+
+        Returns:
+            List of (ts, value); rollups return the bucket mean
+        """
+        if metric not in METRIC_IDS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        end = int(end if end is not None else time.time())
+        start = int(start if start is not None else end - DAY)
+
+        if resolution == 'auto':
+            span = end - start
+            if span <= 6 * HOUR:
+                resolution = 'raw'
+            elif span <= 7 * DAY:
+                resolution = '1m'
+            else:
+                resolution = '1h'
+
+        if resolution == 'raw':
+            sql = ("SELECT ts, value FROM samples_raw "
+                   "WHERE node_num = ? AND metric = ? AND ts >= ? AND ts < ? ORDER BY ts")
+        elif resolution in ('1m', '1h'):
+            sql = (f"SELECT ts, sum / count FROM samples_{resolution} "
+                   "WHERE node_num = ? AND metric = ? AND ts >= ? AND ts < ? ORDER BY ts")
+        else:
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        with self._db_lock:
+            return list(self._conn.execute(sql, (node_num, METRIC_IDS[metric], start, end)))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Row counts per tier and writer counters"""
+        with self._db_lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('samples_raw', 'samples_1m', 'samples_1h')
+            }
+        with self._pending_lock:
+            counts['pending'] = len(self._pending)
+        counts['samples_written'] = self.samples_written
+        counts['flushes'] = self.flushes
+        return counts
@@ -0,0 +1,491 @@
+"""
+MeshTopology - Live mesh graph from NeighborInfo, traceroute and hop counts
+
+Builds an undirected adjacency structure from received packets:
+
+- NEIGHBORINFO_APP: the reporter heard each listed neighbor at that SNR
+- TRACEROUTE_APP:   every consecutive pair on the route and route back,
+                    with the per-hop SNR the firmware reports
+- zero-hop packets: the sender is a direct neighbor of the local node
+
+Each edge keeps the last SNR measured at either end and when it was last
+confirmed. Edges that are not confirmed within edge_ttl are pruned.
+
+Structural queries (articulation points, "what partitions if X dies")
+are cached against a structure version that only changes when an edge
+or node is added or removed, so SNR and freshness refreshes - the bulk
+of the traffic - never invalidate them.
+
+Usage:
+    topo = MeshTopology(local_node=0x10000000)
+    topo.observe_packet(packet)
+    topo.shortest_path(a, b)
+    topo.articulation_points()
+    topo.partition_if_removed(x)
+    topo.to_json() / topo.to_graphml()
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from xml.sax.saxutils import quoteattr
+
+# Traceroute SNR values are dB * 4; INT8_MIN means "unknown"
+TRACEROUTE_SNR_UNKNOWN = -128
+
+
+def _node_num(value) -> Optional[int]:
+    """Accept a node number or a '!xxxxxxxx' id"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            return int(value[1:], 16) if value.startswith('!') else int(value)
+        except ValueError:
+            return None
+    return int(value)
+
+
+def _node_id(num: int) -> str:
+    return f"!{num:08x}"
+
+
+class Edge:
+    """Undirected link between two nodes"""
+
+    __slots__ = ('a', 'b', 'snr', 'last_seen', 'sources')
+
+    def __init__(self, a: int, b: int):
+        self.a = a
+        self.b = b
+        self.snr: Dict[int, float] = {}  # receiving node -> SNR it measured
+        self.last_seen = 0.0
+        self.sources: Set[str] = set()
+
+    @property
+    def best_snr(self) -> Optional[float]:
+        return max(self.snr.values()) if self.snr else None
+
+    @property
+    def worst_snr(self) -> Optional[float]:
+        return min(self.snr.values()) if self.snr else None
+
+    def cost(self) -> float:
+        """
+        Path cost: one per hop plus a penalty for weak links.
+
+        Uses the weaker direction; links below 0 dB SNR cost up to ~3x.
+        Links with no SNR measurement cost 1.5.
+        """
+        snr = self.worst_snr
+        if snr is None:
+            return 1.5
+        return 1.0 + min(2.0, max(0.0, -snr) / 10.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'source': _node_id(self.a),
+            'target': _node_id(self.b),
+            'snr': {_node_id(n): s for n, s in self.snr.items()},
+            'last_seen': self.last_seen,
+            'sources': sorted(self.sources),
+        }
+
+
+class MeshTopology:
+    """Thread-safe, incrementally maintained mesh graph"""
+
+    def __init__(self, local_node: Optional[int] = None, edge_ttl: float = 3 * 3600,
+                 prune_interval: float = 60.0):
+        """
+        Args:
+            local_node: Node number of the radio we are attached to
+            edge_ttl: Seconds an edge survives without being confirmed
+            prune_interval: Minimum seconds between stale-edge sweeps
+        """
+        self.local_node = local_node
+        self.edge_ttl = edge_ttl
+        self.prune_interval = prune_interval
+        self._adj: Dict[int, Dict[int, Edge]] = {}
+        self._lock = threading.RLock()
+        self._last_prune = 0.0
+
+        # Bumped on structural change only
+        self.version = 0
+        self._articulation: Optional[Set[int]] = None
+        self._articulation_version = -1
+        self._partition_cache: Dict[int, Tuple[int, List[Set[int]]]] = {}
+
+        self.packets_used = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_edge(self, a: int, b: int, snr: Optional[float] = None,
+                 measured_by: Optional[int] = None, source: str = 'manual',
+                 now: Optional[float] = None) -> Edge:
+        """Add or refresh the link a-b; snr is what `measured_by` heard"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            edge = self._adj.get(a, {}).get(b)
+            if edge is None:
+                edge = Edge(min(a, b), max(a, b))
+                self._adj.setdefault(a, {})[b] = edge
+                self._adj.setdefault(b, {})[a] = edge
+                self.version += 1
+            if snr is not None and measured_by is not None:
+                edge.snr[measured_by] = snr
+            edge.last_seen = max(edge.last_seen, now)
+            edge.sources.add(source)
+            return edge
+
+    def remove_edge(self, a: int, b: int) -> bool:
+        with self._lock:
+            if b not in self._adj.get(a, {}):
+                return False
+            del self._adj[a][b]
+            del self._adj[b][a]
+            for n in (a, b):
+                if not self._adj[n]:
+                    del self._adj[n]
+            self.version += 1
+            return True
+
+    def remove_node(self, node: int) -> bool:
+        with self._lock:
+            neighbors = self._adj.pop(node, None)
+            if neighbors is None:
+                return False
+            for other in neighbors:
+                peers = self._adj.get(other)
+                if peers is not None:
+                    peers.pop(node, None)
+                    if not peers:
+                        del self._adj[other]
+            self.version += 1
+            return True
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop edges not confirmed within edge_ttl; returns the count removed"""
+        if now is None:
+            now = time.time()
+        cutoff = now - self.edge_ttl
+        with self._lock:
+            self._last_prune = now
+            stale = {(e.a, e.b) for peers in self._adj.values()
+                     for e in peers.values() if e.last_seen < cutoff}
+            for a, b in stale:
+                self.remove_edge(a, b)
+            return len(stale)
+
+    def _maybe_prune(self):
+        now = time.time()
+        if now - self._last_prune >= self.prune_interval:
+            self.prune(now)
+
+    def observe_packet(self, packet: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Feed one received packet dict (meshtastic / packet_to_dict shape).
+
+        Returns:
+            True if the packet contributed topology information
+        """
+        sender = _node_num(packet.get('from'))
+        if sender is None:
+            return False
+        if now is None:
+            now = time.time()
+
+        used = False
+        decoded = packet.get('decoded') or {}
+        neighborinfo = decoded.get('neighborinfo')
+        traceroute = decoded.get('traceroute')
+
+        if neighborinfo:
+            used = self._observe_neighborinfo(sender, neighborinfo, now)
+        elif traceroute:
+            used = self._observe_traceroute(packet, sender, traceroute, now)
+
+        # Heard with no hops used: the sender is our direct neighbor
+        hop_start = packet.get('hopStart')
+        hop_limit = packet.get('hopLimit')
+        if (self.local_node and sender != self.local_node and hop_start is not None
+                and hop_start == hop_limit and not packet.get('viaMqtt')):
+            self.add_edge(self.local_node, sender, packet.get('rxSnr'), self.local_node,
+                          'direct', now)
+            used = True
+
+        if used:
+            self.packets_used += 1
+            self._maybe_prune()
+        return used
+
+    def _observe_neighborinfo(self, sender: int, info: Dict[str, Any], now: float) -> bool:
+        reporter = _node_num(info.get('nodeId')) or sender
+        used = False
+        for neighbor in info.get('neighbors') or []:
+            other = _node_num(neighbor.get('nodeId'))
+            if not other or other == reporter:
+                continue
+            self.add_edge(reporter, other, neighbor.get('snr'), reporter, 'neighborinfo', now)
+            used = True
+        return used
+
+    def _observe_traceroute(self, packet: Dict[str, Any], sender: int,
+                            route: Dict[str, Any], now: float) -> bool:
+        # A traceroute reply travels from the traced node (sender) to the
+        # requester (to): the forward route runs requester -> ... -> sender
+        requester = _node_num(packet.get('to'))
+        if requester is None:
+            return False
+        used = False
+        towards = [requester] + [_node_num(n) for n in route.get('route') or []] + [sender]
+        used |= self._add_path(towards, route.get('snrTowards') or [], now)
+        if 'routeBack' in route or 'snrBack' in route:
+            back = [sender] + [_node_num(n) for n in route.get('routeBack') or []] + [requester]
+            used |= self._add_path(back, route.get('snrBack') or [], now)
+        return used
+
+    def _add_path(self, path: List[Optional[int]], snrs: List[int], now: float) -> bool:
+        used = False
+        for i in range(len(path) - 1):
+            a, b = path[i], path[i + 1]
+            if not a or not b or a == b or a == 0xFFFFFFFF or b == 0xFFFFFFFF:
+                continue
+            snr = None
+            if i < len(snrs) and snrs[i] != TRACEROUTE_SNR_UNKNOWN:
+                snr = snrs[i] / 4.0
+            # snrs[i] is measured by the receiving end of hop i
+            self.add_edge(a, b, snr, b, 'traceroute', now)
+            used = True
+        return used
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._adj)
+
+    def nodes(self) -> List[int]:
+        with self._lock:
+            return list(self._adj)
+
+    def neighbors(self, node: int) -> Dict[int, Edge]:
+        with self._lock:
+            return dict(self._adj.get(node, {}))
+
+    def edges(self) -> List[Edge]:
+        with self._lock:
+            return [e for a, peers in self._adj.items() for b, e in peers.items() if a < b]
+
+    def edge_count(self) -> int:
+        with self._lock:
+            return sum(len(peers) for peers in self._adj.values()) // 2
+
+    def shortest_path(self, source, target, weighted: bool = True) -> Optional[Tuple[List[int], float]]:
+        """
+        Dijkstra shortest path.
+
+        Args:
+            weighted: Use Edge.cost() (penalizes weak links) instead of hops
+
+        Returns:
+            (node path, total cost) or None if unreachable
+        """
+        source, target = _node_num(source), _node_num(target)
+        with self._lock:
+            adj = self._adj
+            if source not in adj or target not in adj:
+                return None
+            dist = {source: 0.0}
+            prev: Dict[int, int] = {}
+            heap = [(0.0, source)]
+            while heap:
+                d, node = heapq.heappop(heap)
+                if node == target:
+                    break
+                if d > dist.get(node, float('inf')):
+                    continue
+                for other, edge in adj[node].items():
+                    nd = d + (edge.cost() if weighted else 1.0)
+                    if nd < dist.get(other, float('inf')):
+                        dist[other] = nd
+                        prev[other] = node
+                        heapq.heappush(heap, (nd, other))
+            if target not in dist:
+                return None
+            path = [target]
+            while path[-1] != source:
+                path.append(prev[path[-1]])
+            path.reverse()
+            return path, dist[target]
+
+    def articulation_points(self) -> Set[int]:
+        """Nodes whose loss disconnects part of the mesh (cached per structure)"""
+        with self._lock:
+            if self._articulation_version != self.version:
+                self._articulation = self._compute_articulation()
+                self._articulation_version = self.version
+            return set(self._articulation)
+
+    def _compute_articulation(self) -> Set[int]:
+        # Iterative Tarjan; recursion would overflow on long chains
+        adj = self._adj
+        disc: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        points: Set[int] = set()
+        counter = 0
+        for root in adj:
+            if root in disc:
+                continue
+            disc[root] = low[root] = counter
+            counter += 1
+            root_children = 0
+            stack = [(root, None, iter(adj[root]))]
+            while stack:
+                node, parent, it = stack[-1]
+                advanced = False
+                for other in it:
+                    if other == parent:
+                        continue
+                    if other in disc:
+                        low[node] = min(low[node], disc[other])
+                    else:
+                        disc[other] = low[other] = counter
+                        counter += 1
+                        if node == root:
+                            root_children += 1
+                        stack.append((other, node, iter(adj[other])))
+                        advanced = True
+                        break
+                if advanced:
+                    continue
+                stack.pop()
+                if parent is not None:
+                    low[parent] = min(low[parent], low[node])
+                    if parent != root and low[node] >= disc[parent]:
+                        points.add(parent)
+            if root_children > 1:
+                points.add(root)
+        return points
+
+    def _component(self, start: int, removed: int, seen: Set[int]) -> Set[int]:
+        adj = self._adj
+        component = {start}
+        queue = [start]
+        while queue:
+            node = queue.pop()
+            for other in adj[node]:
+                if other != removed and other not in component:
+                    component.add(other)
+                    queue.append(other)
+        seen |= component
+        return component
+
+    def partition_if_removed(self, node) -> List[Set[int]]:
+        """
+        Groups of nodes that would be cut off if `node` went down.
+
+        A group is cut off if it no longer reaches the local node (or,
+        without a known local node, the largest remaining group).
+        Returns [] for nodes that are not articulation points.
+        """
+        node = _node_num(node)
+        with self._lock:
+            if node not in self.articulation_points():
+                return []
+            cached = self._partition_cache.get(node)
+            if cached and cached[0] == self.version:
+                return [set(c) for c in cached[1]]
+
+            seen: Set[int] = set()
+            components = [self._component(start, node, seen)
+                          for start in self._adj[node] if start not in seen]
+            anchor = self.local_node if self.local_node in self._adj and self.local_node != node else None
+            if anchor is not None:
+                cut = [c for c in components if anchor not in c]
+            else:
+                largest = max(components, key=len)
+                cut = [c for c in components if c is not largest]
+
+            if len(self._partition_cache) > 1024:
+                self._partition_cache.clear()
+            self._partition_cache[node] = (self.version, cut)
+            return [set(c) for c in cut]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'nodes': len(self._adj),
+                'edges': self.edge_count(),
+                'version': self.version,
+                'articulation_points': len(self.articulation_points()),
+                'packets_used': self.packets_used,
+            }
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_json(self, names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Node-link dict for the web UI.
+
+        Args:
+            names: Optional node_id -> display name
+        """
+        names = names or {}
+        with self._lock:
+            cut = self.articulation_points()
+            nodes = [
+                {
+                    'id': _node_id(n),
+                    'name': names.get(_node_id(n), ''),
+                    'degree': len(peers),
+                    'articulation': n in cut,
+                    'local': n == self.local_node,
+                }
+                for n, peers in self._adj.items()
+            ]
+            edges = [e.to_dict() for e in self.edges()]
+            return {'nodes': nodes, 'edges': edges, 'version': self.version}
+
+    def to_graphml(self, names: Optional[Dict[str, str]] = None) -> str:
+        """GraphML document (node name/articulation, edge snr/last_seen/source)"""
+        names = names or {}
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+            '  <key id="name" for="node" attr.name="name" attr.type="string"/>',
+            '  <key id="articulation" for="node" attr.name="articulation" attr.type="boolean"/>',
+            '  <key id="snr" for="edge" attr.name="snr" attr.type="double"/>',
+            '  <key id="last_seen" for="edge" attr.name="last_seen" attr.type="double"/>',
+            '  <key id="source" for="edge" attr.name="source" attr.type="string"/>',
+            '  <graph id="mesh" edgedefault="undirected">',
+        ]
+        with self._lock:
+            cut = self.articulation_points()
+            for n in self._adj:
+                node_id = _node_id(n)
+                lines.append(f'    <node id={quoteattr(node_id)}>')
+                lines.append(f'      <data key="name">{_escape(names.get(node_id, ""))}</data>')
+                lines.append(f'      <data key="articulation">{"true" if n in cut else "false"}</data>')
+                lines.append('    </node>')
+            for e in self.edges():
+                lines.append(f'    <edge source={quoteattr(_node_id(e.a))} target={quoteattr(_node_id(e.b))}>')
+                if e.best_snr is not None:
+                    lines.append(f'      <data key="snr">{e.best_snr}</data>')
+                lines.append(f'      <data key="last_seen">{e.last_seen}</data>')
+                lines.append(f'      <data key="source">{_escape(",".join(sorted(e.sources)))}</data>')
+                lines.append('    </edge>')
+        lines.append('  </graph>')
+        lines.append('</graphml>')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(text: str) -> str:
+    return quoteattr(text)[1:-1]
@@ -78,6 +78,11 @@ class DashboardPane(Container):
                 yield Static("Hardware", classes="card-title")
                 yield Static("Checking...", id="hw-status", classes="card-value")
 
+        with Horizontal(classes="status-cards"):
+            with Container(classes="card"):
+                yield Static("Channel Utilization", classes="card-title")
+                yield Static("Checking...", id="channel-status", classes="card-value")
+
         yield Static("## Recent Logs", classes="section-title")
         yield Log(id="dashboard-log", classes="log-panel")
 
@@ -152,6 +157,21 @@ class DashboardPane(Container):
         else:
             self.query_one("#hw-status", Static).update("[yellow]Check settings[/yellow]")
 
+        # Channel utilization - rolling stats kept by the radio broker
+        try:
+            from monitoring.broker import try_broker
+            from monitoring.channel_analytics import format_summary_line
+            loop = asyncio.get_event_loop()
+            summary = await loop.run_in_executor(None, try_broker, 'get_channel_analytics')
+            channel_widget = self.query_one("#channel-status", Static)
+            if summary is None:
+                channel_widget.update("[yellow]Radio broker not running[/yellow]")
+            else:
+                color = {'ok': 'green', 'warning': 'yellow'}.get(summary['level'], 'red')
+                channel_widget.update(f"[{color}]{format_summary_line(summary)}[/{color}]")
+        except Exception:
+            self.query_one("#channel-status", Static).update("[red]Error[/red]")
+
         # Logs
         try:
             result = await asyncio.create_subprocess_exec(
@@ -664,6 +684,17 @@ class CLIPane(Container):
     @work
     async def run_meshtastic(self, host: str, args: list, output: Log):
         """Run meshtastic command"""
+        # Node list is served from memory when the radio broker is running
+        if args == ['--nodes'] and host in ('localhost', '127.0.0.1'):
+            from monitoring.broker import try_broker
+            loop = asyncio.get_event_loop()
+            nodes = await loop.run_in_executor(None, try_broker, 'get_nodes')
+            if nodes is not None:
+                output.write(f"[dim]radio broker: {len(nodes)} node(s)[/dim]\n")
+                for n in nodes:
+                    output.write(f"{n['node_id']}  {n['long_name']} ({n['short_name']})")
+                return
+
         # Find meshtastic CLI
         cli_path = self._find_meshtastic_cli()
         if not cli_path:
@@ -0,0 +1,242 @@
+"""Incremental journald log tailing
+
+JournalFollower runs one long-lived `journalctl -u <unit> -f -o json`
+process and keeps the most recent entries in a bounded ring buffer.
+Every entry carries its journal cursor, so readers ask for "everything
+after cursor X" and get only the new entries, in time proportional to
+how many there are, instead of re-running `journalctl -n 100` for every
+request. Any number of readers share the one follower.
+
+Usage:
+    journal = JournalFollower('meshtasticd')
+    entries, cursor, reset = journal.read()                # recent backlog
+    entries, cursor, reset = journal.read(after=cursor)    # only new entries
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+# Seconds between attempts to start journalctl after it failed to run
+RETRY_INTERVAL = 60.0
+# How long a first read waits for the initial backlog to arrive
+BACKLOG_WAIT = 1.0
+
+
+def _message_text(value: Any) -> str:
+    # journald sends non-UTF-8 messages as a list of byte values
+    if isinstance(value, list):
+        return bytes(value).decode('utf-8', errors='replace')
+    return value or ''
+
+
+def format_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    """journalctl JSON record -> entry with a journalctl-style text line"""
+    try:
+        ts = int(record.get('__REALTIME_TIMESTAMP', 0)) / 1e6
+    except ValueError:
+        ts = 0.0
+    message = _message_text(record.get('MESSAGE'))
+    ident = record.get('SYSLOG_IDENTIFIER') or record.get('_COMM') or ''
+    pid = record.get('_PID')
+    stamp = datetime.fromtimestamp(ts).strftime('%b %d %H:%M:%S') if ts else ''
+    host = record.get('_HOSTNAME', '')
+    prefix = f"{ident}[{pid}]" if pid else ident
+    try:
+        priority = int(record.get('PRIORITY', 6))
+    except ValueError:
+        priority = 6
+    return {
+        'cursor': record.get('__CURSOR'),
+        'ts': ts,
+        'priority': priority,
+        'message': message,
+        'line': f"{stamp} {host} {prefix}: {message}".strip(),
+    }
+
+
+class JournalFollower:
+    """Shared `journalctl -f` follower with a cursor-indexed ring buffer"""
+
+    def __init__(self, unit: str = 'meshtasticd', maxlen: int = 2000, backlog: int = 200,
+                 command: Optional[List[str]] = None):
+        """
+        Args:
+            unit: systemd unit to follow
+            maxlen: Entries kept in memory
+            backlog: Entries loaded from the journal when the follower starts
+            command: Override the journalctl command (for other sources)
+        """
+        self.unit = unit
+        self.maxlen = maxlen
+        self.command = command or ['journalctl', '-u', unit, '-f', '-o', 'json',
+                                   '-n', str(backlog), '--no-pager']
+        self._entries: deque = deque()
+        self._seq_of: Dict[str, int] = {}   # cursor -> sequence number
+        self._next_seq = 0
+        self._changed = threading.Condition()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._stopped = False
+        self._started_at = 0.0
+        self._failed_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.restarts = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Start following (idempotent); False if journalctl can't run"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return True
+            if self._failed_at is not None and time.monotonic() - self._failed_at < RETRY_INTERVAL:
+                return False
+            self._stopped = False
+            try:
+                self._spawn()
+            except OSError as e:
+                self.error = str(e)
+                self._failed_at = time.monotonic()
+                logger.warning(f"Cannot follow journal for {self.unit}: {e}")
+                return False
+            self._failed_at = None
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        self._stopped = True
+        proc = self._proc
+        if proc and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        with self._changed:
+            self._changed.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _spawn(self):
+        self._proc = subprocess.Popen(
+            self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace', bufsize=1)
+
+    def _run(self):
+        delay = 1.0
+        while not self._stopped:
+            proc = self._proc
+            for raw in proc.stdout:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                self._append(format_entry(record))
+                delay = 1.0
+            proc.wait()
+            if self._stopped:
+                break
+            # journalctl exited (journald restart, rotation...): resume after
+            # the last cursor we saw so nothing is duplicated or lost
+            self.error = f"journalctl exited with status {proc.returncode}"
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+            last = self._entries[-1]['cursor'] if self._entries else None
+            if last:
+                self.command = [arg for arg in self.command if not arg.startswith('--after-cursor=')]
+                self.command.append(f'--after-cursor={last}')
+            try:
+                self._spawn()
+                self.restarts += 1
+            except OSError as e:
+                self.error = str(e)
+                return
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._changed:
+            entry['seq'] = self._next_seq
+            self._next_seq += 1
+            if len(self._entries) >= self.maxlen:
+                old = self._entries.popleft()
+                self._seq_of.pop(old['cursor'], None)
+            self._entries.append(entry)
+            if entry['cursor']:
+                self._seq_of[entry['cursor']] = entry['seq']
+            self._changed.notify_all()
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def read(self, after: Optional[str] = None,
+             limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+        """
+        Entries newer than a cursor.
+
+        Args:
+            after: Cursor of the last entry the caller has (None: recent tail)
+            limit: Most entries to return (the newest ones)
+
+        Returns:
+            (entries, cursor of the newest entry, reset) - reset is True when
+            `after` is unknown (evicted or from before this follower started)
+            and the caller got the recent tail instead of a continuation
+        """
+        self.start()
+        with self._changed:
+            # Right after start the backlog is still streaming in; wait
+            # until it pauses (bounded by BACKLOG_WAIT)
+            while self.running:
+                remaining = self._started_at + BACKLOG_WAIT - time.monotonic()
+                if remaining <= 0:
+                    break
+                count = self._next_seq
+                self._changed.wait(min(remaining, 0.05))
+                if count and self._next_seq == count:
+                    break
+            entries = self._entries
+            last_cursor = entries[-1]['cursor'] if entries else after
+            seq = self._seq_of.get(after) if after else None
+            if after and seq is None:
+                reset = True
+            else:
+                reset = after is None
+            # Walk back from the newest entry: O(new entries), not O(buffer)
+            new = []
+            for entry in reversed(entries):
+                if (seq is not None and entry['seq'] <= seq) or len(new) >= limit:
+                    break
+                new.append(entry)
+            new.reverse()
+            return new, last_cursor, reset
+
+    def wait(self, after: Optional[str], timeout: float) -> bool:
+        """Block until there is an entry newer than `after` (or timeout)"""
+        self.start()
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not self._stopped:
+                if self._entries and self._entries[-1]['cursor'] != after:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return False
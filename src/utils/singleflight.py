@@ -0,0 +1,172 @@
+"""Single-flight memoization for expensive calls
+
+Concurrent callers asking for the same key share one backend call
+instead of each starting their own: the first caller runs the function,
+the others wait for it and get the same result (or exception).
+
+Results are cached for `ttl` seconds. For `stale_ttl` seconds after
+that, callers get the stale value immediately while one background
+call refreshes it (stale-while-revalidate), so nobody waits on a slow
+backend just because the cache expired.
+
+Usage:
+    radio = SingleFlight(ttl=30, stale_ttl=300)
+    info = radio.do('info', fetch_radio_info)
+    info = radio.refresh('info', fetch_radio_info)   # bypass the cache
+
+    @singleflight(ttl=10, cache_if=lambda r: 'error' not in r)
+    def get_nodes():
+        ...
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.setLevel(logging.WARNING)
+
+
+class _Call:
+    """One in-flight backend call and the callers waiting for it"""
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Per-key call coalescing with a TTL cache and stale-while-revalidate"""
+
+    def __init__(self, ttl: float = 0.0, stale_ttl: float = 0.0,
+                 cache_if: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            ttl: Seconds a result is served from cache (0: coalesce only)
+            stale_ttl: Further seconds a stale result is served while refreshing
+            cache_if: Predicate deciding whether a result may be cached
+                (e.g. not error dicts); uncached results are still shared
+                with the callers that waited for them
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache_if = cache_if
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cache: Dict[Hashable, tuple] = {}  # key -> (result, stored_at)
+        self.hits = 0
+        self.stale_hits = 0
+        self.shared = 0
+        self.calls = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Return the cached result for key, or run fn(*args, **kwargs) once
+        for all concurrent callers.
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                age = time.monotonic() - cached[1]
+                if age < self.ttl:
+                    self.hits += 1
+                    return cached[0]
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._calls:
+                        call = self._calls[key] = _Call()
+                        threading.Thread(target=self._run, args=(key, call, fn, args, kwargs, True),
+                                         daemon=True).start()
+                    return cached[0]
+            call, leader = self._join(key)
+        return self._finish(key, call, leader, fn, args, kwargs)
+
+    def refresh(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """Bypass the cache, but still join a call already in flight"""
+        with self._lock:
+            call, leader = self._join(key)
+        return self._finish(key, call, leader, fn, args, kwargs)
+
+    def forget(self, key: Hashable):
+        """Drop a cached result"""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'shared': self.shared,
+            'in_flight': len(self._calls),
+        }
+
+    def _join(self, key: Hashable):
+        # Caller holds self._lock
+        call = self._calls.get(key)
+        if call is not None:
+            call.waiters += 1
+            self.shared += 1
+            return call, False
+        call = self._calls[key] = _Call()
+        return call, True
+
+    def _finish(self, key, call: _Call, leader: bool, fn, args, kwargs) -> Any:
+        if leader:
+            self._run(key, call, fn, args, kwargs)
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _run(self, key, call: _Call, fn, args, kwargs, background: bool = False):
+        self.calls += 1
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            if background:
+                logger.warning(f"Background refresh of {key!r} failed: {e}")
+        with self._lock:
+            if call.error is None and (self.cache_if is None or self.cache_if(call.result)):
+                self._cache[key] = (call.result, time.monotonic())
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+
+def singleflight(ttl: float = 0.0, stale_ttl: float = 0.0,
+                 cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Decorator form of SingleFlight keyed by the call arguments.
+
+    The wrapped function gains .refresh(*args, **kwargs), .forget(*args,
+    **kwargs) and .flight (the SingleFlight instance).
+    """
+    def decorator(fn):
+        flight = SingleFlight(ttl=ttl, stale_ttl=stale_ttl, cache_if=cache_if)
+
+        def make_key(args, kwargs):
+            return (args, tuple(sorted(kwargs.items())))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flight.do(make_key(args, kwargs), fn, *args, **kwargs)
+
+        wrapper.refresh = lambda *args, **kwargs: flight.refresh(make_key(args, kwargs), fn, *args, **kwargs)
+        wrapper.forget = lambda *args, **kwargs: flight.forget(make_key(args, kwargs))
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
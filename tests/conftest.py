@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the project the same way `python3 -m src.monitor` does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
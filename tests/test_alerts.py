@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from src.monitoring.alerts import AlertEngine, AlertLog, Condition, parse_duration, parse_rules
+from src.monitoring.node_table import NodeTable
+
+
+class Harness:
+    """AlertEngine fed from a NodeTable, the way NodeMonitor feeds it"""
+
+    def __init__(self, rules):
+        self.table = NodeTable()
+        self.sent = []
+        self.engine = AlertEngine(rules=parse_rules(rules), sinks=[self.sent.append])
+        self.now = time.time()
+
+    def update(self, node_id, advance=0.0, **fields):
+        self.now += advance
+        view, is_new, changes = self.table.merge(node_id, int(node_id[1:], 16), fields)
+        self.engine.evaluate(view, None if is_new else changes, now=self.now)
+
+    def tick(self, advance):
+        self.now += advance
+        self.engine.poll(self.now)
+
+    def states(self):
+        return [(alert.rule, alert.node_id, alert.state) for alert in self.sent]
+
+
+def test_parse_duration_and_conditions():
+    assert parse_duration('90s') == 90
+    assert parse_duration('10m') == 600
+    assert parse_duration('2h') == 7200
+    assert parse_duration(5) == 5.0
+    with pytest.raises(ValueError):
+        parse_duration('soon')
+
+    condition = Condition.parse('battery_level < 20 for 10m')
+    assert (condition.field, condition.op, condition.value, condition.hold) == ('battery_level', '<', 20.0, 600)
+    assert Condition.parse('last_heard > 2h').value == 7200
+    with pytest.raises(ValueError):
+        Condition.parse('bogus < 1')
+    with pytest.raises(ValueError):
+        Condition.parse('last_heard < 2h')
+
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        parse_rules([{'name': 'x'}])
+    with pytest.raises(ValueError):
+        parse_rules(['snr < 1', {'name': 'snr < 1', 'when': 'snr < 2'}])
+    with pytest.raises(ValueError):
+        parse_rules([{'when': 'snr < 1', 'severity': 'loud'}])
+    with pytest.raises(ValueError):
+        parse_rules([{'when': 'snr < 1', 'clear': 'battery_level > 1'}])
+
+
+def test_fires_once_and_resolves_with_hysteresis():
+    h = Harness([{'name': 'low', 'when': 'battery_level < 20', 'hysteresis': 5}])
+    h.update('!00000001', battery_level=50)
+    h.update('!00000001', battery_level=15)
+    h.update('!00000001', battery_level=10)
+    h.update('!00000001', battery_level=22)   # above threshold, inside hysteresis
+    assert h.states() == [('low', '!00000001', 'firing')]
+    h.update('!00000001', battery_level=25)
+    assert h.states() == [('low', '!00000001', 'firing'), ('low', '!00000001', 'resolved')]
+
+
+def test_hold_time_fires_from_the_timer():
+    h = Harness([{'name': 'low', 'when': 'battery_level < 20 for 10m'}])
+    h.update('!00000001', battery_level=10)
+    h.tick(300)
+    assert h.sent == []
+    h.tick(301)
+    assert h.states() == [('low', '!00000001', 'firing')]
+
+
+def test_recovery_during_hold_cancels():
+    h = Harness([{'name': 'low', 'when': 'battery_level < 20 for 10m'}])
+    h.update('!00000001', battery_level=10)
+    h.update('!00000001', advance=60, battery_level=50)
+    h.tick(1200)
+    assert h.sent == []
+
+
+def test_age_rule_fires_when_not_heard():
+    h = Harness([{'name': 'silent', 'when': 'last_heard > 1h'}])
+    h.update('!00000001', last_heard=h.now)
+    h.tick(1800)
+    assert h.sent == []
+    h.tick(1801)
+    assert h.states() == [('silent', '!00000001', 'firing')]
+    h.update('!00000001', advance=10, last_heard=h.now + 10)
+    assert h.states()[-1] == ('silent', '!00000001', 'resolved')
+
+
+def test_only_rules_on_changed_fields_run():
+    h = Harness(['battery_level < 20', 'snr < -10'])
+    h.update('!00000001', battery_level=50, snr=0.0)
+    evaluations = h.engine.evaluations
+    h.update('!00000001', snr=1.0)
+    assert h.engine.evaluations == evaluations + 1
+
+
+def test_node_filter_and_cooldown():
+    h = Harness([{'name': 'busy', 'when': 'channel_utilization > 40', 'nodes': ['!00000002'],
+                  'cooldown': '15m'}])
+    h.update('!00000001', channel_utilization=90.0)
+    h.update('!00000002', channel_utilization=90.0)
+    h.update('!00000002', advance=60, channel_utilization=10.0)
+    h.update('!00000002', advance=60, channel_utilization=90.0)   # within cooldown
+    assert h.states() == [('busy', '!00000002', 'firing'), ('busy', '!00000002', 'resolved')]
+    assert [a['node_id'] for a in h.engine.active_alerts()] == ['!00000002']
+
+
+def test_node_removed_resolves_firing_alerts():
+    h = Harness(['battery_level < 20'])
+    h.update('!00000001', battery_level=5)
+    h.engine.node_removed('!00000001')
+    assert h.states()[-1] == ('battery_level < 20', '!00000001', 'resolved')
+    assert h.engine.active_alerts() == []
+
+
+def test_alert_log_since():
+    log = AlertLog(maxlen=2)
+    h = Harness(['battery_level < 20'])
+    h.engine.sinks.append(log)
+    for num in range(1, 4):
+        h.update(f"!{num:08x}", battery_level=5)
+    assert [a.node_id for a in log.since(0)] == ['!00000002', '!00000003']
+    assert [a.node_id for a in log.since(2)] == ['!00000003']
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+
+import pytest
+
+from src.monitoring import broker as broker_module
+from src.monitoring.broker import (
+    MAX_REQUEST_BYTES, SOCKET_MODE, SYSTEM_SOCKET_PATH, USER_SOCKET_NAME, BrokerClient,
+    BrokerError, BrokerRequestError, RadioBroker, default_socket_path, try_broker,
+)
+
+
+def closed_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def with_broker(tmp_path, scenario):
+    """Run scenario(broker, path) against a started broker; blocking calls go to a thread"""
+    path = str(tmp_path / 'broker.sock')
+
+    async def main():
+        # No meshtasticd behind it: the broker still serves its in-memory state
+        broker = RadioBroker('127.0.0.1', closed_port(), socket_path=path)
+        await broker.start()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, scenario, broker, path)
+        finally:
+            await broker.stop()
+
+    return asyncio.run(asyncio.wait_for(main(), 20))
+
+
+def exchange(path, data: bytes, replies: int = 1):
+    """Send raw bytes on one connection and read `replies` JSON lines"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(path)
+    try:
+        sock.sendall(data)
+        buf = b''
+        while buf.count(b'\n') < replies:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    finally:
+        sock.close()
+    return [json.loads(line) for line in buf.splitlines()]
+
+
+def test_json_lines_requests_share_one_connection(tmp_path):
+    def scenario(broker, path):
+        requests = b''.join(json.dumps({'method': m}).encode('utf-8') + b'\n'
+                            for m in ('ping', 'get_node_count', 'ping'))
+        assert exchange(path, requests, replies=3) == [
+            {'result': 'pong'}, {'result': 0}, {'result': 'pong'}]
+        assert broker.requests_served == 3
+
+    with_broker(tmp_path, scenario)
+
+
+def test_client_calls_and_errors(tmp_path):
+    def scenario(broker, path):
+        client = BrokerClient(path)
+        assert client.available()
+        assert client.call('ping') == 'pong'
+        assert client.call('status')['state'] in ('disconnected', 'connecting', 'reconnecting')
+
+        # An unknown method is a plain error: an older broker, not a bad call
+        with pytest.raises(BrokerError) as info:
+            client.call('no_such_method')
+        assert not isinstance(info.value, BrokerRequestError)
+        with pytest.raises(BrokerRequestError):
+            client.call('ping', unexpected=1)
+        # Methods that report their own problems still return a result
+        assert 'error' in client.call('send_text', text='  ')
+
+    with_broker(tmp_path, scenario)
+
+
+@pytest.mark.parametrize('line', [b'not json\n', b'[1, 2]\n', b'{"method": "ping", "params": [1]}\n'])
+def test_malformed_requests_are_bad_requests(tmp_path, line):
+    def scenario(broker, path):
+        reply, = exchange(path, line)
+        assert reply['bad_request'] is True
+        assert reply['error'].startswith('Bad request')
+
+    with_broker(tmp_path, scenario)
+
+
+def test_oversize_request_is_rejected(tmp_path):
+    def scenario(broker, path):
+        request = json.dumps({'method': 'ping', 'params': {'pad': 'x' * MAX_REQUEST_BYTES}})
+        reply, = exchange(path, request.encode('utf-8') + b'\n')
+        assert reply == {'error': 'Request too large', 'bad_request': True}
+        # The broker keeps serving other clients
+        assert BrokerClient(path).call('ping') == 'pong'
+
+    with_broker(tmp_path, scenario)
+
+
+def test_socket_is_group_only(tmp_path):
+    def scenario(broker, path):
+        mode = os.stat(path).st_mode
+        assert stat.S_ISSOCK(mode)
+        assert stat.S_IMODE(mode) == SOCKET_MODE == 0o660
+
+    with_broker(tmp_path, scenario)
+    assert not os.path.exists(tmp_path / 'broker.sock')
+
+
+def test_refuses_to_replace_a_live_broker_or_a_file(tmp_path):
+    def scenario(broker, path):
+        with pytest.raises(BrokerError, match="already running"):
+            broker_module._prepare_socket_path(path)
+
+    with_broker(tmp_path, scenario)
+
+    regular = tmp_path / 'not-a-socket'
+    regular.write_text('data')
+    with pytest.raises(BrokerError, match="not a socket"):
+        broker_module._prepare_socket_path(str(regular))
+    assert regular.exists()
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / 'broker.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    broker_module._prepare_socket_path(path)
+    assert not os.path.exists(path)
+
+
+class TestSocketPath:
+    @pytest.fixture(autouse=True)
+    def env(self, monkeypatch, tmp_path):
+        monkeypatch.delenv('MESHTASTIC_BROKER_SOCKET', raising=False)
+        monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+        self.monkeypatch = monkeypatch
+        self.user_path = str(tmp_path / USER_SOCKET_NAME)
+
+    def as_uid(self, uid):
+        self.monkeypatch.setattr(broker_module.os, 'geteuid', lambda: uid)
+
+    def test_override_wins(self):
+        self.monkeypatch.setenv('MESHTASTIC_BROKER_SOCKET', '/somewhere/b.sock')
+        assert default_socket_path() == default_socket_path(server=True) == '/somewhere/b.sock'
+
+    def test_users_serve_from_the_runtime_dir_and_root_from_run(self):
+        self.as_uid(1000)
+        assert default_socket_path(server=True) == self.user_path
+        self.as_uid(0)
+        assert default_socket_path(server=True) == SYSTEM_SOCKET_PATH
+
+    def test_without_a_runtime_dir_only_the_system_path_is_used(self):
+        self.monkeypatch.delenv('XDG_RUNTIME_DIR')
+        self.as_uid(1000)
+        assert default_socket_path(server=True) == SYSTEM_SOCKET_PATH
+
+    def test_clients_pick_the_socket_that_exists(self):
+        self.as_uid(1000)
+        if os.path.exists(SYSTEM_SOCKET_PATH):
+            pytest.skip("a system broker is running here")
+        open(self.user_path, 'w').close()
+        assert default_socket_path() == self.user_path
+
+
+def test_try_broker_falls_back_to_none(tmp_path, monkeypatch):
+    path = tmp_path / 'broker.sock'
+    monkeypatch.setenv('MESHTASTIC_BROKER_SOCKET', str(path))
+    # No socket at all
+    assert try_broker('ping') is None
+    # A socket file nobody listens on
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    assert try_broker('ping') is None
+    path.unlink()
+
+    def scenario(broker, path):
+        assert try_broker('ping') == 'pong'
+        assert try_broker('no_such_method') is None
+        assert try_broker('ping', unexpected=1) is None
+
+    with_broker(tmp_path, scenario)
@@ -0,0 +1,123 @@
+import os
+
+import pytest
+
+from src.monitoring.capture import (
+    FOOTER, HEADER, INDEX_EVERY, CaptureError, CaptureReader, CaptureWriter,
+)
+from src.monitoring.fake_daemon import encode_config_complete
+
+START = 1700000000.0
+
+
+def payload(i):
+    return bytes([i % 251]) * (i % 40)
+
+
+def write_capture(path, count, close=True):
+    """count records 10ms apart; the first three are a config download"""
+    writer = CaptureWriter(path, start_time=START)
+    for i in range(count):
+        writer.write(payload(i), timestamp=START + i * 0.01, config=i < 3)
+    if close:
+        writer.close()
+    else:
+        writer.flush()
+    return writer
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    write_capture(path, 10)
+    with CaptureReader(path) as reader:
+        assert reader.indexed
+        assert reader.start_time == START and reader.count == 10
+        records = list(reader)
+        assert [p for _, p, _ in records] == [payload(i) for i in range(10)]
+        assert [c for _, _, c in records] == [True] * 3 + [False] * 7
+        assert [t for t, _, _ in records] == pytest.approx([START + i * 0.01 for i in range(10)])
+        assert reader.duration == pytest.approx(0.09)
+        assert len(list(reader.live_records())) == 7
+
+
+def test_timestamps_never_go_backwards(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    with CaptureWriter(path, start_time=START) as writer:
+        writer.write(b'a', timestamp=START + 2)
+        writer.write(b'b', timestamp=START + 1)
+    with CaptureReader(path) as reader:
+        assert [t - START for t, _, _ in reader] == [2.0, 2.0]
+
+
+def test_config_payloads_stop_at_config_complete(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    with CaptureWriter(path, start_time=START) as writer:
+        writer.write(b'\x1a\x00', config=True)
+        writer.write(encode_config_complete(7), config=True)
+        writer.write(b'\x1a\x01', config=True)
+        writer.write(b'live')
+    with CaptureReader(path) as reader:
+        assert reader.config_payloads() == [b'\x1a\x00']
+
+
+@pytest.mark.parametrize('close', [True, False])
+def test_seek_matches_a_linear_scan(tmp_path, close):
+    path = tmp_path / 'mesh.cap'
+    count = INDEX_EVERY * 3 + 17
+    write_capture(path, count, close=close)
+    with CaptureReader(path) as reader:
+        assert reader.indexed == close
+        assert reader.count == count
+        everything = list(reader)
+        for i in (0, 1, INDEX_EVERY - 1, INDEX_EVERY, INDEX_EVERY + 1, count - 1):
+            start = START + i * 0.01
+            expected = [r for r in everything if r[0] >= start - 1e-6]
+            assert list(reader.records(start=start - 1e-6)) == expected
+            assert expected[0][1] == payload(i)
+        assert list(reader.records(start=START + count)) == []
+
+
+def test_unclosed_capture_is_recovered_by_scan(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    write_capture(path, 600, close=False)
+    with CaptureReader(path) as reader:
+        assert not reader.indexed
+        assert reader.count == 600
+        assert [p for _, p, _ in reader] == [payload(i) for i in range(600)]
+        assert reader.duration == pytest.approx(5.99)
+
+
+def test_torn_final_record_is_dropped(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    last = payload(INDEX_EVERY)
+    # Cut inside the payload, all of it, and the length varint after it
+    for cut in (1, len(last), len(last) + 1):
+        write_capture(path, INDEX_EVERY + 1, close=False)
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - cut)
+        with CaptureReader(path) as reader:
+            assert reader.count == INDEX_EVERY
+            records = list(reader)
+            assert len(records) == INDEX_EVERY
+            assert records[-1][1] == payload(INDEX_EVERY - 1)
+            # The last index entry pointed at the torn record and is gone
+            assert all(offset < reader._end for _, offset in reader._index)
+            assert list(reader.records(start=START + 100)) == []
+
+
+def test_header_only_capture_is_empty(tmp_path):
+    path = tmp_path / 'mesh.cap'
+    CaptureWriter(path, start_time=START).flush()
+    with CaptureReader(path) as reader:
+        assert reader.count == 0 and list(reader) == [] and reader.duration == 0.0
+    assert os.path.getsize(path) == HEADER.size < HEADER.size + FOOTER.size
+
+
+@pytest.mark.parametrize('data, error', [
+    (b'', 'empty'), (b'MSHCAP01', 'truncated'), (b'NOTACAPTURE-FILE', 'not a capture'),
+])
+def test_unreadable_files(tmp_path, data, error):
+    path = tmp_path / 'bad.cap'
+    path.write_bytes(data)
+    with pytest.raises(CaptureError, match=error):
+        CaptureReader(path)
@@ -0,0 +1,77 @@
+from src.monitoring.dedup import PacketDedupCache
+
+
+def packet(packet_id, sender=0x42, relay=None, hop_start=None, hop_limit=None):
+    packet = {'from': sender, 'id': packet_id}
+    if relay is not None:
+        packet['relayNode'] = relay
+    if hop_start is not None:
+        packet['hopStart'], packet['hopLimit'] = hop_start, hop_limit
+    return packet
+
+
+def test_only_the_first_copy_is_delivered():
+    cache = PacketDedupCache(window=600)
+    assert cache.observe(packet(1, relay=0x10, hop_start=3, hop_limit=3), now=100)
+    assert not cache.observe(packet(1, relay=0x20, hop_start=3, hop_limit=1), now=101)
+    assert not cache.observe(packet(1, relay=0x10, hop_start=3, hop_limit=2), now=102)
+    # Same id from another sender is a different packet
+    assert cache.observe(packet(1, sender=0x43), now=103)
+
+    record = cache.get(0x42, 1)
+    assert (record.copies, record.min_hops, record.max_hops) == (3, 0, 2)
+    assert record.relays == [0x10, 0x20, 0x10]
+    assert (record.first_seen, record.last_seen) == (100, 102)
+    assert record.to_dict()['from'] == '!00000042'
+
+    stats = {s.relay: s for s in cache.get_relay_stats()}
+    assert (stats[0x10].relayed, stats[0x10].first, stats[0x10].redundant) == (2, 1, 1)
+    assert (stats[0x20].relayed, stats[0x20].redundant_ratio) == (1, 1.0)
+    assert cache.get_stats()['unique'] == 2
+    assert cache.get_stats()['duplicates'] == 2
+    assert cache.get_stats()['copies_per_packet'] == 2.0
+
+
+def test_packets_without_sender_or_id_are_always_delivered():
+    cache = PacketDedupCache()
+    for _ in range(2):
+        assert cache.observe({'from': 0x42}, now=1)
+        assert cache.observe({'id': 7}, now=1)
+    assert cache.untracked == 4
+    assert len(cache) == 0
+
+
+def test_a_copy_after_the_window_is_new():
+    cache = PacketDedupCache(window=60)
+    assert cache.observe(packet(1), now=1000)
+    assert cache.observe(packet(2), now=1030)
+    assert not cache.observe(packet(1), now=1060)    # exactly at the edge
+    # Expiry goes by first sighting, not the last copy
+    assert cache.observe(packet(1), now=1061)
+    assert cache.get(0x42, 1).copies == 1
+    assert len(cache) == 2
+    assert cache.observe(packet(3), now=1091)
+    assert cache.get(0x42, 2) is None
+    assert not cache.observe(packet(1), now=1091)
+    assert cache.evicted == 0
+
+
+def test_oldest_entries_are_evicted_past_max_entries():
+    cache = PacketDedupCache(window=600, max_entries=3)
+    for packet_id in range(1, 6):
+        assert cache.observe(packet(packet_id), now=packet_id)
+    assert len(cache) == 3
+    assert cache.evicted == 2
+    assert cache.get(0x42, 1) is None and cache.get(0x42, 2) is None
+    assert not cache.observe(packet(5), now=10)
+    # An evicted packet is delivered again
+    assert cache.observe(packet(1), now=10)
+    assert cache.get(0x42, 3) is None
+
+
+def test_clear_forgets_packets_and_relays():
+    cache = PacketDedupCache()
+    cache.observe(packet(1, relay=0x10), now=1)
+    cache.clear()
+    assert len(cache) == 0 and cache.get_relay_stats() == []
+    assert cache.observe(packet(1), now=2)
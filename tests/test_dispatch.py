@@ -0,0 +1,221 @@
+import threading
+import time
+
+import pytest
+
+from src.monitoring.dispatch import EventDispatcher, OverflowPolicy
+
+
+class Node:
+    def __init__(self, node_id, **fields):
+        self.node_id = node_id
+        self.__dict__.update(fields)
+
+
+class Recorder:
+    """Node handlers that hold the worker on its first event until released"""
+
+    def __init__(self):
+        self.events = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _record(self, item):
+        self.events.append(item)
+        self.started.set()
+        self.release.wait(5)
+
+    def handlers(self):
+        return {
+            'node_added': lambda node: self._record(('added', node.node_id)),
+            'node_update': lambda node: self._record(('update', node.node_id)),
+            'node_changed': lambda node, changes: self._record(('changed', node.node_id, changes)),
+            'node_removed': lambda node_id: self._record(('removed', node_id)),
+        }
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = EventDispatcher()
+    yield dispatcher
+    dispatcher.close(timeout=2)
+
+
+def test_one_subscriber_sees_node_events_in_publish_order(dispatcher):
+    recorder = Recorder()
+    sub = dispatcher.subscribe_nodes(recorder.handlers(), name='test')
+    a, b = Node('!a'), Node('!b')
+
+    dispatcher.publish('node_added', a)
+    assert recorder.started.wait(2)
+    # Worker is busy with the add: everything below queues up
+    dispatcher.publish('node_changed', a, {'battery_level': 50})
+    dispatcher.publish('node_changed', a, {'battery_level': 40, 'snr': 3.0})
+    dispatcher.publish('node_changed', a, {'battery_level': 20})
+    dispatcher.publish('node_removed', '!a')
+    dispatcher.publish('node_added', b)
+    dispatcher.publish('node_changed', b, {'battery_level': 10})
+    recorder.release.set()
+    dispatcher.close(timeout=2)
+
+    assert recorder.events == [
+        ('added', '!a'),
+        ('changed', '!a', {'battery_level': 20, 'snr': 3.0}),
+        ('removed', '!a'),
+        ('added', '!b'),
+        ('changed', '!b', {'battery_level': 10}),
+    ]
+    assert sub.coalesced == 2
+    assert sub.dropped == 0
+
+
+def test_removal_is_a_barrier_for_coalescing(dispatcher):
+    recorder = Recorder()
+    dispatcher.subscribe_nodes(recorder.handlers())
+    a = Node('!a')
+
+    dispatcher.publish('node_added', Node('!z'))
+    assert recorder.started.wait(2)
+    dispatcher.publish('node_changed', a, {'snr': 1.0})
+    dispatcher.publish('node_removed', '!a')
+    dispatcher.publish('node_added', a)
+    # Must not merge into the change queued before the removal
+    dispatcher.publish('node_changed', a, {'snr': 2.0})
+    recorder.release.set()
+    dispatcher.close(timeout=2)
+
+    assert recorder.events[1:] == [
+        ('changed', '!a', {'snr': 1.0}),
+        ('removed', '!a'),
+        ('added', '!a'),
+        ('changed', '!a', {'snr': 2.0}),
+    ]
+
+
+def test_coalesces_per_node_and_event(dispatcher):
+    recorder = Recorder()
+    dispatcher.subscribe_nodes(recorder.handlers())
+    a, b = Node('!a'), Node('!b')
+
+    dispatcher.publish('node_added', Node('!z'))
+    assert recorder.started.wait(2)
+    for _ in range(3):
+        dispatcher.publish('node_update', a)
+        dispatcher.publish('node_update', b)
+    recorder.release.set()
+    dispatcher.close(timeout=2)
+
+    assert recorder.events[1:] == [('update', '!a'), ('update', '!b')]
+
+
+def test_subscribers_are_independent(dispatcher):
+    slow, fast = Recorder(), []
+    dispatcher.subscribe('node_added', lambda node: slow._record(node.node_id), name='slow')
+    dispatcher.subscribe('node_added', lambda node: fast.append(node.node_id), name='fast')
+    dispatcher.publish('node_added', Node('!a'))
+    dispatcher.publish('node_added', Node('!b'))
+    assert slow.started.wait(2)
+
+    for _ in range(100):
+        if len(fast) == 2:
+            break
+        time.sleep(0.01)
+    assert fast == ['!a', '!b']
+    slow.release.set()
+
+
+@pytest.mark.parametrize('policy, expected', [
+    (OverflowPolicy.DROP_OLDEST, [0, 3, 4]),
+    (OverflowPolicy.DROP_NEWEST, [0, 1, 2]),
+])
+def test_overflow_policies(dispatcher, policy, expected):
+    recorder = Recorder()
+    sub = dispatcher.subscribe('message', recorder._record, maxsize=2, policy=policy)
+    dispatcher.publish('message', 0)
+    assert recorder.started.wait(2)
+    for i in range(1, 5):
+        dispatcher.publish('message', i)
+    recorder.release.set()
+    dispatcher.close(timeout=2)
+
+    assert recorder.events == expected
+    assert sub.dropped == 2
+
+
+def test_handler_errors_are_counted_not_raised(dispatcher):
+    delivered = []
+
+    def handler(value):
+        if value == 1:
+            raise RuntimeError("boom")
+        delivered.append(value)
+
+    sub = dispatcher.subscribe('message', handler)
+    for value in range(3):
+        dispatcher.publish('message', value)
+    dispatcher.close(timeout=2)
+    assert delivered == [0, 2]
+    assert sub.errors == 1
+    assert sub.delivered == 3
+
+
+def test_synchronous_mode_runs_inline():
+    dispatcher = EventDispatcher(synchronous=True)
+    seen = []
+    dispatcher.subscribe('message', seen.append)
+    dispatcher.publish('message', 'x')
+    assert seen == ['x']
+
+
+def test_unsubscribe_and_validation(dispatcher):
+    sub = dispatcher.subscribe_nodes({'node_added': lambda node: None})
+    assert dispatcher.has_subscribers('node_added')
+    dispatcher.unsubscribe(sub)
+    assert not dispatcher.has_subscribers('node_added')
+
+    with pytest.raises(ValueError):
+        dispatcher.subscribe_nodes({'message': print})
+    with pytest.raises(ValueError):
+        dispatcher.subscribe('message', print, policy=OverflowPolicy.COALESCE)
+
+
+def test_event_put_while_the_worker_is_exiting_is_delivered(dispatcher, monkeypatch):
+    from src.monitoring import dispatch
+    seen = []
+    sub = dispatcher.subscribe('message', seen.append)
+    exiting, resume = threading.Event(), threading.Event()
+    original_pop = dispatch.Subscription._pop
+
+    def slow_exit(self):
+        entry = original_pop(self)
+        if entry is None and not exiting.is_set():
+            # The worker has decided to stop but its thread is still alive
+            exiting.set()
+            resume.wait(5)
+        return entry
+
+    monkeypatch.setattr(dispatch.Subscription, '_pop', slow_exit)
+    dispatcher.publish('message', 1)
+    sub.close(timeout=0)
+    assert exiting.wait(2)
+    dispatcher.publish('message', 2)
+    resume.set()
+
+    for _ in range(200):
+        if seen == [1, 2]:
+            break
+        time.sleep(0.01)
+    assert seen == [1, 2]
+
+
+def test_synchronous_delivery_counts_every_call():
+    dispatcher = EventDispatcher(synchronous=True)
+    sub = dispatcher.subscribe('message', lambda value: 1 / value)
+    threads = [threading.Thread(target=lambda: [dispatcher.publish('message', v) for v in (0, 1) * 500])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert sub.delivered == 4000
+    assert sub.errors == 2000
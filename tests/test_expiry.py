@@ -0,0 +1,76 @@
+import random
+
+from src.monitoring.expiry import DEFAULT_NODE_TTLS, TimerWheel, ttl_for_role
+
+
+def test_fires_at_deadline_not_before():
+    wheel = TimerWheel(tick=1.0, now=0)
+    wheel.schedule('a', 10)
+    assert wheel.advance(9) == []
+    assert wheel.advance(10) == ['a']
+    assert 'a' not in wheel
+    assert wheel.advance(20) == []
+
+
+def test_reschedule_moves_the_deadline():
+    wheel = TimerWheel(tick=1.0, now=0)
+    wheel.schedule('a', 10)
+    wheel.schedule('a', 30)
+    assert wheel.advance(15) == []
+    assert wheel.deadline('a') == 30
+    assert wheel.advance(30) == ['a']
+
+
+def test_cancel():
+    wheel = TimerWheel(tick=1.0, now=0)
+    wheel.schedule('a', 10)
+    assert wheel.cancel('a')
+    assert not wheel.cancel('a')
+    assert wheel.advance(100) == []
+    assert len(wheel) == 0
+
+
+def test_past_deadline_fires_on_next_tick():
+    wheel = TimerWheel(tick=1.0, now=100)
+    wheel.schedule('late', 50)
+    assert wheel.advance(101) == ['late']
+
+
+def test_cascades_from_coarse_wheels():
+    wheel = TimerWheel(tick=1.0, now=0)
+    wheel.schedule('hours', 5 * 3600 + 17)
+    assert wheel.advance(5 * 3600 + 16) == []
+    assert wheel.advance(5 * 3600 + 17) == ['hours']
+
+
+def test_jump_past_the_whole_wheel():
+    # e.g. resuming from suspend: everything due fires, the rest stays
+    wheel = TimerWheel(tick=1.0, levels=(10, 10), now=0)
+    wheel.schedule('due', 500)
+    wheel.schedule('later', 2000)
+    assert wheel.advance(1000) == ['due']
+    assert wheel.advance(1999) == []
+    assert wheel.advance(2000) == ['later']
+
+
+def test_matches_a_sorted_schedule():
+    rng = random.Random(7)
+    wheel = TimerWheel(tick=1.0, now=0)
+    deadlines = {f"n{i}": rng.randint(1, 30000) for i in range(500)}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    fired = {}
+    for now in range(0, 30001, 97):
+        for key in wheel.advance(now):
+            fired[key] = now
+    assert set(fired) == set(deadlines)
+    for key, now in fired.items():
+        # Fired on the first advance() at or after its deadline
+        assert deadlines[key] <= now < deadlines[key] + 97
+
+
+def test_ttl_for_role():
+    assert ttl_for_role('ROUTER', DEFAULT_NODE_TTLS) == 24 * 3600
+    assert ttl_for_role('CLIENT', DEFAULT_NODE_TTLS) == DEFAULT_NODE_TTLS['default']
+    assert ttl_for_role(None, {'default': None}) is None
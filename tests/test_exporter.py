@@ -0,0 +1,77 @@
+import re
+import time
+
+import pytest
+
+from src.monitoring.exporter import MetricsExporter, escape_label, render_host_stats
+from src.monitoring.node_monitor import NodeMonitor
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})? \S+$')
+
+
+@pytest.fixture
+def monitor():
+    monitor = NodeMonitor(host='localhost', port=1, sync_callbacks=True, dedup=True)
+    yield monitor
+    monitor.events.close()
+
+
+def samples(text, name):
+    return [line for line in text.splitlines() if line.startswith(name + '{') or line.startswith(name + ' ')]
+
+
+def test_exposition_names_labels_and_escaping(monitor):
+    monitor._apply_node_data('!00000001', {
+        'user': {'longName': 'Base "North"\\1\nA', 'shortName': 'BN'},
+        'deviceMetrics': {'batteryLevel': 87, 'voltage': 4.05}, 'snr': -3.25})
+    monitor._apply_node_data('!00000002', {'user': {'longName': 'Hill', 'shortName': 'HL'}, 'hopsAway': 2})
+    exporter = MetricsExporter(monitor, host_stats=lambda: {'cpu_percent': 12.5, 'temperature': None})
+    text = exporter.render()
+
+    for line in text.splitlines():
+        assert line.startswith('# HELP ') or line.startswith('# TYPE ') or SAMPLE.match(line), line
+    labels = r'{node="!00000001",name="Base \"North\"\\1\nA",short_name="BN"}'
+    assert samples(text, 'meshtastic_node_battery_level_percent') == [
+        f'meshtastic_node_battery_level_percent{labels} 87']
+    assert samples(text, 'meshtastic_node_voltage_volts')[0].endswith(' 4.05')
+    assert samples(text, 'meshtastic_node_snr_db') == [f'meshtastic_node_snr_db{labels} -3.25']
+    assert samples(text, 'meshtastic_node_hops_away') == [
+        'meshtastic_node_hops_away{node="!00000002",name="Hill",short_name="HL"} 2']
+    assert samples(text, 'meshtastic_nodes') == ['meshtastic_nodes 2']
+    assert samples(text, 'meshtastic_connected') == ['meshtastic_connected 0']
+    assert '# TYPE meshtastic_packets_duplicate_total counter' in text
+    assert samples(text, 'meshtastic_host_cpu_percent') == ['meshtastic_host_cpu_percent 12.5']
+    assert 'meshtastic_host_temperature_celsius' not in text
+    assert exporter.render_bytes() == text.encode('utf-8')
+
+
+def test_exposition_follows_node_changes(monitor):
+    monitor._apply_node_data('!00000001', {'user': {'longName': 'A'}, 'deviceMetrics': {'batteryLevel': 50}})
+    exporter = MetricsExporter(monitor, host_stats=None)
+    first = exporter.render()
+    exporter.render()
+    assert exporter.renders == 1    # unchanged table: cached body
+
+    monitor._apply_node_data('!00000001', {'deviceMetrics': {'batteryLevel': 40}})
+    text = exporter.render()
+    assert samples(text, 'meshtastic_node_battery_level_percent') == [
+        'meshtastic_node_battery_level_percent{node="!00000001",name="A",short_name=""} 40']
+    assert text != first
+
+    # A label change re-renders every family with the new name
+    monitor._apply_node_data('!00000001', {'user': {'longName': 'B'}})
+    assert 'name="A"' not in exporter.render()
+
+    assert monitor.expire_stale(now=time.time() + 365 * 86400) == ['!00000001']
+    text = exporter.render()
+    assert samples(text, 'meshtastic_node_battery_level_percent') == []
+    assert 'meshtastic_host_' not in text
+    exporter.close()
+
+
+def test_helpers():
+    assert escape_label('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+    assert render_host_stats({'load1': 0.5, 'mem_percent': 'n/a'}) == (
+        '# HELP meshtastic_host_load1 Host 1 minute load average\n'
+        '# TYPE meshtastic_host_load1 gauge\n'
+        'meshtastic_host_load1 0.5\n')
@@ -0,0 +1,104 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+from src.utils.journal import JournalFollower, format_entry
+
+# Stands in for `journalctl -f -o json`: prints the records for its
+# --after-cursor position, then exits (EXIT=1) or keeps following
+FAKE_JOURNALCTL = textwrap.dedent('''
+    import json, sys, time
+    records = json.loads(sys.argv[1])
+    exit_first = sys.argv[2] == '1'
+    after = [a.split('=', 1)[1] for a in sys.argv[3:] if a.startswith('--after-cursor=')]
+    if after:
+        cursors = [r['__CURSOR'] for r in records]
+        records = records[cursors.index(after[-1]) + 1:]
+    elif exit_first:
+        records = records[:2]
+    for record in records:
+        print(json.dumps(record), flush=True)
+    if after or not exit_first:
+        time.sleep(30)
+''')
+
+
+def record(n, message=None):
+    return {'__CURSOR': f"c{n}", '__REALTIME_TIMESTAMP': str(1700000000000000 + n * 1000000),
+            'MESSAGE': message or f"line {n}", 'SYSLOG_IDENTIFIER': 'meshtasticd',
+            '_PID': '42', '_HOSTNAME': 'pi', 'PRIORITY': '6'}
+
+
+def follower(records, exit_first=False, maxlen=100):
+    command = [sys.executable, '-c', FAKE_JOURNALCTL, json.dumps(records), '1' if exit_first else '0']
+    return JournalFollower('meshtasticd', maxlen=maxlen, command=command)
+
+
+@pytest.fixture
+def journals():
+    started = []
+    yield started
+    for journal in started:
+        journal.stop()
+
+
+def test_format_entry():
+    entry = format_entry(record(1))
+    assert entry['cursor'] == 'c1'
+    assert entry['priority'] == 6
+    assert entry['line'].endswith('pi meshtasticd[42]: line 1')
+    # journald sends non-UTF-8 messages as byte lists
+    assert format_entry(dict(record(2), MESSAGE=list(b'caf\xc3\xa9')))['message'] == 'café'
+    assert format_entry({'PRIORITY': 'x', '__REALTIME_TIMESTAMP': 'y'})['priority'] == 6
+
+
+def test_reads_backlog_then_only_new_entries(journals):
+    journal = follower([record(n) for n in range(1, 6)])
+    journals.append(journal)
+
+    entries, cursor, reset = journal.read()
+    assert [e['cursor'] for e in entries] == ['c1', 'c2', 'c3', 'c4', 'c5']
+    assert cursor == 'c5'
+    assert reset
+
+    entries, cursor, reset = journal.read(after='c3')
+    assert [e['cursor'] for e in entries] == ['c4', 'c5']
+    assert not reset
+
+    entries, cursor, reset = journal.read(after='c5')
+    assert entries == [] and cursor == 'c5' and not reset
+
+
+def test_unknown_cursor_resets_to_the_tail(journals):
+    journal = follower([record(n) for n in range(1, 6)], maxlen=3)
+    journals.append(journal)
+    journal.read()
+
+    # c1 was evicted from the ring buffer
+    entries, cursor, reset = journal.read(after='c1', limit=2)
+    assert reset
+    assert [e['cursor'] for e in entries] == ['c4', 'c5']
+
+
+def test_resumes_after_the_last_cursor_when_journalctl_exits(journals):
+    journal = follower([record(n) for n in range(1, 5)], exit_first=True)
+    journals.append(journal)
+    entries, cursor, _ = journal.read()
+    assert cursor == 'c2'
+
+    assert journal.wait(after='c2', timeout=10)
+    for _ in range(100):
+        entries, cursor, _ = journal.read(after='c2')
+        if cursor == 'c4':
+            break
+        journal.wait(after=cursor, timeout=0.1)
+    assert [e['cursor'] for e in entries] == ['c3', 'c4']
+    assert journal.restarts == 1
+
+
+def test_missing_command_reports_an_error():
+    journal = JournalFollower('meshtasticd', command=['/nonexistent/journalctl'])
+    assert not journal.start()
+    assert journal.error
@@ -0,0 +1,168 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.monitoring.message_store import (
+    BROADCAST_NUM, MessageStore, fts5_available, message_from_packet, parse_query,
+)
+
+NOW = int(time.time())
+
+
+def text_packet(packet_id, text, sender=0x42, to=BROADCAST_NUM, channel=0, ts=NOW, **extra):
+    packet = {'from': sender, 'to': to, 'id': packet_id, 'channel': channel, 'rxTime': ts,
+              'decoded': {'portnum': 'TEXT_MESSAGE_APP', 'text': text}}
+    packet.update(extra)
+    return packet
+
+
+@pytest.fixture(params=['fts5', 'terms'])
+def store(request, tmp_path):
+    if request.param == 'fts5' and not fts5_available():
+        pytest.skip("SQLite built without FTS5")
+    # A long interval: tests flush explicitly
+    store = MessageStore(tmp_path / 'messages.db', flush_interval=60,
+                         use_fts=request.param == 'fts5')
+    yield store
+    store.close()
+
+
+def test_message_from_packet():
+    row = message_from_packet(text_packet(7, 'hi', hopStart=3, hopLimit=1, rxSnr=4.5))
+    assert row == (NOW, 0x42, BROADCAST_NUM, 0, 7, 'hi', 4.5, 2)
+    assert message_from_packet({'from': 1, 'decoded': {'portnum': 'POSITION_APP'}}) is None
+    assert message_from_packet(text_packet(7, '')) is None
+    assert parse_query('Solar* "OR" panel-2') == [('solar', True), ('or', False), ('panel', False), ('2', False)]
+
+
+def test_insert_is_batched_and_deduplicated(store):
+    assert store.record(text_packet(1, 'hello mesh'))
+    assert not store.record({'from': 0x42, 'decoded': {'portnum': 'POSITION_APP'}})
+    assert store.search() == []
+    assert store.get_stats()['pending'] == 1
+
+    # The same packet heard again, and the same id from another sender
+    store.record(text_packet(1, 'hello mesh'))
+    store.record(text_packet(1, 'other sender', sender=0x43))
+    store.flush()
+    assert store.messages_written == 2
+    assert store.get_stats()['messages'] == 2
+    store.record(text_packet(1, 'hello mesh'))
+    store.flush()
+    assert store.get_stats()['messages'] == 2
+
+
+def test_search(store):
+    store.record(text_packet(1, 'Solar panel is up', ts=NOW - 7200))
+    store.record(text_packet(2, 'solar-powered repeater', sender=0x43, channel=1, ts=NOW - 60))
+    store.record(text_packet(3, 'antenna on the panel', to=0x43, ts=NOW))
+    store.flush()
+
+    def texts(**filters):
+        return [m['text'] for m in store.search(**filters)]
+
+    assert texts(query='solar') == ['solar-powered repeater', 'Solar panel is up']
+    assert texts(query='sol*') == ['solar-powered repeater', 'Solar panel is up']
+    assert texts(query='panel solar') == ['Solar panel is up']
+    assert texts(query='sol') == []
+    # Operators and quotes in user input are plain words
+    assert texts(query='solar OR antenna') == []
+    assert texts(query='"panel') == ['antenna on the panel', 'Solar panel is up']
+    assert texts(query='!!!') == []
+
+    assert texts(sender='!00000043') == ['solar-powered repeater']
+    assert texts(dest='^all', channel=0) == ['Solar panel is up']
+    assert texts(dest='!00000043') == ['antenna on the panel']
+    assert texts(start=NOW - 3600, end=NOW) == ['solar-powered repeater']
+
+    newest, = store.search(limit=1)
+    assert newest['to'] == '!00000043' and newest['from'] == '!00000042'
+    assert texts(before_id=newest['id']) == ['solar-powered repeater', 'Solar panel is up']
+    with pytest.raises(ValueError):
+        store.search(sender='not a node')
+
+
+def test_retention_drops_old_messages(tmp_path):
+    store = MessageStore(tmp_path / 'messages.db', flush_interval=60, retention=86400)
+    try:
+        store.record(text_packet(1, 'last week', ts=NOW - 7 * 86400))
+        store.record(text_packet(2, 'today'))
+        store.flush()
+        assert [m['text'] for m in store.search()] == ['today']
+        assert store.search(query='week') == []
+    finally:
+        store.close()
+
+
+def test_close_writes_pending_messages(tmp_path):
+    path = tmp_path / 'messages.db'
+    store = MessageStore(path, flush_interval=60)
+    store.record(text_packet(1, 'kept'))
+    store.close()
+    reopened = MessageStore(path, flush_interval=60, use_fts=False)
+    try:
+        # The index kind is fixed when the database is created
+        assert reopened.index == store.index
+        assert [m['text'] for m in reopened.search(query='kept')] == ['kept']
+    finally:
+        reopened.close()
+
+
+def test_readonly_open_searches_alongside_a_writer(store):
+    store.record(text_packet(1, 'from the broker'))
+    store.flush()
+    reader = MessageStore(store.path, readonly=True)
+    try:
+        assert reader.index == store.index
+        assert [m['text'] for m in reader.search(query='broker')] == ['from the broker']
+        # Queued messages are ignored rather than written
+        reader.record(text_packet(2, 'dropped'))
+        reader.flush()
+    finally:
+        reader.close()
+    assert store.get_stats()['messages'] == 1
+
+
+def test_readonly_open_of_a_missing_database_fails(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        MessageStore(tmp_path / 'missing.db', readonly=True)
+    assert not (tmp_path / 'missing.db').exists()
+
+
+# ----------------------------------------------------------------------
+# /api/messages without a broker
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def web(monkeypatch, tmp_path):
+    pytest.importorskip('flask')
+    from src import main_web
+    # main_web imports the package as top-level `monitoring`
+    import monitoring.message_store
+    monkeypatch.setenv('MESHTASTIC_BROKER_SOCKET', str(tmp_path / 'missing.sock'))
+    monkeypatch.setattr(monitoring.message_store, 'DEFAULT_DB_PATH', tmp_path / 'messages.db')
+    return main_web
+
+
+def test_api_messages_reads_the_database_directly(web, tmp_path):
+    store = MessageStore(tmp_path / 'messages.db', flush_interval=60)
+    for packet_id in (1, 2, 3):
+        store.record(text_packet(packet_id, f"message {packet_id}"))
+    store.close()
+
+    client = web.app.test_client()
+    data = client.get('/api/messages?q=message&limit=2').get_json()
+    assert [m['text'] for m in data['messages']] == ['message 3', 'message 2']
+    assert data['next_before'] == data['messages'][-1]['id']
+    data = client.get(f"/api/messages?limit=2&before={data['next_before']}").get_json()
+    assert [m['text'] for m in data['messages']] == ['message 1']
+    assert data['next_before'] is None
+
+    assert client.get('/api/messages?from=bogus').status_code == 400
+    assert client.get('/api/messages?channel=x').status_code == 400
+
+
+def test_api_messages_without_history_is_503(web):
+    response = web.app.test_client().get('/api/messages')
+    assert response.status_code == 503
@@ -0,0 +1,159 @@
+import io
+import json
+import signal
+import sys
+import time
+
+import pytest
+
+from src.monitoring.node_monitor import ConnectionState, NodeMonitor, node_to_dict
+
+# src.monitor installs SIGINT/SIGTERM handlers on import; keep pytest's
+_handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+from src import monitor as cli  # noqa: E402
+for _sig, _handler in _handlers.items():
+    signal.signal(_sig, _handler)
+
+
+def records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture
+def stream():
+    return io.StringIO()
+
+
+@pytest.fixture
+def writer(stream):
+    return cli.NdjsonWriter(stream)
+
+
+@pytest.fixture
+def monitor(writer):
+    monitor = NodeMonitor(host='localhost', port=1, sync_callbacks=True)
+    cli.attach_event_stream(monitor, writer, node_to_dict)
+    yield monitor
+    monitor.events.close()
+
+
+def test_node_lifecycle_records(monitor, writer, stream):
+    heard = time.time()
+    monitor._apply_node_data('!00000042', {
+        'lastHeard': heard, 'snr': 5.5, 'user': {'longName': 'Alpha', 'shortName': 'ALP'}})
+    monitor._apply_node_data('!00000042', {'lastHeard': heard, 'snr': -1.25})
+    monitor.expire_stale(now=heard + 30 * 86400)
+    writer.flush()
+
+    add, update, remove = records(stream)
+    assert add['event'] == 'add' and add['node_id'] == '!00000042'
+    assert add['node']['long_name'] == 'Alpha' and add['node']['snr'] == 5.5
+    assert update == {'event': 'update', 'ts': update['ts'], 'node_id': '!00000042',
+                      'changes': {'snr': -1.25}}
+    assert remove == {'event': 'remove', 'ts': remove['ts'], 'node_id': '!00000042'}
+    for record in (add, update, remove):
+        assert isinstance(record['ts'], str)
+
+
+def test_connection_record(monitor, writer, stream):
+    monitor.state = ConnectionState.CONNECTED
+    writer.flush()
+    record, = records(stream)
+    assert record == {'event': 'connection', 'ts': record['ts'], 'state': 'connected'}
+
+
+def test_snapshot_record(monitor, writer, stream):
+    for num in (1, 2):
+        monitor._apply_node_data(f"!{num:08x}", {'user': {'longName': f"node {num}"}})
+    writer.write(cli.snapshot_record(monitor.get_nodes(), node_to_dict))
+    writer.flush()
+
+    snapshot = records(stream)[-1]
+    assert snapshot['event'] == 'snapshot'
+    assert snapshot['node_count'] == 2
+    assert sorted(n['node_id'] for n in snapshot['nodes']) == ['!00000001', '!00000002']
+
+
+def test_lines_are_buffered_until_flush(writer, stream):
+    writer.write({'event': 'remove', 'node_id': '!00000001'})
+    writer.write({'event': 'remove', 'node_id': '!00000002'})
+    assert stream.getvalue() == ''
+    writer.flush()
+    # One compact record per line
+    assert stream.getvalue() == ('{"event":"remove","node_id":"!00000001"}\n'
+                                 '{"event":"remove","node_id":"!00000002"}\n')
+    assert writer.lines_written == 2
+    writer.flush()
+    assert writer.lines_written == 2
+
+
+def test_full_buffer_flushes_on_write(stream):
+    writer = cli.NdjsonWriter(stream, max_buffer=100)
+    writer.write({'pad': 'x' * 40})
+    assert stream.getvalue() == ''
+    writer.write({'pad': 'y' * 40})
+    assert len(records(stream)) == 2
+    assert writer.lines_written == 2
+
+
+def test_broken_pipe_closes_the_writer():
+    class Gone(io.StringIO):
+        def write(self, data):
+            raise BrokenPipeError()
+
+    writer = cli.NdjsonWriter(Gone())
+    writer.write({'event': 'remove'})
+    writer.flush()
+    assert writer.closed
+    writer.write({'event': 'remove'})
+    writer.flush()
+    assert writer.lines_written == 0
+
+
+# ----------------------------------------------------------------------
+# Search options
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli, 'run_search', lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(cli, 'run_monitor', lambda **kwargs: calls.append('monitor'))
+    monkeypatch.setattr(cli, 'load_config', lambda: {})
+    return calls
+
+
+def run_main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['monitor', *argv])
+    cli.main()
+
+
+@pytest.mark.parametrize('argv, key, value', [
+    (['--search', 'solar'], 'query', 'solar'),
+    (['--from', '!a1b2c3d4'], 'sender', '!a1b2c3d4'),
+    (['--channel', '0'], 'channel', 0),
+    (['--since', '24'], 'since', 24.0),
+])
+def test_every_filter_starts_a_search(monkeypatch, searches, argv, key, value):
+    run_main(monkeypatch, *argv)
+    call, = searches
+    assert call[key] == value
+    assert call['limit'] == 50
+
+
+def test_limit_applies_to_a_search(monkeypatch, searches):
+    run_main(monkeypatch, '--since', '1', '--limit', '5')
+    assert searches[0]['limit'] == 5
+
+
+@pytest.mark.parametrize('argv', [['--limit', '5'], ['--message-db', 'm.db']])
+def test_search_options_without_a_search_are_errors(monkeypatch, searches, argv):
+    with pytest.raises(SystemExit) as info:
+        run_main(monkeypatch, *argv)
+    assert info.value.code == 2
+    assert searches == []
+
+
+def test_no_filters_runs_the_monitor(monkeypatch, searches):
+    run_main(monkeypatch)
+    assert searches == ['monitor']
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from src.monitoring.dispatch import EventDispatcher
+from src.monitoring.multi_monitor import MultiMonitor, parse_host_spec
+
+DAY = 86400
+
+
+@pytest.fixture
+def multi():
+    # Sources are fed directly; nothing connects
+    multi = MultiMonitor(['pi1', 'pi2:4404'])
+    # Inline delivery, so queued changes aren't coalesced
+    multi.events = EventDispatcher(synchronous=True)
+    multi.seen = []
+    multi.events.subscribe_nodes({
+        'node_added': lambda node: multi.seen.append(('added', node.node_id)),
+        'node_changed': lambda node, changes: multi.seen.append(('changed', node.node_id, changes)),
+        'node_removed': lambda node_id: multi.seen.append(('removed', node_id)),
+    })
+    multi.a, multi.b = multi._monitors['pi1:4403'], multi._monitors['pi2:4404']
+    yield multi
+    for monitor in (multi.a, multi.b):
+        monitor.events.close()
+    multi.events.close()
+
+
+def report(source, heard, **fields):
+    data = {'lastHeard': heard}
+    if 'snr' in fields:
+        data['snr'] = fields.pop('snr')
+    if fields:
+        data['user'] = {'longName': fields['long_name']}
+    source._apply_node_data('!00000042', data)
+
+
+def test_parse_host_spec():
+    assert parse_host_spec('pi1') == ('pi1', 4403)
+    assert parse_host_spec(' pi2:4404 ') == ('pi2', 4404)
+    assert parse_host_spec('::1') == ('::1', 4403)
+
+
+def test_freshest_report_wins_and_best_snr_is_kept(multi):
+    now = time.time()
+    report(multi.a, now - 600, long_name='old name', snr=6.0)
+    report(multi.b, now - 60, long_name='new name', snr=-4.0)
+
+    node = multi.get_node('!00000042')
+    assert node.long_name == 'new name'
+    assert node.last_heard.timestamp() == pytest.approx(now - 60)
+    assert node.snr == 6.0
+    assert multi.best_source('!00000042') == 'pi1:4403'
+
+    # A stale report doesn't overwrite fresher fields or move last_heard back
+    report(multi.a, now - 300, long_name='stale name', snr=5.0)
+    node = multi.get_node('!00000042')
+    assert node.long_name == 'new name'
+    assert node.last_heard.timestamp() == pytest.approx(now - 60)
+    assert node.snr == 5.0
+    assert multi.get_node_count() == 1
+
+
+def test_source_expiring_a_node_recomputes_best_snr(multi):
+    now = time.time()
+    report(multi.a, now - 3 * 3600, long_name='n', snr=8.0)
+    report(multi.b, now - 60, long_name='n', snr=-2.0)
+    assert multi.best_source('!00000042') == 'pi1:4403'
+
+    # pi1 last heard the node 3h ago; after its 6h TTL only pi2 has it
+    assert multi.a.expire_stale(now=now + 4 * 3600) == ['!00000042']
+    node = multi.get_node('!00000042')
+    assert node is not None
+    assert node.snr == -2.0
+    assert multi.best_source('!00000042') == 'pi2:4404'
+
+    assert multi.b.expire_stale(now=now + 2 * DAY) == ['!00000042']
+    assert multi.get_node('!00000042') is None
+    assert multi.best_source('!00000042') is None
+
+    assert multi.seen == [
+        ('added', '!00000042'),
+        ('changed', '!00000042', {'last_heard': pytest.approx(now - 60)}),
+        ('changed', '!00000042', {'snr': -2.0}),
+        ('removed', '!00000042'),
+    ]
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from src.monitoring.channel_analytics import ChannelAnalytics
+from src.monitoring.node_monitor import NodeMonitor
+
+
+@pytest.fixture
+def monitor():
+    monitor = NodeMonitor(host='localhost', port=1, sync_callbacks=True,
+                          channel_analytics=ChannelAnalytics())
+    events = []
+    monitor.events.subscribe_nodes({
+        'node_added': lambda node: events.append(('added', node.node_id)),
+        'node_changed': lambda node, changes: events.append(('changed', node.node_id)),
+        'node_removed': lambda node_id: events.append(('removed', node_id)),
+    })
+    monitor.seen = events
+    yield monitor
+    monitor.events.close()
+
+
+def test_node_already_past_its_ttl_is_not_added(monitor):
+    stale = time.time() - 7 * 3600
+    monitor._apply_node_data('!00000001', {'lastHeard': stale})
+    monitor._apply_node_data('!00000002', {'lastHeard': time.time()})
+    assert monitor.get_node('!00000001') is None
+    assert monitor.seen == [('added', '!00000002')]
+
+
+def test_role_change_past_the_new_ttl_removes_the_node(monitor):
+    heard = time.time() - 7 * 3600
+    monitor._apply_node_data('!00000001', {'lastHeard': heard, 'user': {'role': 'ROUTER'}})
+    monitor._apply_node_data('!00000001', {'user': {'role': 'CLIENT'}})
+    assert monitor.get_node('!00000001') is None
+    assert monitor.seen == [('added', '!00000001'), ('removed', '!00000001')]
+
+
+def test_every_telemetry_report_reaches_channel_analytics(monitor):
+    now = time.time()
+
+    def report(packet_id, rx_time):
+        monitor._on_receive({'id': packet_id, 'from': 1, 'rxTime': rx_time, 'decoded': {
+            'portnum': 'TELEMETRY_APP',
+            'telemetry': {'deviceMetrics': {'channelUtilization': 12.5}}}}, None)
+
+    report(1, now - 20)
+    report(1, now - 20)     # duplicate packet
+    report(2, now - 10)     # same values, new report
+    # The node DB update carrying the report already seen from its packet
+    monitor._apply_node_data('!00000001', {'lastHeard': now - 10,
+                                           'deviceMetrics': {'channelUtilization': 12.5}})
+    assert monitor.channel_analytics.samples == 2
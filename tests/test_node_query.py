@@ -0,0 +1,163 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from src.monitoring.node_table import NodeTable
+
+
+def make_table(count=6):
+    table = NodeTable()
+    for num in range(1, count + 1):
+        table.merge(f"!{num:08x}", num, {
+            'long_name': f"node {num}",
+            'snr': float(num),
+            'battery_level': None if num == 3 else num * 10,
+        })
+    return table
+
+
+def cursor(*state):
+    return base64.urlsafe_b64encode(json.dumps(list(state)).encode('utf-8')).decode('ascii')
+
+
+def test_paging_visits_every_node_once():
+    table = make_table(25)
+    seen, after = [], None
+    while True:
+        page = table.query(sort='battery_level', limit=7, fields=['node_id'], after=after)
+        seen += [node['node_id'] for node in page['nodes']]
+        after = page['next']
+        if not after:
+            break
+    assert len(seen) == 25 == len(set(seen))
+    # Unset values sort last
+    assert seen[-1] == '!00000003'
+
+
+@pytest.mark.parametrize('state', [
+    ['snr', False, 'x', '!00000001'],       # string for a float column
+    ['snr', False, True, '!00000001'],      # bool for a float column
+    ['node_id', False, 5, '!00000001'],
+    ['via_mqtt', False, 1, '!00000001'],
+    ['snr', False, 1.0, 7],                 # node_id must be a string
+    ['snr', False, [1], '!00000001'],
+])
+def test_tampered_cursor_is_rejected(state):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        make_table().query(sort=state[0], after=cursor(*state))
+
+
+@pytest.mark.parametrize('after', ['not base64!', cursor('snr', False), 'e30='])
+def test_malformed_cursor_is_rejected(after):
+    with pytest.raises(ValueError):
+        make_table().query(sort='snr', after=after)
+
+
+def test_hand_built_cursor_of_the_right_type_works():
+    page = make_table().query(sort='snr', fields=['node_num'], after=cursor('snr', False, 4, '!'))
+    assert [n['node_num'] for n in page['nodes']] == [4, 5, 6]
+    page = make_table().query(sort='battery_level', fields=['node_num'],
+                              after=cursor('battery_level', False, None, '!'))
+    assert [n['node_num'] for n in page['nodes']] == [3]
+
+
+# ----------------------------------------------------------------------
+# /api/nodes
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def web(monkeypatch, tmp_path):
+    pytest.importorskip('flask')
+    from src import main_web
+    # No broker: every query goes to the (faked) CLI node table
+    monkeypatch.setenv('MESHTASTIC_BROKER_SOCKET', str(tmp_path / 'missing.sock'))
+    table = make_table()
+    monkeypatch.setattr(main_web, '_cli_node_table', lambda: {'table': table, 'raw': ''})
+    return main_web
+
+
+def test_parse_node_query(web):
+    from werkzeug.datastructures import MultiDict
+    params = web.parse_node_query(MultiDict([
+        ('sort', 'snr'), ('order', 'desc'), ('limit', '5000'), ('fields', 'node_id, snr,'),
+        ('q', 'node'), ('after', 'abc'), ('filter', 'battery_level<20'),
+        ('filter', 'via_mqtt=false'), ('filter', 'long_name!=x'),
+    ]))
+    assert params == {
+        'sort': 'snr', 'descending': True, 'limit': 1000, 'fields': ['node_id', 'snr'],
+        'search': 'node', 'after': 'abc',
+        'filters': [['battery_level', '<', 20.0], ['via_mqtt', '==', False], ['long_name', '!=', 'x']],
+    }
+    assert web.parse_node_query(MultiDict([('limit', '-3')]))['limit'] == 0
+    with pytest.raises(ValueError):
+        web.parse_node_query(MultiDict([('filter', 'battery_level')]))
+    with pytest.raises(ValueError):
+        web.parse_node_query(MultiDict([('limit', 'ten')]))
+
+
+def test_api_nodes_revalidates_with_etag(web):
+    client = web.app.test_client()
+    response = client.get('/api/nodes?sort=snr&limit=2')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total'] == 6 and len(data['nodes']) == 2 and data['next']
+    etag = response.headers['ETag']
+
+    response = client.get('/api/nodes?sort=snr&limit=2', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    response = client.get('/api/nodes?sort=snr&limit=3', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('query', [
+    'filter=bogus<1', 'filter=snr<x', 'sort=bogus', 'fields=node_id,bogus',
+    'sort=snr&after=' + cursor('snr', False, 'x', '!0'),
+    'sort=snr&after=' + cursor('long_name', False, 'x', '!0'),
+])
+def test_api_nodes_bad_queries_are_400_without_etag(web, query):
+    response = web.app.test_client().get('/api/nodes?' + query)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+    assert 'ETag' not in response.headers
+
+
+def test_api_nodes_broker_rejection_is_400(web, monkeypatch, tmp_path):
+    class Client:
+        socket_path = str(tmp_path)
+
+        def call(self, method, **params):
+            # main_web imports the package as top-level `monitoring`
+            raise web.BrokerRequestError("Bad request: Unknown field: bogus")
+
+    monkeypatch.setattr(web, 'BrokerClient', Client)
+    response = web.app.test_client().get('/api/nodes?sort=bogus')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': "Bad request: Unknown field: bogus"}
+
+
+def test_api_nodes_unreachable_is_503(web, monkeypatch):
+    monkeypatch.setattr(web, '_cli_node_table', lambda: {'error': 'meshtasticd not running'})
+    response = web.app.test_client().get('/api/nodes')
+    assert response.status_code == 503
+    assert 'ETag' not in response.headers
+
+
+@pytest.mark.parametrize('params, error', [
+    ({'sort': 'bogus'}, "Unknown field: bogus"),
+    ({'filters': [['snr', '~', 1]]}, "Unknown operator"),
+    ({'sort': 'snr', 'after': cursor('snr', False, 'x', '!0')}, "Invalid cursor"),
+])
+def test_broker_rejects_bad_queries(tmp_path, params, error):
+    from src.monitoring.broker import RadioBroker
+    broker = RadioBroker(socket_path=str(tmp_path / 'broker.sock'))
+    broker.monitor._apply_node_data('!00000001', {'snr': 1.0})
+    try:
+        line = json.dumps({'method': 'query_nodes', 'params': params}).encode('utf-8')
+        reply = asyncio.run(broker._dispatch(line))
+    finally:
+        broker.monitor.events.close()
+    assert reply['bad_request'] is True
+    assert error in reply['error']
+    assert 'result' not in reply
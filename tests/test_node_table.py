@@ -0,0 +1,145 @@
+import pytest
+
+from src.monitoring.node_table import NodeSnapshot, NodeTable, node_fields
+
+
+def make_table(count=5):
+    table = NodeTable()
+    for num in range(1, count + 1):
+        table.merge(f"!{num:08x}", num, {
+            'long_name': f"node {num}",
+            'battery_level': num * 10,
+            'last_heard': 1000.0 + num,
+            'via_mqtt': num % 2 == 0,
+        })
+    return table
+
+
+def test_merge_reports_only_changed_fields():
+    table = NodeTable()
+    view, is_new, changes = table.merge('!00000001', 1, {'long_name': 'a', 'snr': 5.0})
+    assert is_new
+    assert changes == {'long_name': 'a', 'snr': 5.0}
+
+    version = table.version
+    _, is_new, changes = table.merge('!00000001', 1, {'long_name': 'a', 'snr': 6.0})
+    assert not is_new
+    assert changes == {'snr': 6.0}
+
+    _, _, changes = table.merge('!00000001', 1, {'long_name': 'a'})
+    assert changes == {}
+    assert table.version == version + 1
+    assert view.snr == 6.0
+
+
+def test_removed_row_invalidates_views_but_not_snapshots():
+    table = make_table(2)
+    row = table.row_of('!00000001')
+    view = table.view(row)
+    snapshot = table.snapshot(row)
+    info = table.to_node_info(row)
+
+    assert table.remove('!00000001')
+    assert not view.is_valid
+    with pytest.raises(LookupError):
+        view.long_name
+
+    # The freed row is reused by the next node; copies still show the old one
+    table.merge('!00000009', 9, {'long_name': 'reused'})
+    assert isinstance(snapshot, NodeSnapshot)
+    assert snapshot.long_name == 'node 1'
+    assert snapshot.metrics.battery_level == 10
+    assert info.long_name == 'node 1'
+    assert node_fields(snapshot)['battery_level'] == 10
+
+
+def test_node_fields_matches_row_fields():
+    table = make_table(1)
+    row = table.row_of('!00000001')
+    assert node_fields(table.view(row)) == table.row_fields(row)
+    assert node_fields(table.to_node_info(row)) == table.row_fields(row)
+    assert node_fields(table.snapshot(row)) == table.row_fields(row)
+
+
+def test_where_handles_node_id_and_node_num():
+    table = make_table()
+    assert [v.node_id for v in table.where('node_id', '==', '!00000003')] == ['!00000003']
+    assert sorted(v.node_num for v in table.where('node_num', '<=', 2)) == [1, 2]
+
+
+def test_where_skips_unset_and_removed_rows():
+    table = make_table()
+    table.merge('!00000010', 16, {'long_name': 'no battery'})
+    table.remove('!00000005')
+    assert sorted(v.node_num for v in table.where('battery_level', '>=', 30)) == [3, 4]
+
+
+def test_where_coerces_compatible_values():
+    table = make_table()
+    assert len(table.where('battery_level', '<', '25')) == 2
+    assert len(table.where('via_mqtt', '==', 'true')) == 2
+    table.merge('!00000001', 1, {'long_name': '42'})
+    assert [v.node_num for v in table.where('long_name', '==', 42)] == [1]
+
+
+@pytest.mark.parametrize('name, op, value', [
+    ('battery_level', '<', 'abc'),
+    ('via_mqtt', '==', 'maybe'),
+    ('last_heard', '>', 'yesterday'),
+    ('snr', '>', None),
+    ('battery_level', '~', 1),
+])
+def test_where_rejects_incompatible_values(name, op, value):
+    with pytest.raises(ValueError):
+        make_table().where_rows(name, op, value)
+
+
+def test_where_rejects_unknown_field():
+    with pytest.raises(KeyError):
+        make_table().where_rows('bogus', '==', 1)
+
+
+def test_filter_combines_criteria():
+    table = make_table()
+    nodes = table.filter(battery_level__ge=20, via_mqtt=True)
+    assert sorted(v.node_num for v in nodes) == [2, 4]
+
+
+def test_query_pages_with_stable_cursors():
+    table = make_table(10)
+    first = table.query(sort='battery_level', descending=True, limit=4,
+                        fields=['node_id', 'battery_level'])
+    assert first['total'] == 10
+    assert [n['battery_level'] for n in first['nodes']] == [100, 90, 80, 70]
+
+    # A node disappearing between pages doesn't shift the next page
+    table.remove('!00000001')
+    second = table.query(sort='battery_level', descending=True, limit=4,
+                         fields=['node_id', 'battery_level'], after=first['next'])
+    assert [n['battery_level'] for n in second['nodes']] == [60, 50, 40, 30]
+
+    with pytest.raises(ValueError):
+        table.query(sort='long_name', after=first['next'])
+
+
+def test_query_filters_and_search():
+    table = make_table(10)
+    result = table.query(filters=[('battery_level', '>', 50), ('node_num', '!=', 7)],
+                         search='NODE', fields=['node_num'], limit=100)
+    assert sorted(n['node_num'] for n in result['nodes']) == [6, 8, 9, 10]
+    assert table.query(limit=0) == {'total': 10, 'nodes': [], 'next': None,
+                                    'version': table.version}
+
+
+def test_export_and_from_columns_round_trip():
+    table = make_table()
+    table.remove('!00000002')
+    node_ids, columns = table.export_columns()
+    copy = NodeTable.from_columns(node_ids, columns)
+    assert sorted(node_ids) == ['!00000001', '!00000003', '!00000004', '!00000005']
+    for node_id in node_ids:
+        assert copy.row_fields(copy.row_of(node_id)) == table.row_fields(table.row_of(node_id))
+
+    # The copy is independent of the source table
+    table.merge('!00000001', 1, {'long_name': 'changed'})
+    assert copy.get('!00000001').long_name == 'node 1'
@@ -0,0 +1,80 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.monitoring import reconnect
+from src.monitoring.reconnect import Backoff, ConnectionStats
+
+
+class Extreme:
+    """rng stand-in that always draws the upper (or lower) bound"""
+
+    def __init__(self, high=True):
+        self.high = high
+
+    def uniform(self, a, b):
+        return b if self.high else a
+
+
+def test_delays_triple_up_to_the_cap():
+    backoff = Backoff(initial=0.1, maximum=30.0, rng=Extreme())
+    delays = [backoff.next() for _ in range(8)]
+    assert delays == pytest.approx([0.1, 0.3, 0.9, 2.7, 8.1, 24.3, 30.0, 30.0])
+    assert backoff.attempts == 8
+
+
+def test_lowest_draws_stay_at_the_initial_delay():
+    backoff = Backoff(initial=0.5, maximum=30.0, rng=Extreme(high=False))
+    assert [backoff.next() for _ in range(5)] == [0.5] * 5
+
+
+def test_jitter_stays_within_bounds():
+    backoff = Backoff(initial=0.1, maximum=5.0, rng=random.Random(1234))
+    previous = backoff.next()
+    assert previous == 0.1
+    delays = set()
+    for _ in range(2000):
+        delay = backoff.next()
+        assert 0.1 <= delay <= min(5.0, previous * 3)
+        delays.add(delay)
+        previous = delay
+    # Decorrelated: clients don't settle on one delay
+    assert len(delays) > 1000
+
+
+def test_same_seed_same_sequence():
+    first = Backoff(rng=random.Random(7))
+    second = Backoff(rng=random.Random(7))
+    assert [first.next() for _ in range(20)] == [second.next() for _ in range(20)]
+
+
+def test_reset_starts_over():
+    backoff = Backoff(initial=0.1, maximum=30.0, rng=Extreme())
+    for _ in range(6):
+        backoff.next()
+    backoff.reset()
+    assert backoff.attempts == 0
+    assert backoff.next() == 0.1
+    assert backoff.next() == pytest.approx(0.3)
+
+
+def test_connection_stats(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(reconnect, 'time', SimpleNamespace(time=lambda: clock[0]))
+    stats = ConnectionStats(flap_window=60)
+    stats.record_disconnect()                   # never connected: ignored
+    stats.record_failure(ConnectionRefusedError("refused"))
+    stats.record_connect(0.2)
+    clock[0] += 10
+    stats.record_disconnect()                   # short-lived: a flap
+    stats.record_connect(0.4)
+    clock[0] += 600
+    stats.record_disconnect()
+
+    assert (stats.connects, stats.failures, stats.disconnects, stats.flaps) == (2, 1, 2, 1)
+    data = stats.to_dict()
+    assert data['mean_latency_ms'] == 300.0
+    assert (data['min_latency_ms'], data['max_latency_ms'], data['last_latency_ms']) == (200.0, 400.0, 400.0)
+    assert data['last_error'] == 'refused'
+    assert data['connected_since'] is None
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.singleflight import SingleFlight, singleflight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', fetch)))
+               for _ in range(8)]
+    threads[0].start()
+    assert started.wait(2)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.shared < 7:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['value'] * 8
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("backend down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('k', fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(2)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.shared < 2:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == ['backend down'] * 3
+    # Failures are not cached
+    assert flight.do('k', lambda: 'ok') == 'ok'
+
+
+def test_ttl_cache_and_refresh():
+    flight = SingleFlight(ttl=60)
+    counter = iter(range(100))
+    assert flight.do('k', lambda: next(counter)) == 0
+    assert flight.do('k', lambda: next(counter)) == 0
+    assert flight.hits == 1
+    assert flight.refresh('k', lambda: next(counter)) == 1
+    assert flight.do('k', lambda: next(counter)) == 1
+    flight.forget('k')
+    assert flight.do('k', lambda: next(counter)) == 2
+
+
+def test_cache_if_skips_error_results():
+    flight = SingleFlight(ttl=60, cache_if=lambda result: 'error' not in result)
+    responses = iter([{'error': 'timeout'}, {'nodes': 3}, {'nodes': 4}])
+    assert flight.do('k', lambda: next(responses)) == {'error': 'timeout'}
+    assert flight.do('k', lambda: next(responses)) == {'nodes': 3}
+    assert flight.do('k', lambda: next(responses)) == {'nodes': 3}
+
+
+def test_stale_while_revalidate():
+    flight = SingleFlight(ttl=0.05, stale_ttl=60)
+    refreshed = threading.Event()
+    assert flight.do('k', lambda: 'old') == 'old'
+    time.sleep(0.06)
+
+    def slow_new():
+        refreshed.set()
+        return 'new'
+
+    # Expired but within stale_ttl: the stale value comes back at once
+    assert flight.do('k', slow_new) == 'old'
+    assert refreshed.wait(2)
+    for _ in range(100):
+        if not flight.get_stats()['in_flight']:
+            break
+        time.sleep(0.01)
+    assert flight.do('k', lambda: 'unused') == 'new'
+    assert flight.stale_hits == 1
+
+
+def test_decorator_keys_on_arguments():
+    calls = []
+
+    @singleflight(ttl=60)
+    def square(x, offset=0):
+        calls.append(x)
+        return x * x + offset
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(4) == 16
+    assert square(3, offset=1) == 10
+    assert calls == [3, 4, 3]
+    square.forget(3)
+    assert square(3) == 9
+    assert calls == [3, 4, 3, 3]
+    with pytest.raises(TypeError):
+        square()
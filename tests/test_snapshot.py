@@ -0,0 +1,125 @@
+import json
+import struct
+import time
+from array import array
+
+import pytest
+
+from src.monitoring.node_monitor import NodeMonitor
+from src.monitoring.node_table import NodeTable
+from src.monitoring.snapshot import MAGIC, SnapshotError, read_snapshot, write_snapshot
+
+
+def make_table():
+    table = NodeTable()
+    table.merge('!00000001', 1, {'long_name': 'Alpha', 'snr': 5.5, 'battery_level': 80,
+                                 'via_mqtt': True, 'last_heard': time.time()})
+    table.merge('!00000002', 2, {'long_name': 'Bravo\0', 'hops_away': 2})
+    return table
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'nodes.snap'
+    table = make_table()
+    node_ids, columns = table.export_columns()
+    size = write_snapshot(path, node_ids, columns, {'host': 'pi1', 'port': 4403})
+    assert size == path.stat().st_size
+    assert not (tmp_path / 'nodes.snap.tmp').exists()
+
+    loaded_ids, loaded, header = read_snapshot(path)
+    assert loaded_ids == node_ids
+    # Compare numeric columns as bytes: unset floats are NaN
+    assert {name: col.tobytes() if isinstance(col, array) else col for name, col in loaded.items()} == {
+        name: col.tobytes() if isinstance(col, array) else [v.replace('\0', '') for v in col]
+        for name, col in columns.items()}
+    assert (header['host'], header['port'], header['rows']) == ('pi1', 4403, 2)
+
+    copy = NodeTable.from_columns(loaded_ids, loaded)
+    alpha = copy.to_node_info(copy.row_of('!00000001'))
+    assert (alpha.long_name, alpha.snr, alpha.via_mqtt) == ('Alpha', 5.5, True)
+    assert alpha.metrics.battery_level == 80
+    assert copy.to_node_info(copy.row_of('!00000002')).hops_away == 2
+
+
+def test_empty_table_round_trips(tmp_path):
+    path = tmp_path / 'nodes.snap'
+    write_snapshot(path, *NodeTable().export_columns())
+    node_ids, columns, header = read_snapshot(path)
+    assert node_ids == [] and header['rows'] == 0
+    assert all(len(col) == 0 for col in columns.values())
+
+
+def test_monitor_warm_start(tmp_path):
+    path = str(tmp_path / 'nodes.snap')
+    first = NodeMonitor(host='pi1', port=4403, sync_callbacks=True, snapshot=path)
+    first.my_node_num = 0x42
+    first._apply_node_data('!00000001', {'lastHeard': time.time(), 'user': {'longName': 'Alpha'}})
+    assert first.save_snapshot()
+    first.events.close()
+
+    second = NodeMonitor(host='pi1', port=4403, sync_callbacks=True, snapshot=path)
+    try:
+        assert second.get_node('!00000001').long_name == 'Alpha'
+        assert second.my_node_id == '!00000042'
+    finally:
+        second.events.close()
+
+
+def corrupt(path, edit):
+    data = bytearray(path.read_bytes())
+    edit(data)
+    path.write_bytes(bytes(data))
+
+
+def flip_data_byte(data):
+    (length,) = struct.unpack_from('<I', data, len(MAGIC))
+    # Inside the first node id, so it still decodes
+    data[len(MAGIC) + 4 + length + 1] ^= 0x01
+
+
+def set_header(data, **changes):
+    (length,) = struct.unpack_from('<I', data, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(bytes(data[start:start + length]))
+    header.update(changes)
+    blob = json.dumps(header).encode('utf-8')
+    data[len(MAGIC):start + length] = struct.pack('<I', len(blob)) + blob
+
+
+@pytest.mark.parametrize('edit, error', [
+    (lambda d: d.__setitem__(slice(0, 8), b'MSHSNP02'), "Unsupported snapshot version 02"),
+    (lambda d: d.__setitem__(slice(0, 8), b'NOTASNAP'), "Not a node snapshot"),
+    (lambda d: d.__delitem__(slice(-3, None)), "Truncated"),
+    (flip_data_byte, "Checksum mismatch"),
+    (lambda d: d.__setitem__(len(MAGIC) + 5, 0x00), "Bad snapshot header"),
+    (lambda d: d.__delitem__(slice(len(MAGIC) + 2, None)), "Bad snapshot header"),
+    (lambda d: set_header(d, columns=[{'name': 'x'}]), "Bad snapshot header"),
+    (lambda d: set_header(d, columns=[{'name': 'x', 'type': 'Z', 'bytes': 0}]), "Bad column"),
+    (lambda d: set_header(d, columns=[{'name': 'x', 'type': 'd', 'bytes': 3}]), "Bad column"),
+    (lambda d: set_header(d, rows=5), "expected 5"),
+])
+def test_corrupt_snapshots_are_rejected(tmp_path, edit, error):
+    path = tmp_path / 'nodes.snap'
+    write_snapshot(path, *make_table().export_columns())
+    corrupt(path, edit)
+    with pytest.raises(SnapshotError, match=error):
+        read_snapshot(path)
+
+
+def test_missing_and_empty_files(tmp_path):
+    with pytest.raises(SnapshotError, match="Cannot open"):
+        read_snapshot(tmp_path / 'missing.snap')
+    (tmp_path / 'empty.snap').write_bytes(b'')
+    with pytest.raises(SnapshotError, match="Empty"):
+        read_snapshot(tmp_path / 'empty.snap')
+
+
+def test_monitor_starts_empty_from_a_bad_snapshot(tmp_path):
+    path = tmp_path / 'nodes.snap'
+    write_snapshot(path, *make_table().export_columns())
+    corrupt(path, lambda d: set_header(d, columns=[{'name': 'x', 'type': 'Z', 'bytes': 0}]))
+    monitor = NodeMonitor(host='pi1', port=4403, sync_callbacks=True, snapshot=str(path))
+    try:
+        assert monitor.get_node_count() == 0
+    finally:
+        monitor.events.close()
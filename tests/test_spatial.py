@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from src.monitoring.spatial import SpatialIndex, haversine_km, valid_position
+
+
+def brute_within(points, lat, lon, radius_km):
+    return sorted(node_id for node_id, (plat, plon) in points.items()
+                  if haversine_km(lat, lon, plat, plon) <= radius_km)
+
+
+@pytest.fixture
+def scattered():
+    rng = random.Random(3)
+    index = SpatialIndex(cell_deg=0.05)
+    points = {}
+    for i in range(400):
+        lat, lon = 21.3 + rng.uniform(-0.5, 0.5), -157.85 + rng.uniform(-0.5, 0.5)
+        points[f"!{i:08x}"] = (lat, lon)
+        index.update(f"!{i:08x}", lat, lon)
+    return index, points
+
+
+def test_haversine_known_distance():
+    # One degree of latitude is about 111 km anywhere
+    assert haversine_km(0, 0, 1, 0) == pytest.approx(111.19, abs=0.1)
+
+
+def test_within_matches_brute_force(scattered):
+    index, points = scattered
+    for radius in (0.5, 3, 12, 40):
+        found = index.within(21.31, -157.86, radius)
+        assert sorted(node_id for node_id, _ in found) == brute_within(points, 21.31, -157.86, radius)
+        distances = [km for _, km in found]
+        assert distances == sorted(distances)
+
+
+def test_nearest_matches_brute_force(scattered):
+    index, points = scattered
+    expected = sorted(points, key=lambda n: haversine_km(21.0, -158.0, *points[n]))[:7]
+    assert [node_id for node_id, _ in index.nearest(21.0, -158.0, k=7)] == expected
+    assert index.nearest(21.0, -158.0, k=3, max_km=0.001) == []
+
+
+def test_move_and_remove():
+    index = SpatialIndex(cell_deg=0.05)
+    index.update('a', 10.0, 10.0)
+    index.update('a', 40.0, 40.0)
+    assert index.within(10.0, 10.0, 5) == []
+    assert [n for n, _ in index.within(40.0, 40.0, 5)] == ['a']
+    assert index.remove('a')
+    assert len(index) == 0
+
+
+def test_invalid_position_removes_node():
+    index = SpatialIndex()
+    index.update('a', 10.0, 10.0)
+    index.update('a', 0, 0)
+    assert 'a' not in index
+    assert not valid_position(None, 1.0)
+    assert not valid_position(float('nan'), 1.0)
+    assert not valid_position(91.0, 1.0)
+
+
+def test_bbox_across_the_antimeridian():
+    index = SpatialIndex(cell_deg=1.0)
+    index.update('east', 0.5, 179.5)
+    index.update('west', 0.5, -179.5)
+    index.update('far', 0.5, 100.0)
+    assert sorted(index.in_bbox(0, 179, 1, -179)) == ['east', 'west']
+    assert index.in_bbox(0, 99, 1, 101) == ['far']
+
+
+def test_within_across_the_antimeridian():
+    index = SpatialIndex(cell_deg=0.5)
+    index.update('west', 10.0, -179.9)
+    assert [n for n, _ in index.within(10.0, 179.9, 50)] == ['west']
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def web():
+    pytest.importorskip('flask')
+    from src import main_web
+    return main_web
+
+
+class Probe:
+    """Returns its call count, or raises while `failing` is set"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.failing = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.failing:
+            raise RuntimeError(self.failing)
+        return {'name': self.name, 'calls': self.calls}
+
+
+@pytest.fixture
+def collector(web):
+    # Long intervals: background threads start but don't collect during a test
+    collector = web.StatusCollector()
+    collector.fast, collector.slow = Probe('fast'), Probe('slow')
+    collector.add('fast', collector.fast, 60.0)
+    collector.add('slow', collector.slow, 600.0, placeholder={'running': False})
+    return collector
+
+
+def test_first_read_collects_then_serves_the_cache(collector):
+    assert collector.get('fast') == {'name': 'fast', 'calls': 1}
+    assert collector.get('fast') == {'name': 'fast', 'calls': 1}
+    assert collector.fast.calls == 1
+    # Sources are independent
+    assert collector.slow.calls == 0
+
+
+def test_refresh_collects_one_source(collector):
+    collector.get('fast')
+    collector.get('slow')
+    assert collector.refresh('fast') == {'name': 'fast', 'calls': 2}
+    assert (collector.fast.calls, collector.slow.calls) == (2, 1)
+    assert collector.get('slow') == {'name': 'slow', 'calls': 1}
+
+
+def test_stale_data_is_collected_on_read(collector):
+    collector.get('fast')
+    # Older than two intervals: the background thread isn't keeping up
+    collector._sources['fast'].updated -= 200
+    assert collector.get('fast')['calls'] == 2
+
+
+def test_placeholder_until_the_probe_succeeds(collector):
+    collector.slow.failing = 'systemctl missing'
+    assert collector.get('slow') == {'running': False, 'error': 'systemctl missing'}
+    # The placeholder is copied, not handed out
+    assert collector._sources['slow'].placeholder == {'running': False}
+
+    collector.slow.failing = None
+    assert collector.refresh('slow') == {'name': 'slow', 'calls': 2}
+
+    # A later failure keeps serving the last good data
+    collector.slow.failing = 'timeout'
+    assert collector.refresh('slow') == {'name': 'slow', 'calls': 2}
+    assert collector.describe(['slow'])['sources']['slow']['error'] == 'timeout'
+
+
+def test_placeholder_without_an_error_message(web):
+    collector = web.StatusCollector()
+    collector.add('radio', lambda: None, 60.0)
+    assert collector.get('radio') == {'error': 'No radio data yet'}
+
+
+def test_describe_reports_age_and_versions(collector):
+    assert collector.describe(['fast'])['sources']['fast']['updated'] is None
+    collector.get('fast')
+    collector.get('slow')
+    info = collector.describe(['fast', 'slow'])
+    assert info['version'] == 2
+    assert (info['sources']['fast']['version'], info['sources']['slow']['version']) == (1, 2)
+    assert info['sources']['fast']['interval_s'] == 60.0
+    assert info['sources']['fast']['cost_ms'] >= 0
+    assert info['sources']['fast']['error'] is None
+
+    collector._sources['fast'].updated -= 30
+    assert collector.describe(['fast'])['sources']['fast']['age_s'] == pytest.approx(30, abs=0.5)
+
+    collector.refresh('fast')
+    info = collector.describe(['fast', 'slow'])
+    assert info['version'] == 3
+    assert info['sources']['fast']['version'] == 3
+    assert info['sources']['fast']['age_s'] < 1
+
+
+def test_background_thread_collects_and_wakes(web):
+    collector = web.StatusCollector()
+    collected = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        if len(calls) > 1:
+            collected.set()
+        return {'calls': len(calls)}
+
+    collector.add('service', probe, 60.0)
+    collector.get('service')
+    # A service action asks for an early collection
+    collector.wake('service')
+    assert collected.wait(5)
+    assert collector.get('service')['calls'] >= 2
+
+
+def test_status_snapshot_shape(web, monkeypatch):
+    collector = web.StatusCollector()
+    collector.add('service', lambda: {'running': True, 'status': 'active'}, 60.0)
+    collector.add('system', lambda: {'cpu_percent': 5}, 60.0)
+    monkeypatch.setattr(web, '_status', collector)
+    snapshot = web.status_snapshot()
+    assert snapshot['service'] == {'running': True, 'status': 'active'}
+    assert snapshot['system'] == {'cpu_percent': 5}
+    assert set(snapshot['collector']['sources']) == {'service', 'system'}
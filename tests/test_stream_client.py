@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+
+from src.monitoring.fake_daemon import (
+    FakeMeshtasticd, encode_config_complete, parse_config_complete_id, parse_want_config_id,
+)
+from src.monitoring.stream_client import MAX_PAYLOAD, FrameDecoder, MeshtasticStreamClient, encode_frame
+
+
+def test_decoder_reassembles_split_frames():
+    decoder = FrameDecoder()
+    data = encode_frame(b'one') + encode_frame(b'') + encode_frame(b'three')
+    frames = []
+    for i in range(len(data)):
+        frames += decoder.feed(data[i:i + 1])
+    assert frames == [b'one', b'', b'three']
+    assert decoder.discarded_bytes == 0
+
+
+def test_decoder_skips_debug_output_and_stray_start_bytes():
+    decoder = FrameDecoder()
+    garbage = b'INFO | boot\r\n\x94\x94x\x94'
+    frames = decoder.feed(garbage + encode_frame(b'payload') + b'tail')
+    assert frames == [b'payload']
+    assert decoder.discarded_bytes == len(garbage) + len(b'tail')
+
+
+def test_decoder_resyncs_after_an_oversize_length_header():
+    decoder = FrameDecoder()
+    bad_header = bytes([0x94, 0xC3, 0xFF, 0xFF])
+    assert decoder.feed(bad_header + encode_frame(b'ok')) == [b'ok']
+    # Only the bad header was dropped, not the frame behind it
+    assert decoder.discarded_bytes == len(bad_header)
+
+
+def test_decoder_waits_for_a_partial_header():
+    decoder = FrameDecoder()
+    frame = encode_frame(b'abc')
+    assert decoder.feed(frame[:1]) == []
+    assert decoder.feed(frame[1:3]) == []
+    assert decoder.feed(frame[3:]) == [b'abc']
+
+
+def test_encode_frame_rejects_oversize_payloads():
+    assert len(encode_frame(b'x' * MAX_PAYLOAD)) == MAX_PAYLOAD + 4
+    with pytest.raises(ValueError):
+        encode_frame(b'x' * (MAX_PAYLOAD + 1))
+
+
+def test_config_id_codecs():
+    assert parse_config_complete_id(encode_config_complete(0xDEADBEEF)) == 0xDEADBEEF
+    assert parse_want_config_id(encode_config_complete(5)) is None
+    assert parse_want_config_id(b'\x18\x80') is None     # truncated varint
+
+
+# ----------------------------------------------------------------------
+# Client against FakeMeshtasticd
+# ----------------------------------------------------------------------
+
+@pytest.fixture
+def pb():
+    pytest.importorskip('meshtastic')
+    from src.monitoring.stream_client import _load_protobufs
+    return _load_protobufs()
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_handshake_delivers_the_node_db_then_config_complete(pb):
+    from src.monitoring.fake_daemon import build_my_info_payload, build_node_info_payload
+
+    async def scenario():
+        daemon = FakeMeshtasticd(config_payloads=[
+            build_my_info_payload(0x1234), build_node_info_payload(0x42, long_name='Alpha')])
+        port = await daemon.start()
+        client = MeshtasticStreamClient('127.0.0.1', port, heartbeat_interval=0)
+        variants = []
+        client.on_from_radio = lambda msg: variants.append(msg.WhichOneof('payload_variant'))
+        try:
+            await client.connect(timeout=5)
+            assert client.config_complete and client.is_connected
+            assert client.my_info.my_node_num == 0x1234
+            assert variants == ['my_info', 'node_info', 'config_complete_id']
+            # The client asked with the id the daemon echoed
+            assert parse_want_config_id(daemon.received[0]) == client._config_id
+        finally:
+            await client.close()
+            await daemon.stop()
+
+    run(scenario())
+
+
+def test_live_packets_and_send_text(pb):
+    mesh_pb2, portnums_pb2, _ = pb
+
+    async def scenario():
+        daemon = FakeMeshtasticd()
+        port = await daemon.start()
+        client = MeshtasticStreamClient('127.0.0.1', port, heartbeat_interval=0)
+        packets = asyncio.Queue()
+        client.on_from_radio = lambda msg: msg.HasField('packet') and packets.put_nowait(msg.packet)
+        try:
+            await client.connect(timeout=5)
+            from_radio = mesh_pb2.FromRadio()
+            from_radio.packet.to = 0xFFFFFFFF
+            setattr(from_radio.packet, 'from', 0x42)
+            from_radio.packet.decoded.portnum = portnums_pb2.PortNum.TEXT_MESSAGE_APP
+            from_radio.packet.decoded.payload = 'hello'.encode('utf-8')
+            await daemon.broadcast(from_radio.SerializeToString())
+            packet = client.packet_to_dict(await packets.get())
+            assert packet['fromId'] == '!00000042'
+            assert packet['decoded']['portnum'] == 'TEXT_MESSAGE_APP'
+            assert packet['decoded']['text'] == 'hello'
+
+            await client.send_text('hi there', destination=0x42)
+            for _ in range(100):
+                if len(daemon.received) > 1:
+                    break
+                await asyncio.sleep(0.01)
+            to_radio = mesh_pb2.ToRadio()
+            to_radio.ParseFromString(daemon.received[-1])
+            assert to_radio.packet.to == 0x42
+            assert to_radio.packet.decoded.payload == b'hi there'
+        finally:
+            await client.close()
+            await daemon.stop()
+
+    run(scenario())
+
+
+def test_handshake_times_out_and_closes_the_socket(pb):
+    async def scenario():
+        closed = asyncio.Event()
+
+        async def silent(reader, writer):
+            # Accepts the connection but never answers want_config
+            while await reader.read(4096):
+                pass
+            closed.set()
+            writer.close()
+
+        server = await asyncio.start_server(silent, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = MeshtasticStreamClient('127.0.0.1', port, heartbeat_interval=0)
+        try:
+            with pytest.raises(TimeoutError):
+                await client.connect(timeout=0.3)
+            await asyncio.wait_for(closed.wait(), 2)
+            assert not client.is_connected
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    run(scenario())
+
+
+def test_connection_closed_during_config_download(pb):
+    async def scenario():
+        async def hang_up(reader, writer):
+            writer.close()
+
+        server = await asyncio.start_server(hang_up, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = MeshtasticStreamClient('127.0.0.1', port, heartbeat_interval=0)
+        try:
+            with pytest.raises(ConnectionError):
+                await client.connect(timeout=5)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    run(scenario())
+
+
+def test_unreachable_daemon_raises_connection_error(pb):
+    async def scenario():
+        server = await asyncio.start_server(lambda r, w: None, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        with pytest.raises(ConnectionError):
+            await MeshtasticStreamClient('127.0.0.1', port).connect(timeout=2)
+
+    run(scenario())
+
+
+def test_daemon_going_away_fires_on_disconnect(pb):
+    async def scenario():
+        daemon = FakeMeshtasticd()
+        port = await daemon.start()
+        client = MeshtasticStreamClient('127.0.0.1', port, heartbeat_interval=0)
+        disconnects = []
+        client.on_disconnect = disconnects.append
+        await client.connect(timeout=5)
+        assert daemon.client_count == 1
+
+        await daemon.stop()
+        await client.wait_closed()
+        assert disconnects == [None]
+        assert not client.is_connected
+        await client.close()
+
+    run(scenario())
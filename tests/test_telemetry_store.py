@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from src.monitoring.node_monitor import NodeMonitor
+from src.monitoring.telemetry_store import HOUR, TelemetryStore
+
+
+@pytest.fixture
+def open_store(tmp_path):
+    stores = []
+
+    def open_store(**kwargs):
+        store = TelemetryStore(path=str(tmp_path / 'telemetry.db'), flush_interval=3600, **kwargs)
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
+
+
+@pytest.fixture
+def base():
+    """Start of an hour that is complete, so every tier rolls up"""
+    return (int(time.time()) // HOUR - 3) * HOUR
+
+
+def test_record_and_rollups(open_store, base):
+    store = open_store()
+    store.record(1, {'battery_level': 80, 'snr': 4.0}, base + 5)
+    store.record(1, {'battery_level': 70}, base + 25)
+    store.record(1, {'battery_level': 60}, base + 65)
+    store.record(2, {'battery_level': 10}, base + 5)
+    store.flush()
+
+    assert store.query(1, 'battery_level', base, base + HOUR, 'raw') == [
+        (base + 5, 80.0), (base + 25, 70.0), (base + 65, 60.0)]
+    assert store.query(1, 'battery_level', base, base + HOUR, '1m') == [(base, 75.0), (base + 60, 60.0)]
+    assert store.query(1, 'battery_level', base, base + HOUR, '1h') == [(base, 70.0)]
+    assert store.query(1, 'snr', base, base + HOUR, '1h') == [(base, 4.0)]
+    assert store._conn.execute(
+        "SELECT count, min, max FROM samples_1h WHERE node_num = 1 AND metric = 0").fetchone() == (3, 60.0, 80.0)
+    assert store.get_stats()['samples_written'] == 5
+
+
+def test_repeated_values_are_all_counted(open_store, base):
+    store = open_store()
+    for offset in (0, 10, 20):
+        store.record(1, {'voltage': 4.0}, base + offset)
+    store.flush()
+    assert store._conn.execute(
+        "SELECT count, sum FROM samples_1m WHERE ts = ? AND metric = 1", (base,)).fetchone() == (3, 12.0)
+
+
+def test_same_report_overwrites_in_place(open_store, base):
+    store = open_store()
+    store.record(1, {'battery_level': 80}, base + 5)
+    store.record(1, {'battery_level': 81}, base + 5)
+    store.flush()
+    assert store.query(1, 'battery_level', base, base + HOUR, 'raw') == [(base + 5, 81.0)]
+    assert store.query(1, 'battery_level', base, base + HOUR, '1m') == [(base, 81.0)]
+
+
+def test_late_sample_rolls_up_its_minute_again(open_store, base):
+    store = open_store()
+    store.record(1, {'battery_level': 80}, base + 5)
+    store.flush()
+    store.record(1, {'battery_level': 60}, base + 10)
+    store.flush()
+    assert store.query(1, 'battery_level', base, base + HOUR, '1m') == [(base, 70.0)]
+    assert store.query(1, 'battery_level', base, base + HOUR, '1h') == [(base, 70.0)]
+
+
+def test_rollup_state_survives_reopen(open_store, base):
+    store = open_store()
+    store.record(1, {'battery_level': 50}, base + 5)
+    store.close()
+    store = open_store()
+    store.record(1, {'battery_level': 70}, base + 6)
+    store.flush()
+    assert store.query(1, 'battery_level', base, base + HOUR, '1h') == [(base, 60.0)]
+
+
+def test_retention_per_tier(open_store, base):
+    store = open_store(raw_retention=HOUR, minute_retention=2 * HOUR)
+    recent = int(time.time()) - 10
+    store.record(1, {'battery_level': 40}, base + 5)
+    store.record(1, {'battery_level': 30}, recent)
+    store.flush()
+
+    assert store.query(1, 'battery_level', base, recent + 1, 'raw') == [(recent, 30.0)]
+    assert store.query(1, 'battery_level', base, base + HOUR, '1m') == []
+    assert store.query(1, 'battery_level', base, base + HOUR, '1h') == [(base, 40.0)]
+
+
+def test_skips_unknown_and_missing_values(open_store, base):
+    store = open_store()
+    store.record(1, {'battery_level': None, 'rssi': -90})
+    assert store.get_stats()['pending'] == 0
+    with pytest.raises(ValueError):
+        store.query(1, 'rssi')
+    with pytest.raises(ValueError):
+        store.query(1, 'snr', resolution='5m')
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def record(self, node_num, metrics, timestamp=None):
+        self.calls.append((node_num, metrics, timestamp))
+
+
+def test_node_monitor_records_every_report_not_just_changes():
+    store = Recorder()
+    monitor = NodeMonitor(host='localhost', port=1, sync_callbacks=True, telemetry_store=store)
+    try:
+        now = time.time()
+        for offset in (60, 30):
+            monitor._apply_node_data('!00000001', {
+                'lastHeard': now - offset, 'snr': 5.0,
+                'deviceMetrics': {'batteryLevel': 90, 'voltage': 4.1}})
+        # A position-only update carries no metrics
+        monitor._apply_node_data('!00000001', {'lastHeard': now, 'position': {'altitude': 10}})
+    finally:
+        monitor.events.close()
+
+    assert store.calls == [
+        (1, {'battery_level': 90, 'voltage': 4.1, 'snr': 5.0}, now - 60),
+        (1, {'battery_level': 90, 'voltage': 4.1, 'snr': 5.0}, now - 30),
+    ]
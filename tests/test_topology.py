@@ -0,0 +1,114 @@
+import random
+import time
+
+from src.monitoring.topology import MeshTopology
+
+
+def build(edges, local_node=None):
+    topo = MeshTopology(local_node=local_node)
+    for a, b in edges:
+        topo.add_edge(a, b, now=1000.0)
+    return topo
+
+
+def components(adj, removed=None):
+    seen, count = set(), 0
+    for start in adj:
+        if start == removed or start in seen:
+            continue
+        count += 1
+        stack = [start]
+        seen.add(start)
+        while stack:
+            node = stack.pop()
+            for other in adj[node]:
+                if other != removed and other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+    return count
+
+
+def brute_articulation(edges):
+    adj = {}
+    for a, b in edges:
+        adj.setdefault(a, set()).add(b)
+        adj.setdefault(b, set()).add(a)
+    base = components(adj)
+    return {node for node in adj if components(adj, removed=node) > base}
+
+
+def test_articulation_points_of_a_bowtie():
+    # Two triangles joined by a bridge 3-4
+    topo = build([(1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (5, 6), (6, 4)])
+    assert topo.articulation_points() == {3, 4}
+
+
+def test_articulation_points_match_brute_force():
+    rng = random.Random(11)
+    for _ in range(30):
+        nodes = list(range(1, rng.randint(3, 25)))
+        edges = {tuple(sorted(rng.sample(nodes, 2))) for _ in range(rng.randint(2, 40))}
+        assert build(edges).articulation_points() == brute_articulation(edges)
+
+
+def test_long_chain_does_not_recurse():
+    count = 5000
+    topo = build([(i, i + 1) for i in range(1, count)])
+    assert topo.articulation_points() == set(range(2, count))
+
+
+def test_cache_follows_structural_changes_only():
+    topo = build([(1, 2), (2, 3)])
+    assert topo.articulation_points() == {2}
+    version = topo.version
+    topo.add_edge(1, 2, snr=5.0, measured_by=1, now=2000.0)
+    assert topo.version == version
+    topo.add_edge(1, 3, now=2000.0)
+    assert topo.articulation_points() == set()
+    topo.remove_edge(1, 3)
+    assert topo.articulation_points() == {2}
+
+
+def test_partition_if_removed_is_relative_to_the_local_node():
+    topo = build([(1, 2), (2, 3), (3, 4), (2, 5)], local_node=1)
+    assert sorted(map(sorted, topo.partition_if_removed(2))) == [[3, 4], [5]]
+    assert topo.partition_if_removed(4) == []
+
+
+def test_remove_node_drops_its_edges():
+    topo = build([(1, 2), (2, 3)])
+    assert topo.remove_node(2)
+    assert len(topo) == 0
+    assert topo.edge_count() == 0
+
+
+def test_shortest_path_prefers_strong_links():
+    topo = MeshTopology()
+    topo.add_edge(1, 2, snr=-15.0, measured_by=2, now=1000.0)
+    topo.add_edge(1, 3, snr=10.0, measured_by=3, now=1000.0)
+    topo.add_edge(3, 2, snr=10.0, measured_by=2, now=1000.0)
+    assert topo.shortest_path(1, 2, weighted=False) == ([1, 2], 1.0)
+    path, _ = topo.shortest_path(1, 2)
+    assert path == [1, 3, 2]
+    topo.add_edge(8, 9, now=1000.0)
+    assert topo.shortest_path(1, 9) is None
+
+
+def test_observe_neighborinfo_and_direct_packets():
+    # observe_packet prunes against the wall clock, so use it here
+    now = time.time()
+    topo = MeshTopology(local_node=1)
+    assert topo.observe_packet({'from': 2, 'decoded': {'neighborinfo': {
+        'nodeId': 2, 'neighbors': [{'nodeId': 3, 'snr': 4.5}, {'nodeId': 4}]}}}, now=now)
+    assert topo.observe_packet({'from': 5, 'hopStart': 3, 'hopLimit': 3, 'rxSnr': 6.0}, now=now)
+    assert not topo.observe_packet({'from': 6, 'hopStart': 3, 'hopLimit': 2}, now=now)
+    assert sorted(topo.neighbors(2)) == [3, 4]
+    assert list(topo.neighbors(1)) == [5]
+
+
+def test_prune_drops_stale_edges():
+    topo = MeshTopology(edge_ttl=100)
+    topo.add_edge(1, 2, now=1000.0)
+    topo.add_edge(2, 3, now=1090.0)
+    assert topo.prune(now=1150.0) == 1
+    assert sorted(topo.nodes()) == [2, 3]
@@ -0,0 +1,144 @@
+import queue
+
+import pytest
+
+
+@pytest.fixture
+def web():
+    pytest.importorskip('flask')
+    from src import main_web
+    return main_web
+
+
+@pytest.fixture
+def events(web, monkeypatch):
+    """A broadcaster whose producer thread collects nothing"""
+    broadcaster = web.EventBroadcaster(interval=0.05, client_queue_size=4)
+    for name in ('_collect_status', '_collect_nodes', '_collect_logs'):
+        monkeypatch.setattr(broadcaster, name, lambda: None)
+    return broadcaster
+
+
+def drain(client):
+    items = []
+    while True:
+        try:
+            items.append(client.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def test_events_fan_out_to_every_client(events):
+    first, second = events.subscribe(), events.subscribe()
+    events.publish('nodes', {'total': 3, 'version': 1})
+    events.publish('logs', {'reset': False, 'lines': ['x'], 'cursor': 'c1'})
+    expected = [('nodes', {'total': 3, 'version': 1}),
+                ('logs', {'reset': False, 'lines': ['x'], 'cursor': 'c1'})]
+    assert drain(first) == drain(second) == expected
+
+
+def test_new_client_gets_the_current_state(events):
+    events._status = {'service': {'running': True}}
+    events._nodes = {'total': 3, 'version': 7}
+    events._log_lines.extend(['a', 'b'])
+    events._log_cursor = 'c2'
+    client = events.subscribe()
+    assert drain(client) == [
+        ('status', {'service': {'running': True}}),
+        ('nodes', {'total': 3, 'version': 7}),
+        ('logs', {'reset': True, 'lines': ['a', 'b'], 'cursor': 'c2'}),
+    ]
+
+
+def test_slow_client_is_dropped_without_blocking_others(events):
+    slow, fast = events.subscribe(), events.subscribe()
+    for version in range(6):
+        events.publish('nodes', {'version': version})
+        drain(fast)
+    assert not events.is_subscribed(slow)
+    assert events.is_subscribed(fast)
+    # What the slow client got before the overflow is still in order
+    assert [data['version'] for _, data in drain(slow)] == [0, 1, 2, 3]
+
+    events.unsubscribe(fast)
+    assert not events._has_clients.is_set()
+
+
+def test_unsubscribe_stops_delivery_and_idles_the_producer(events):
+    client = events.subscribe()
+    assert events._has_clients.is_set()
+    assert events._thread.is_alive()
+    events.unsubscribe(client)
+    events.unsubscribe(client)      # twice is harmless
+    events.publish('nodes', {'version': 1})
+    assert drain(client) == []
+    assert not events._has_clients.is_set()
+
+
+def test_closing_the_stream_unsubscribes(web, events, monkeypatch):
+    monkeypatch.setattr(web, '_events', events)
+    events._nodes = {'total': 1, 'version': 1}
+    response = web.app.test_client().get('/api/events', buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks) == b'retry: 3000\n\n'
+    assert next(chunks) == b'event: nodes\ndata: {"total": 1, "version": 1}\n\n'
+    client, = events._clients
+    # The browser going away closes the generator
+    response.close()
+    assert not events.is_subscribed(client)
+    assert not events._has_clients.is_set()
+
+
+def test_collectors_publish_only_changes(web, monkeypatch):
+    events = web.EventBroadcaster()
+    client = queue.Queue()
+    events._clients.add(client)
+
+    versions = {'service': 1, 'system': 1}
+    monkeypatch.setattr(web, 'status_snapshot', lambda: {'collector': {'sources': {
+        name: {'version': version} for name, version in versions.items()}}})
+    events._collect_status()
+    events._collect_status()
+    versions['system'] = 2
+    events._collect_status()
+
+    summaries = iter([{'total': 2, 'version': 5, 'nodes': []}, {'total': 2, 'version': 5, 'nodes': []},
+                      {'error': 'meshtasticd not running'}, None])
+    monkeypatch.setattr(web, 'try_broker', lambda method, **params: next(summaries))
+    for _ in range(4):
+        events._collect_nodes()
+
+    assert [event for event, _ in drain(client)] == ['status', 'status', 'nodes']
+    assert events._nodes == {'total': 2, 'version': 5}
+
+
+def test_log_lines_follow_the_journal_cursor(web, monkeypatch):
+    class Journal:
+        def __init__(self):
+            self.reads = []
+            self.batches = [([{'line': 'one'}, {'line': 'two'}], 'c2', False),
+                            ([], 'c2', False),
+                            ([{'line': 'three'}], 'c9', True)]
+
+        def start(self):
+            return True
+
+        def read(self, after=None, limit=100):
+            self.reads.append(after)
+            return self.batches.pop(0)
+
+    journal = Journal()
+    monkeypatch.setattr(web, '_journal', journal)
+    events = web.EventBroadcaster(log_lines=10)
+    client = queue.Queue()
+    events._clients.add(client)
+    for _ in range(3):
+        events._collect_logs()
+
+    assert journal.reads == [None, 'c2', 'c2']
+    assert drain(client) == [
+        ('logs', {'reset': False, 'lines': ['one', 'two'], 'cursor': 'c2'}),
+        ('logs', {'reset': True, 'lines': ['three'], 'cursor': 'c9'}),
+    ]
+    # A reset replaces the backlog new clients are sent
+    assert list(events._log_lines) == ['three']